@@ -0,0 +1,99 @@
+"""Compares the copy engines of the copy tool
+
+Usage:
+    python -m benchmarks.bench_copy_engines --size-mb 1024 --target-dir /other/disk
+
+Source files are created sparse thus reading them costs no disk
+I/O. This measures the overhead of the engines themselves (syscalls,
+copies between kernel and userspace). Specify a target directory
+on a different filesystem to check cross-filesystem copies.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from chia_tea.copy.copy_engines import COPY_ENGINES, copy_file_content
+
+
+def _create_sparse_file(filepath: str, size: int):
+    with open(filepath, "wb") as fp:
+        fp.truncate(size)
+
+
+def _get_cpu_time() -> float:
+    times = os.times()
+    return times.user + times.system
+
+
+def run_benchmark(size: int, source_dir: str, target_dir: str, repetitions: int):
+    """Copies a sparse file with every engine and prints the results
+
+    Parameters
+    ----------
+    size : int
+        size of the file to copy in bytes
+    source_dir : str
+        directory to create the source file in
+    target_dir : str
+        directory to copy the file into
+    repetitions : int
+        how often to copy the file per engine
+    """
+    source_path = os.path.join(source_dir, "bench_source.plot")
+    target_path = os.path.join(target_dir, "bench_target.plot")
+    _create_sparse_file(source_path, size)
+
+    print(f"Copying {size / 1024**2:.0f} MiB from '{source_dir}' to '{target_dir}'")
+    print(f"{'engine':<16} {'wall [s]':>10} {'cpu [s]':>10} {'MiB/s':>10}")
+
+    try:
+        for engine in COPY_ENGINES:
+            if not engine.is_available():
+                print(f"{engine.name:<16} {'not available':>32}")
+                continue
+
+            wall_times = []
+            cpu_times = []
+            try:
+                for _ in range(repetitions):
+                    wall_start, cpu_start = time.perf_counter(), _get_cpu_time()
+                    copy_file_content(source_path, target_path, engines=[engine])
+                    wall_times.append(time.perf_counter() - wall_start)
+                    cpu_times.append(_get_cpu_time() - cpu_start)
+            except OSError as err:
+                print(f"{engine.name:<16} {'failed: ' + str(err):>32}")
+                continue
+            finally:
+                if os.path.exists(target_path):
+                    os.unlink(target_path)
+
+            wall_time = min(wall_times)
+            cpu_time = min(cpu_times)
+            print(
+                f"{engine.name:<16} {wall_time:>10.3f} {cpu_time:>10.3f} "
+                f"{size / 1024**2 / wall_time:>10.0f}"
+            )
+    finally:
+        os.unlink(source_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=1024, help="size of the test file")
+    parser.add_argument("--source-dir", default="", help="directory for the source file")
+    parser.add_argument("--target-dir", default="", help="directory for the copied file")
+    parser.add_argument("--repetitions", type=int, default=3, help="copies per engine")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        run_benchmark(
+            size=args.size_mb * 1024 * 1024,
+            source_dir=args.source_dir or tmp_dir,
+            target_dir=args.target_dir or tmp_dir,
+            repetitions=args.repetitions,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+"""Replays plot arrivals onto a simulated fleet of target disks
+
+Usage:
+    python -m benchmarks.bench_copy_fleet --disk 256:64 --disk 256:16:0.3 --n-plots 30
+
+Every simulated disk is a folder on tmpfs with a capacity, a write
+speed in MB/s and a failure rate. A disk is given as
+'CAPACITY_MB:MB_PER_SEC[:FAILURE_RATE]' where the failure rate is the
+expected number of I/O errors per plot copied onto the disk. Plots
+are created in a source folder following an arrival schedule while
+'run_copy' runs with the real scheduler, placement policy, journal
+and source watcher. Only the copy engine and the free space are
+simulated: copies onto a disk share its speed and the free space is
+the capacity minus the files in its folder.
+
+Once all plots arrived, the benchmark waits until the copies settled
+and drains the copy process through its control API. Reported are
+the time to drain the source folder after the first arrival, the
+utilization of every disk (time spent writing divided by the time to
+drain), the plots per disk and the placement balance (coefficient of
+variation of the plots per disk, 0 is perfectly balanced). Every
+placement policy given runs on a fresh fleet.
+
+Runs offline without root, use small plots and high speeds to keep
+it fast and the memory usage of tmpfs low.
+"""
+import argparse
+import errno
+import functools
+import logging
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import BinaryIO, Dict, List, Optional
+from unittest.mock import patch
+
+from chia_tea.copy.control import COMMAND_DRAIN, COMMAND_LIST_JOBS, send_control_command
+from chia_tea.copy.copy_engines import AbstractCopyEngine, copy_file_content, get_n_bytes_copied
+from chia_tea.copy.DiskSpaceModel import DiskSpaceModel
+from chia_tea.copy.main import run_copy
+from chia_tea.protobuf.generated.config_pb2 import ChiaTeaConfig
+
+# bytes written at once by the simulated disks
+SLICE_SIZE = 1024 * 1024
+BYTES_PER_MB = 1e6
+DEFAULT_DISKS = ["256:64", "256:64", "256:32", "256:32:0.3"]
+DEFAULT_POLICIES = ["least_used", "fill_first", "throughput"]
+
+
+@dataclass
+class SimulatedDisk:
+    """Target disk with a capacity, a write speed and a failure rate"""
+
+    folder: str
+    capacity: int
+    bytes_per_sec: float
+    failure_rate: float = 0.0
+    # seconds spent writing and injected failures
+    busy_seconds: float = 0.0
+    n_failures: int = 0
+    busy_until: float = 0.0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def get_used_space(self) -> int:
+        """Bytes of all files in the folder of the disk"""
+        with os.scandir(self.folder) as entries:
+            return sum(entry.stat().st_size for entry in entries if entry.is_file())
+
+    def get_plots(self) -> List[str]:
+        """Filenames of the plots copied onto the disk"""
+        return [filename for filename in os.listdir(self.folder) if filename.endswith(".plot")]
+
+
+def parse_disk(spec: str, folder: str) -> SimulatedDisk:
+    """Creates a simulated disk from 'CAPACITY_MB:MB_PER_SEC[:FAILURE_RATE]'"""
+    values = spec.split(":")
+    if len(values) not in (2, 3):
+        raise ValueError(f"Invalid disk '{spec}', use CAPACITY_MB:MB_PER_SEC[:FAILURE_RATE]")
+
+    return SimulatedDisk(
+        folder=folder,
+        capacity=int(float(values[0]) * BYTES_PER_MB),
+        bytes_per_sec=float(values[1]) * BYTES_PER_MB,
+        failure_rate=float(values[2]) if len(values) == 3 else 0.0,
+    )
+
+
+class SimulatedDiskEngine(AbstractCopyEngine):
+    """Copies at the speed of the simulated target disk
+
+    Parallel copies onto the same disk share its speed. Failures are
+    injected as I/O errors like a dying disk would raise them.
+    """
+
+    name = "simulated"
+
+    def __init__(self, disks: Dict[str, SimulatedDisk], seed: int):
+        self.disks = disks
+        self.random = random.Random(seed)
+
+    def copy_chunk(self, source: BinaryIO, target: BinaryIO, offset: int, count: int) -> int:
+        disk = self.disks[os.path.dirname(target.name)]
+        count = min(count, SLICE_SIZE)
+
+        data = os.pread(source.fileno(), count, offset)
+        size = os.fstat(source.fileno()).st_size
+        duration = len(data) / disk.bytes_per_sec
+
+        with disk.lock:
+            # the failure rate is per plot thus spread over its slices
+            if self.random.random() < disk.failure_rate * len(data) / max(1, size):
+                disk.n_failures += 1
+                raise OSError(errno.EIO, "Simulated I/O error", target.name)
+
+            now = time.monotonic()
+            disk.busy_until = max(now, disk.busy_until) + duration
+            disk.busy_seconds += duration
+            wait = disk.busy_until - now
+
+        os.pwrite(target.fileno(), data, offset)
+        time.sleep(wait)
+        return len(data)
+
+
+def _create_space_model(disks: Dict[str, SimulatedDisk]) -> type:
+    """Creates a disk space model class using the capacity of the disks"""
+
+    class _SimulatedDiskSpaceModel(DiskSpaceModel):
+        def get_free_space(self, folder: str) -> int:
+            disk = disks[os.path.normpath(folder)]
+            n_bytes_outstanding = sum(
+                max(0, reservation.n_bytes - get_n_bytes_copied(target_filepath))
+                for target_filepath, reservation in self.reservations.items()
+                if os.path.dirname(target_filepath) == disk.folder
+            )
+            return disk.capacity - disk.get_used_space() - n_bytes_outstanding
+
+    return _SimulatedDiskSpaceModel
+
+
+def _create_plot(source_dir: str, name: str, size: int):
+    """Writes a plot and renames it when complete like a plotter"""
+    tmp_filepath = os.path.join(source_dir, name + ".tmp")
+    with open(tmp_filepath, "wb") as fp:
+        fp.write(os.urandom(size))
+    os.rename(tmp_filepath, os.path.join(source_dir, name))
+
+
+def _count_source_plots(source_dir: str) -> int:
+    return sum(filename.endswith(".plot") for filename in os.listdir(source_dir))
+
+
+def replay_arrivals(
+    source_dir: str, n_plots: int, plot_size: int, interval: float, burst: int
+) -> float:
+    """Creates the plots following the arrival schedule
+
+    Returns
+    -------
+    first_arrival : float
+        monotonic time of the first arrival
+    """
+    first_arrival = time.monotonic()
+    for i_plot in range(n_plots):
+        if i_plot and i_plot % burst == 0:
+            time.sleep(max(0.0, first_arrival + i_plot // burst * interval - time.monotonic()))
+        _create_plot(source_dir, f"plot-{i_plot:04d}.plot", plot_size)
+    return first_arrival
+
+
+def wait_until_settled(source_dir: str, socket_filepath: str, timeout: float, stuck_seconds: float):
+    """Waits until all plots are copied or no copy is running for a while"""
+    deadline = time.monotonic() + timeout
+    idle_since: Optional[float] = None
+    while time.monotonic() < deadline:
+        n_jobs = len(send_control_command(socket_filepath, COMMAND_LIST_JOBS)["jobs"])
+        if n_jobs == 0 and _count_source_plots(source_dir) == 0:
+            return
+
+        # plots are left but nothing copies them, e.g. all disks are full
+        if n_jobs == 0:
+            idle_since = idle_since if idle_since is not None else time.monotonic()
+            if time.monotonic() - idle_since > stuck_seconds:
+                return
+        else:
+            idle_since = None
+        time.sleep(0.05)
+
+
+def run_fleet(
+    disk_specs: List[str],
+    policy: str,
+    args: argparse.Namespace,
+    folder: str,
+):
+    """Replays the arrivals onto a fresh fleet and prints the results"""
+    source_dir = os.path.join(folder, "source")
+    os.makedirs(source_dir)
+    disks: Dict[str, SimulatedDisk] = {}
+    for i_disk, spec in enumerate(disk_specs):
+        disk = parse_disk(spec, os.path.join(folder, f"disk_{i_disk}"))
+        os.makedirs(disk.folder)
+        disks[disk.folder] = disk
+
+    socket_filepath = os.path.join(folder, "control.sock")
+    config = ChiaTeaConfig()
+    config.copy.source_folders.append(source_dir)
+    config.copy.target_folders.extend(disks)
+    config.copy.max_parallel_copies = args.parallel
+    config.copy.max_parallel_copies_per_target = args.per_target
+    config.copy.placement_policy = policy
+    config.copy.state_filepath = os.path.join(folder, "journal.jsonl")
+    config.copy.control_socket_filepath = socket_filepath
+
+    engine = SimulatedDiskEngine(disks, seed=args.seed)
+    with patch(
+        "chia_tea.copy.Disk.copy_file_content",
+        functools.partial(copy_file_content, engines=[engine]),
+    ), patch("chia_tea.copy.CopyScheduler.DiskSpaceModel", _create_space_model(disks)):
+        copy_thread = threading.Thread(target=run_copy, args=(config,), daemon=True)
+        copy_thread.start()
+        # the control API is up once the copy process started
+        while True:
+            try:
+                send_control_command(socket_filepath, COMMAND_LIST_JOBS)
+                break
+            except ConnectionError:
+                time.sleep(0.05)
+
+        first_arrival = replay_arrivals(
+            source_dir, args.n_plots, int(args.plot_mb * BYTES_PER_MB), args.interval, args.burst
+        )
+        wait_until_settled(source_dir, socket_filepath, args.timeout, args.stuck_seconds)
+        time_to_drain = time.monotonic() - first_arrival
+
+        send_control_command(socket_filepath, COMMAND_DRAIN)
+        copy_thread.join()
+
+    n_plots_per_disk = [len(disk.get_plots()) for disk in disks.values()]
+    balance = (
+        statistics.pstdev(n_plots_per_disk) / statistics.mean(n_plots_per_disk)
+        if sum(n_plots_per_disk)
+        else 0.0
+    )
+    print(
+        f"policy {policy}: time to drain {time_to_drain:.2f} s, "
+        f"{_count_source_plots(source_dir)} plots left, balance {balance:.2f}"
+    )
+    print(f"  {'disk':<24} {'MB/s':>6} {'plots':>6} {'full':>6} {'busy':>6} {'errors':>7}")
+    for spec, disk, n_plots in zip(disk_specs, disks.values(), n_plots_per_disk):
+        print(
+            f"  {spec:<24} {disk.bytes_per_sec / BYTES_PER_MB:>6.0f} {n_plots:>6} "
+            f"{disk.get_used_space() / disk.capacity:>6.0%} "
+            f"{disk.busy_seconds / time_to_drain:>6.0%} {disk.n_failures:>7}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--disk",
+        action="append",
+        help="CAPACITY_MB:MB_PER_SEC[:FAILURE_RATE], repeat for every disk",
+    )
+    parser.add_argument("--policy", action="append", help="placement policy, repeatable")
+    parser.add_argument("--n-plots", type=int, default=24, help="plots arriving")
+    parser.add_argument("--plot-mb", type=float, default=16, help="size of a plot")
+    parser.add_argument("--interval", type=float, default=0.5, help="seconds between arrivals")
+    parser.add_argument("--burst", type=int, default=2, help="plots arriving at once")
+    parser.add_argument("--parallel", type=int, default=4, help="parallel copies")
+    parser.add_argument("--per-target", type=int, default=1, help="parallel copies per disk")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the failure injection")
+    parser.add_argument("--timeout", type=float, default=300, help="maximum seconds per run")
+    parser.add_argument(
+        "--stuck-seconds", type=float, default=5, help="idle seconds until plots count as left"
+    )
+    parser.add_argument("--dir", default="", help="directory for the fleet, tmpfs by default")
+    parser.add_argument("--verbose", action="store_true", help="show the copy logs")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.disable(logging.CRITICAL)
+
+    disk_specs = args.disk or DEFAULT_DISKS
+    tmp_root = args.dir or ("/dev/shm" if os.path.isdir("/dev/shm") else None)
+    if args.dir:
+        os.makedirs(args.dir, exist_ok=True)
+    print(
+        f"{args.n_plots} plots of {args.plot_mb:.0f} MB, {args.burst} every {args.interval} s, "
+        f"{len(disk_specs)} disks, {args.parallel} parallel copies ({args.per_target} per disk)"
+    )
+    for policy in args.policy or DEFAULT_POLICIES:
+        with tempfile.TemporaryDirectory(dir=tmp_root) as tmp_dir:
+            run_fleet(disk_specs, policy, args, tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Measures the throughput and page cache usage of direct I/O copies
+
+Usage:
+    python -m benchmarks.bench_direct_io --size-mb 4096 --target-dir /other/disk
+
+The same file with random content is copied with and without direct
+I/O. Before and after every copy the share of the source and target
+pages residing in the page cache is measured with 'mincore'. Copies
+through the page cache leave the whole plot cached and thus evict
+other data, while direct I/O copies leave next to nothing behind.
+
+Filesystems without O_DIRECT support such as tmpfs fall back to
+dropping the copied data, the engine used is printed. Files on tmpfs
+always reside in memory, so use real disks for meaningful results.
+"""
+import argparse
+import ctypes
+import ctypes.util
+import mmap
+import os
+import tempfile
+import time
+
+from chia_tea.copy.copy_engines import copy_file_content
+from chia_tea.copy.verification import drop_page_cache
+
+# bytes written at once when creating the test file
+WRITE_SIZE = 8 * 1024 * 1024
+
+_LIBC = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+_LIBC.mincore.argtypes = (ctypes.c_void_p, ctypes.c_size_t, ctypes.POINTER(ctypes.c_ubyte))
+_LIBC.mincore.restype = ctypes.c_int
+
+
+def _create_random_file(filepath: str, size: int):
+    with open(filepath, "wb") as fp:
+        block = os.urandom(WRITE_SIZE)
+        for offset in range(0, size, WRITE_SIZE):
+            fp.write(block[: min(WRITE_SIZE, size - offset)])
+        fp.flush()
+        os.fsync(fp.fileno())
+
+
+def get_cached_fraction(filepath: str) -> float:
+    """Get the share of the pages of a file residing in the page cache
+
+    Parameters
+    ----------
+    filepath : str
+        file to check
+
+    Returns
+    -------
+    fraction : float
+        cached pages divided by all pages of the file, 0 if empty
+    """
+    size = os.path.getsize(filepath)
+    if size == 0:
+        return 0.0
+
+    n_pages = (size + mmap.PAGESIZE - 1) // mmap.PAGESIZE
+    residency = (ctypes.c_ubyte * n_pages)()
+
+    with open(filepath, "rb") as fp, mmap.mmap(
+        fp.fileno(), size, access=mmap.ACCESS_COPY
+    ) as mapping:
+        # mapping the file does not read it, only touching pages would
+        address = ctypes.c_char.from_buffer(mapping)
+        try:
+            if _LIBC.mincore(ctypes.addressof(address), size, residency) != 0:
+                err = ctypes.get_errno()
+                raise OSError(err, os.strerror(err), filepath)
+        finally:
+            del address
+
+    return sum(page & 1 for page in residency) / n_pages
+
+
+def _drop_file(filepath: str):
+    with open(filepath, "rb") as fp:
+        drop_page_cache(fp)
+
+
+def run_benchmark(size: int, source_dir: str, target_dir: str, repetitions: int):
+    """Copies a file with and without direct I/O and prints the results
+
+    Parameters
+    ----------
+    size : int
+        size of the file to copy in bytes
+    source_dir : str
+        directory to create the source file in
+    target_dir : str
+        directory to copy the file into
+    repetitions : int
+        how often to copy the file per mode
+    """
+    source_path = os.path.join(source_dir, "bench_source.plot")
+    target_path = os.path.join(target_dir, "bench_target.plot")
+    _create_random_file(source_path, size)
+
+    print(f"Copying {size / 1024**2:.0f} MiB from '{source_dir}' to '{target_dir}'")
+    print(
+        f"{'mode':<12} {'engine':<16} {'wall [s]':>10} {'MiB/s':>10} "
+        f"{'src before':>11} {'src after':>10} {'tgt after':>10}"
+    )
+
+    try:
+        for direct_io in (False, True):
+            wall_times = []
+            for _ in range(repetitions):
+                # every copy starts with a cold cache like a fresh plot
+                _drop_file(source_path)
+                source_before = get_cached_fraction(source_path)
+
+                wall_start = time.perf_counter()
+                engine_name = copy_file_content(source_path, target_path, direct_io=direct_io)
+                wall_times.append(time.perf_counter() - wall_start)
+
+                source_after = get_cached_fraction(source_path)
+                target_after = get_cached_fraction(target_path)
+                os.unlink(target_path)
+
+            wall_time = min(wall_times)
+            print(
+                f"{'direct' if direct_io else 'page cache':<12} {engine_name:<16} "
+                f"{wall_time:>10.3f} {size / 1024**2 / wall_time:>10.0f} "
+                f"{source_before:>11.0%} {source_after:>10.0%} {target_after:>10.0%}"
+            )
+    finally:
+        if os.path.exists(target_path):
+            os.unlink(target_path)
+        os.unlink(source_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=1024, help="size of the test file")
+    parser.add_argument("--source-dir", default="", help="directory for the source file")
+    parser.add_argument("--target-dir", default="", help="directory for the copied file")
+    parser.add_argument("--repetitions", type=int, default=3, help="copies per mode")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        run_benchmark(
+            size=args.size_mb * 1024 * 1024,
+            source_dir=args.source_dir or tmp_dir,
+            target_dir=args.target_dir or tmp_dir,
+            repetitions=args.repetitions,
+        )
+
+
+if __name__ == "__main__":
+    main()
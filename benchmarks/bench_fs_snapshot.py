@@ -0,0 +1,270 @@
+"""Counts the filesystem calls of one copy loop iteration
+
+Usage:
+    python -m benchmarks.bench_fs_snapshot --n-files 5000 --latency-ms 0.5
+
+One iteration collects the plots in the source folders and, for every
+copy started, checks the target folders for running copies and free
+space. This runs once with the calls as done before the filesystem
+snapshot (glob, exists, isdir, isfile, listdir and stat per path) and
+once with a snapshot shared by the iteration.
+
+Calls are counted by wrapping the functions of the os module. Stats of
+scandir entries are counted when they are first needed since entries
+cache them. The optional latency is added to every call to emulate a
+network filesystem where every call is a round trip.
+"""
+import argparse
+import builtins
+import glob
+import os
+import tempfile
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Set
+from unittest.mock import patch
+
+import psutil
+
+from chia_tea.copy.copy_engines import CHECKPOINT_SUFFIX, PARTIAL_SUFFIX
+from chia_tea.copy.Disk import (
+    DiskCopyInfo,
+    collect_files_from_folders,
+    get_disks_with_space,
+    get_files_being_copied,
+)
+from chia_tea.copy.FilesystemSnapshot import FilesystemSnapshot
+
+N_TARGET_FOLDERS = 4
+
+
+class _CountingEntry:
+    """Wraps a scandir entry to count the calls hitting the filesystem"""
+
+    def __init__(self, entry: os.DirEntry, counter: Counter, latency: float):
+        self.__entry = entry
+        self.__counter = counter
+        self.__latency = latency
+        self.__has_stat = False
+        self.name = entry.name
+        self.path = entry.path
+
+    def __count(self, name: str):
+        self.__counter[name] += 1
+        time.sleep(self.__latency)
+
+    def stat(self, *args, **kwargs):
+        if not self.__has_stat:
+            self.__has_stat = True
+            self.__count("DirEntry.stat")
+        return self.__entry.stat(*args, **kwargs)
+
+    def is_file(self, *args, **kwargs):
+        # the type of symlinks needs a stat of the link target
+        if self.__entry.is_symlink():
+            self.__count("DirEntry.stat")
+        return self.__entry.is_file(*args, **kwargs)
+
+    def is_dir(self, *args, **kwargs):
+        if self.__entry.is_symlink():
+            self.__count("DirEntry.stat")
+        return self.__entry.is_dir(*args, **kwargs)
+
+    def is_symlink(self):
+        return self.__entry.is_symlink()
+
+
+@contextmanager
+def count_filesystem_calls(latency: float) -> Iterator[Counter]:
+    """Counts the filesystem calls made within the context
+
+    Parameters
+    ----------
+    latency : float
+        seconds added to every call
+
+    Returns
+    -------
+    counter : Counter
+        number of calls per function
+    """
+    counter: Counter = Counter()
+
+    def _wrap(name, func):
+        def _counting(*args, **kwargs):
+            counter[name] += 1
+            time.sleep(latency)
+            return func(*args, **kwargs)
+
+        return _counting
+
+    @contextmanager
+    def _counting_scandir(path):
+        counter["os.scandir"] += 1
+        time.sleep(latency)
+        with os_scandir(path) as entries:
+            yield (_CountingEntry(entry, counter, latency) for entry in entries)
+
+    os_scandir = os.scandir
+    with patch("os.stat", _wrap("os.stat", os.stat)), patch(
+        "os.listdir", _wrap("os.listdir", os.listdir)
+    ), patch("os.scandir", _counting_scandir), patch(
+        "builtins.open", _wrap("open", builtins.open)
+    ), patch(
+        "psutil.disk_usage", _wrap("statvfs", psutil.disk_usage)
+    ):
+        yield counter
+
+
+def _legacy_collect_files_from_folders(folder_set: Set[str], pattern: str) -> Set[str]:
+    """collect_files_from_folders before the filesystem snapshot"""
+    all_filepaths = set()
+    valid_folders = {
+        folder
+        for folder in folder_set
+        if os.path.exists(folder) and not os.path.isfile(folder) and os.path.isdir(folder)
+    }
+    for folder in valid_folders:
+        for filepath in glob.glob(os.path.join(folder, pattern)):
+            if os.path.isfile(filepath):
+                all_filepaths.add(filepath)
+    return all_filepaths
+
+
+def _legacy_get_files_being_copied(
+    directories: Set[str], previous_check: Dict[str, DiskCopyInfo]
+) -> Dict[str, DiskCopyInfo]:
+    """get_files_being_copied before the filesystem snapshot without probing"""
+    disk_copy_data: Dict[str, DiskCopyInfo] = {}
+    for folder_path in directories:
+        if not os.path.exists(folder_path) or not os.path.isdir(folder_path):
+            continue
+
+        new_info = DiskCopyInfo(files_in_progress=set(), files_not_being_copied=set())
+        disk_copy_data[folder_path] = new_info
+        all_files_to_check = {
+            os.path.join(folder_path, f)
+            for f in os.listdir(folder_path)
+            if CHECKPOINT_SUFFIX not in f and os.path.isfile(os.path.join(folder_path, f))
+        }
+        for f in all_files_to_check:
+            if f.endswith(PARTIAL_SUFFIX):
+                new_info.files_in_progress.add(f)
+            elif f in previous_check[folder_path].files_not_being_copied:
+                new_info.files_not_being_copied.add(f)
+    return disk_copy_data
+
+
+def _legacy_get_disks_with_space(filepath: str, target_dirs: Set[str]) -> Dict[str, float]:
+    """get_disks_with_space before the filesystem snapshot"""
+    fstat = os.stat(filepath)
+    disks_with_space = {}
+    for dirpath in target_dirs:
+        if not os.path.exists(dirpath):
+            os.makedirs(dirpath, exist_ok=True)
+        free_space = psutil.disk_usage(dirpath).free
+        if free_space > fstat.st_size:
+            disks_with_space[dirpath] = free_space - fstat.st_size
+    return disks_with_space
+
+
+def _create_files(folder: str, n_files: int, suffix: str):
+    os.makedirs(folder, exist_ok=True)
+    for i_file in range(n_files):
+        with open(os.path.join(folder, f"file_{i_file:06d}{suffix}"), "wb"):
+            pass
+
+
+def _run_iteration(
+    source_dir: str,
+    target_dirs: Set[str],
+    n_submits: int,
+    previous_check: Dict[str, DiskCopyInfo],
+    snapshot: Optional[FilesystemSnapshot],
+):
+    """Runs the filesystem checks of one copy loop iteration"""
+    if snapshot is None:
+        source_files = sorted(_legacy_collect_files_from_folders({source_dir}, "*.plot"))
+        for source_filepath in source_files[:n_submits]:
+            _legacy_get_files_being_copied(target_dirs, previous_check)
+            _legacy_get_disks_with_space(source_filepath, target_dirs)
+    else:
+        source_files = sorted(collect_files_from_folders({source_dir}, "*.plot"))
+        target_process_counts = {folder: 0 for folder in target_dirs}
+        for source_filepath in source_files[:n_submits]:
+            get_files_being_copied(target_dirs, previous_check, snapshot=snapshot)
+            get_disks_with_space(source_filepath, target_process_counts, snapshot=snapshot)
+
+
+def run_benchmark(n_files: int, n_submits: int, latency: float, folder: str):
+    """Counts the filesystem calls with and without snapshot and prints them
+
+    Parameters
+    ----------
+    n_files : int
+        number of files in the source folder and in all target folders
+    n_submits : int
+        number of copies started in the iteration
+    latency : float
+        seconds added to every filesystem call
+    folder : str
+        folder to create the test folders in
+    """
+    source_dir = os.path.join(folder, "source")
+    target_dirs = {
+        os.path.join(folder, f"target_{i_target}") for i_target in range(N_TARGET_FOLDERS)
+    }
+    _create_files(source_dir, n_files, ".plot")
+    for target_dir in target_dirs:
+        _create_files(target_dir, n_files // N_TARGET_FOLDERS, ".plot")
+
+    # files in the targets were probed by previous iterations already
+    previous_check = get_files_being_copied(target_dirs)
+
+    print(
+        f"{n_files} source files, {n_files} target files in {N_TARGET_FOLDERS} folders, "
+        f"{n_submits} copies started, {latency * 1000:.2f} ms latency per call"
+    )
+
+    results = {}
+    for name, snapshot in (("before", None), ("snapshot", FilesystemSnapshot())):
+        with count_filesystem_calls(latency) as counter:
+            start = time.perf_counter()
+            _run_iteration(source_dir, target_dirs, n_submits, previous_check, snapshot)
+            duration = time.perf_counter() - start
+        results[name] = (counter, duration)
+
+    functions = sorted(set().union(*(counter for counter, _ in results.values())))
+    print(f"{'call':<16}" + "".join(f"{name:>12}" for name in results))
+    for function in functions:
+        print(
+            f"{function:<16}"
+            + "".join(f"{counter[function]:>12}" for counter, _ in results.values())
+        )
+    print(
+        f"{'total':<16}"
+        + "".join(f"{sum(counter.values()):>12}" for counter, _ in results.values())
+    )
+    print(f"{'time [s]':<16}" + "".join(f"{duration:>12.3f}" for _, duration in results.values()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n-files", type=int, default=5000, help="files per side")
+    parser.add_argument("--n-submits", type=int, default=4, help="copies started")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="latency per call")
+    parser.add_argument("--dir", default="", help="directory to create the files in")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.dir or None) as tmp_dir:
+        run_benchmark(
+            n_files=args.n_files,
+            n_submits=args.n_submits,
+            latency=args.latency_ms / 1000,
+            folder=tmp_dir,
+        )
+
+
+if __name__ == "__main__":
+    main()
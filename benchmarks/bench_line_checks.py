@@ -0,0 +1,166 @@
+"""Measures the line throughput of the chia logfile checks
+
+Usage:
+    python -m benchmarks.bench_line_checks --n-lines 200000
+    python -m benchmarks.bench_line_checks --logfile ~/.chia/mainnet/log/debug.log
+
+Lines are processed once as done before the dispatcher, where every
+action scans the whole line for its codewords and a matching action
+splits the line and converts the timestamp itself, and once with the
+dispatcher, which parses the prefix of a line once and only checks the
+actions of the service which logged it.
+
+Without a recorded logfile a synthetic one is generated. Its mix of
+lines follows a farming node with debug logging, where most lines are
+chatter of the full node and only a few lines are of interest.
+"""
+import argparse
+import logging
+import random
+import time
+from typing import Callable, List
+
+from chia_tea.models.ChiaWatchdog import ChiaWatchdog
+from chia_tea.watchdog.collection.logfile.line_checks import ALL_LINE_ACTIONS, process_line
+
+N_HARVESTERS = 8
+
+# weight and template of the synthetic lines
+LINE_TEMPLATES = (
+    (
+        30,
+        "{timestamp} full_node full_node_server        : DEBUG    <- new_peak from peer "
+        "{node_id} {ip_address}",
+    ),
+    (
+        20,
+        "{timestamp} full_node full_node_server        : DEBUG    -> request_blocks to peer "
+        "{ip_address} {node_id}",
+    ),
+    (
+        10,
+        "{timestamp} full_node chia.full_node.mempool_manager: DEBUG    add_spendbundle took "
+        "0.01 seconds, cost 0 (0%)",
+    ),
+    (
+        6,
+        "{timestamp} wallet wallet_server          : DEBUG    <- new_peak_wallet from peer "
+        "{node_id} {ip_address}",
+    ),
+    (
+        4,
+        "{timestamp} full_node chia.full_node.full_node: INFO     \U0001f331 Updated peak to "
+        "height 1000000, weight 1, hh {node_id}, forked at 999999",
+    ),
+    (
+        4,
+        "{timestamp} farmer farmer_server              : DEBUG    -> "
+        "new_signage_point_harvester to peer {ip_address} {node_id}",
+    ),
+    (
+        4,
+        "{timestamp} farmer farmer_server              : DEBUG    <- farming_info from peer "
+        "{node_id} {ip_address}",
+    ),
+    (
+        4,
+        "{timestamp} harvester chia.harvester.harvester: INFO     1 plots were eligible for "
+        "farming 65322a31ad... Found 0 proofs. Time: 0.00015 s. Total 100 plots",
+    ),
+    (
+        1,
+        "{timestamp} full_node chia.full_node.full_node: INFO     :timer:  Finished signage "
+        "point 19/64: CC: 4f6e RC: 7a3b",
+    ),
+    (
+        1,
+        "    raise ValueError()",
+    ),
+)
+
+
+def generate_lines(n_lines: int, seed: int) -> List[str]:
+    """Generates a synthetic logfile with the mix of a farming node"""
+    rng = random.Random(seed)
+    weights = [weight for weight, _ in LINE_TEMPLATES]
+    templates = [template for _, template in LINE_TEMPLATES]
+    harvesters = [
+        (f"{rng.getrandbits(160):040x}", f"10.0.0.{i_harvester + 1}")
+        for i_harvester in range(N_HARVESTERS)
+    ]
+
+    lines = []
+    for i_line, template in enumerate(rng.choices(templates, weights, k=n_lines)):
+        node_id, ip_address = rng.choice(harvesters)
+        seconds = i_line // 100
+        timestamp = f"2021-05-26T{seconds // 3600 % 24:02d}:{seconds // 60 % 60:02d}:" + (
+            f"{seconds % 60:02d}.{i_line % 1000:03d}"
+        )
+        lines.append(
+            template.format(timestamp=timestamp, node_id=node_id, ip_address=ip_address) + "\n"
+        )
+    return lines
+
+
+# codewords the actions scanned the whole line for before the dispatcher
+LEGACY_CODEWORDS = (
+    ("farmer", "farming_info from peer"),
+    ("farmer", "new_signage_point_harvester"),
+    ("full_node", "Finished signage point"),
+    ("farmer", "harvester_handshake to peer"),
+    ("farmer", "peer disconnected"),
+    ("harvester chia.harvester.harvester", "eligible", "Found", "proofs"),
+)
+
+
+def process_line_legacy(chia_dog: ChiaWatchdog, line: str):
+    """Processes a line by checking every action on the whole line"""
+    try:
+        if line:
+            for codewords, action in zip(LEGACY_CODEWORDS, ALL_LINE_ACTIONS):
+                if all(word in line for word in codewords):
+                    action.apply(line, chia_dog)
+    except Exception:
+        pass
+
+
+def measure(name: str, lines: List[str], process: Callable[[ChiaWatchdog, str], None]):
+    """Prints the throughput of processing all lines"""
+    chia_dog = ChiaWatchdog("", [])
+    n_bytes = sum(len(line) for line in lines)
+
+    start = time.perf_counter()
+    for line in lines:
+        process(chia_dog, line)
+    duration = time.perf_counter() - start
+
+    print(
+        f"{name:<12} {duration:>8.3f} s {len(lines) / duration / 1e3:>10.0f} klines/s "
+        f"{n_bytes / duration / 1e6:>8.1f} MB/s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logfile", default="", help="recorded chia debug.log")
+    parser.add_argument("--n-lines", type=int, default=200000, help="synthetic lines")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the synthetic lines")
+    args = parser.parse_args()
+
+    # lines of the synthetic logfile are valid, errors of a recorded one are not of interest
+    logging.disable(logging.CRITICAL)
+
+    if args.logfile:
+        with open(args.logfile, "r", encoding="utf8", errors="replace") as fp:
+            lines = fp.readlines()
+        print(f"{len(lines)} lines from {args.logfile}")
+    else:
+        lines = generate_lines(args.n_lines, args.seed)
+        print(f"{len(lines)} synthetic lines")
+
+    measure("per action", lines, process_line_legacy)
+    measure("dispatcher", lines, process_line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Measures the cold start of the watchdog on a large chia logfile
+
+Usage:
+    python -m benchmarks.bench_logfile_ingest --size-mb 50
+    python -m benchmarks.bench_logfile_ingest --logfile ~/.chia/mainnet/log/debug.log
+
+The logfile is read until all lines present at the start went
+through the line checks, in three ways:
+
+- readline: text mode, one line and one coroutine call at a time
+- chunks: the watchdog's `LogWatcher`, binary chunks split into
+  lines in bulk, every line decoded
+- prefilter: binary chunks as well, but only lines containing a
+  keyword of the line checks decoded and checked
+
+The harvester state of every run is compared to make sure all ways
+see the same lines of interest. Without a logfile a synthetic one
+with the line mix of a farming node is generated in a temporary
+folder.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+from typing import List, Optional, Tuple
+
+from benchmarks.bench_line_checks import generate_lines
+from chia_tea.general.LogWatcher import LogWatcher
+from chia_tea.models.ChiaWatchdog import ChiaWatchdog
+from chia_tea.watchdog.collection.logfile.line_checks import (
+    LINE_PREFILTER,
+    run_line_checks,
+    run_line_checks_on_lines,
+)
+
+BYTES_PER_MB = 1e6
+# lines generated at once for the synthetic logfile
+LINES_PER_BATCH = 100000
+# bytes at the end of a recorded logfile searched for its last line break
+TAIL_SIZE = 1024 * 1024
+
+
+def write_synthetic_logfile(filepath: str, size: int, seed: int):
+    """Writes synthetic lines until the logfile has the size"""
+    n_bytes = 0
+    i_batch = 0
+    with open(filepath, "w", encoding="utf8") as fp:
+        while n_bytes < size:
+            lines = generate_lines(LINES_PER_BATCH, seed + i_batch)
+            fp.writelines(lines)
+            n_bytes += sum(len(line.encode("utf8")) for line in lines)
+            i_batch += 1
+
+
+async def ingest_readline(filepath: str) -> Tuple[ChiaWatchdog, int]:
+    """Reads the logfile line by line in text mode"""
+    chia_dog = ChiaWatchdog(filepath, [])
+    n_lines = 0
+    with open(filepath, "r", encoding="utf8", errors="replace") as fp:
+        for line in iter(fp.readline, ""):
+            await run_line_checks(chia_dog, line)
+            n_lines += 1
+    return chia_dog, n_lines
+
+
+def get_end_of_last_line(filepath: str) -> int:
+    """Byte offset after the last complete line of the logfile"""
+    with open(filepath, "rb") as fp:
+        i_start = max(0, fp.seek(0, os.SEEK_END) - TAIL_SIZE)
+        fp.seek(i_start)
+        return i_start + fp.read().rfind(b"\n") + 1
+
+
+async def ingest_watcher(
+    filepath: str, prefilter: Optional[Tuple[bytes, ...]]
+) -> Tuple[ChiaWatchdog, int]:
+    """Reads the logfile with the watchdog's log watcher until all lines are checked"""
+    chia_dog = ChiaWatchdog(filepath, [])
+    n_lines = 0
+
+    async def _on_lines(lines: List[str]):
+        nonlocal n_lines
+        await run_line_checks_on_lines(chia_dog, lines)
+        n_lines += len(lines)
+
+    log_watcher = LogWatcher()
+    position = log_watcher.add_logfile(filepath, on_lines=_on_lines, prefilter=prefilter)
+
+    # the position moves past the last line present once it was checked
+    end_of_last_line = get_end_of_last_line(filepath)
+    task = asyncio.ensure_future(log_watcher.run())
+    while position.offset < end_of_last_line and not task.done():
+        await asyncio.sleep(0.001)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+    return chia_dog, n_lines
+
+
+def get_state(chia_dog: ChiaWatchdog) -> tuple:
+    """Summary of the state gathered from the logfile"""
+    return tuple(
+        sorted(
+            (
+                harvester.harvester_id,
+                harvester.is_connected,
+                harvester.n_responses,
+                harvester.n_overdue_responses,
+            )
+            for harvester in chia_dog.harvester_infos.values()
+        )
+    )
+
+
+def measure(name: str, filepath: str, ingest) -> tuple:
+    """Prints the time to ingest the logfile"""
+    size = os.path.getsize(filepath)
+
+    start = time.perf_counter()
+    chia_dog, n_lines = asyncio.run(ingest(filepath))
+    duration = time.perf_counter() - start
+
+    print(
+        f"{name:<10} {duration:>8.2f} s {size / duration / BYTES_PER_MB:>8.1f} MB/s "
+        f"{n_lines:>10} lines checked"
+    )
+    return get_state(chia_dog)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logfile", default="", help="recorded chia debug.log")
+    parser.add_argument("--size-mb", type=float, default=50, help="size of the synthetic log")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the synthetic lines")
+    args = parser.parse_args()
+
+    # errors in lines of a recorded logfile are not of interest
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filepath = args.logfile
+        if not filepath:
+            filepath = os.path.join(tmp_dir, "debug.log")
+            write_synthetic_logfile(filepath, int(args.size_mb * BYTES_PER_MB), args.seed)
+        print(f"{os.path.getsize(filepath) / BYTES_PER_MB:.0f} MB logfile {filepath}")
+
+        states = [
+            measure("readline", filepath, ingest_readline),
+            measure("chunks", filepath, lambda path: ingest_watcher(path, None)),
+            measure("prefilter", filepath, lambda path: ingest_watcher(path, LINE_PREFILTER)),
+        ]
+        print("same state:", all(state == states[0] for state in states))
+
+
+if __name__ == "__main__":
+    main()
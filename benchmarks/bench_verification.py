@@ -0,0 +1,100 @@
+"""Measures the overhead of verifying copies
+
+Usage:
+    python -m benchmarks.bench_verification --size-mb 1024 --target-dir /other/disk
+
+Every verification mode copies the same file with random content.
+The overhead is relative to copying without verification. Random
+content is used since hashing a sparse file would only measure
+reading zeros from the page cache.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from chia_tea.copy.copy_engines import copy_file_content
+from chia_tea.copy.verification import VERIFY_MODES
+
+# bytes written at once when creating the test file
+WRITE_SIZE = 8 * 1024 * 1024
+
+
+def _create_random_file(filepath: str, size: int):
+    with open(filepath, "wb") as fp:
+        block = os.urandom(WRITE_SIZE)
+        for offset in range(0, size, WRITE_SIZE):
+            fp.write(block[: min(WRITE_SIZE, size - offset)])
+
+
+def _get_cpu_time() -> float:
+    times = os.times()
+    return times.user + times.system
+
+
+def run_benchmark(size: int, source_dir: str, target_dir: str, repetitions: int):
+    """Copies a file with every verification mode and prints the results
+
+    Parameters
+    ----------
+    size : int
+        size of the file to copy in bytes
+    source_dir : str
+        directory to create the source file in
+    target_dir : str
+        directory to copy the file into
+    repetitions : int
+        how often to copy the file per mode
+    """
+    source_path = os.path.join(source_dir, "bench_source.plot")
+    target_path = os.path.join(target_dir, "bench_target.plot")
+    _create_random_file(source_path, size)
+
+    print(f"Copying {size / 1024**2:.0f} MiB from '{source_dir}' to '{target_dir}'")
+    print(f"{'verification':<16} {'wall [s]':>10} {'cpu [s]':>10} {'MiB/s':>10} {'overhead':>10}")
+
+    try:
+        baseline = None
+        for verify_mode in VERIFY_MODES:
+            wall_times = []
+            cpu_times = []
+            try:
+                for _ in range(repetitions):
+                    wall_start, cpu_start = time.perf_counter(), _get_cpu_time()
+                    copy_file_content(source_path, target_path, verify_mode=verify_mode)
+                    wall_times.append(time.perf_counter() - wall_start)
+                    cpu_times.append(_get_cpu_time() - cpu_start)
+            finally:
+                if os.path.exists(target_path):
+                    os.unlink(target_path)
+
+            wall_time = min(wall_times)
+            cpu_time = min(cpu_times)
+            baseline = baseline or wall_time
+            print(
+                f"{verify_mode:<16} {wall_time:>10.3f} {cpu_time:>10.3f} "
+                f"{size / 1024**2 / wall_time:>10.0f} {wall_time / baseline - 1:>10.0%}"
+            )
+    finally:
+        os.unlink(source_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=512, help="size of the test file")
+    parser.add_argument("--source-dir", default="", help="directory for the source file")
+    parser.add_argument("--target-dir", default="", help="directory for the copied file")
+    parser.add_argument("--repetitions", type=int, default=3, help="copies per mode")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        run_benchmark(
+            size=args.size_mb * 1024 * 1024,
+            source_dir=args.source_dir or tmp_dir,
+            target_dir=args.target_dir or tmp_dir,
+            repetitions=args.repetitions,
+        )
+
+
+if __name__ == "__main__":
+    main()
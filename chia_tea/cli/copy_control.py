@@ -0,0 +1,102 @@
+from typing import Any, Dict
+
+import typer
+
+from ..copy.control import (
+    COMMAND_DRAIN,
+    COMMAND_LIST_JOBS,
+    COMMAND_PAUSE_TARGET,
+    COMMAND_RESUME_TARGET,
+    COMMAND_SET_CONCURRENCY,
+    send_control_command,
+)
+from ..utils.config import DEFAULT_CONFIG_FILEPATH, read_config
+
+copy_cmd = typer.Typer(
+    no_args_is_help=True,
+    help="Control a running copy process.",
+)
+
+
+def _send(config_filepath: str, command: str, **args) -> Dict[str, Any]:
+    """Sends a command to the copy process of a config and handles errors"""
+    try:
+        config = read_config(filepath=config_filepath)
+        if not config.copy.control_socket_filepath:
+            raise RuntimeError(
+                "The control API is disabled, see copy.control_socket_filepath in the config"
+            )
+        return send_control_command(config.copy.control_socket_filepath, command, **args)
+    except ConnectionError as err:
+        typer.echo(f"⛈️  Cannot reach the copy process, is it running? ({err})")
+        raise typer.Exit(1)
+    except Exception as err:
+        typer.echo(f"⛈️  Error: {err}")
+        raise typer.Exit(1)
+
+
+def _echo_jobs(status: Dict[str, Any]) -> None:
+    """Prints the state returned by the copy process"""
+    typer.echo(
+        f"Parallel copies: {status['max_parallel_copies']} "
+        f"({status['max_parallel_copies_per_target']} per target)"
+        + (", draining" if status["draining"] else "")
+    )
+    for target_dir in status["paused_targets"]:
+        typer.echo(f"Paused: {target_dir}")
+    if not status["jobs"]:
+        typer.echo("No copies running")
+    for job in status["jobs"]:
+        progress = job["n_bytes_copied"] / job["n_bytes_total"] if job["n_bytes_total"] else 0
+        typer.echo(
+            f"{progress:>4.0%} {job['bytes_per_sec'] / 1e6:>6.1f} MB/s "
+            f"{job['source_filepath']} -> {job['target_filepath']}"
+        )
+
+
+@copy_cmd.command(name="jobs")
+def jobs_cmd(config: str = DEFAULT_CONFIG_FILEPATH) -> None:
+    """List the running copies"""
+    _echo_jobs(_send(config, COMMAND_LIST_JOBS))
+
+
+@copy_cmd.command(name="pause")
+def pause_cmd(target_dir: str, config: str = DEFAULT_CONFIG_FILEPATH) -> None:
+    """Stop starting new copies into a target folder
+
+    Copies already running into the folder are finished.
+    """
+    _echo_jobs(_send(config, COMMAND_PAUSE_TARGET, target_dir=target_dir))
+
+
+@copy_cmd.command(name="resume")
+def resume_cmd(target_dir: str, config: str = DEFAULT_CONFIG_FILEPATH) -> None:
+    """Start copying into a paused target folder again"""
+    _echo_jobs(_send(config, COMMAND_RESUME_TARGET, target_dir=target_dir))
+
+
+@copy_cmd.command(name="drain")
+def drain_cmd(config: str = DEFAULT_CONFIG_FILEPATH) -> None:
+    """Finish the running copies without starting new ones, then stop"""
+    _echo_jobs(_send(config, COMMAND_DRAIN))
+
+
+@copy_cmd.command(name="concurrency")
+def concurrency_cmd(
+    total: int = typer.Argument(..., help="maximum number of parallel copies, 0 keeps it"),
+    per_target: int = typer.Argument(0, help="maximum parallel copies per target, 0 keeps it"),
+    config: str = DEFAULT_CONFIG_FILEPATH,
+) -> None:
+    """Change the copy limits without interrupting running copies"""
+    if not total and not per_target:
+        typer.echo("⛈️  Specify the total and/or per target limit")
+        raise typer.Exit(1)
+
+    _echo_jobs(
+        _send(
+            config,
+            COMMAND_SET_CONCURRENCY,
+            max_parallel_copies=total or None,
+            max_parallel_copies_per_target=per_target or None,
+        )
+    )
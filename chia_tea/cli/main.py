@@ -1,11 +1,13 @@
 import typer
 
 from .config import config_cmd
+from .copy_control import copy_cmd
 from .start import start_cmd
 
 app = typer.Typer(no_args_is_help=True)
 app.add_typer(config_cmd, name="config")
 app.add_typer(start_cmd, name="start")
+app.add_typer(copy_cmd, name="copy")
 
 if __name__ == "__main__":
     app()
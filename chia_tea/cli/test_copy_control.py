@@ -0,0 +1,99 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from typer.testing import CliRunner
+
+from ..protobuf.generated.config_pb2 import ChiaTeaConfig
+from ..utils.config import DEFAULT_CONFIG_FILEPATH
+from .copy_control import copy_cmd
+
+runner = CliRunner()
+
+
+def _get_config(control_socket_filepath: str) -> ChiaTeaConfig:
+    config = ChiaTeaConfig()
+    config.copy.control_socket_filepath = control_socket_filepath
+    return config
+
+
+STATUS = {
+    "jobs": [
+        {
+            "source_filepath": "/source/a.plot",
+            "target_filepath": "/target/a.plot",
+            "start_time": 0.0,
+            "n_bytes_copied": 50,
+            "n_bytes_total": 100,
+            "bytes_per_sec": 2e6,
+        }
+    ],
+    "paused_targets": ["/target"],
+    "max_parallel_copies": 4,
+    "max_parallel_copies_per_target": 1,
+    "draining": False,
+}
+
+
+class TestCopyControlCmd(unittest.TestCase):
+    @patch("chia_tea.cli.copy_control.read_config")
+    @patch("chia_tea.cli.copy_control.send_control_command")
+    def test_jobs_are_listed(self, send_mock: MagicMock, read_config_mock: MagicMock):
+        read_config_mock.return_value = _get_config("control.sock")
+        send_mock.return_value = STATUS
+
+        result = runner.invoke(copy_cmd, ["jobs"])
+
+        self.assertEqual(result.exit_code, 0)
+        read_config_mock.assert_called_once_with(filepath=DEFAULT_CONFIG_FILEPATH)
+        send_mock.assert_called_once_with("control.sock", "list_jobs")
+        self.assertIn("Paused: /target", result.output)
+        self.assertIn("50%    2.0 MB/s /source/a.plot -> /target/a.plot", result.output)
+
+    @patch("chia_tea.cli.copy_control.read_config")
+    @patch("chia_tea.cli.copy_control.send_control_command")
+    def test_commands_send_their_args(self, send_mock: MagicMock, read_config_mock: MagicMock):
+        read_config_mock.return_value = _get_config("control.sock")
+        send_mock.return_value = STATUS
+
+        runner.invoke(copy_cmd, ["pause", "/target"])
+        send_mock.assert_called_with("control.sock", "pause_target", target_dir="/target")
+
+        runner.invoke(copy_cmd, ["resume", "/target"])
+        send_mock.assert_called_with("control.sock", "resume_target", target_dir="/target")
+
+        runner.invoke(copy_cmd, ["drain"])
+        send_mock.assert_called_with("control.sock", "drain")
+
+        runner.invoke(copy_cmd, ["concurrency", "6"])
+        send_mock.assert_called_with(
+            "control.sock",
+            "set_concurrency",
+            max_parallel_copies=6,
+            max_parallel_copies_per_target=None,
+        )
+
+        runner.invoke(copy_cmd, ["concurrency", "0", "2"])
+        send_mock.assert_called_with(
+            "control.sock",
+            "set_concurrency",
+            max_parallel_copies=None,
+            max_parallel_copies_per_target=2,
+        )
+
+    @patch("chia_tea.cli.copy_control.read_config")
+    @patch("chia_tea.cli.copy_control.send_control_command")
+    def test_errors_exit(self, send_mock: MagicMock, read_config_mock: MagicMock):
+        read_config_mock.return_value = _get_config("control.sock")
+        send_mock.side_effect = ConnectionRefusedError()
+
+        result = runner.invoke(copy_cmd, ["jobs"])
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn("Cannot reach the copy process", result.output)
+
+        read_config_mock.return_value = _get_config("")
+        result = runner.invoke(copy_cmd, ["drain"])
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn("control API is disabled", result.output)
+
+        result = runner.invoke(copy_cmd, ["concurrency", "0"])
+        self.assertEqual(result.exit_code, 1)
@@ -0,0 +1,274 @@
+import asyncio
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from typing import Any, Callable, Dict, Optional
+
+from ..utils.logger import get_logger
+from .control import (
+    COMMAND_DRAIN,
+    COMMAND_LIST_JOBS,
+    COMMAND_PAUSE_TARGET,
+    COMMAND_RESUME_TARGET,
+    COMMAND_SET_CONCURRENCY,
+    start_control_server,
+)
+from .copy_status import write_copy_status
+from .CopyScheduler import CopyScheduler
+from .FilesystemSnapshot import FilesystemSnapshot
+from .SourceQueue import SourceQueue
+from .SourceWatcher import SourceWatcher
+from .ThroughputTracker import ThroughputTracker
+
+# maximum time between two searches for new files
+POLL_INTERVAL_SECONDS = 15
+# time between two logs of the measured throughputs
+STATS_LOG_INTERVAL_SECONDS = 600
+
+
+class CopyDaemon:
+    """Runs the copy loop on an asyncio event loop
+
+    The event loop only coordinates. Everything touching the
+    filesystem or the scheduler runs in a single worker thread
+    so that the scheduler needs no locks, waiting for copies to
+    finish runs in another one and the copies themselves run in
+    the thread pool of the scheduler. Thus the loop stays
+    responsive for the control API, which allows to list the
+    jobs, pause and resume targets, drain the copies or change
+    the copy limits while copies are running.
+    """
+
+    def __init__(
+        self,
+        scheduler: CopyScheduler,
+        source_watcher: SourceWatcher,
+        source_queue: Optional[SourceQueue] = None,
+        status_filepath: str = "",
+        control_socket_filepath: str = "",
+        poll_interval: float = POLL_INTERVAL_SECONDS,
+    ):
+        """Initialize a copy daemon
+
+        Parameters
+        ----------
+        scheduler : CopyScheduler
+            scheduler running the copies
+        source_watcher : SourceWatcher
+            watcher providing the files to copy
+        source_queue : Optional[SourceQueue]
+            queue ordering the files. A new one without source
+            priorities is used if not specified.
+        status_filepath : str
+            file to write the running copies to, not written if empty
+        control_socket_filepath : str
+            unix socket of the control API, disabled if empty
+        poll_interval : float
+            maximum time between two searches for new files in seconds
+        """
+        self.scheduler = scheduler
+        self.source_watcher = source_watcher
+        self.source_queue = source_queue if source_queue is not None else SourceQueue()
+        self.status_filepath = status_filepath
+        self.control_socket_filepath = control_socket_filepath
+        self.poll_interval = poll_interval
+
+        # no new copies are started and the daemon stops
+        # once the running copies finished
+        self.draining = False
+
+        self.__io_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="copy-io")
+        self.__wait_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="copy-wait")
+        self.__commands: Dict[str, Callable[..., Any]] = {
+            COMMAND_LIST_JOBS: self.__list_jobs,
+            COMMAND_PAUSE_TARGET: self.__pause_target,
+            COMMAND_RESUME_TARGET: self.__resume_target,
+            COMMAND_DRAIN: self.__drain,
+            COMMAND_SET_CONCURRENCY: self.__set_concurrency,
+        }
+
+    async def run(self) -> None:
+        """Runs the copy loop until drained or cancelled
+
+        Notes
+        -----
+            Running copies are not stopped when the daemon stops,
+            shut down the scheduler for that.
+        """
+        logger = get_logger(__file__)
+
+        server = None
+        if self.control_socket_filepath:
+            server = await start_control_server(self.handle_command, self.control_socket_filepath)
+            logger.info("Control API listening on '%s'", self.control_socket_filepath)
+
+        loop = asyncio.get_event_loop()
+        last_stats_log = time.monotonic()
+        try:
+            while not (self.draining and self.scheduler.n_copies_in_progress == 0):
+                await self._run_io(self.__fill_free_copy_slots)
+
+                # returns early if a copy finishes, a new file arrives or
+                # a command changed something so that it is used right away
+                await loop.run_in_executor(
+                    self.__wait_executor, self.scheduler.wait_for_wake_up, self.poll_interval
+                )
+                await self._run_io(self.scheduler.collect_finished_copies)
+
+                if self.status_filepath:
+                    await self._run_io(self.__write_status)
+
+                if time.monotonic() - last_stats_log > STATS_LOG_INTERVAL_SECONDS:
+                    log_throughput_stats(self.scheduler.throughput_tracker)
+                    last_stats_log = time.monotonic()
+
+            logger.info("All copies finished after draining")
+        finally:
+            if server is not None:
+                server.close()
+                await server.wait_closed()
+            # unblock a pending wait so that its thread ends
+            self.scheduler.wake_up()
+            self.__wait_executor.shutdown(wait=True)
+            self.__io_executor.shutdown(wait=True)
+
+    async def _run_io(self, func: Callable[..., Any], *args) -> Any:
+        """Runs a function in the worker thread owning the scheduler"""
+        return await asyncio.get_event_loop().run_in_executor(self.__io_executor, func, *args)
+
+    async def handle_command(self, command: str, args: Dict[str, Any]) -> Any:
+        """Runs a command of the control API
+
+        Parameters
+        ----------
+        command : str
+            name of the command
+        args : Dict[str, Any]
+            keyword arguments of the command
+
+        Returns
+        -------
+        result : Any
+            json serializable result of the command
+
+        Raises
+        ------
+        ValueError
+            If the command is unknown.
+        TypeError
+            If the arguments don't match the command.
+        """
+        func = self.__commands.get(command)
+        if func is None:
+            raise ValueError(f"Unknown command '{command}'")
+        return await self._run_io(lambda: func(**args))
+
+    def __fill_free_copy_slots(self):
+        if self.draining or not self.scheduler.has_free_slot():
+            return
+
+        try:
+            fill_free_copy_slots(self.scheduler, self.source_watcher, self.source_queue)
+        except Exception as err:
+            logger = get_logger(__file__)
+            logger.error("%s", err)
+            logger.debug(traceback.format_exc())
+
+    def __write_status(self):
+        write_copy_status(self.status_filepath, self.scheduler.get_copy_jobs())
+
+    def __list_jobs(self) -> Dict[str, Any]:
+        return {
+            "jobs": [asdict(copy_job) for copy_job in self.scheduler.get_copy_jobs()],
+            "paused_targets": sorted(self.scheduler.paused_targets),
+            "max_parallel_copies": self.scheduler.max_parallel_copies,
+            "max_parallel_copies_per_target": self.scheduler.max_parallel_copies_per_target,
+            "draining": self.draining,
+        }
+
+    def __pause_target(self, target_dir: str) -> Dict[str, Any]:
+        self.scheduler.pause_target(target_dir)
+        get_logger(__file__).info("Paused target '%s'", target_dir)
+        return self.__list_jobs()
+
+    def __resume_target(self, target_dir: str) -> Dict[str, Any]:
+        self.scheduler.resume_target(target_dir)
+        get_logger(__file__).info("Resumed target '%s'", target_dir)
+        return self.__list_jobs()
+
+    def __drain(self) -> Dict[str, Any]:
+        self.draining = True
+        self.scheduler.wake_up()
+        get_logger(__file__).info(
+            "Draining, stopping after %d running copies", self.scheduler.n_copies_in_progress
+        )
+        return self.__list_jobs()
+
+    def __set_concurrency(
+        self,
+        max_parallel_copies: Optional[int] = None,
+        max_parallel_copies_per_target: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        self.scheduler.set_concurrency(max_parallel_copies, max_parallel_copies_per_target)
+        get_logger(__file__).info(
+            "Parallel copies changed to %d (%d per target)",
+            self.scheduler.max_parallel_copies,
+            self.scheduler.max_parallel_copies_per_target,
+        )
+        return self.__list_jobs()
+
+
+def fill_free_copy_slots(
+    scheduler: CopyScheduler,
+    source_watcher: SourceWatcher,
+    source_queue: Optional[SourceQueue] = None,
+) -> None:
+    """Starts copies for the most urgent files until all slots are taken
+
+    Parameters
+    ----------
+    scheduler : CopyScheduler
+        scheduler running the copies
+    source_watcher : SourceWatcher
+        watcher providing the files to copy
+    source_queue : Optional[SourceQueue]
+        queue ordering the files. A new one without source
+        priorities is used if not specified.
+
+    Raises
+    ------
+    RuntimeError
+        If there is a file to copy but no copy is running and no
+        target folder has space for it.
+    """
+    if source_queue is None:
+        source_queue = SourceQueue()
+    source_queue.update(source_watcher.get_files())
+
+    # the target folders are listed once for all files
+    snapshot = FilesystemSnapshot()
+    while scheduler.has_free_slot():
+        source_filepath = source_queue.get_next(copying=scheduler.copies_in_progress)
+        if source_filepath is None:
+            break
+
+        if not scheduler.submit(source_filepath, snapshot):
+            # running copies will free up their target slots
+            # thus this is only a problem if nothing is running
+            if scheduler.n_copies_in_progress:
+                break
+            raise RuntimeError("No disk space available for: %s" % source_filepath)
+
+
+def log_throughput_stats(throughput_tracker: ThroughputTracker) -> None:
+    """Logs the measured throughputs of the copies
+
+    Parameters
+    ----------
+    throughput_tracker : ThroughputTracker
+        tracker of the copy scheduler
+    """
+    logger = get_logger(__file__)
+    for line in throughput_tracker.get_stats_lines():
+        logger.info("Throughput %s", line)
@@ -0,0 +1,223 @@
+import json
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Dict
+
+from ..utils.logger import get_logger
+
+# the journal is rewritten with only the unfinished copies
+# once it contains this many records
+COMPACT_AFTER_RECORDS = 1000
+
+EVENT_START = "start"
+EVENT_FINISH = "finish"
+
+
+@dataclass
+class JournalEntry:
+    """A copy which was started but did not finish yet"""
+
+    source: str
+    target: str
+    # size and modification time of the source when the copy
+    # started, -1 if unknown
+    size: int = -1
+    mtime_ns: int = -1
+
+
+class CopyJournal:
+    """Append-only journal of the copies started and finished
+
+    Every start and finish of a copy is appended as a line of json
+    and flushed to disk before the copy starts. After a crash the
+    copies which never finished are found by replaying the journal
+    without scanning the target folders. A torn last line of a crash
+    is ignored.
+
+    The journal is compacted once it grew large, leaving only the
+    unfinished copies. It is not thread-safe, the owner must
+    serialize the calls.
+    """
+
+    def __init__(self, filepath: str, compact_after_records: int = COMPACT_AFTER_RECORDS):
+        """Initialize a copy journal
+
+        Parameters
+        ----------
+        filepath : str
+            path of the journal file
+        compact_after_records : int
+            number of records after which the journal is compacted
+        """
+        self.filepath = os.path.expanduser(filepath)
+        self.compact_after_records = compact_after_records
+
+        # target filepath -> unfinished copy
+        self.__unfinished: Dict[str, JournalEntry] = {}
+        self.__n_records = 0
+
+    @property
+    def unfinished(self) -> Dict[str, JournalEntry]:
+        """Copies started but not finished with the target filepath as key"""
+        return dict(self.__unfinished)
+
+    def replay(self) -> Dict[str, JournalEntry]:
+        """Reads the journal file to find the unfinished copies
+
+        Returns
+        -------
+        unfinished : Dict[str, JournalEntry]
+            copies started but not finished with the target filepath as key
+
+        Notes
+        -----
+            State files of older versions containing a single json
+            object with the running copies are read as well.
+        """
+        self.__unfinished = {}
+        self.__n_records = 0
+
+        if not os.path.exists(self.filepath):
+            return {}
+
+        n_broken_lines = 0
+        with open(self.filepath, "r", encoding="utf8") as fp:
+            for line in fp:
+                try:
+                    self.__apply(json.loads(line))
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    n_broken_lines += 1
+                    continue
+                self.__n_records += 1
+
+        if n_broken_lines:
+            get_logger(__file__).warning(
+                "Ignored %d broken lines in copy journal '%s'", n_broken_lines, self.filepath
+            )
+
+        return self.unfinished
+
+    def __apply(self, record: Dict[str, Any]):
+        """Updates the unfinished copies with a record"""
+        if "copies_in_progress" in record:
+            # state file of an older version
+            for copy_info in record["copies_in_progress"]:
+                entry = JournalEntry(source=copy_info["source"], target=copy_info["target"])
+                self.__unfinished[entry.target] = entry
+        elif record["event"] == EVENT_START:
+            entry = JournalEntry(
+                source=record["source"],
+                target=record["target"],
+                size=record.get("size", -1),
+                mtime_ns=record.get("mtime_ns", -1),
+            )
+            self.__unfinished[entry.target] = entry
+        elif record["event"] == EVENT_FINISH:
+            self.__unfinished.pop(record["target"], None)
+        else:
+            raise ValueError(f"Unknown journal event '{record['event']}'")
+
+    def log_start(self, entry: JournalEntry):
+        """Records the start of a copy
+
+        Parameters
+        ----------
+        entry : JournalEntry
+            copy being started
+        """
+        self.__unfinished[entry.target] = entry
+        self.__append(
+            {
+                "event": EVENT_START,
+                "source": entry.source,
+                "target": entry.target,
+                "size": entry.size,
+                "mtime_ns": entry.mtime_ns,
+                "time": time.time(),
+            }
+        )
+
+    def log_finish(self, target_filepath: str, success: bool):
+        """Records the end of a copy
+
+        Parameters
+        ----------
+        target_filepath : str
+            path the file was copied to
+        success : bool
+            whether the copy succeeded
+        """
+        self.__unfinished.pop(target_filepath, None)
+        self.__append(
+            {
+                "event": EVENT_FINISH,
+                "target": target_filepath,
+                "success": success,
+                "time": time.time(),
+            }
+        )
+
+    def discard(self, target_filepath: str):
+        """Forgets an unfinished copy without recording its end
+
+        Parameters
+        ----------
+        target_filepath : str
+            path the file was copied to
+
+        Notes
+        -----
+            This is used for copies cleaned up after a crash. The
+            journal file reflects it with the next compaction.
+        """
+        self.__unfinished.pop(target_filepath, None)
+
+    def compact(self):
+        """Rewrites the journal file with only the unfinished copies"""
+        records = [
+            json.dumps(
+                {
+                    "event": EVENT_START,
+                    "source": entry.source,
+                    "target": entry.target,
+                    "size": entry.size,
+                    "mtime_ns": entry.mtime_ns,
+                }
+            )
+            for entry in self.__unfinished.values()
+        ]
+
+        try:
+            self.__make_folder()
+            # write and rename so that a crash never loses the journal
+            tmp_filepath = self.filepath + ".tmp"
+            with open(tmp_filepath, "w", encoding="utf8") as fp:
+                fp.writelines(record + "\n" for record in records)
+                fp.flush()
+                os.fsync(fp.fileno())
+            os.replace(tmp_filepath, self.filepath)
+            self.__n_records = len(records)
+        except OSError as err:
+            get_logger(__file__).error("Cannot compact copy journal '%s': %s", self.filepath, err)
+
+    def __append(self, record: Dict[str, Any]):
+        """Appends a record and flushes it to disk"""
+        try:
+            self.__make_folder()
+            with open(self.filepath, "a", encoding="utf8") as fp:
+                fp.write(json.dumps(record) + "\n")
+                fp.flush()
+                os.fsync(fp.fileno())
+            self.__n_records += 1
+        except OSError as err:
+            get_logger(__file__).error("Cannot write copy journal '%s': %s", self.filepath, err)
+            return
+
+        if self.__n_records >= self.compact_after_records:
+            self.compact()
+
+    def __make_folder(self):
+        folder = os.path.dirname(self.filepath)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
@@ -0,0 +1,284 @@
+import os
+import threading
+from typing import Dict, Optional, Set
+
+from ..utils.logger import get_logger
+from .copy_engines import PARTIAL_SUFFIX, get_partial_filepath, read_checkpoint, remove_partial_copy
+from .CopyJournal import CopyJournal, JournalEntry
+from .Disk import DiskCopyInfo, get_files_being_copied
+from .FilesystemSnapshot import FilesystemSnapshot
+from .verification import verify_sampled
+
+# final targets not matching their source are renamed to this
+# instead of being deleted, since the mismatch might be a read error
+SUSPECT_SUFFIX = ".suspect"
+
+
+class CopyLedger:
+    """Bookkeeping of the copies started by this process
+
+    The ledger is the authority on the copies it started. Files
+    unknown to it, such as copies of another process, are probed
+    on the filesystem but only once they are not being copied
+    anymore.
+    """
+
+    def __init__(self, state_filepath: str = ""):
+        """Initialize a copy ledger
+
+        Parameters
+        ----------
+        state_filepath : str
+            Optional journal file in which the started and finished
+            copies are recorded to clean up after a crash. Nothing
+            is recorded if empty.
+        """
+        self.state_filepath = os.path.expanduser(state_filepath) if state_filepath else ""
+        self.journal = CopyJournal(self.state_filepath) if self.state_filepath else None
+
+        self.__lock = threading.Lock()
+        # target filepath -> source filepath
+        self.__copies_in_progress: Dict[str, str] = {}
+        # result of the last filesystem check
+        self.__disk_copy_data: Dict[str, DiskCopyInfo] = {}
+
+    @property
+    def copies_in_progress(self) -> Dict[str, str]:
+        """Copies running right now with target filepath as key
+        and source filepath as value"""
+        with self.__lock:
+            return dict(self.__copies_in_progress)
+
+    @property
+    def files_in_progress(self) -> Set[str]:
+        """All files written by the running copies including
+        their incomplete '.partial' files"""
+        with self.__lock:
+            return self.__get_files_in_progress()
+
+    def __get_files_in_progress(self) -> Set[str]:
+        files_in_progress = set(self.__copies_in_progress)
+        files_in_progress |= {
+            get_partial_filepath(target_filepath) for target_filepath in self.__copies_in_progress
+        }
+        return files_in_progress
+
+    def start_copy(
+        self,
+        source_filepath: str,
+        target_filepath: str,
+        source_stat: Optional[os.stat_result] = None,
+    ):
+        """Registers a copy before it is started
+
+        Parameters
+        ----------
+        source_filepath : str
+            path of the file being copied
+        target_filepath : str
+            path the file is copied to
+        source_stat : Optional[os.stat_result]
+            stat of the source file to detect changes after a crash
+        """
+        with self.__lock:
+            self.__copies_in_progress[target_filepath] = source_filepath
+            if self.journal is not None:
+                self.journal.log_start(
+                    JournalEntry(
+                        source=source_filepath,
+                        target=target_filepath,
+                        size=source_stat.st_size if source_stat is not None else -1,
+                        mtime_ns=source_stat.st_mtime_ns if source_stat is not None else -1,
+                    )
+                )
+
+    def finish_copy(self, target_filepath: str, success: bool):
+        """Removes a copy from the ledger once it ended
+
+        Parameters
+        ----------
+        target_filepath : str
+            path the file was copied to
+        success : bool
+            whether the copy finished successfully. Successful copies
+            are remembered as finished files and never probed.
+        """
+        with self.__lock:
+            self.__copies_in_progress.pop(target_filepath, None)
+            if self.journal is not None:
+                self.journal.log_finish(target_filepath, success)
+
+            folder_info = self.__disk_copy_data.get(os.path.dirname(target_filepath))
+            if folder_info is not None:
+                folder_info.files_in_progress.discard(target_filepath)
+                folder_info.files_in_progress.discard(get_partial_filepath(target_filepath))
+                if success:
+                    folder_info.files_not_being_copied.add(target_filepath)
+
+    def get_files_being_copied(
+        self, directories: Set[str], snapshot: Optional[FilesystemSnapshot] = None
+    ) -> Dict[str, DiskCopyInfo]:
+        """Get the files being copied into the directories
+
+        Parameters
+        ----------
+        directories : Set[str]
+            directories to check for files being copied
+        snapshot : Optional[FilesystemSnapshot]
+            filesystem snapshot of the current iteration
+
+        Returns
+        -------
+        disk_copy_data : Dict[str, DiskCopyInfo]
+            Dictionary containing as key the directory and as value the disk copy
+            info.
+
+        Notes
+        -----
+            Only files neither started by this process nor known to
+            be finished are probed on the filesystem. Interrupted
+            copies whose source file is gone cannot be resumed anymore
+            and are removed.
+        """
+        with self.__lock:
+            known_copies = self.__get_files_in_progress()
+            previous_check = self.__disk_copy_data
+
+        disk_copy_data = get_files_being_copied(
+            directories=directories,
+            previous_check=previous_check,
+            known_copies=known_copies,
+            snapshot=snapshot,
+        )
+        for info in disk_copy_data.values():
+            _remove_orphaned_copies(info)
+
+        with self.__lock:
+            self.__disk_copy_data = disk_copy_data
+
+        return disk_copy_data
+
+    def recover(self):
+        """Reconciles the copies interrupted by a crash
+
+        Notes
+        -----
+            Copies without a finish in the journal were interrupted.
+            Only these are checked, the target folders are not scanned.
+            Files are renamed to their final name only when complete.
+            Thus if the final file exists and matches the source, only
+            the removal of the source file is missing. Incomplete
+            '.partial' files are kept so that the copy can be resumed
+            unless the source file is gone or changed.
+
+            This must be called before new copies are started.
+        """
+        if self.journal is None:
+            return
+
+        logger = get_logger(__file__)
+
+        with self.__lock:
+            try:
+                interrupted_copies = self.journal.replay()
+            except OSError as err:
+                logger.error("Cannot read copy journal '%s': %s", self.state_filepath, err)
+                return
+
+            for entry in interrupted_copies.values():
+                try:
+                    _recover_copy(entry)
+                except OSError as err:
+                    # retried on the next start
+                    logger.error("Cannot recover copy '%s': %s", entry.target, err)
+                    continue
+                self.journal.discard(entry.target)
+
+            if interrupted_copies:
+                logger.info("Reconciled %d interrupted copies", len(interrupted_copies))
+
+            self.journal.compact()
+
+
+def _remove_orphaned_copies(info: DiskCopyInfo):
+    """Removes interrupted copies whose source file does not exist anymore
+
+    Parameters
+    ----------
+    info : DiskCopyInfo
+        files of a target folder, removed copies are dropped from it
+
+    Notes
+    -----
+        e.g. a copy failed and its source was moved to another target
+        afterwards. Copies without checkpoint are kept since their
+        source is unknown.
+    """
+    logger = get_logger(__file__)
+
+    for partial_filepath in list(info.interrupted_copies):
+        target_filepath = partial_filepath[: -len(PARTIAL_SUFFIX)]
+        checkpoint = read_checkpoint(target_filepath)
+        if checkpoint is None or os.path.exists(checkpoint["source"]):
+            continue
+
+        logger.warning("Removing interrupted copy of vanished file: %s", partial_filepath)
+        try:
+            remove_partial_copy(target_filepath)
+        except OSError as err:
+            logger.error("Cannot remove interrupted copy '%s': %s", partial_filepath, err)
+            continue
+        info.interrupted_copies.discard(partial_filepath)
+
+
+def _is_complete_copy(source_filepath: str, target_filepath: str) -> bool:
+    """Checks if a final target file matches its source"""
+    size = os.path.getsize(source_filepath)
+    with open(source_filepath, "rb", buffering=0) as source, open(
+        target_filepath, "rb", buffering=0
+    ) as target:
+        return verify_sampled(source, target, size)
+
+
+def _is_source_unchanged(entry: JournalEntry) -> bool:
+    """Checks if the source file is still the one the copy started with"""
+    if not os.path.exists(entry.source):
+        return False
+    if entry.size < 0:
+        # recorded by an older version
+        return True
+
+    stat = os.stat(entry.source)
+    return stat.st_size == entry.size and stat.st_mtime_ns == entry.mtime_ns
+
+
+def _recover_copy(entry: JournalEntry):
+    """Finishes or cleans up a copy which was interrupted
+
+    A final target which does not match its source is quarantined
+    with the suffix '.suspect' and has to be checked by the user.
+
+    Parameters
+    ----------
+    entry : JournalEntry
+        copy which did not finish according to the journal
+    """
+    logger = get_logger(__file__)
+
+    source_exists = os.path.exists(entry.source)
+
+    if source_exists and os.path.exists(entry.target):
+        if _is_complete_copy(entry.source, entry.target):
+            logger.info("Copy finished before crash, removing source: %s", entry.source)
+            os.unlink(entry.source)
+        else:
+            suspect_filepath = entry.target + SUSPECT_SUFFIX
+            logger.warning("Copy does not match its source, moving it to: %s", suspect_filepath)
+            os.replace(entry.target, suspect_filepath)
+    elif _is_source_unchanged(entry):
+        logger.info("Keeping interrupted copy to resume it: %s", entry.target)
+    else:
+        if source_exists:
+            logger.warning("Removing interrupted copy of changed file: %s", entry.target)
+        # nothing to resume
+        remove_partial_copy(entry.target)
@@ -0,0 +1,579 @@
+import functools
+import ntpath
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from ..utils.logger import get_logger
+from .copy_engines import get_n_bytes_copied, get_partial_filepath
+from .copy_status import CopyJobStatus
+from .CopyLedger import CopyLedger
+from .DiskSpaceModel import DiskSpaceModel
+from .Disk import DiskCopyInfo, get_disks_with_space, move_file
+from .FilesystemSnapshot import FilesystemSnapshot
+from .placement_policies import (
+    AbstractPlacementPolicy,
+    PlacementCandidate,
+    create_placement_policy,
+)
+from .throttling import BandwidthLimiter
+from .ThroughputTracker import ThroughputTracker
+from .verification import VERIFY_NONE
+
+
+class CopyScheduler:
+    """Runs multiple file copies in parallel onto a set of target folders
+
+    The scheduler keeps track of its copies in memory. Thus it
+    knows at any time how many copies are running per target
+    folder without looking at the filesystem. Only copies of
+    other processes are detected through the filesystem.
+
+    Stalled copies don't count against the global copy limit so
+    that a dying disk cannot block the other copies.
+    """
+
+    def __init__(
+        self,
+        target_folders: Iterable[str],
+        max_parallel_copies: int = 1,
+        max_parallel_copies_per_target: int = 1,
+        ledger: Optional[CopyLedger] = None,
+        bandwidth_limiter: Optional[BandwidthLimiter] = None,
+        disk_space_model: Optional[DiskSpaceModel] = None,
+        placement_policy: Optional[AbstractPlacementPolicy] = None,
+        throughput_tracker: Optional[ThroughputTracker] = None,
+        verify_mode: str = VERIFY_NONE,
+        direct_io: bool = False,
+    ):
+        """Initialize a copy scheduler
+
+        Parameters
+        ----------
+        target_folders : Iterable[str]
+            folders to copy files into
+        max_parallel_copies : int
+            maximum number of copies running at the same time
+        max_parallel_copies_per_target : int
+            maximum number of copies running at the same time
+            into the same target folder
+        ledger : Optional[CopyLedger]
+            ledger to register the copies in. A ledger without
+            state file is used if not specified.
+        bandwidth_limiter : Optional[BandwidthLimiter]
+            limiter shared by all copies. Copies run at full
+            speed if not specified.
+        disk_space_model : Optional[DiskSpaceModel]
+            model of the free space of the target folders in which
+            the copies reserve their space. A new one is used if
+            not specified.
+        placement_policy : Optional[AbstractPlacementPolicy]
+            policy choosing the target folder of a file. The
+            default policy is used if not specified.
+        throughput_tracker : Optional[ThroughputTracker]
+            tracker measuring the copies and demoting degraded
+            targets. A new one is used if not specified.
+        verify_mode : str
+            how to check copies before the source file is removed
+        direct_io : bool
+            whether copies bypass the page cache
+
+        Notes
+        -----
+            Limits smaller than one are treated as one.
+        """
+        self.target_folders = set(target_folders)
+        self.max_parallel_copies = max(1, max_parallel_copies)
+        self.max_parallel_copies_per_target = max(1, max_parallel_copies_per_target)
+        self.ledger = ledger if ledger is not None else CopyLedger()
+        self.bandwidth_limiter = bandwidth_limiter
+        self.disk_space_model = (
+            disk_space_model if disk_space_model is not None else DiskSpaceModel()
+        )
+        self.placement_policy = (
+            placement_policy if placement_policy is not None else create_placement_policy("")
+        )
+        self.throughput_tracker = (
+            throughput_tracker if throughput_tracker is not None else ThroughputTracker()
+        )
+        self.verify_mode = verify_mode
+        self.direct_io = direct_io
+
+        # source filepath -> target folder
+        self.copies_in_progress: Dict[str, str] = {}
+        # target folders receiving no new copies
+        self.paused_targets: Set[str] = set()
+
+        self.__futures: Dict[Future, str] = {}
+        # source filepath -> start time (monotonic and unix) and size of the file
+        self.__copy_starts: Dict[str, Tuple[float, float, int]] = {}
+        self.__wake_up_event = threading.Event()
+        # makes running copies stop after their current chunk
+        self.__stop_event = threading.Event()
+        # stalled copies may keep their threads busy for a long time
+        self.__max_threads = 2 * self.max_parallel_copies
+        self.__executor = ThreadPoolExecutor(
+            max_workers=self.__max_threads,
+            thread_name_prefix="copy",
+        )
+        self.__executor_size = self.__max_threads
+        # executors replaced by larger ones which finish their copies
+        self.__retired_executors: List[ThreadPoolExecutor] = []
+
+    @property
+    def n_copies_in_progress(self) -> int:
+        """Number of copies currently running"""
+        return len(self.copies_in_progress)
+
+    def has_free_slot(self) -> bool:
+        """Checks if another copy may be started
+
+        Returns
+        -------
+        has_free_slot : bool
+            whether the global copy limit is not reached yet
+
+        Notes
+        -----
+            Stalled copies are not counted as long as there are
+            threads left to run more copies.
+        """
+        if self.n_copies_in_progress >= self.__max_threads:
+            return False
+
+        n_stalled_copies = len(self.throughput_tracker.get_stalled_copies())
+        return self.n_copies_in_progress - n_stalled_copies < self.max_parallel_copies
+
+    def set_concurrency(
+        self,
+        max_parallel_copies: Optional[int] = None,
+        max_parallel_copies_per_target: Optional[int] = None,
+    ):
+        """Changes the copy limits while copies are running
+
+        Parameters
+        ----------
+        max_parallel_copies : Optional[int]
+            new maximum number of copies running at the same time.
+            Unchanged if not specified.
+        max_parallel_copies_per_target : Optional[int]
+            new maximum number of copies running at the same time
+            into the same target folder. Unchanged if not specified.
+
+        Notes
+        -----
+            Running copies are never interrupted. If the limits are
+            lowered, no new copies start until enough copies finished.
+            Limits smaller than one are treated as one.
+        """
+        if max_parallel_copies is not None:
+            self.max_parallel_copies = max(1, max_parallel_copies)
+        if max_parallel_copies_per_target is not None:
+            self.max_parallel_copies_per_target = max(1, max_parallel_copies_per_target)
+
+        self.__max_threads = 2 * self.max_parallel_copies
+        if self.__max_threads > self.__executor_size:
+            # thread pools cannot grow, the running copies
+            # finish in the old one
+            self.__executor.shutdown(wait=False)
+            self.__retired_executors.append(self.__executor)
+            self.__executor = ThreadPoolExecutor(
+                max_workers=self.__max_threads,
+                thread_name_prefix="copy",
+            )
+            self.__executor_size = self.__max_threads
+
+        self.wake_up()
+
+    def pause_target(self, target_dir: str):
+        """Stops starting new copies into a target folder
+
+        Parameters
+        ----------
+        target_dir : str
+            target folder to pause
+
+        Raises
+        ------
+        ValueError
+            If the folder is not a target folder of the scheduler.
+
+        Notes
+        -----
+            Copies already running into the folder are finished.
+        """
+        if target_dir not in self.target_folders:
+            raise ValueError(f"'{target_dir}' is not a target folder")
+        self.paused_targets.add(target_dir)
+
+    def resume_target(self, target_dir: str):
+        """Starts copying into a paused target folder again
+
+        Parameters
+        ----------
+        target_dir : str
+            target folder to resume
+
+        Raises
+        ------
+        ValueError
+            If the folder is not a target folder of the scheduler.
+        """
+        if target_dir not in self.target_folders:
+            raise ValueError(f"'{target_dir}' is not a target folder")
+        self.paused_targets.discard(target_dir)
+        self.wake_up()
+
+    def get_target_copy_counts(self) -> Dict[str, int]:
+        """Get the number of running copies for every target folder
+
+        Returns
+        -------
+        target_copy_counts : Dict[str, int]
+            Dictionary containing as key the target folder and as value
+            the number of copies running into it. Folders which don't
+            exist are not contained.
+
+        Notes
+        -----
+            Copies of this scheduler are taken from memory. Copies of
+            other processes are detected by the ledger.
+        """
+        disk_copy_data = self.ledger.get_files_being_copied(self.target_folders)
+        return self.__add_own_copies(self.__count_foreign_copies(disk_copy_data))
+
+    def __count_foreign_copies(self, disk_copy_data: Dict[str, DiskCopyInfo]) -> Dict[str, int]:
+        """Counts the copies of other processes per folder from a filesystem check"""
+        own_filepaths = self.ledger.files_in_progress
+
+        return {
+            folder: len(info.files_in_progress - own_filepaths)
+            for folder, info in disk_copy_data.items()
+        }
+
+    def __add_own_copies(self, foreign_copy_counts: Dict[str, int]) -> Dict[str, int]:
+        """Adds the copies of this scheduler to the copy counts per folder"""
+        target_copy_counts = dict(foreign_copy_counts)
+        for target_dir in self.copies_in_progress.values():
+            if target_dir in target_copy_counts:
+                target_copy_counts[target_dir] += 1
+
+        return target_copy_counts
+
+    def find_target_dir(
+        self, source_filepath: str, snapshot: Optional[FilesystemSnapshot] = None
+    ) -> Union[str, None]:
+        """Finds a target folder for a file
+
+        Parameters
+        ----------
+        source_filepath : str
+            path to the file to be copied
+        snapshot : Optional[FilesystemSnapshot]
+            filesystem snapshot shared by the checks of the current
+            iteration. A new one is used if not specified.
+
+        Returns
+        -------
+        target_dir : Union[str, None]
+            Target folder with a free slot and enough space or None
+            if there is none.
+
+        Notes
+        -----
+            The placement policy chooses among all folders with a free
+            slot and enough space. Folders demoted by the throughput
+            tracker or paused are skipped. An interrupted copy of the file is
+            resumed in its folder if possible.
+
+            Copies of this scheduler reserve their exact size in the disk
+            space model. Copies of other processes are assumed to be as
+            large as the file.
+        """
+        snapshot = snapshot if snapshot is not None else FilesystemSnapshot()
+        disk_copy_data = self.ledger.get_files_being_copied(self.target_folders, snapshot)
+        foreign_copy_counts = self.__count_foreign_copies(disk_copy_data)
+        target_copy_counts = self.__add_own_copies(foreign_copy_counts)
+        skipped_dirs = self.throughput_tracker.get_demoted_targets() | self.paused_targets
+        disk_copy_data = {
+            folder: info for folder, info in disk_copy_data.items() if folder not in skipped_dirs
+        }
+
+        resume_dir = self.__find_resume_dir(
+            source_filepath, disk_copy_data, foreign_copy_counts, target_copy_counts, snapshot
+        )
+        if resume_dir is not None:
+            return resume_dir
+
+        free_folders = [
+            folder
+            for folder, n_copies in target_copy_counts.items()
+            if n_copies < self.max_parallel_copies_per_target and folder not in skipped_dirs
+        ]
+        if not free_folders:
+            return None
+
+        disks_with_space = get_disks_with_space(
+            source_filepath,
+            {folder: foreign_copy_counts[folder] for folder in free_folders},
+            self.disk_space_model,
+            snapshot,
+        )
+        if not disks_with_space:
+            return None
+
+        return self.placement_policy.choose_target_dir(
+            source_filepath,
+            [
+                PlacementCandidate(
+                    folder=folder,
+                    n_copies=target_copy_counts[folder],
+                    free_space=free_space,
+                )
+                for folder, free_space in sorted(disks_with_space.items())
+            ],
+        )
+
+    def __find_resume_dir(
+        self,
+        source_filepath: str,
+        disk_copy_data: Dict[str, DiskCopyInfo],
+        foreign_copy_counts: Dict[str, int],
+        target_copy_counts: Dict[str, int],
+        snapshot: FilesystemSnapshot,
+    ) -> Union[str, None]:
+        """Finds the folder containing an interrupted copy of the file"""
+        for folder, info in disk_copy_data.items():
+            partial_filepath = get_partial_filepath(_get_target_filepath(source_filepath, folder))
+            if partial_filepath in info.interrupted_copies:
+                n_counted = 0
+            elif partial_filepath in info.files_in_progress:
+                # written recently thus counted as running foreign copy
+                n_counted = 1
+            else:
+                continue
+
+            if target_copy_counts[folder] - n_counted < self.max_parallel_copies_per_target and (
+                get_disks_with_space(
+                    source_filepath,
+                    {folder: foreign_copy_counts[folder] - n_counted},
+                    self.disk_space_model,
+                    snapshot,
+                )
+            ):
+                return folder
+
+        return None
+
+    def get_copy_jobs(self) -> List[CopyJobStatus]:
+        """Get the progress of the running copies
+
+        Returns
+        -------
+        copy_jobs : List[CopyJobStatus]
+            running copies as of the last time the scheduler woke up
+        """
+        copy_progress = self.throughput_tracker.get_copy_progress()
+
+        copy_jobs = []
+        for source_filepath, target_dir in self.copies_in_progress.items():
+            target_filepath = _get_target_filepath(source_filepath, target_dir)
+            _, start_time, file_size = self.__copy_starts[source_filepath]
+            n_bytes_copied, bytes_per_sec = copy_progress.get(target_filepath, (0, 0.0))
+            copy_jobs.append(
+                CopyJobStatus(
+                    source_filepath=source_filepath,
+                    target_filepath=target_filepath,
+                    start_time=start_time,
+                    n_bytes_copied=n_bytes_copied,
+                    n_bytes_total=file_size,
+                    bytes_per_sec=bytes_per_sec,
+                )
+            )
+
+        return copy_jobs
+
+    def submit(self, source_filepath: str, snapshot: Optional[FilesystemSnapshot] = None) -> bool:
+        """Starts copying a file if there is a free slot and space
+
+        Parameters
+        ----------
+        source_filepath : str
+            path to the file to be moved
+        snapshot : Optional[FilesystemSnapshot]
+            filesystem snapshot shared by the checks of the current
+            iteration. A new one is used if not specified.
+
+        Returns
+        -------
+        submitted : bool
+            whether the copy was started
+        """
+        if not self.has_free_slot() or source_filepath in self.copies_in_progress:
+            return False
+
+        target_dir = self.find_target_dir(source_filepath, snapshot)
+        if target_dir is None:
+            return False
+
+        target_filepath = _get_target_filepath(source_filepath, target_dir)
+        try:
+            source_stat = os.stat(source_filepath)
+        except FileNotFoundError:
+            # e.g. moved away by another copier in the meantime
+            get_logger(__file__).warning("File '%s' vanished before copying.", source_filepath)
+            return False
+        file_size = source_stat.st_size
+        self.disk_space_model.reserve(target_filepath, file_size)
+        self.throughput_tracker.start_copy(
+            target_filepath,
+            target_dir,
+            source_stat.st_dev,
+            get_n_bytes_copied(target_filepath),
+        )
+        self.__copy_starts[source_filepath] = (time.monotonic(), time.time(), file_size)
+        self.copies_in_progress[source_filepath] = target_dir
+        self.ledger.start_copy(source_filepath, target_filepath, source_stat)
+        future = self.__executor.submit(
+            move_file,
+            source_filepath,
+            target_dir,
+            self.bandwidth_limiter,
+            self.verify_mode,
+            self.direct_io,
+            functools.partial(self.throughput_tracker.set_copy_phase, target_filepath),
+            self.__stop_event,
+        )
+        self.__futures[future] = source_filepath
+        future.add_done_callback(self.__on_copy_done)
+
+        return True
+
+    def __on_copy_done(self, _: Future):
+        self.wake_up()
+
+    def wake_up(self):
+        """Makes `wait_for_free_slot` return early
+
+        Notes
+        -----
+            Finished copies wake up the scheduler by themselves. Call this
+            e.g. when new files arrived which can be copied.
+        """
+        self.__wake_up_event.set()
+
+    def wait_for_free_slot(self, timeout: float) -> Set[str]:
+        """Waits until a copy finished, `wake_up` is called or the timeout passed
+
+        Parameters
+        ----------
+        timeout : float
+            maximum time to wait in seconds
+
+        Returns
+        -------
+        finished_filepaths : Set[str]
+            source filepaths of the copies which finished
+        """
+        self.wait_for_wake_up(timeout)
+        return self.collect_finished_copies()
+
+    def wait_for_wake_up(self, timeout: float) -> bool:
+        """Waits until a copy finished, `wake_up` is called or the timeout passed
+
+        Parameters
+        ----------
+        timeout : float
+            maximum time to wait in seconds
+
+        Returns
+        -------
+        woken_up : bool
+            whether the wait ended before the timeout
+
+        Notes
+        -----
+            Only this method may be called from another thread than
+            the other methods, e.g. to not block an event loop.
+        """
+        woken_up = self.__wake_up_event.wait(timeout)
+        self.__wake_up_event.clear()
+        return woken_up
+
+    def collect_finished_copies(self) -> Set[str]:
+        """Updates the progress and frees the slots of finished copies
+
+        Returns
+        -------
+        finished_filepaths : Set[str]
+            source filepaths of the copies which finished
+        """
+        self.__sample_progress()
+
+        done = [future for future in self.__futures if future.done()]
+
+        return self.__collect_finished_copies(done)
+
+    def __sample_progress(self):
+        """Reports the bytes written by the running copies to the tracker"""
+        target_filepaths = [
+            _get_target_filepath(source_filepath, target_dir)
+            for source_filepath, target_dir in self.copies_in_progress.items()
+        ]
+        self.throughput_tracker.update_progress(
+            {
+                target_filepath: get_n_bytes_copied(target_filepath)
+                for target_filepath in target_filepaths
+            }
+        )
+
+    def __collect_finished_copies(self, done: Iterable[Future]) -> Set[str]:
+        """Removes finished copies from the bookkeeping"""
+        logger = get_logger(__file__)
+
+        finished_filepaths: Set[str] = set()
+        for future in done:
+            source_filepath = self.__futures.pop(future)
+            target_dir = self.copies_in_progress.pop(source_filepath)
+            finished_filepaths.add(source_filepath)
+
+            err = future.exception()
+            if err is not None:
+                logger.error("Copy of '%s' failed: %s", source_filepath, err)
+
+            start_time, _, file_size = self.__copy_starts.pop(source_filepath)
+            success = err is None and bool(future.result())
+            if success:
+                self.placement_policy.on_copy_finished(
+                    target_dir, file_size, time.monotonic() - start_time
+                )
+
+            target_filepath = _get_target_filepath(source_filepath, target_dir)
+            self.disk_space_model.release(target_filepath)
+            self.throughput_tracker.finish_copy(target_filepath, success=success)
+            self.ledger.finish_copy(target_filepath, success=success)
+
+        return finished_filepaths
+
+    def shutdown(self, wait_for_copies: bool = True):
+        """Shuts down the scheduler
+
+        Parameters
+        ----------
+        wait_for_copies : bool
+            whether to block until running copies are finished. If
+            not, running copies stop after their current chunk and
+            keep their incomplete file to be resumed later.
+        """
+        if not wait_for_copies:
+            self.__stop_event.set()
+        self.__executor.shutdown(wait=wait_for_copies)
+        for executor in self.__retired_executors:
+            executor.shutdown(wait=wait_for_copies)
+
+
+def _get_target_filepath(source_filepath: str, target_dir: str) -> str:
+    """Filepath of a file after it was moved into the target dir"""
+    return os.path.join(target_dir, ntpath.basename(source_filepath))
@@ -1,15 +1,20 @@
-from dataclasses import dataclass
-import glob
+from dataclasses import dataclass, field
 import ntpath
 import os
-import shutil
+import threading
 import time
 import traceback
-from typing import Dict, Set, Union
-
-import psutil
+from typing import Callable, Dict, Optional, Set, Union
 
 from ..utils.logger import get_logger
+from .copy_engines import CHECKPOINT_SUFFIX, PARTIAL_SUFFIX, copy_file_content
+from .DiskSpaceModel import DiskSpaceModel
+from .FilesystemSnapshot import FilesystemSnapshot
+from .throttling import BandwidthLimiter
+from .verification import VERIFY_NONE
+
+# incomplete copies not written for this long are considered interrupted
+ABANDONED_PARTIAL_SECONDS = 300
 
 
 def filter_least_used_disks(disk_to_copy_processes_count: Dict[str, int]) -> Set[str]:
@@ -36,7 +41,10 @@ def filter_least_used_disks(disk_to_copy_processes_count: Dict[str, int]) -> Set
 
 
 def find_disk_with_space(
-    filepath_file: str, target_dirs_process_count: Dict[str, int]
+    filepath_file: str,
+    target_dirs_process_count: Dict[str, int],
+    disk_space_model: Optional[DiskSpaceModel] = None,
+    snapshot: Optional[FilesystemSnapshot] = None,
 ) -> Union[str, None]:
     """Searches for space for a file to be moved
 
@@ -47,29 +55,82 @@ def find_disk_with_space(
     target_dirs_process_count : Dict[str, int]
         Dictionary containing as key the directory and as value
         the number of copy processes for that directory.
+    disk_space_model : Optional[DiskSpaceModel]
+        Model caching the free space and the space reserved by
+        copies. Copies reserved in the model must not be counted
+        in `target_dirs_process_count`.
+    snapshot : Optional[FilesystemSnapshot]
+        Filesystem snapshot of the current iteration. A new one
+        is used if not specified.
 
     Returns
     -------
     dirpath : Union[str, None]
         A target dir with space or None if no space available
     """
-    logger = get_logger(__file__)
-
-    fstat = os.stat(filepath_file)
+    disks_with_space = get_disks_with_space(
+        filepath_file, target_dirs_process_count, disk_space_model, snapshot
+    )
 
     # we collect multiple possible disks so that we can select one randomly
     # in the end.
-    disks_with_space: Set[str] = set()
+    if disks_with_space:
+        return set(disks_with_space).pop()
+
+    return None
+
+
+def get_disks_with_space(
+    filepath_file: str,
+    target_dirs_process_count: Dict[str, int],
+    disk_space_model: Optional[DiskSpaceModel] = None,
+    snapshot: Optional[FilesystemSnapshot] = None,
+) -> Dict[str, float]:
+    """Get all directories with space for a file to be moved
+
+    Parameters
+    ----------
+    filepath_file : str
+        Path to the file to be copied
+    target_dirs_process_count : Dict[str, int]
+        Dictionary containing as key the directory and as value
+        the number of copy processes for that directory.
+    disk_space_model : Optional[DiskSpaceModel]
+        Model caching the free space and the space reserved by
+        copies. Copies reserved in the model must not be counted
+        in `target_dirs_process_count`.
+    snapshot : Optional[FilesystemSnapshot]
+        Filesystem snapshot of the current iteration. A new one
+        is used if not specified.
+
+    Returns
+    -------
+    disks_with_space : Dict[str, float]
+        Dictionary containing as key the directories with enough space
+        and as value the bytes left after copying the file.
+
+    Notes
+    -----
+        Without a disk space model every copy process is assumed
+        to need 108GB. With the model, copies without reservation
+        are assumed to be as large as the file to be copied.
+    """
+    logger = get_logger(__file__)
+    snapshot = snapshot if snapshot is not None else FilesystemSnapshot()
+
+    fstat = snapshot.stat(filepath_file)
+
+    disks_with_space: Dict[str, float] = {}
+
+    estimated_copy_size = fstat.st_size if disk_space_model is not None else 1.08e11  # 108GB
 
     for dirpath, n_processes in target_dirs_process_count.items():
         try:
-            if not os.path.exists(dirpath):
-                os.makedirs(dirpath, exist_ok=True)
             # size check
-            space_after_copying = n_processes * 1.08e11  # 108GB
-            space = psutil.disk_usage(dirpath)
-            if space.free > (fstat.st_size + space_after_copying):
-                disks_with_space.add(dirpath)
+            space_after_copying = n_processes * estimated_copy_size
+            free_space = _get_free_space(dirpath, disk_space_model, snapshot)
+            if free_space > (fstat.st_size + space_after_copying):
+                disks_with_space[dirpath] = free_space - fstat.st_size - space_after_copying
         except PermissionError:
             warn_msg = "Permission denied to directory '%s'."
             logger.warning(warn_msg, dirpath)
@@ -83,13 +144,32 @@ def find_disk_with_space(
             warn_msg = "Cannot reach host for drive '%s'"
             logger.warning(warn_msg, dirpath)
 
-    if disks_with_space:
-        return disks_with_space.pop()
+    return disks_with_space
 
-    return None
 
+def _get_free_space(
+    dirpath: str, disk_space_model: Optional[DiskSpaceModel], snapshot: FilesystemSnapshot
+) -> int:
+    """Get the free space of the disk of a directory, creating it if missing"""
+    if disk_space_model is not None:
+        return disk_space_model.get_free_space(dirpath)
 
-def move_file(filepath, target_dir):
+    try:
+        return snapshot.get_free_space(dirpath)
+    except FileNotFoundError:
+        os.makedirs(dirpath, exist_ok=True)
+        return snapshot.get_free_space(dirpath)
+
+
+def move_file(
+    filepath,
+    target_dir,
+    bandwidth_limiter: Optional[BandwidthLimiter] = None,
+    verify_mode: str = VERIFY_NONE,
+    direct_io: bool = False,
+    on_phase: Optional[Callable[[str], None]] = None,
+    stop_event: Optional[threading.Event] = None,
+) -> bool:
     """Moves a file to a target directory
 
     Parameters
@@ -98,12 +178,33 @@ def move_file(filepath, target_dir):
         Path to the file to be moved
     target_dir : str
         Path to the target directory
+    bandwidth_limiter : Optional[BandwidthLimiter]
+        Limits the copy speed if specified
+    verify_mode : str
+        How to check the copy before the original file is removed
+    direct_io : bool
+        Whether to bypass the page cache while copying
+    on_phase : Optional[Callable[[str], None]]
+        Called when the copy starts or stops verifying, see
+        `copy_file_content`
+    stop_event : Optional[threading.Event]
+        Stops the copy once set, see `copy_file_content`
+
+    Returns
+    -------
+    success : bool
+        If the file was copied to the target directory.
+
+    Raises
+    ------
+    InterruptedError
+        If the copy was stopped through the stop event.
     """
     logger = get_logger(__file__)
 
     if not os.path.isdir(target_dir):
         logger.error("Target directory '%s' does not exist.", target_dir)
-        return
+        return False
 
     # compose new filepath after move
     filename = ntpath.basename(filepath)
@@ -113,11 +214,20 @@ def move_file(filepath, target_dir):
     logger.info("moving file: %s -> %s", filepath, target_path)
     start = time.time()
 
-    successful_copy = copy_file(filepath, target_path)
+    engine_name = copy_file(
+        filepath,
+        target_path,
+        bandwidth_limiter=bandwidth_limiter,
+        verify_mode=verify_mode,
+        direct_io=direct_io,
+        on_phase=on_phase,
+        stop_event=stop_event,
+    )
+    successful_copy = bool(engine_name)
 
     duration_secs = time.time() - start
     if successful_copy:
-        logger.info("copied '%s' in %.1fs", filepath, duration_secs)
+        logger.info("copied '%s' in %.1fs with %s", filepath, duration_secs, engine_name)
         try:
             os.unlink(filepath)
         except FileNotFoundError:
@@ -125,8 +235,18 @@ def move_file(filepath, target_dir):
     else:
         logger.error("failed to copy %s in %.1fs", filepath, duration_secs)
 
+    return successful_copy
 
-def copy_file(source_path: str, target_path: str) -> bool:
+
+def copy_file(
+    source_path: str,
+    target_path: str,
+    bandwidth_limiter: Optional[BandwidthLimiter] = None,
+    verify_mode: str = VERIFY_NONE,
+    direct_io: bool = False,
+    on_phase: Optional[Callable[[str], None]] = None,
+    stop_event: Optional[threading.Event] = None,
+) -> str:
     """Copies a file from a source path to a target path
 
     Parameters
@@ -135,68 +255,133 @@ def copy_file(source_path: str, target_path: str) -> bool:
         Path to the existing source file
     target_path : str
         Path where to copy the file
+    bandwidth_limiter : Optional[BandwidthLimiter]
+        Limits the copy speed if specified
+    verify_mode : str
+        How to check the copy, see `copy_file_content`
+    direct_io : bool
+        Whether to bypass the page cache, see `copy_file_content`
+    on_phase : Optional[Callable[[str], None]]
+        Called when the copy starts or stops verifying, see
+        `copy_file_content`
+    stop_event : Optional[threading.Event]
+        Stops the copy once set, see `copy_file_content`
 
     Returns
     -------
-    success : bool
-        If the copy was a success.
+    engine_name : str
+        Name of the copy engine used or an empty string if the
+        copy was not successful.
+
+    Raises
+    ------
+    InterruptedError
+        If the copy was stopped through the stop event.
     """
     logger = get_logger(__file__)
 
     try:
         if is_accessible(source_path):
-            shutil.copyfile(source_path, target_path)
-            return True
+            return copy_file_content(
+                source_path,
+                target_path,
+                bandwidth_limiter=bandwidth_limiter,
+                verify_mode=verify_mode,
+                direct_io=direct_io,
+                on_phase=on_phase,
+                stop_event=stop_event,
+            )
 
         logger.error("Cannot copy file '%s' since it is being accessed.", source_path)
-        return False
+        return ""
 
+    except InterruptedError:
+        # the copy is resumed later
+        raise
     except Exception:
         trace = traceback.format_stack()
         get_logger(__file__).error(trace)
-        return False
+        return ""
 
 
-def collect_files_from_folders(folder_set: Set[str], pattern: str) -> Set[str]:
-    """Collect files from folders
+def filter_valid_folders(
+    folder_set: Set[str], snapshot: Optional[FilesystemSnapshot] = None
+) -> Set[str]:
+    """Filters for existing directories
 
     Parameters
     ----------
     folder_set : Set[str]
-        set of folders to search for files
-    pattern : str
-        file pattern to search for
+        set of folders to check
+    snapshot : Optional[FilesystemSnapshot]
+        Filesystem snapshot of the current iteration. A new one
+        is used if not specified.
 
     Returns
     -------
-    filepaths : Set[str]
-        paths to the files
+    valid_folders : Set[str]
+        folders which exist and are directories
+
+    Notes
+    -----
+        A warning is logged for every invalid folder.
     """
     logger = get_logger(__file__)
-    logger.debug("Collecting Plots")
+    snapshot = snapshot if snapshot is not None else FilesystemSnapshot()
 
-    all_filepaths = set()
+    valid_folders = set()
 
     for folder in folder_set:
 
-        if not os.path.exists(folder):
+        if not snapshot.exists(folder):
             warn_msg = "Folder '%s' does not exist."
             logger.warning(warn_msg, folder)
             continue
 
-        if os.path.isfile(folder):
+        if snapshot.is_file(folder):
             warn_msg = "Path '%s' is a file and not a directory."
             logger.warning(warn_msg, folder)
             continue
 
-        if not os.path.isdir(folder):
+        if not snapshot.is_dir(folder):
             warn_msg = "Path '%s' is not a directory."
             logger.warning(warn_msg, folder)
             continue
 
-        for filepath in glob.glob(os.path.join(folder, pattern)):
-            if os.path.isfile(filepath):
-                all_filepaths.add(filepath)
+        valid_folders.add(folder)
+
+    return valid_folders
+
+
+def collect_files_from_folders(
+    folder_set: Set[str], pattern: str, snapshot: Optional[FilesystemSnapshot] = None
+) -> Set[str]:
+    """Collect files from folders
+
+    Parameters
+    ----------
+    folder_set : Set[str]
+        set of folders to search for files
+    pattern : str
+        file pattern to search for
+    snapshot : Optional[FilesystemSnapshot]
+        Filesystem snapshot of the current iteration. A new one
+        is used if not specified.
+
+    Returns
+    -------
+    filepaths : Set[str]
+        paths to the files
+    """
+    logger = get_logger(__file__)
+    logger.debug("Collecting Plots")
+
+    snapshot = snapshot if snapshot is not None else FilesystemSnapshot()
+
+    all_filepaths = set()
+
+    for folder in filter_valid_folders(folder_set, snapshot):
+        all_filepaths.update(snapshot.get_files(folder, pattern))
 
     return all_filepaths
 
@@ -245,53 +430,103 @@ class DiskCopyInfo:
 
     files_in_progress: Set[str]
     files_not_being_copied: Set[str]
+    # '.partial' files of copies which are not running anymore
+    interrupted_copies: Set[str] = field(default_factory=set)
 
 
-def get_files_being_copied(directories: Set[str]) -> Dict[str, DiskCopyInfo]:
+def get_files_being_copied(
+    directories: Set[str],
+    previous_check: Optional[Dict[str, DiskCopyInfo]] = None,
+    known_copies: Optional[Set[str]] = None,
+    snapshot: Optional[FilesystemSnapshot] = None,
+) -> Dict[str, DiskCopyInfo]:
     """Get all the files which are not accessible for write (i.e. being copied)
 
     Parameters
     ----------
     directories : Set[str]
         Directories where to search for files, which cannot be accessed (i.e. being copied)
-    previous_check : Dict[str, DiskCopyInfo]
+    previous_check : Optional[Dict[str, DiskCopyInfo]]
         Dictionary containing as key the directory and as value the disk copy
         info from the previous check to speed up the check. Previous files not
         being copied are not checked again.
+    known_copies : Optional[Set[str]]
+        Filepaths of files known to be copied right now such as copies
+        started by this process. These are not checked either.
+    snapshot : Optional[FilesystemSnapshot]
+        Filesystem snapshot of the current iteration. A new one
+        is used if not specified.
 
     Returns
     -------
     disk_copy_data : Dict[str, DiskCopyInfo]
         Dictionary containing as key the directory and as value the disk copy
         info.
+
+    Notes
+    -----
+        Files ending with '.partial' are incomplete copies. They are
+        counted as in progress if known or written recently, else
+        the copy was interrupted e.g. by a crash or an error. Their
+        checkpoint files are ignored.
     """
     disk_copy_data: Dict[str, DiskCopyInfo] = {}
+    previous_check = previous_check or {}
+    known_copies = known_copies or set()
+    snapshot = snapshot if snapshot is not None else FilesystemSnapshot()
 
     logger = get_logger(__file__)
+    now = time.time()
     for folder_path in directories:
 
         new_info = DiskCopyInfo(files_in_progress=set(), files_not_being_copied=set())
 
-        if not os.path.exists(folder_path):
+        try:
+            snapshot.list_folder(folder_path)
+        except FileNotFoundError:
             logger.warning("Target directory '%s' does not exist.", folder_path)
             continue
-
-        if not os.path.isdir(folder_path):
+        except NotADirectoryError:
             logger.warning("Target directory '%s' is not a directory.", folder_path)
             continue
 
         disk_copy_data[folder_path] = new_info
 
+        # checkpoints belong to partial files and are no copies themselves
         all_files_to_check = {
-            os.path.join(folder_path, f)
-            for f in os.listdir(folder_path)
-            if os.path.isfile(os.path.join(folder_path, f))
+            filepath
+            for filepath in snapshot.get_files(folder_path)
+            if CHECKPOINT_SUFFIX not in os.path.basename(filepath)
         }
 
+        previous_info = previous_check.get(folder_path)
+        files_checked_previously = (
+            previous_info.files_not_being_copied if previous_info is not None else set()
+        )
+
         for f in all_files_to_check:
-            if not is_accessible(f):
+            if f in known_copies:
+                new_info.files_in_progress.add(f)
+            elif f.endswith(PARTIAL_SUFFIX):
+                is_running = _is_recently_written(f, snapshot, now)
+                (new_info.files_in_progress if is_running else new_info.interrupted_copies).add(f)
+            elif f in files_checked_previously:
+                new_info.files_not_being_copied.add(f)
+            elif not is_accessible(f):
                 new_info.files_in_progress.add(f)
             else:
                 new_info.files_not_being_copied.add(f)
 
     return disk_copy_data
+
+
+def _is_recently_written(partial_filepath: str, snapshot: FilesystemSnapshot, now: float) -> bool:
+    """Checks if an incomplete copy or its checkpoint was written lately"""
+    last_write_time = 0.0
+    for filepath in (partial_filepath, partial_filepath + CHECKPOINT_SUFFIX):
+        try:
+            last_write_time = max(last_write_time, snapshot.stat(filepath).st_mtime)
+        except OSError:
+            pass
+
+    return now - last_write_time < ABANDONED_PARTIAL_SECONDS
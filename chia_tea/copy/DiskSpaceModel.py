@@ -0,0 +1,170 @@
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict
+
+import psutil
+
+from .copy_engines import get_n_bytes_copied
+
+# seconds for which the free space of a disk is not checked again
+DISK_USAGE_TTL_SECONDS = 30
+
+
+@dataclass
+class DiskUsage:
+    """Free space of the disk of a folder at some point in time"""
+
+    timestamp: float
+    device: int
+    free: int
+
+
+@dataclass
+class SpaceReservation:
+    """Space reserved for a file being copied"""
+
+    device: int
+    n_bytes: int
+    # bytes of the file already on disk when the free space was checked
+    n_bytes_written: int = 0
+
+    @property
+    def n_bytes_outstanding(self) -> int:
+        """Bytes which still will be written"""
+        return max(0, self.n_bytes - self.n_bytes_written)
+
+
+class DiskSpaceModel:
+    """Free space of the target disks minus the space reserved by copies
+
+    The free space of every disk is cached for a short time to avoid
+    querying slow (network) drives for every file. Copies reserve the
+    exact size of their file until they finished so that disks are
+    never filled beyond their capacity.
+    """
+
+    def __init__(self, ttl_seconds: float = DISK_USAGE_TTL_SECONDS):
+        """Initialize a disk space model
+
+        Parameters
+        ----------
+        ttl_seconds : float
+            time for which the free space of a disk is cached
+        """
+        self.ttl_seconds = ttl_seconds
+
+        self.__lock = threading.Lock()
+        # folder -> disk usage
+        self.__disk_usages: Dict[str, DiskUsage] = {}
+        # target filepath -> reservation
+        self.__reservations: Dict[str, SpaceReservation] = {}
+
+    @property
+    def reservations(self) -> Dict[str, SpaceReservation]:
+        """Space reserved per target filepath"""
+        with self.__lock:
+            return dict(self.__reservations)
+
+    def get_free_space(self, folder: str) -> int:
+        """Get the space of a folder's disk which is not reserved
+
+        Parameters
+        ----------
+        folder : str
+            folder on the disk. It is created if it doesn't exist.
+
+        Returns
+        -------
+        free_space : int
+            free bytes minus the bytes reserved for copies onto the
+            same disk
+
+        Raises
+        ------
+        OSError
+            If the disk cannot be reached.
+        """
+        with self.__lock:
+            disk_usage = self.__disk_usages.get(folder)
+            if disk_usage is None or time.monotonic() - disk_usage.timestamp > self.ttl_seconds:
+                disk_usage = self.__update_disk_usage(folder)
+
+            n_bytes_reserved = sum(
+                reservation.n_bytes_outstanding
+                for reservation in self.__reservations.values()
+                if reservation.device == disk_usage.device
+            )
+
+            return disk_usage.free - n_bytes_reserved
+
+    def reserve(self, target_filepath: str, n_bytes: int):
+        """Reserves space for a file being copied
+
+        Parameters
+        ----------
+        target_filepath : str
+            path the file is copied to
+        n_bytes : int
+            size of the file
+
+        Raises
+        ------
+        OSError
+            If the folder of the file cannot be reached.
+        """
+        folder = os.path.dirname(target_filepath)
+
+        with self.__lock:
+            disk_usage = self.__disk_usages.get(folder)
+            device = disk_usage.device if disk_usage is not None else os.stat(folder).st_dev
+
+            self.__reservations[target_filepath] = SpaceReservation(
+                device=device,
+                n_bytes=n_bytes,
+            )
+
+    def release(self, target_filepath: str):
+        """Releases the space of a copy which ended
+
+        Parameters
+        ----------
+        target_filepath : str
+            path the file was copied to
+
+        Notes
+        -----
+            The free space of the disk is checked again on the next
+            request since the cached value doesn't contain the bytes
+            written in the meantime.
+        """
+        with self.__lock:
+            reservation = self.__reservations.pop(target_filepath, None)
+            if reservation is None:
+                return
+
+            self.__disk_usages = {
+                folder: disk_usage
+                for folder, disk_usage in self.__disk_usages.items()
+                if disk_usage.device != reservation.device
+            }
+
+    def __update_disk_usage(self, folder: str) -> DiskUsage:
+        """Checks the free space of the disk of a folder"""
+        if not os.path.exists(folder):
+            os.makedirs(folder, exist_ok=True)
+
+        disk_usage = DiskUsage(
+            timestamp=time.monotonic(),
+            device=os.stat(folder).st_dev,
+            free=psutil.disk_usage(folder).free,
+        )
+        self.__disk_usages[folder] = disk_usage
+
+        # the free space contains what the copies wrote so far
+        for target_filepath, reservation in self.__reservations.items():
+            if reservation.device == disk_usage.device:
+                reservation.n_bytes_written = get_n_bytes_copied(target_filepath)
+
+        return disk_usage
@@ -0,0 +1,215 @@
+import errno
+import fnmatch
+import os
+import stat as stat_module
+from typing import Dict, List, Optional, Union
+
+import psutil
+
+
+class FilesystemSnapshot:
+    """Caches directory listings, stats and free space for one iteration
+
+    Every folder is listed once with 'os.scandir' whose entries know
+    their file type without another call and cache their stat result.
+    Paths inside listed folders are answered from these entries and
+    other paths are stat'ed once. Errors are cached as well so that an
+    unreachable network drive is not asked again.
+
+    Over network filesystems every call is a round trip, thus a
+    snapshot is shared by all checks of one iteration of the copy
+    loop and thrown away afterwards. It may be outdated by then.
+    """
+
+    def __init__(self):
+        # folder -> filename -> entry or the error listing it
+        self.__listings: Dict[str, Union[Dict[str, os.DirEntry], OSError]] = {}
+        # path -> stat or the error of the stat
+        self.__stats: Dict[str, Union[os.stat_result, OSError]] = {}
+        # folder -> free bytes
+        self.__free_space: Dict[str, int] = {}
+
+    def list_folder(self, folder: str) -> Dict[str, os.DirEntry]:
+        """Get the entries of a folder
+
+        Parameters
+        ----------
+        folder : str
+            folder to list
+
+        Returns
+        -------
+        entries : Dict[str, os.DirEntry]
+            entries of the folder by filename
+
+        Raises
+        ------
+        OSError
+            If the folder cannot be listed, e.g. FileNotFoundError if
+            it does not exist or NotADirectoryError if it is a file.
+        """
+        folder = os.path.normpath(folder)
+
+        listing = self.__listings.get(folder)
+        if listing is None:
+            try:
+                with os.scandir(folder) as entries:
+                    listing = {entry.name: entry for entry in entries}
+            except OSError as err:
+                listing = err
+            self.__listings[folder] = listing
+
+        if isinstance(listing, OSError):
+            raise listing
+        return listing
+
+    def get_files(self, folder: str, pattern: Optional[str] = None) -> List[str]:
+        """Get the files in a folder matching a pattern
+
+        Parameters
+        ----------
+        folder : str
+            folder to search
+        pattern : Optional[str]
+            glob pattern of the filenames. Hidden files only match
+            patterns starting with a dot like with 'glob'. All files
+            are returned if not specified.
+
+        Returns
+        -------
+        filepaths : List[str]
+            paths of the matching regular files, empty if the
+            folder cannot be listed
+        """
+        try:
+            entries = self.list_folder(folder)
+        except OSError:
+            return []
+
+        if pattern is not None:
+            include_hidden = pattern.startswith(".")
+            entries = {
+                filename: entry
+                for filename, entry in entries.items()
+                if (include_hidden or not filename.startswith("."))
+                and fnmatch.fnmatch(filename, pattern)
+            }
+
+        return [
+            os.path.join(folder, filename) for filename, entry in entries.items() if _is_file(entry)
+        ]
+
+    def stat(self, path: str) -> os.stat_result:
+        """Get the stat of a path following symlinks
+
+        Parameters
+        ----------
+        path : str
+            path to check
+
+        Returns
+        -------
+        stat : os.stat_result
+            stat of the path
+
+        Raises
+        ------
+        OSError
+            If the path cannot be stat'ed.
+        """
+        path = os.path.normpath(path)
+
+        stat = self.__stats.get(path)
+        if stat is None:
+            listing = self.__get_parent_listing(path)
+            try:
+                if listing is None:
+                    stat = os.stat(path)
+                elif os.path.basename(path) in listing:
+                    stat = listing[os.path.basename(path)].stat()
+                else:
+                    raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), path)
+            except OSError as err:
+                stat = err
+            self.__stats[path] = stat
+
+        if isinstance(stat, OSError):
+            raise stat
+        return stat
+
+    def exists(self, path: str) -> bool:
+        """Checks if a path exists like 'os.path.exists'"""
+        try:
+            self.stat(path)
+        except (OSError, ValueError):
+            return False
+        return True
+
+    def is_file(self, path: str) -> bool:
+        """Checks if a path is a regular file like 'os.path.isfile'"""
+        listing = self.__get_parent_listing(path)
+        if listing is not None:
+            entry = listing.get(os.path.basename(os.path.normpath(path)))
+            return entry is not None and _is_file(entry)
+
+        try:
+            return stat_module.S_ISREG(self.stat(path).st_mode)
+        except (OSError, ValueError):
+            return False
+
+    def is_dir(self, path: str) -> bool:
+        """Checks if a path is a directory like 'os.path.isdir'"""
+        listing = self.__get_parent_listing(path)
+        if listing is not None:
+            entry = listing.get(os.path.basename(os.path.normpath(path)))
+            try:
+                return entry is not None and entry.is_dir()
+            except OSError:
+                return False
+
+        try:
+            return stat_module.S_ISDIR(self.stat(path).st_mode)
+        except (OSError, ValueError):
+            return False
+
+    def get_free_space(self, folder: str) -> int:
+        """Get the free space of the disk of a folder
+
+        Parameters
+        ----------
+        folder : str
+            folder on the disk
+
+        Returns
+        -------
+        free_space : int
+            free bytes on the disk
+
+        Raises
+        ------
+        OSError
+            If the disk cannot be reached. Errors are not cached.
+        """
+        folder = os.path.normpath(folder)
+
+        free_space = self.__free_space.get(folder)
+        if free_space is None:
+            free_space = psutil.disk_usage(folder).free
+            self.__free_space[folder] = free_space
+
+        return free_space
+
+    def __get_parent_listing(self, path: str) -> Optional[Dict[str, os.DirEntry]]:
+        """Get the entries of the folder of a path if it was listed already"""
+        listing = self.__listings.get(os.path.dirname(os.path.normpath(path)))
+        if listing is None or isinstance(listing, OSError):
+            return None
+        return listing
+
+
+def _is_file(entry: os.DirEntry) -> bool:
+    """Checks if an entry is a regular file following symlinks"""
+    try:
+        return entry.is_file()
+    except OSError:
+        return False
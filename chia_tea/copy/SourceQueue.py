@@ -0,0 +1,171 @@
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import psutil
+
+from ..utils.logger import get_logger
+
+# seconds for which the free space of a source disk is not checked again
+DISK_USAGE_TTL_SECONDS = 10
+
+
+@dataclass
+class SourceFile:
+    """A file waiting to be copied"""
+
+    filepath: str
+    device: int
+    size: int
+    mtime: float
+    priority: int
+
+
+class SourceQueue:
+    """Orders the files waiting to be copied by urgency
+
+    Files from source folders with a higher configured priority
+    come first. Among those, files from the source disk with the
+    least free space come first so that the disk closest to filling
+    up is drained before its plotter stalls. Running copies count
+    as free space of their source disk since it is released soon.
+    The oldest file of a disk is copied first.
+
+    Only new files are inspected when the files are updated and the
+    free space is checked once per disk, not per file.
+    """
+
+    def __init__(
+        self,
+        source_priorities: Optional[Dict[str, int]] = None,
+        disk_usage_ttl_seconds: float = DISK_USAGE_TTL_SECONDS,
+    ):
+        """Initialize a source queue
+
+        Parameters
+        ----------
+        source_priorities : Optional[Dict[str, int]]
+            priority per source folder, higher is copied first.
+            Folders not contained have priority 0.
+        disk_usage_ttl_seconds : float
+            time for which the free space of a disk is cached
+        """
+        self.source_priorities = {
+            os.path.normpath(folder): priority
+            for folder, priority in (source_priorities or {}).items()
+        }
+        self.disk_usage_ttl_seconds = disk_usage_ttl_seconds
+
+        # filepath -> file info
+        self.__files: Dict[str, SourceFile] = {}
+        # device -> (timestamp, free bytes)
+        self.__free_space: Dict[int, Tuple[float, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.__files)
+
+    def update(self, filepaths: Iterable[str]):
+        """Updates the files waiting to be copied
+
+        Parameters
+        ----------
+        filepaths : Iterable[str]
+            all files currently waiting in the source folders
+        """
+        filepaths = set(filepaths)
+
+        for filepath in set(self.__files) - filepaths:
+            source_file = self.__files.pop(filepath)
+            # the disk has more space now
+            self.__free_space.pop(source_file.device, None)
+
+        for filepath in filepaths - set(self.__files):
+            try:
+                stat = os.stat(filepath)
+            except OSError:
+                # gone already, e.g. moved by another process
+                continue
+
+            self.__files[filepath] = SourceFile(
+                filepath=filepath,
+                device=stat.st_dev,
+                size=stat.st_size,
+                mtime=stat.st_mtime,
+                priority=self.source_priorities.get(os.path.dirname(os.path.normpath(filepath)), 0),
+            )
+
+    def get_ordered_files(self, copying: Iterable[str] = ()) -> List[str]:
+        """Get the waiting files from most to least urgent
+
+        Parameters
+        ----------
+        copying : Iterable[str]
+            files being copied already. They are not returned but
+            their size counts as free space of their disk.
+
+        Returns
+        -------
+        filepaths : List[str]
+            files ordered by priority, free space of their disk and age
+        """
+        copying = set(copying)
+
+        free_space = {}
+        for source_file in self.__files.values():
+            if source_file.device not in free_space:
+                free_space[source_file.device] = self.__get_free_space(source_file)
+
+        for filepath in copying:
+            source_file = self.__files.get(filepath)
+            if source_file is not None:
+                free_space[source_file.device] += source_file.size
+
+        waiting_files = [
+            source_file for filepath, source_file in self.__files.items() if filepath not in copying
+        ]
+        waiting_files.sort(
+            key=lambda source_file: (
+                -source_file.priority,
+                free_space[source_file.device],
+                source_file.mtime,
+                source_file.filepath,
+            )
+        )
+
+        return [source_file.filepath for source_file in waiting_files]
+
+    def get_next(self, copying: Iterable[str] = ()) -> Optional[str]:
+        """Get the most urgent file to copy next
+
+        Parameters
+        ----------
+        copying : Iterable[str]
+            files being copied already
+
+        Returns
+        -------
+        filepath : Optional[str]
+            most urgent file or None if no file is waiting
+        """
+        ordered_files = self.get_ordered_files(copying)
+        return ordered_files[0] if ordered_files else None
+
+    def __get_free_space(self, source_file: SourceFile) -> int:
+        """Get the free space of the disk of a file"""
+        now = time.monotonic()
+
+        cached = self.__free_space.get(source_file.device)
+        if cached is not None and now - cached[0] <= self.disk_usage_ttl_seconds:
+            return cached[1]
+
+        try:
+            free = psutil.disk_usage(os.path.dirname(source_file.filepath)).free
+        except OSError as err:
+            get_logger(__file__).warning(
+                "Cannot check free space of '%s': %s", source_file.filepath, err
+            )
+            free = 0
+
+        self.__free_space[source_file.device] = (now, free)
+        return free
@@ -0,0 +1,229 @@
+import fnmatch
+import os
+import threading
+import time
+from typing import Callable, Iterable, Optional, Set
+
+from ..general.inotify import (
+    IN_CLOSE_WRITE,
+    IN_DELETE,
+    IN_DELETE_SELF,
+    IN_IGNORED,
+    IN_ISDIR,
+    IN_MOVE_SELF,
+    IN_MOVED_FROM,
+    IN_MOVED_TO,
+    IN_ONLYDIR,
+    IN_Q_OVERFLOW,
+    IN_UNMOUNT,
+    Inotify,
+    InotifyEvent,
+    is_inotify_available,
+)
+from ..utils.logger import get_logger
+from .Disk import collect_files_from_folders, filter_valid_folders
+
+# events of the source folders being watched
+WATCH_MASK = (
+    IN_CLOSE_WRITE
+    | IN_MOVED_TO
+    | IN_DELETE
+    | IN_MOVED_FROM
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+    | IN_ONLYDIR
+)
+# files are complete once closed after writing or renamed into the folder
+FILE_ADDED_EVENTS = IN_CLOSE_WRITE | IN_MOVED_TO
+FILE_REMOVED_EVENTS = IN_DELETE | IN_MOVED_FROM
+FOLDER_REMOVED_EVENTS = IN_DELETE_SELF | IN_MOVE_SELF | IN_UNMOUNT | IN_IGNORED
+# the folders are scanned fully in this interval in case events got lost
+# and to pick up folders which didn't exist before
+RESCAN_INTERVAL_SECONDS = 300
+# maximum time the watcher thread waits for events before checking for stop
+EVENT_TIMEOUT_SECONDS = 1.0
+
+
+class SourceWatcher:
+    """Keeps track of the files to copy in the source folders
+
+    On linux the folders are watched with inotify in a background
+    thread. New files are reported as soon as they are written
+    completely or renamed into a folder. Without inotify the
+    folders are scanned whenever the files are requested.
+    """
+
+    def __init__(
+        self,
+        folders: Iterable[str],
+        pattern: str = "*.plot",
+        on_new_files: Optional[Callable[[], None]] = None,
+    ):
+        """Initialize a source watcher
+
+        Parameters
+        ----------
+        folders : Iterable[str]
+            folders to watch for files
+        pattern : str
+            pattern of the files to copy
+        on_new_files : Optional[Callable[[], None]]
+            called from the watcher thread when new files arrived
+        """
+        self.folders = set(folders)
+        self.pattern = pattern
+        self.on_new_files = on_new_files
+
+        self.__lock = threading.Lock()
+        self.__files: Set[str] = set()
+        self.__last_scan = 0.0
+        self.__rescan_needed = False
+        self.__inotify: Optional[Inotify] = None
+        self.__thread: Optional[threading.Thread] = None
+        self.__stop_event = threading.Event()
+
+    @property
+    def is_event_driven(self) -> bool:
+        """Whether the folders are watched with inotify"""
+        return self.__inotify is not None
+
+    def start(self):
+        """Starts watching the folders
+
+        Notes
+        -----
+            Falls back to scanning the folders if inotify is not
+            available or fails e.g. due to reaching its limits.
+        """
+        logger = get_logger(__file__)
+
+        if is_inotify_available():
+            try:
+                self.__inotify = Inotify()
+            except OSError as err:
+                logger.warning("Cannot use inotify, scanning folders instead: %s", err)
+
+        if self.__inotify is None:
+            logger.info("Scanning source folders regularly for new files")
+            return
+
+        logger.info("Watching source folders for new files")
+
+        # watches are set up before the scan so no file is missed
+        self.__rescan()
+        self.__thread = threading.Thread(
+            target=self.__run,
+            name="source-watcher",
+            daemon=True,
+        )
+        self.__thread.start()
+
+    def stop(self):
+        """Stops watching the folders"""
+        self.__stop_event.set()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+        if self.__inotify is not None:
+            self.__inotify.close()
+            self.__inotify = None
+
+    def get_files(self) -> Set[str]:
+        """Get the files in the source folders
+
+        Returns
+        -------
+        filepaths : Set[str]
+            paths to the files matching the pattern
+        """
+        if self.__inotify is None:
+            return collect_files_from_folders(self.folders, self.pattern)
+
+        with self.__lock:
+            return set(self.__files)
+
+    def __run(self):
+        """Processes inotify events until stopped"""
+        logger = get_logger(__file__)
+
+        while not self.__stop_event.is_set():
+            try:
+                has_new_files = False
+                for event in self.__inotify.read_events(timeout=EVENT_TIMEOUT_SECONDS):
+                    has_new_files |= self.__handle_event(event)
+
+                rescan_due = time.monotonic() - self.__last_scan > RESCAN_INTERVAL_SECONDS
+                if self.__rescan_needed or rescan_due:
+                    has_new_files |= self.__rescan()
+
+                if has_new_files and self.on_new_files is not None:
+                    self.on_new_files()
+
+            except Exception as err:
+                logger.error("Error while watching source folders: %s", err)
+                self.__stop_event.wait(EVENT_TIMEOUT_SECONDS)
+
+    def __handle_event(self, event: InotifyEvent) -> bool:
+        """Updates the files from an event and returns if a file was added"""
+        if event.mask & IN_Q_OVERFLOW:
+            get_logger(__file__).warning("Lost inotify events, scanning source folders")
+            self.__rescan_needed = True
+            return False
+
+        if not event.path:
+            # watch was removed already
+            return False
+
+        if event.mask & FOLDER_REMOVED_EVENTS and not event.name:
+            # the kernel reports IN_IGNORED after the actual reason
+            if not event.mask & IN_IGNORED:
+                get_logger(__file__).warning("Source folder '%s' disappeared", event.path)
+            self.__inotify.remove_watch(event.watch_descriptor)
+            folder_prefix = os.path.join(event.path, "")
+            with self.__lock:
+                self.__files = {
+                    filepath for filepath in self.__files if not filepath.startswith(folder_prefix)
+                }
+            return False
+
+        if event.mask & IN_ISDIR or not self.__is_match(event.name):
+            return False
+
+        with self.__lock:
+            if event.mask & FILE_ADDED_EVENTS:
+                is_new = event.filepath not in self.__files
+                self.__files.add(event.filepath)
+                return is_new
+
+            if event.mask & FILE_REMOVED_EVENTS:
+                self.__files.discard(event.filepath)
+
+        return False
+
+    def __is_match(self, filename: str) -> bool:
+        # glob ignores hidden files too
+        return not filename.startswith(".") and fnmatch.fnmatch(filename, self.pattern)
+
+    def __rescan(self) -> bool:
+        """Scans all folders and returns if new files were found"""
+        self.__rescan_needed = False
+        self.__last_scan = time.monotonic()
+
+        self.__update_watches()
+        filepaths = collect_files_from_folders(self.folders, self.pattern)
+
+        with self.__lock:
+            has_new_files = bool(filepaths - self.__files)
+            self.__files = filepaths
+
+        return has_new_files
+
+    def __update_watches(self):
+        """Watches folders which are not watched yet"""
+        watched_folders = set(self.__inotify.watches.values())
+
+        for folder in filter_valid_folders(self.folders - watched_folders):
+            try:
+                self.__inotify.add_watch(folder, WATCH_MASK)
+            except OSError as err:
+                get_logger(__file__).warning("Cannot watch folder '%s': %s", folder, err)
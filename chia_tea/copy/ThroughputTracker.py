@@ -0,0 +1,374 @@
+import statistics
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from ..utils.logger import get_logger
+from .copy_engines import PHASE_COPYING
+
+# time after which a measurement has only half of its weight left
+HALF_LIFE_SECONDS = 300
+# targets are only compared once measured for this long
+MIN_MEASURED_SECONDS = 120
+# copies without progress for this long are considered stalled
+STALL_TIMEOUT_SECONDS = 300
+# targets slower than this fraction of the median target are degraded
+SLOW_THROUGHPUT_RATIO = 0.2
+# failed copies in a row after which a target is degraded
+MAX_CONSECUTIVE_FAILURES = 3
+# time for which degraded targets don't receive new copies
+DEMOTION_SECONDS = 1800
+
+
+@dataclass
+class ThroughputStats:
+    """Exponentially weighted average of the throughput of a disk"""
+
+    bytes_per_sec: float = 0.0
+    # time the disk was measured in total
+    measured_seconds: float = 0.0
+
+    def update(self, bytes_per_sec: float, duration_seconds: float, half_life_seconds: float):
+        """Adds a measurement
+
+        Parameters
+        ----------
+        bytes_per_sec : float
+            throughput during the measurement
+        duration_seconds : float
+            duration of the measurement
+        half_life_seconds : float
+            time after which a measurement has half of its weight
+        """
+        if self.measured_seconds <= 0:
+            self.bytes_per_sec = bytes_per_sec
+        else:
+            weight = 1 - 0.5 ** (duration_seconds / half_life_seconds)
+            self.bytes_per_sec += weight * (bytes_per_sec - self.bytes_per_sec)
+        self.measured_seconds += duration_seconds
+
+
+@dataclass
+class CopyProgress:
+    """Progress of a running copy"""
+
+    target_dir: str
+    source_device: int
+    # bytes on the target disk at the last sample
+    n_bytes: int
+    # time at which bytes were written the last time
+    last_progress_time: float
+    throughput: ThroughputStats = field(default_factory=ThroughputStats)
+    # the target only grows while copying
+    phase: str = PHASE_COPYING
+
+
+class ThroughputTracker:
+    """Measures the throughput of the target folders and source disks
+
+    The bytes written by the running copies are sampled regularly and
+    averaged over time per target folder and per source device. Target
+    folders which fail, stall or are far slower than the others are
+    demoted for a while so that no new copies are placed on them.
+    Copies which read the files to verify them don't write anything,
+    thus they are neither measured nor considered stalled meanwhile.
+    """
+
+    def __init__(
+        self,
+        half_life_seconds: float = HALF_LIFE_SECONDS,
+        stall_timeout_seconds: float = STALL_TIMEOUT_SECONDS,
+        slow_throughput_ratio: float = SLOW_THROUGHPUT_RATIO,
+        max_consecutive_failures: int = MAX_CONSECUTIVE_FAILURES,
+        demotion_seconds: float = DEMOTION_SECONDS,
+    ):
+        """Initialize a throughput tracker
+
+        Parameters
+        ----------
+        half_life_seconds : float
+            time after which a measurement has half of its weight
+        stall_timeout_seconds : float
+            time without progress after which a copy is stalled
+        slow_throughput_ratio : float
+            targets slower than this fraction of the median
+            target are degraded
+        max_consecutive_failures : int
+            failed copies in a row after which a target is degraded
+        demotion_seconds : float
+            time for which degraded targets are avoided
+        """
+        self.half_life_seconds = half_life_seconds
+        self.stall_timeout_seconds = stall_timeout_seconds
+        self.slow_throughput_ratio = slow_throughput_ratio
+        self.max_consecutive_failures = max_consecutive_failures
+        self.demotion_seconds = demotion_seconds
+
+        self.__lock = threading.Lock()
+        self.__last_sample_time: Optional[float] = None
+        # target filepath -> progress
+        self.__copies: Dict[str, CopyProgress] = {}
+        # target folder -> throughput
+        self.__target_stats: Dict[str, ThroughputStats] = {}
+        # source device -> throughput
+        self.__source_stats: Dict[int, ThroughputStats] = {}
+        # target folder -> failed copies in a row
+        self.__failures: Dict[str, int] = {}
+        # target folder -> time until which it is avoided
+        self.__demoted_until: Dict[str, float] = {}
+
+    @property
+    def target_throughputs(self) -> Dict[str, float]:
+        """Average bytes per second written into each target folder"""
+        with self.__lock:
+            return {folder: stats.bytes_per_sec for folder, stats in self.__target_stats.items()}
+
+    @property
+    def source_throughputs(self) -> Dict[int, float]:
+        """Average bytes per second read from each source device"""
+        with self.__lock:
+            return {device: stats.bytes_per_sec for device, stats in self.__source_stats.items()}
+
+    def start_copy(
+        self, target_filepath: str, target_dir: str, source_device: int, n_bytes_copied: int = 0
+    ):
+        """Starts tracking a copy
+
+        Parameters
+        ----------
+        target_filepath : str
+            path the file is copied to
+        target_dir : str
+            target folder of the copy
+        source_device : int
+            device of the source file
+        n_bytes_copied : int
+            bytes on the target disk already e.g. when resuming
+        """
+        with self.__lock:
+            self.__copies[target_filepath] = CopyProgress(
+                target_dir=target_dir,
+                source_device=source_device,
+                n_bytes=n_bytes_copied,
+                last_progress_time=time.monotonic(),
+            )
+
+    def set_copy_phase(self, target_filepath: str, phase: str):
+        """Reports that a copy entered another phase
+
+        Parameters
+        ----------
+        target_filepath : str
+            path the file is copied to
+        phase : str
+            PHASE_COPYING or PHASE_VERIFYING
+
+        Notes
+        -----
+            Called from the thread running the copy.
+        """
+        with self.__lock:
+            progress = self.__copies.get(target_filepath)
+            if progress is None:
+                return
+
+            progress.phase = phase
+            # the time spent verifying does not count as stalling
+            progress.last_progress_time = time.monotonic()
+
+    def update_progress(self, n_bytes_copied: Dict[str, int]):
+        """Samples the progress of the running copies
+
+        Parameters
+        ----------
+        n_bytes_copied : Dict[str, int]
+            bytes on the target disk per target filepath
+
+        Notes
+        -----
+            The throughput of a folder or device is the sum over all
+            copies running on it since the previous sample. Folders
+            and devices without running copies are not updated, copies
+            being verified are not counted.
+        """
+        now = time.monotonic()
+
+        with self.__lock:
+            duration = now - self.__last_sample_time if self.__last_sample_time is not None else 0.0
+            self.__last_sample_time = now
+
+            target_bytes: Dict[str, int] = {}
+            source_bytes: Dict[int, int] = {}
+            for target_filepath, n_bytes in n_bytes_copied.items():
+                progress = self.__copies.get(target_filepath)
+                if progress is None or progress.phase != PHASE_COPYING:
+                    continue
+
+                delta = max(0, n_bytes - progress.n_bytes)
+                if delta:
+                    progress.n_bytes = n_bytes
+                    progress.last_progress_time = now
+                if duration > 0:
+                    progress.throughput.update(delta / duration, duration, self.half_life_seconds)
+
+                target_bytes[progress.target_dir] = target_bytes.get(progress.target_dir, 0) + delta
+                source_bytes[progress.source_device] = (
+                    source_bytes.get(progress.source_device, 0) + delta
+                )
+
+            if duration <= 0:
+                return
+
+            for folder, n_bytes in target_bytes.items():
+                self.__target_stats.setdefault(folder, ThroughputStats()).update(
+                    n_bytes / duration, duration, self.half_life_seconds
+                )
+            for device, n_bytes in source_bytes.items():
+                self.__source_stats.setdefault(device, ThroughputStats()).update(
+                    n_bytes / duration, duration, self.half_life_seconds
+                )
+
+    def finish_copy(self, target_filepath: str, success: bool):
+        """Stops tracking a copy
+
+        Parameters
+        ----------
+        target_filepath : str
+            path the file was copied to
+        success : bool
+            whether the copy succeeded
+        """
+        with self.__lock:
+            progress = self.__copies.pop(target_filepath, None)
+            if progress is None:
+                return
+
+            if success:
+                self.__failures.pop(progress.target_dir, None)
+            else:
+                self.__failures[progress.target_dir] = (
+                    self.__failures.get(progress.target_dir, 0) + 1
+                )
+
+    def get_copy_progress(self) -> Dict[str, Tuple[int, float]]:
+        """Get the progress of the running copies
+
+        Returns
+        -------
+        copy_progress : Dict[str, Tuple[int, float]]
+            bytes on the target disk and average bytes per second
+            per target filepath as of the last sample
+        """
+        with self.__lock:
+            return {
+                target_filepath: (progress.n_bytes, progress.throughput.bytes_per_sec)
+                for target_filepath, progress in self.__copies.items()
+            }
+
+    def get_stalled_copies(self) -> Set[str]:
+        """Get the copies which made no progress for a long time
+
+        Returns
+        -------
+        target_filepaths : Set[str]
+            target paths of the stalled copies
+        """
+        now = time.monotonic()
+        with self.__lock:
+            return {
+                target_filepath
+                for target_filepath, progress in self.__copies.items()
+                if self.__is_stalled(progress, now)
+            }
+
+    def __is_stalled(self, progress: CopyProgress, now: float) -> bool:
+        """Checks if a copy wrote nothing for too long although it should"""
+        return (
+            progress.phase == PHASE_COPYING
+            and now - progress.last_progress_time > self.stall_timeout_seconds
+        )
+
+    def get_demoted_targets(self) -> Set[str]:
+        """Get the target folders which should not receive new copies
+
+        Returns
+        -------
+        target_dirs : Set[str]
+            folders which failed, stalled or were far slower than the
+            others recently
+
+        Notes
+        -----
+            Demoted folders are measured anew once the demotion ended
+            so that a recovered disk is used again.
+        """
+        now = time.monotonic()
+
+        with self.__lock:
+            for folder, reason in self.__get_degradations(now).items():
+                if self.__demoted_until.get(folder, 0) > now:
+                    continue
+
+                get_logger(__file__).warning(
+                    "Avoiding target '%s' for %ds since %s",
+                    folder,
+                    self.demotion_seconds,
+                    reason,
+                )
+                self.__demoted_until[folder] = now + self.demotion_seconds
+                self.__failures.pop(folder, None)
+                self.__target_stats.pop(folder, None)
+
+            return {folder for folder, until in self.__demoted_until.items() if until > now}
+
+    def __get_degradations(self, now: float) -> Dict[str, str]:
+        """Finds degraded target folders and the reason why"""
+        degradations: Dict[str, str] = {}
+
+        for folder, n_failures in self.__failures.items():
+            if n_failures >= self.max_consecutive_failures:
+                degradations[folder] = f"{n_failures} copies failed in a row"
+
+        measured = {
+            folder: stats.bytes_per_sec
+            for folder, stats in self.__target_stats.items()
+            if stats.measured_seconds >= MIN_MEASURED_SECONDS
+        }
+        for folder, bytes_per_sec in measured.items():
+            others = [value for other, value in measured.items() if other != folder]
+            if others and bytes_per_sec < self.slow_throughput_ratio * statistics.median(others):
+                degradations[folder] = "it is much slower than the other targets (%.1f MB/s)" % (
+                    bytes_per_sec / 1e6
+                )
+
+        for progress in self.__copies.values():
+            if self.__is_stalled(progress, now):
+                degradations[progress.target_dir] = "a copy into it stalled"
+
+        return degradations
+
+    def get_stats_lines(self) -> List[str]:
+        """Get a human readable summary of the throughputs
+
+        Returns
+        -------
+        lines : List[str]
+            one line per target folder and source device
+        """
+        now = time.monotonic()
+        with self.__lock:
+            lines = [
+                "target %s: %.1f MB/s%s"
+                % (
+                    folder,
+                    stats.bytes_per_sec / 1e6,
+                    " (demoted)" if self.__demoted_until.get(folder, 0) > now else "",
+                )
+                for folder, stats in sorted(self.__target_stats.items())
+            ]
+            lines += [
+                "source device %d: %.1f MB/s" % (device, stats.bytes_per_sec / 1e6)
+                for device, stats in sorted(self.__source_stats.items())
+            ]
+        return lines
@@ -0,0 +1,182 @@
+import asyncio
+import json
+import os
+import socket
+import stat
+import tempfile
+from typing import Any, Awaitable, Callable, Dict
+
+from ..utils.logger import get_logger
+
+# maximum size of a request or response line
+MAX_LINE_BYTES = 1024 * 1024
+
+COMMAND_LIST_JOBS = "list_jobs"
+COMMAND_PAUSE_TARGET = "pause_target"
+COMMAND_RESUME_TARGET = "resume_target"
+COMMAND_DRAIN = "drain"
+COMMAND_SET_CONCURRENCY = "set_concurrency"
+
+CommandHandler = Callable[[str, Dict[str, Any]], Awaitable[Any]]
+
+
+async def start_control_server(
+    handler: CommandHandler, socket_filepath: str
+) -> asyncio.AbstractServer:
+    """Starts the local control API of a copy process
+
+    Parameters
+    ----------
+    handler : CommandHandler
+        coroutine function called with the command and its
+        arguments returning a json serializable result. Raised
+        exceptions are sent back as error.
+    socket_filepath : str
+        path of the unix socket to listen on
+
+    Returns
+    -------
+    server : asyncio.AbstractServer
+        server accepting connections on the running event loop
+
+    Raises
+    ------
+    OSError
+        If another copy process listens on the socket already or
+        the socket cannot be created.
+
+    Notes
+    -----
+        The socket can only be used by the user running the copy
+        process, since the API is not authenticated. It is created
+        in a private directory and moved into place with its final
+        permissions, thus never accessible to others.
+
+        Every request and response is a single line of json. A
+        request looks like '{"command": "...", "args": {...}}' and
+        is answered with '{"ok": true, "result": ...}' or
+        '{"ok": false, "error": "..."}'.
+    """
+
+    async def _handle_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                response = await _handle_request(handler, line)
+                writer.write(json.dumps(response).encode("utf8") + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            # ValueError is raised for lines longer than the limit
+            pass
+        finally:
+            writer.close()
+
+    socket_filepath = os.path.expanduser(socket_filepath)
+    folder = os.path.dirname(os.path.abspath(socket_filepath))
+    os.makedirs(folder, mode=0o700, exist_ok=True)
+    _remove_stale_socket(socket_filepath)
+
+    private_folder = tempfile.mkdtemp(dir=folder)
+    try:
+        tmp_filepath = os.path.join(private_folder, "control.sock")
+        server = await asyncio.start_unix_server(
+            _handle_connection, path=tmp_filepath, limit=MAX_LINE_BYTES
+        )
+        try:
+            os.chmod(tmp_filepath, 0o600)
+            os.replace(tmp_filepath, socket_filepath)
+        except OSError:
+            server.close()
+            raise
+    finally:
+        if os.path.exists(tmp_filepath):
+            os.unlink(tmp_filepath)
+        os.rmdir(private_folder)
+
+    return server
+
+
+def _remove_stale_socket(socket_filepath: str):
+    """Removes the socket of a copy process which is not running anymore"""
+    try:
+        mode = os.stat(socket_filepath).st_mode
+    except FileNotFoundError:
+        return
+
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"'{socket_filepath}' exists and is not a socket")
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        try:
+            connection.connect(socket_filepath)
+        except ConnectionRefusedError:
+            os.unlink(socket_filepath)
+            return
+    raise OSError(f"Another copy process listens on '{socket_filepath}'")
+
+
+async def _handle_request(handler: CommandHandler, line: bytes) -> Dict[str, Any]:
+    """Runs the command of a request line and builds the response"""
+    try:
+        request = json.loads(line)
+        command = request["command"]
+        args = request.get("args", {})
+        if not isinstance(command, str) or not isinstance(args, dict):
+            raise ValueError("Invalid request")
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return {"ok": False, "error": "Invalid request"}
+
+    try:
+        return {"ok": True, "result": await handler(command, args)}
+    except Exception as err:
+        get_logger(__file__).warning("Control command '%s' failed: %s", command, err)
+        return {"ok": False, "error": str(err)}
+
+
+def send_control_command(socket_filepath: str, command: str, timeout: float = 10.0, **args) -> Any:
+    """Sends a command to the control API of a running copy process
+
+    Parameters
+    ----------
+    socket_filepath : str
+        path of the unix socket of the control API
+    command : str
+        command to run
+    timeout : float
+        maximum time to wait for the answer in seconds
+    **args
+        arguments of the command
+
+    Returns
+    -------
+    result : Any
+        result of the command
+
+    Raises
+    ------
+    ConnectionError
+        If no copy process is listening on the socket.
+    RuntimeError
+        If the command failed.
+    """
+    request = json.dumps({"command": command, "args": args}).encode("utf8") + b"\n"
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.settimeout(timeout)
+        try:
+            connection.connect(os.path.expanduser(socket_filepath))
+        except FileNotFoundError as err:
+            raise ConnectionError(f"No socket at '{socket_filepath}'") from err
+        connection.sendall(request)
+        with connection.makefile("rb") as fp:
+            line = fp.readline(MAX_LINE_BYTES)
+
+    if not line:
+        raise ConnectionError("The copy process closed the connection")
+
+    response = json.loads(line)
+    if not response["ok"]:
+        raise RuntimeError(response["error"])
+    return response["result"]
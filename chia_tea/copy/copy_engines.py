@@ -0,0 +1,852 @@
+import errno
+import json
+import mmap
+import os
+import sys
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    # not available on windows
+    fcntl = None  # pylint: disable=invalid-name
+
+from ..utils.logger import get_logger
+from .throttling import BandwidthLimiter
+from .verification import (
+    VERIFY_FULL,
+    VERIFY_NONE,
+    VERIFY_SAMPLED,
+    create_hasher,
+    drop_page_cache,
+    hash_file_range,
+    verify_full,
+    verify_sampled,
+)
+
+# bytes handed to the kernel (or copied through the buffer) at once
+CHUNK_SIZE = 64 * 1024 * 1024
+# bytes copied at once if the copy is throttled
+THROTTLED_CHUNK_SIZE = 4 * 1024 * 1024
+# size of the reusable buffer for copies in userspace
+BUFFER_SIZE = 8 * 1024 * 1024
+# offsets and sizes of reads and writes with O_DIRECT must be multiples
+# of the logical block size, 4096 covers all common disks
+DIRECT_IO_ALIGNMENT = 4096
+
+# incomplete copies are written to '<target>.partial' and
+# '<target>.partial.checkpoint' records the bytes flushed to disk
+PARTIAL_SUFFIX = ".partial"
+CHECKPOINT_SUFFIX = ".checkpoint"
+CHECKPOINT_KEYS = {"source", "size", "mtime_ns", "committed"}
+# bytes copied between two checkpoints
+CHECKPOINT_INTERVAL = 1024 * 1024 * 1024
+# bytes compared before resuming an incomplete copy
+VERIFY_SIZE = 1024 * 1024
+
+# phases of a copy, the target only grows while copying. While verifying
+# the copy reads the files e.g. to hash them but writes nothing.
+PHASE_COPYING = "copying"
+PHASE_VERIFYING = "verifying"
+
+# errors indicating that an engine does not work for a pair of filesystems
+UNSUPPORTED_ERRNOS = {
+    errno.EXDEV,
+    errno.ENOSYS,
+    errno.EINVAL,
+    errno.EOPNOTSUPP,
+    errno.ENOTSUP,
+    errno.EBADF,
+}
+
+
+class AbstractCopyEngine(ABC):
+    """Engine copying byte ranges from one file into another"""
+
+    name: str = ""
+
+    def is_available(self) -> bool:
+        """Checks if the engine can be used on this system
+
+        Returns
+        -------
+        is_available : bool
+            whether the engine is supported by the os and python
+        """
+        return True
+
+    @abstractmethod
+    def copy_chunk(self, source: BinaryIO, target: BinaryIO, offset: int, count: int) -> int:
+        """Copies a chunk from the source to the same offset in the target
+
+        Parameters
+        ----------
+        source : BinaryIO
+            unbuffered file to read from
+        target : BinaryIO
+            unbuffered file to write to
+        offset : int
+            position in bytes to start the copy from
+        count : int
+            maximum number of bytes to copy
+
+        Returns
+        -------
+        n_bytes : int
+            number of bytes copied, zero if the source has no more data
+
+        Raises
+        ------
+        OSError
+            If the engine fails. An errno in UNSUPPORTED_ERRNOS
+            indicates that the engine does not support the files.
+        """
+        raise NotImplementedError()
+
+
+class CopyFileRangeEngine(AbstractCopyEngine):
+    """Copies within the kernel with 'copy_file_range'
+
+    Filesystems may even copy without moving any data
+    such as reflinks or server-side copies on NFS.
+    """
+
+    name = "copy_file_range"
+
+    def is_available(self) -> bool:
+        return hasattr(os, "copy_file_range")
+
+    def copy_chunk(self, source: BinaryIO, target: BinaryIO, offset: int, count: int) -> int:
+        # pylint: disable=no-member
+        return os.copy_file_range(source.fileno(), target.fileno(), count, offset, offset)
+
+
+class SendfileEngine(AbstractCopyEngine):
+    """Copies within the kernel with 'sendfile'"""
+
+    name = "sendfile"
+
+    def is_available(self) -> bool:
+        # other systems only support sockets as target
+        return hasattr(os, "sendfile") and sys.platform.startswith("linux")
+
+    def copy_chunk(self, source: BinaryIO, target: BinaryIO, offset: int, count: int) -> int:
+        # sendfile writes at the current position of the target
+        target.seek(offset)
+        return os.sendfile(target.fileno(), source.fileno(), offset, count)
+
+
+class BufferedEngine(AbstractCopyEngine):
+    """Copies through a large reusable buffer in userspace
+
+    This works everywhere and is the last resort.
+    """
+
+    name = "buffered"
+
+    def __init__(self, buffer_size: int = BUFFER_SIZE):
+        """Initialize the engine
+
+        Parameters
+        ----------
+        buffer_size : int
+            size of the buffer in bytes
+        """
+        self.buffer_size = buffer_size
+        # copies run in parallel threads, each needs its own buffer
+        self.__thread_data = threading.local()
+
+    def _get_buffer(self) -> memoryview:
+        """Get the reusable buffer of the current thread"""
+        buffer = getattr(self.__thread_data, "buffer", None)
+        if buffer is None:
+            buffer = memoryview(bytearray(self.buffer_size))
+            self.__thread_data.buffer = buffer
+        return buffer
+
+    def copy_chunk(self, source: BinaryIO, target: BinaryIO, offset: int, count: int) -> int:
+        buffer = self._get_buffer()
+
+        source.seek(offset)
+        target.seek(offset)
+
+        n_bytes_total = 0
+        while n_bytes_total < count:
+            chunk = buffer[: min(self.buffer_size, count - n_bytes_total)]
+            n_bytes_read = source.readinto(chunk)
+            if not n_bytes_read:
+                break
+            self._on_read(chunk[:n_bytes_read])
+
+            n_bytes_written = 0
+            while n_bytes_written < n_bytes_read:
+                n_bytes_written += target.write(chunk[n_bytes_written:n_bytes_read])
+
+            n_bytes_total += n_bytes_read
+
+        return n_bytes_total
+
+    def _on_read(self, data: memoryview):
+        """Called with every block read from the source in order"""
+
+
+class HashingEngine(BufferedEngine):
+    """Copies through a buffer and hashes the data on the way
+
+    The source thus is read only once for copying and verifying.
+    Every copy needs its own engine since the hash is stateful.
+    """
+
+    name = "hashing"
+
+    def __init__(self, hasher: Any, buffer_size: int = BUFFER_SIZE):
+        """Initialize the engine
+
+        Parameters
+        ----------
+        hasher : Any
+            hashlib object updated with the copied data
+        buffer_size : int
+            size of the buffer in bytes
+        """
+        super().__init__(buffer_size)
+        self.hasher = hasher
+
+    def _on_read(self, data: memoryview):
+        self.hasher.update(data)
+
+
+def _set_direct_io(fd: int, enabled: bool):
+    """Enables or disables O_DIRECT on an open file"""
+    if fcntl is None or not hasattr(os, "O_DIRECT"):
+        return
+
+    flags = fcntl.fcntl(fd, fcntl.F_GETFL)
+    # pylint: disable=no-member
+    new_flags = flags | os.O_DIRECT if enabled else flags & ~os.O_DIRECT
+    if new_flags != flags:
+        fcntl.fcntl(fd, fcntl.F_SETFL, new_flags)
+
+
+def _drop_cached_range(fp: BinaryIO, offset: int, count: int):
+    """Evicts a byte range of a file from the page cache if possible"""
+    if hasattr(os, "posix_fadvise") and count > 0:
+        # pylint: disable=no-member
+        os.posix_fadvise(fp.fileno(), offset, count, os.POSIX_FADV_DONTNEED)
+
+
+def _pwrite_all(fd: int, data: memoryview, offset: int):
+    """Writes all of the data at an offset"""
+    n_bytes_written = 0
+    while n_bytes_written < len(data):
+        n_bytes_written += os.pwrite(fd, data[n_bytes_written:], offset + n_bytes_written)
+
+
+class DirectIOEngine(AbstractCopyEngine):
+    """Copies with O_DIRECT bypassing the page cache
+
+    Plots are read and written only once, caching them just evicts
+    the pages of other processes such as the harvester. O_DIRECT
+    needs aligned buffers, offsets and sizes, thus every thread
+    reuses a page aligned buffer and an unaligned start or end of
+    a file is copied without O_DIRECT.
+    """
+
+    name = "direct"
+
+    def __init__(self, buffer_size: int = BUFFER_SIZE):
+        """Initialize the engine
+
+        Parameters
+        ----------
+        buffer_size : int
+            size of the buffer in bytes, a multiple of DIRECT_IO_ALIGNMENT
+        """
+        if buffer_size <= 0 or buffer_size % DIRECT_IO_ALIGNMENT:
+            raise ValueError(
+                f"Buffer size {buffer_size} is not a multiple of {DIRECT_IO_ALIGNMENT}"
+            )
+        self.buffer_size = buffer_size
+        # copies run in parallel threads, each needs its own buffer
+        self.__thread_data = threading.local()
+
+    def is_available(self) -> bool:
+        return (
+            fcntl is not None
+            and hasattr(os, "O_DIRECT")
+            and hasattr(os, "preadv")
+            and sys.platform.startswith("linux")
+        )
+
+    def _get_buffer(self) -> memoryview:
+        """Get the page aligned buffer of the current thread"""
+        buffer = getattr(self.__thread_data, "buffer", None)
+        if buffer is None:
+            # anonymous mappings are page aligned unlike bytearrays
+            buffer = memoryview(mmap.mmap(-1, self.buffer_size))
+            self.__thread_data.buffer = buffer
+        return buffer
+
+    def copy_chunk(self, source: BinaryIO, target: BinaryIO, offset: int, count: int) -> int:
+        source_fd, target_fd = source.fileno(), target.fileno()
+
+        # another engine may have stopped at an unaligned offset
+        n_bytes_unaligned = -offset % DIRECT_IO_ALIGNMENT
+        use_direct_io = n_bytes_unaligned == 0
+        count = min(count, self.buffer_size if use_direct_io else n_bytes_unaligned)
+
+        try:
+            _set_direct_io(source_fd, use_direct_io)
+            _set_direct_io(target_fd, use_direct_io)
+
+            buffer = self._get_buffer()
+            n_bytes_to_read = -(-count // DIRECT_IO_ALIGNMENT) * DIRECT_IO_ALIGNMENT
+            # pylint: disable=no-member
+            n_bytes = min(count, os.preadv(source_fd, [buffer[:n_bytes_to_read]], offset))
+
+            n_bytes_direct = n_bytes - n_bytes % DIRECT_IO_ALIGNMENT if use_direct_io else 0
+            _pwrite_all(target_fd, buffer[:n_bytes_direct], offset)
+            if n_bytes_direct < n_bytes:
+                # the end of the file is not aligned
+                _set_direct_io(target_fd, False)
+                _pwrite_all(target_fd, buffer[n_bytes_direct:n_bytes], offset + n_bytes_direct)
+        except OSError:
+            # other engines continue with regular file access
+            _set_direct_io(source_fd, False)
+            _set_direct_io(target_fd, False)
+            raise
+
+        return n_bytes
+
+
+class CacheDroppingEngine(AbstractCopyEngine):
+    """Wraps an engine and drops the copied data from the page cache
+
+    This is the fallback if direct I/O is requested but not supported.
+    Written pages can only be dropped once written back, thus the
+    target pages are dropped one chunk later.
+    """
+
+    def __init__(self, engine: AbstractCopyEngine):
+        """Initialize the engine
+
+        Parameters
+        ----------
+        engine : AbstractCopyEngine
+            engine doing the actual copy
+        """
+        self.engine = engine
+        self.name = engine.name
+
+    def is_available(self) -> bool:
+        return self.engine.is_available()
+
+    def copy_chunk(self, source: BinaryIO, target: BinaryIO, offset: int, count: int) -> int:
+        n_bytes = self.engine.copy_chunk(source, target, offset, count)
+
+        _drop_cached_range(source, offset, n_bytes)
+        previous_offset = max(0, offset - count)
+        _drop_cached_range(target, previous_offset, offset + n_bytes - previous_offset)
+
+        return n_bytes
+
+
+# engines in order of preference
+COPY_ENGINES: Tuple[AbstractCopyEngine, ...] = (
+    CopyFileRangeEngine(),
+    SendfileEngine(),
+    BufferedEngine(),
+)
+# only used if the page cache shall be bypassed
+DIRECT_IO_ENGINE = DirectIOEngine()
+
+__LOCK = threading.Lock()
+# (source device, target device) -> names of engines not working
+__UNSUPPORTED_ENGINES: Dict[Tuple[int, int], Set[str]] = {}
+
+
+def get_copy_engines(
+    source_device: int, target_device: int, direct_io: bool = False
+) -> List[AbstractCopyEngine]:
+    """Get the engines to try for copying between two devices
+
+    Parameters
+    ----------
+    source_device : int
+        device id of the source file (st_dev)
+    target_device : int
+        device id of the target file (st_dev)
+    direct_io : bool
+        whether to try the direct I/O engine first
+
+    Returns
+    -------
+    engines : List[AbstractCopyEngine]
+        available engines in order of preference
+    """
+    engines = (DIRECT_IO_ENGINE,) + COPY_ENGINES if direct_io else COPY_ENGINES
+
+    with __LOCK:
+        unsupported = __UNSUPPORTED_ENGINES.get((source_device, target_device), set())
+        return [
+            engine for engine in engines if engine.is_available() and engine.name not in unsupported
+        ]
+
+
+def mark_engine_unsupported(engine: AbstractCopyEngine, source_device: int, target_device: int):
+    """Remembers that an engine does not work for two devices
+
+    Parameters
+    ----------
+    engine : AbstractCopyEngine
+        engine which failed
+    source_device : int
+        device id of the source file (st_dev)
+    target_device : int
+        device id of the target file (st_dev)
+    """
+    with __LOCK:
+        __UNSUPPORTED_ENGINES.setdefault((source_device, target_device), set()).add(engine.name)
+
+
+def get_partial_filepath(target_path: str) -> str:
+    """Get the path a file is written to while being copied
+
+    Parameters
+    ----------
+    target_path : str
+        final path of the copied file
+
+    Returns
+    -------
+    partial_path : str
+        path of the incomplete file
+    """
+    return target_path + PARTIAL_SUFFIX
+
+
+def get_checkpoint_filepath(target_path: str) -> str:
+    """Get the path of the checkpoint file of an incomplete copy
+
+    Parameters
+    ----------
+    target_path : str
+        final path of the copied file
+
+    Returns
+    -------
+    checkpoint_path : str
+        path of the checkpoint file next to the incomplete file
+    """
+    return get_partial_filepath(target_path) + CHECKPOINT_SUFFIX
+
+
+def read_checkpoint(target_path: str) -> Optional[Dict[str, Any]]:
+    """Reads the checkpoint of an incomplete copy
+
+    Parameters
+    ----------
+    target_path : str
+        final path of the copied file
+
+    Returns
+    -------
+    checkpoint : Optional[Dict[str, Any]]
+        checkpoint data or None if there is no valid checkpoint
+    """
+    try:
+        with open(get_checkpoint_filepath(target_path), "r", encoding="utf8") as fp:
+            checkpoint = json.load(fp)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(checkpoint, dict) or not CHECKPOINT_KEYS.issubset(checkpoint):
+        return None
+
+    return checkpoint
+
+
+def remove_partial_copy(target_path: str):
+    """Removes an incomplete copy and its checkpoint
+
+    Parameters
+    ----------
+    target_path : str
+        final path of the copied file
+    """
+    for filepath in (get_partial_filepath(target_path), get_checkpoint_filepath(target_path)):
+        if os.path.exists(filepath):
+            os.unlink(filepath)
+
+
+def get_n_bytes_copied(target_path: str) -> int:
+    """Get the bytes of a copy which are on the target disk already
+
+    Parameters
+    ----------
+    target_path : str
+        final path of the copied file
+
+    Returns
+    -------
+    n_bytes : int
+        size of the incomplete file or of the final file if the copy
+        is complete, 0 if neither exists
+    """
+    for filepath in (get_partial_filepath(target_path), target_path):
+        try:
+            return os.stat(filepath).st_size
+        except OSError:
+            pass
+    return 0
+
+
+def _write_checkpoint(
+    target_path: str, source_path: str, source_stat: os.stat_result, committed: int
+):
+    """Writes the checkpoint of an incomplete copy
+
+    Parameters
+    ----------
+    target_path : str
+        final path of the copied file
+    source_path : str
+        path of the file being copied
+    source_stat : os.stat_result
+        stat of the source file to detect changes
+    committed : int
+        number of bytes safely written to disk
+    """
+    checkpoint_path = get_checkpoint_filepath(target_path)
+    tmp_path = checkpoint_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf8") as fp:
+        json.dump(
+            {
+                "source": source_path,
+                "size": source_stat.st_size,
+                "mtime_ns": source_stat.st_mtime_ns,
+                "committed": committed,
+            },
+            fp,
+        )
+    os.replace(tmp_path, checkpoint_path)
+
+
+def _get_resume_offset(
+    source: BinaryIO,
+    target: BinaryIO,
+    target_path: str,
+    source_stat: os.stat_result,
+) -> int:
+    """Get the offset to resume an incomplete copy from
+
+    Parameters
+    ----------
+    source : BinaryIO
+        unbuffered source file
+    target : BinaryIO
+        unbuffered incomplete file
+    target_path : str
+        final path of the copied file
+    source_stat : os.stat_result
+        stat of the source file
+
+    Returns
+    -------
+    offset : int
+        number of bytes which don't need to be copied again
+
+    Notes
+    -----
+        The copy restarts from zero if the source changed since the
+        checkpoint or the last committed block does not match.
+    """
+    checkpoint = read_checkpoint(target_path)
+    if checkpoint is None:
+        return 0
+
+    if (
+        checkpoint["size"] != source_stat.st_size
+        or checkpoint["mtime_ns"] != source_stat.st_mtime_ns
+    ):
+        return 0
+
+    committed = min(checkpoint["committed"], os.fstat(target.fileno()).st_size)
+
+    # verify the last committed block
+    n_bytes = min(VERIFY_SIZE, committed)
+    source.seek(committed - n_bytes)
+    target.seek(committed - n_bytes)
+    if source.read(n_bytes) != target.read(n_bytes):
+        return 0
+
+    return committed
+
+
+def _get_candidate_engines(
+    engines: Optional[Sequence[AbstractCopyEngine]],
+    hasher: Optional[Any],
+    source_device: int,
+    target_device: int,
+    direct_io: bool,
+) -> List[AbstractCopyEngine]:
+    """Get the engines to try for a copy in order of preference"""
+    if hasher is not None:
+        # the data must pass through userspace to be hashed
+        candidates: List[AbstractCopyEngine] = [HashingEngine(hasher)]
+    elif engines is not None:
+        candidates = list(engines)
+    else:
+        candidates = get_copy_engines(source_device, target_device, direct_io)
+
+    if direct_io:
+        # engines using the page cache at least drop what they copied
+        candidates = [
+            engine if isinstance(engine, DirectIOEngine) else CacheDroppingEngine(engine)
+            for engine in candidates
+        ]
+
+    return candidates
+
+
+def _prepare_partial_file(
+    source: BinaryIO,
+    target: BinaryIO,
+    source_path: str,
+    target_path: str,
+    source_stat: os.stat_result,
+    hasher: Optional[Any],
+    set_phase: Callable[[str], None],
+    stop_event: Optional[threading.Event],
+) -> int:
+    """Truncates the partial file to the offset to continue from and returns it"""
+    offset = _get_resume_offset(source, target, target_path, source_stat)
+    if offset:
+        get_logger(__file__).info(
+            "Resuming copy of '%s' at %.1f GiB", source_path, offset / 1024**3
+        )
+        if hasher is not None:
+            # the hash must cover the part copied before
+            set_phase(PHASE_VERIFYING)
+            hash_file_range(source, 0, offset, hasher, stop_event)
+            set_phase(PHASE_COPYING)
+
+    target.truncate(offset)
+    _write_checkpoint(target_path, source_path, source_stat, offset)
+
+    return offset
+
+
+def _verify_copy(
+    source: BinaryIO,
+    target: BinaryIO,
+    size: int,
+    verify_mode: str,
+    hasher: Optional[Any],
+    stop_event: Optional[threading.Event],
+) -> bool:
+    """Checks a copy flushed to disk according to the verification mode"""
+    if verify_mode == VERIFY_FULL and hasher is not None:
+        return verify_full(target, size, hasher.digest(), stop_event)
+    if verify_mode == VERIFY_SAMPLED:
+        return verify_sampled(source, target, size)
+    return True
+
+
+def _finish_partial_file(
+    source: BinaryIO,
+    target: BinaryIO,
+    size: int,
+    verify_mode: str,
+    hasher: Optional[Any],
+    direct_io: bool,
+    stop_event: Optional[threading.Event],
+) -> bool:
+    """Flushes a complete partial file to disk and checks it"""
+    if direct_io:
+        # verification reads with unaligned buffers
+        _set_direct_io(source.fileno(), False)
+        _set_direct_io(target.fileno(), False)
+
+    os.fsync(target.fileno())
+    is_valid = _verify_copy(source, target, size, verify_mode, hasher, stop_event)
+
+    if direct_io:
+        # everything is written back now and can be dropped
+        drop_page_cache(source)
+        drop_page_cache(target)
+
+    return is_valid
+
+
+def _stop_if_requested(
+    stop_event: Optional[threading.Event],
+    target: BinaryIO,
+    source_path: str,
+    target_path: str,
+    source_stat: os.stat_result,
+    offset: int,
+):
+    """Checkpoints an incomplete copy and stops it if the stop event is set"""
+    if stop_event is None or not stop_event.is_set():
+        return
+
+    os.fsync(target.fileno())
+    _write_checkpoint(target_path, source_path, source_stat, offset)
+    raise InterruptedError(errno.EINTR, f"Copy was stopped after {offset} bytes", source_path)
+
+
+def _ignore_phase(_: str):
+    """Used if the caller is not interested in the phase of a copy"""
+
+
+def copy_file_content(
+    source_path: str,
+    target_path: str,
+    engines: Optional[Sequence[AbstractCopyEngine]] = None,
+    bandwidth_limiter: Optional[BandwidthLimiter] = None,
+    verify_mode: str = VERIFY_NONE,
+    direct_io: bool = False,
+    on_phase: Optional[Callable[[str], None]] = None,
+    stop_event: Optional[threading.Event] = None,
+) -> str:
+    """Copies a file with the best engine for the filesystems
+
+    Parameters
+    ----------
+    source_path : str
+        Path to the existing source file
+    target_path : str
+        Path where to copy the file
+    engines : Optional[Sequence[AbstractCopyEngine]]
+        Engines to try in this order. By default the available
+        engines supporting the filesystems are used.
+    bandwidth_limiter : Optional[BandwidthLimiter]
+        Limits the copy speed per source and target device.
+        Copies run at full speed if not specified.
+    verify_mode : str
+        How to check the copy before it is renamed to the target path,
+        one of VERIFY_MODES. 'full' hashes the data while copying
+        through userspace and reads the target once. 'sampled' compares
+        blocks spread over the file with the source.
+    direct_io : bool
+        Bypass the page cache with O_DIRECT so that copying does not
+        evict data of other processes. If the filesystems don't support
+        it, the copied data is dropped from the page cache instead.
+    on_phase : Optional[Callable[[str], None]]
+        Called with PHASE_VERIFYING before files are read without
+        writing to the target, such as hashing the part copied before
+        a resume or verifying the copy, and with PHASE_COPYING once
+        the copy continues.
+    stop_event : Optional[threading.Event]
+        Checked once per chunk, the copy stops once it is set. The
+        incomplete copy is checkpointed to be resumed later.
+
+    Returns
+    -------
+    engine_name : str
+        name of the engine which did the copy
+
+    Raises
+    ------
+    OSError
+        If the copy fails, the source file gets truncated or the copy
+        does not match the source. A copy which does not match is
+        removed instead of being resumed.
+    InterruptedError
+        If the copy was stopped through the stop event.
+
+    Notes
+    -----
+        The file is written to a '.partial' file first and renamed
+        once it is complete. Next to it a checkpoint records how many
+        bytes were flushed to disk. If the copy is interrupted, the
+        next copy of the same file into the same place resumes from
+        there.
+
+        If an engine does not support the filesystems, the next one
+        continues the copy where it stopped. This is remembered for
+        the pair of filesystems so the engine is not tried again.
+    """
+    logger = get_logger(__file__)
+
+    set_phase = on_phase if on_phase is not None else _ignore_phase
+    partial_path = get_partial_filepath(target_path)
+    # keep the content of an existing partial file to resume
+    partial_mode = "r+b" if os.path.exists(partial_path) else "w+b"
+
+    with open(source_path, "rb", buffering=0) as source, open(
+        partial_path, partial_mode, buffering=0
+    ) as target:
+        source_stat = os.fstat(source.fileno())
+        source_device = source_stat.st_dev
+        target_device = os.fstat(target.fileno()).st_dev
+        hasher = create_hasher() if verify_mode == VERIFY_FULL else None
+        candidates = _get_candidate_engines(
+            engines, hasher, source_device, target_device, direct_io
+        )
+
+        size = source_stat.st_size
+        offset = _prepare_partial_file(
+            source, target, source_path, target_path, source_stat, hasher, set_phase, stop_event
+        )
+
+        # smaller chunks keep the rate of throttled copies smooth
+        chunk_size = CHUNK_SIZE
+        if bandwidth_limiter is not None and bandwidth_limiter.is_limiting:
+            chunk_size = min(CHUNK_SIZE, THROTTLED_CHUNK_SIZE)
+        else:
+            bandwidth_limiter = None
+
+        last_checkpoint = offset
+        while offset < size:
+            _stop_if_requested(stop_event, target, source_path, target_path, source_stat, offset)
+            engine = candidates[0]
+            count = min(chunk_size, size - offset)
+            if bandwidth_limiter is not None:
+                bandwidth_limiter.throttle(source_device, target_device, count)
+            try:
+                n_bytes = engine.copy_chunk(source, target, offset, count)
+            except OSError as err:
+                if err.errno not in UNSUPPORTED_ERRNOS or len(candidates) == 1:
+                    raise
+                logger.debug(
+                    "Copy engine '%s' not supported for '%s' -> '%s': %s",
+                    engine.name,
+                    source_path,
+                    target_path,
+                    err,
+                )
+                mark_engine_unsupported(engine, source_device, target_device)
+                candidates.pop(0)
+                continue
+
+            if n_bytes == 0:
+                raise OSError(
+                    errno.EIO,
+                    f"Source file ended after {offset} of {size} bytes",
+                    source_path,
+                )
+            offset += n_bytes
+
+            if offset - last_checkpoint >= CHECKPOINT_INTERVAL:
+                os.fsync(target.fileno())
+                _write_checkpoint(target_path, source_path, source_stat, offset)
+                last_checkpoint = offset
+
+        set_phase(PHASE_VERIFYING)
+        is_valid = _finish_partial_file(
+            source, target, size, verify_mode, hasher, direct_io, stop_event
+        )
+
+    if not is_valid:
+        # a corrupted copy must not be resumed
+        remove_partial_copy(target_path)
+        raise OSError(errno.EIO, "Copy does not match the source", target_path)
+
+    os.replace(partial_path, target_path)
+    os.unlink(get_checkpoint_filepath(target_path))
+
+    return candidates[0].name
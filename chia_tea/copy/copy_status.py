@@ -0,0 +1,91 @@
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from typing import List
+
+from ..utils.logger import get_logger
+
+# status files not updated for this long belong to a stopped copy process
+STATUS_MAX_AGE_SECONDS = 120
+
+
+@dataclass
+class CopyJobStatus:
+    """Progress of a running copy as published to other processes"""
+
+    source_filepath: str
+    target_filepath: str
+    # unix timestamp of when the copy started
+    start_time: float
+    n_bytes_copied: int
+    n_bytes_total: int
+    bytes_per_sec: float
+
+    @property
+    def eta_seconds(self) -> float:
+        """Expected time until the copy finished, -1 if unknown"""
+        if self.bytes_per_sec <= 0:
+            return -1.0
+        return max(0, self.n_bytes_total - self.n_bytes_copied) / self.bytes_per_sec
+
+
+def write_copy_status(status_filepath: str, copy_jobs: List[CopyJobStatus]):
+    """Publishes the running copies in a status file
+
+    Parameters
+    ----------
+    status_filepath : str
+        path of the status file
+    copy_jobs : List[CopyJobStatus]
+        copies currently running
+
+    Notes
+    -----
+        The file is replaced atomically so that readers never see
+        a partially written file. Errors are only logged since
+        the status must never interrupt copying.
+    """
+    status = {
+        "timestamp": time.time(),
+        "copy_jobs": [asdict(copy_job) for copy_job in copy_jobs],
+    }
+
+    try:
+        folder = os.path.dirname(status_filepath)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+        tmp_filepath = status_filepath + ".tmp"
+        with open(tmp_filepath, "w", encoding="utf8") as fp:
+            json.dump(status, fp)
+        os.replace(tmp_filepath, status_filepath)
+    except OSError as err:
+        get_logger(__file__).error("Cannot write copy status file '%s': %s", status_filepath, err)
+
+
+def read_copy_status(status_filepath: str) -> List[CopyJobStatus]:
+    """Reads the running copies from a status file
+
+    Parameters
+    ----------
+    status_filepath : str
+        path of the status file
+
+    Returns
+    -------
+    copy_jobs : List[CopyJobStatus]
+        copies currently running. Empty if the file does not exist,
+        is broken or was not updated for a long time.
+    """
+    try:
+        with open(status_filepath, "r", encoding="utf8") as fp:
+            status = json.load(fp)
+
+        if time.time() - status["timestamp"] > STATUS_MAX_AGE_SECONDS:
+            return []
+
+        return [CopyJobStatus(**copy_job) for copy_job in status["copy_jobs"]]
+
+    except (OSError, ValueError, KeyError, TypeError):
+        return []
@@ -1,16 +1,20 @@
-import time
-import traceback
-from typing import Dict
+import asyncio
+import os
 
 from ..protobuf.generated.config_pb2 import ChiaTeaConfig
 from ..utils.logger import get_logger
-from .Disk import (
-    collect_files_from_folders,
-    filter_least_used_disks,
-    find_disk_with_space,
-    get_files_being_copied,
-    move_file,
-)
+from .copy_status import write_copy_status
+from .CopyDaemon import CopyDaemon
+from .CopyLedger import CopyLedger
+from .CopyScheduler import CopyScheduler
+from .placement_policies import create_placement_policy
+from .SourceQueue import SourceQueue
+from .SourceWatcher import SourceWatcher
+from .throttling import BandwidthLimiter, start_watching_madmax_plotter
+from .verification import get_verify_mode
+
+# MB/s in the config are converted to bytes per second
+BYTES_PER_MB = 1e6
 
 
 def run_copy(config: ChiaTeaConfig) -> None:
@@ -20,6 +24,22 @@ def run_copy(config: ChiaTeaConfig) -> None:
     ----------
     config : ChiaTeaConfig
         Config containing the copy settings
+
+    Notes
+    -----
+        Multiple copies run in parallel as specified in the config.
+        A new file is picked as soon as a copy finished or a new file
+        appeared in the source folders. Files of the fullest source
+        disk are copied first. If the madmax
+        logfile is specified, copies are slowed down while the plotter
+        is in phase 3 or 4. Targets which fail, stall or are far
+        slower than the others are avoided for a while.
+
+        The loop runs on an asyncio event loop which also serves the
+        local control API if a control socket is configured. Runs
+        until interrupted or drained through the control API. Copies
+        running when interrupted stop and are resumed on the next
+        start.
     """
 
     # get logger
@@ -31,47 +51,86 @@ def run_copy(config: ChiaTeaConfig) -> None:
     logger.info("Copying from: %s", from_folders)
     logger.info("Copying to  : %s", target_folders)
 
-    # execute infinite copy loop
-    while True:
-        iteration_start_time = time.time()
-        try:
-            files_to_copy = collect_files_from_folders(from_folders, "*.plot")
-
-            # pick a file
-            source_filepath = files_to_copy.pop()
-
-            # Check which files are being copied. This helps us to select a
-            # disk which is used the least.
-            disk_copy_data = get_files_being_copied(directories=target_folders)
-
-            disk_to_copy_processes_count: Dict[str, int] = {
-                folder: len(data.files_in_progress) for folder, data in disk_copy_data.items()
-            }
-
-            # check if we have enough space on the disks of the target folders
-            available_target_dirpaths = filter_least_used_disks(disk_to_copy_processes_count)
-
-            # filter out the folders which are available
-            disk_to_copy_processes_count = {
-                disk: disk_to_copy_processes_count[disk] for disk in available_target_dirpaths
-            }
-
-            # search for a space on the specified disks
-            target_dir = find_disk_with_space(source_filepath, disk_to_copy_processes_count)
-            if target_dir is None:
-                raise RuntimeError("No disk space available for: %s" % source_filepath)
-
-            # compose new filepath after move
-            move_file(source_filepath, target_dir)
-
-        except Exception as err:
-            trace = traceback.format_stack()
-            logger.error("%s", err)
-            logger.debug(trace)
-
-        finally:
-            # if the iteration took less than the specified interval, wait
-            # this is to prevent the loop from running too fast
-            duration_secs = time.time() - iteration_start_time
-            sleep_time_secs = 15 - min(duration_secs, 15)
-            time.sleep(sleep_time_secs)
+    # clean up after a previous crash before copying anything
+    ledger = CopyLedger(state_filepath=config.copy.state_filepath)
+    ledger.recover()
+
+    bandwidth_limiter = create_bandwidth_limiter(config)
+    madmax_logfiles = [filepath for filepath in config.chia.madmax_logfiles if filepath]
+    if bandwidth_limiter.is_limiting and madmax_logfiles:
+        start_watching_madmax_plotter(madmax_logfiles, bandwidth_limiter)
+
+    scheduler = CopyScheduler(
+        target_folders=target_folders,
+        max_parallel_copies=config.copy.max_parallel_copies,
+        max_parallel_copies_per_target=config.copy.max_parallel_copies_per_target,
+        ledger=ledger,
+        bandwidth_limiter=bandwidth_limiter,
+        placement_policy=create_placement_policy(config.copy.placement_policy),
+        verify_mode=get_verify_mode(config.copy.verify_mode),
+        direct_io=config.copy.direct_io,
+    )
+    logger.info(
+        "Parallel copies: %d (%d per target), placement policy: %s, verification: %s, "
+        "direct I/O: %s",
+        scheduler.max_parallel_copies,
+        scheduler.max_parallel_copies_per_target,
+        scheduler.placement_policy.name,
+        scheduler.verify_mode,
+        scheduler.direct_io,
+    )
+
+    source_watcher = SourceWatcher(from_folders, "*.plot", on_new_files=scheduler.wake_up)
+    source_watcher.start()
+    source_queue = SourceQueue(source_priorities=dict(config.copy.source_priorities))
+
+    status_filepath = os.path.expanduser(config.copy.status_filepath)
+
+    daemon = CopyDaemon(
+        scheduler=scheduler,
+        source_watcher=source_watcher,
+        source_queue=source_queue,
+        status_filepath=status_filepath,
+        control_socket_filepath=config.copy.control_socket_filepath,
+    )
+    try:
+        asyncio.run(daemon.run())
+    finally:
+        source_watcher.stop()
+        # waiting for running copies could take hours
+        scheduler.shutdown(wait_for_copies=False)
+        if status_filepath:
+            write_copy_status(status_filepath, [])
+
+
+def create_bandwidth_limiter(config: ChiaTeaConfig) -> BandwidthLimiter:
+    """Creates the bandwidth limiter from the copy config
+
+    Parameters
+    ----------
+    config : ChiaTeaConfig
+        Config containing the copy settings
+
+    Returns
+    -------
+    bandwidth_limiter : BandwidthLimiter
+        limiter for all copies
+    """
+    bandwidth_limiter = BandwidthLimiter(
+        max_source_bytes_per_sec=config.copy.max_source_mb_per_sec * BYTES_PER_MB,
+        max_target_bytes_per_sec=config.copy.max_target_mb_per_sec * BYTES_PER_MB,
+        max_source_bytes_per_sec_while_plotting=(
+            config.copy.max_source_mb_per_sec_while_plotting * BYTES_PER_MB
+        ),
+    )
+
+    if bandwidth_limiter.is_limiting:
+        get_logger(__file__).info(
+            "Bandwidth limits per disk in MB/s (0 = unlimited): "
+            "source %d, source while plotting %d, target %d",
+            config.copy.max_source_mb_per_sec,
+            config.copy.max_source_mb_per_sec_while_plotting,
+            config.copy.max_target_mb_per_sec,
+        )
+
+    return bandwidth_limiter
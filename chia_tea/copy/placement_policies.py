@@ -0,0 +1,242 @@
+import random
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Type
+
+from .Disk import filter_least_used_disks
+
+DEFAULT_PLACEMENT_POLICY = "least_used"
+
+
+@dataclass
+class PlacementCandidate:
+    """A target folder with a free slot and enough space for a file"""
+
+    folder: str
+    # copies running into the folder including those of other processes
+    n_copies: int
+    # bytes left on the disk after all running copies finished
+    free_space: float
+
+
+class AbstractPlacementPolicy(ABC):
+    """Decides into which target folder a file is copied
+
+    Policies only choose among folders which have a free copy slot
+    and enough space. They may keep state between decisions and
+    learn from finished copies.
+    """
+
+    name = ""
+
+    @abstractmethod
+    def choose_target_dir(
+        self, source_filepath: str, candidates: Sequence[PlacementCandidate]
+    ) -> Optional[str]:
+        """Chooses the folder to copy a file into
+
+        Parameters
+        ----------
+        source_filepath : str
+            path to the file to be copied
+        candidates : Sequence[PlacementCandidate]
+            folders with a free slot and enough space, never empty
+
+        Returns
+        -------
+        target_dir : Optional[str]
+            chosen folder or None to not copy the file right now
+        """
+        raise NotImplementedError()
+
+    def on_copy_finished(self, target_dir: str, n_bytes: int, duration_seconds: float):
+        """Called when a copy finished successfully
+
+        Parameters
+        ----------
+        target_dir : str
+            folder the file was copied into
+        n_bytes : int
+            size of the file
+        duration_seconds : float
+            time the copy took
+        """
+
+
+class LeastUsedPolicy(AbstractPlacementPolicy):
+    """Spreads copies over the folders with the fewest running copies
+
+    Among equally used folders one is chosen randomly.
+    """
+
+    name = "least_used"
+
+    def choose_target_dir(
+        self, source_filepath: str, candidates: Sequence[PlacementCandidate]
+    ) -> Optional[str]:
+        least_used_dirs = filter_least_used_disks(
+            {candidate.folder: candidate.n_copies for candidate in candidates}
+        )
+        return random.choice(sorted(least_used_dirs))
+
+
+class FillFirstPolicy(AbstractPlacementPolicy):
+    """Fills up one disk after another
+
+    The fullest disk which still has space is chosen. Thus new
+    plots go to the same disk until it is full and the other disks
+    can spin down.
+    """
+
+    name = "fill_first"
+
+    def choose_target_dir(
+        self, source_filepath: str, candidates: Sequence[PlacementCandidate]
+    ) -> Optional[str]:
+        return min(
+            candidates, key=lambda candidate: (candidate.free_space, candidate.folder)
+        ).folder
+
+
+class RoundRobinPolicy(AbstractPlacementPolicy):
+    """Cycles through the folders in alphabetical order"""
+
+    name = "round_robin"
+
+    def __init__(self):
+        self.last_target_dir = ""
+
+    def choose_target_dir(
+        self, source_filepath: str, candidates: Sequence[PlacementCandidate]
+    ) -> Optional[str]:
+        folders = sorted(candidate.folder for candidate in candidates)
+        next_folders = [folder for folder in folders if folder > self.last_target_dir]
+        self.last_target_dir = next_folders[0] if next_folders else folders[0]
+        return self.last_target_dir
+
+
+class ThroughputWeightedPolicy(AbstractPlacementPolicy):
+    """Prefers the folders which were written fastest so far
+
+    Folders are chosen randomly weighted by their measured
+    throughput divided by the copies running into them. Folders
+    without measurement get the best throughput so that they
+    are tried out.
+    """
+
+    name = "throughput"
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        # folder -> bytes per second of the last copies
+        self.throughputs: Dict[str, float] = {}
+
+    def choose_target_dir(
+        self, source_filepath: str, candidates: Sequence[PlacementCandidate]
+    ) -> Optional[str]:
+        with self.__lock:
+            default_throughput = max(self.throughputs.values(), default=1.0)
+            weights = [
+                self.throughputs.get(candidate.folder, default_throughput)
+                / (1 + candidate.n_copies)
+                for candidate in candidates
+            ]
+
+        return random.choices([candidate.folder for candidate in candidates], weights=weights)[0]
+
+    def on_copy_finished(self, target_dir: str, n_bytes: int, duration_seconds: float):
+        if duration_seconds <= 0:
+            return
+
+        throughput = n_bytes / duration_seconds
+        with self.__lock:
+            previous_throughput = self.throughputs.get(target_dir)
+            # average with the previous copies but follow changes quickly
+            self.throughputs[target_dir] = (
+                throughput
+                if previous_throughput is None
+                else (previous_throughput + throughput) / 2
+            )
+
+
+class SmrSequentialPolicy(AbstractPlacementPolicy):
+    """Writes to one disk at a time and fills disks in order
+
+    Drive-managed SMR disks slow down heavily on parallel or
+    interleaved writes. Thus a folder is only chosen if nothing
+    is being copied into it and disks are filled one after another
+    in alphabetical order.
+    """
+
+    name = "smr_sequential"
+
+    def choose_target_dir(
+        self, source_filepath: str, candidates: Sequence[PlacementCandidate]
+    ) -> Optional[str]:
+        idle_folders = sorted(
+            candidate.folder for candidate in candidates if candidate.n_copies == 0
+        )
+        return idle_folders[0] if idle_folders else None
+
+
+PLACEMENT_POLICIES: Dict[str, Type[AbstractPlacementPolicy]] = {
+    policy.name: policy
+    for policy in (
+        LeastUsedPolicy,
+        FillFirstPolicy,
+        RoundRobinPolicy,
+        ThroughputWeightedPolicy,
+        SmrSequentialPolicy,
+    )
+}
+
+
+def register_placement_policy(policy_class: Type[AbstractPlacementPolicy]):
+    """Makes a placement policy selectable by its name
+
+    Parameters
+    ----------
+    policy_class : Type[AbstractPlacementPolicy]
+        class of the policy, must have a unique name
+    """
+    PLACEMENT_POLICIES[policy_class.name] = policy_class
+
+
+def get_placement_policy_names() -> List[str]:
+    """Get the names of all registered placement policies
+
+    Returns
+    -------
+    names : List[str]
+        names of the policies in alphabetical order
+    """
+    return sorted(PLACEMENT_POLICIES)
+
+
+def create_placement_policy(name: str) -> AbstractPlacementPolicy:
+    """Creates a placement policy by its name
+
+    Parameters
+    ----------
+    name : str
+        name of the policy. The default policy is used if empty.
+
+    Returns
+    -------
+    placement_policy : AbstractPlacementPolicy
+        new instance of the policy
+
+    Raises
+    ------
+    ValueError
+        If no policy with the name exists.
+    """
+    policy_class = PLACEMENT_POLICIES.get(name or DEFAULT_PLACEMENT_POLICY)
+    if policy_class is None:
+        raise ValueError(
+            f"Unknown placement policy '{name}', "
+            f"choose one of: {', '.join(get_placement_policy_names())}"
+        )
+
+    return policy_class()
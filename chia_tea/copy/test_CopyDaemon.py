@@ -0,0 +1,97 @@
+import asyncio
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from ..utils.testing import async_test
+from .control import (
+    COMMAND_DRAIN,
+    COMMAND_LIST_JOBS,
+    COMMAND_PAUSE_TARGET,
+    COMMAND_SET_CONCURRENCY,
+)
+from .CopyDaemon import CopyDaemon
+from .CopyScheduler import CopyScheduler
+from .SourceWatcher import SourceWatcher
+
+
+class TestCopyDaemon(unittest.TestCase):
+    def setUp(self) -> None:
+        # pylint: disable=consider-using-with
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.target_dir = os.path.join(self.tmp_dir.name, "target")
+        os.makedirs(self.target_dir)
+        self.scheduler = CopyScheduler(target_folders={self.target_dir}, max_parallel_copies=1)
+        self.source_watcher = MagicMock(spec=SourceWatcher)
+        self.source_watcher.get_files.return_value = set()
+
+    def tearDown(self) -> None:
+        self.scheduler.shutdown()
+        self.tmp_dir.cleanup()
+
+    def _source_file(self, name: str) -> str:
+        filepath = os.path.join(self.tmp_dir.name, name)
+        with open(filepath, "wb") as fp:
+            fp.write(b"0" * 10)
+        return filepath
+
+    @async_test
+    async def test_drain_without_copies_stops(self):
+
+        daemon = CopyDaemon(self.scheduler, self.source_watcher, poll_interval=10)
+        task = asyncio.ensure_future(daemon.run())
+
+        status = await daemon.handle_command(COMMAND_DRAIN, {})
+
+        self.assertTrue(status["draining"])
+        await asyncio.wait_for(task, timeout=5)
+
+    @patch("chia_tea.copy.CopyScheduler.move_file")
+    @async_test
+    async def test_commands_while_copying(self, move_file_mock: MagicMock):
+
+        release = threading.Event()
+        move_file_mock.side_effect = lambda *_: release.wait(5)
+        source_filepaths = {self._source_file(f"file_{i_file}.plot") for i_file in range(2)}
+        self.source_watcher.get_files.return_value = source_filepaths
+
+        daemon = CopyDaemon(self.scheduler, self.source_watcher, poll_interval=0.05)
+        task = asyncio.ensure_future(daemon.run())
+        while self.scheduler.n_copies_in_progress == 0:
+            await asyncio.sleep(0.01)
+
+        status = await daemon.handle_command(COMMAND_LIST_JOBS, {})
+        self.assertEqual(len(status["jobs"]), 1)
+        self.assertEqual(status["max_parallel_copies"], 1)
+
+        status = await daemon.handle_command(COMMAND_PAUSE_TARGET, {"target_dir": self.target_dir})
+        self.assertListEqual(status["paused_targets"], [self.target_dir])
+
+        # a paused target receives no new copies even with free slots
+        await daemon.handle_command(
+            COMMAND_SET_CONCURRENCY, {"max_parallel_copies": 2, "max_parallel_copies_per_target": 2}
+        )
+        await asyncio.sleep(0.2)
+        self.assertEqual(self.scheduler.n_copies_in_progress, 1)
+
+        await daemon.handle_command(COMMAND_DRAIN, {})
+        release.set()
+        await asyncio.wait_for(task, timeout=5)
+
+        # the running copy finished, the other one never started
+        self.assertEqual(move_file_mock.call_count, 1)
+        self.assertEqual(self.scheduler.n_copies_in_progress, 0)
+
+    @async_test
+    async def test_invalid_commands_raise(self):
+
+        daemon = CopyDaemon(self.scheduler, self.source_watcher)
+
+        with self.assertRaises(ValueError):
+            await daemon.handle_command("unknown", {})
+        with self.assertRaises(TypeError):
+            await daemon.handle_command(COMMAND_LIST_JOBS, {"unknown": 1})
+        with self.assertRaises(ValueError):
+            await daemon.handle_command(COMMAND_PAUSE_TARGET, {"target_dir": "unknown"})
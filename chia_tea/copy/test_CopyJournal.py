@@ -0,0 +1,67 @@
+import json
+import os
+import tempfile
+import unittest
+
+from .CopyJournal import CopyJournal, JournalEntry
+
+
+def _count_lines(filepath: str) -> int:
+    with open(filepath, "r", encoding="utf8") as fp:
+        return len(fp.readlines())
+
+
+class TestCopyJournal(unittest.TestCase):
+    def test_replay_finds_unfinished_copies(self):
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filepath = os.path.join(tmp_dir, "journal.jsonl")
+
+            journal = CopyJournal(filepath)
+            journal.log_start(JournalEntry("a.plot", "target/a.plot", 4, 1))
+            journal.log_start(JournalEntry("b.plot", "target/b.plot", 8, 2))
+            journal.log_finish("target/a.plot", success=True)
+
+            self.assertDictEqual(
+                CopyJournal(filepath).replay(),
+                {"target/b.plot": JournalEntry("b.plot", "target/b.plot", 8, 2)},
+            )
+
+    def test_replay_ignores_torn_last_line(self):
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filepath = os.path.join(tmp_dir, "journal.jsonl")
+
+            journal = CopyJournal(filepath)
+            journal.log_start(JournalEntry("a.plot", "target/a.plot"))
+            with open(filepath, "a", encoding="utf8") as fp:
+                fp.write('{"event": "finish", "tar')
+
+            self.assertListEqual(list(CopyJournal(filepath).replay()), ["target/a.plot"])
+
+    def test_replay_reads_old_state_file(self):
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filepath = os.path.join(tmp_dir, "state.json")
+            with open(filepath, "w", encoding="utf8") as fp:
+                json.dump({"copies_in_progress": [{"source": "a.plot", "target": "t/a.plot"}]}, fp)
+
+            self.assertDictEqual(
+                CopyJournal(filepath).replay(),
+                {"t/a.plot": JournalEntry("a.plot", "t/a.plot")},
+            )
+
+    def test_journal_is_compacted(self):
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filepath = os.path.join(tmp_dir, "journal.jsonl")
+
+            journal = CopyJournal(filepath, compact_after_records=5)
+            journal.log_start(JournalEntry("running.plot", "target/running.plot"))
+            for i_copy in range(3):
+                journal.log_start(JournalEntry(f"{i_copy}.plot", f"target/{i_copy}.plot"))
+                journal.log_finish(f"target/{i_copy}.plot", success=True)
+
+            # compacted at the fifth record, one more appended since
+            self.assertEqual(_count_lines(filepath), 3)
+            self.assertListEqual(list(CopyJournal(filepath).replay()), ["target/running.plot"])
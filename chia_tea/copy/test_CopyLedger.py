@@ -0,0 +1,206 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from .CopyJournal import CopyJournal, JournalEntry
+from .CopyLedger import SUSPECT_SUFFIX, CopyLedger
+
+
+def _touch(filepath: str):
+    with open(filepath, "w", encoding="utf8"):
+        pass
+
+
+def _write(filepath: str, data: bytes):
+    with open(filepath, "wb") as fp:
+        fp.write(data)
+
+
+class TestCopyLedger(unittest.TestCase):
+    @patch("chia_tea.copy.Disk.is_accessible")
+    def test_own_and_finished_files_are_not_probed(self, is_accessible_mock: MagicMock):
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            own_copy = os.path.join(tmp_dir, "own.plot")
+            finished_plot = os.path.join(tmp_dir, "finished.plot")
+            _touch(own_copy)
+            _touch(finished_plot)
+            is_accessible_mock.return_value = True
+
+            ledger = CopyLedger()
+            ledger.start_copy("source/own.plot", own_copy)
+
+            # first check probes only the unknown file
+            result = ledger.get_files_being_copied({tmp_dir})
+            self.assertSetEqual(result[tmp_dir].files_in_progress, {own_copy})
+            self.assertSetEqual(result[tmp_dir].files_not_being_copied, {finished_plot})
+            is_accessible_mock.assert_called_once_with(finished_plot)
+
+            # finished files are remembered
+            is_accessible_mock.reset_mock()
+            ledger.finish_copy(own_copy, success=True)
+            result = ledger.get_files_being_copied({tmp_dir})
+            self.assertSetEqual(result[tmp_dir].files_in_progress, set())
+            self.assertSetEqual(
+                result[tmp_dir].files_not_being_copied,
+                {own_copy, finished_plot},
+            )
+            is_accessible_mock.assert_not_called()
+
+    @patch("chia_tea.copy.Disk.is_accessible")
+    def test_foreign_copies_are_probed_until_finished(self, is_accessible_mock: MagicMock):
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            foreign_copy = os.path.join(tmp_dir, "foreign.plot")
+            _touch(foreign_copy)
+
+            ledger = CopyLedger()
+
+            is_accessible_mock.return_value = False
+            result = ledger.get_files_being_copied({tmp_dir})
+            self.assertSetEqual(result[tmp_dir].files_in_progress, {foreign_copy})
+
+            is_accessible_mock.return_value = True
+            result = ledger.get_files_being_copied({tmp_dir})
+            self.assertSetEqual(result[tmp_dir].files_not_being_copied, {foreign_copy})
+
+            # no more probing once it is finished
+            is_accessible_mock.reset_mock()
+            ledger.get_files_being_copied({tmp_dir})
+            is_accessible_mock.assert_not_called()
+
+    def test_journal_is_written(self):
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            state_filepath = os.path.join(tmp_dir, "state", "journal.jsonl")
+            source_filepath = os.path.join(tmp_dir, "source.plot")
+            _write(source_filepath, b"0123")
+            source_stat = os.stat(source_filepath)
+
+            ledger = CopyLedger(state_filepath=state_filepath)
+            ledger.start_copy(source_filepath, "target.plot", source_stat)
+
+            self.assertDictEqual(
+                CopyJournal(state_filepath).replay(),
+                {
+                    "target.plot": JournalEntry(
+                        source=source_filepath,
+                        target="target.plot",
+                        size=4,
+                        mtime_ns=source_stat.st_mtime_ns,
+                    )
+                },
+            )
+
+            ledger.finish_copy("target.plot", success=True)
+
+            self.assertDictEqual(CopyJournal(state_filepath).replay(), {})
+
+    def test_recover_cleans_up_interrupted_copies(self):
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            state_filepath = os.path.join(tmp_dir, "state.json")
+
+            def _path(name: str) -> str:
+                return os.path.join(tmp_dir, name)
+
+            # copy was interrupted, the partial file is kept to resume
+            _write(_path("interrupted_source.plot"), b"0123")
+            _write(_path("interrupted_target.plot.partial"), b"01")
+
+            # copy finished but the source was not removed
+            _write(_path("unremoved_source.plot"), b"0123")
+            _write(_path("unremoved_target.plot"), b"0123")
+
+            # target has an unexpected size
+            _write(_path("broken_source.plot"), b"0123")
+            _write(_path("broken_target.plot"), b"01")
+
+            # source is gone, nothing to resume
+            _write(_path("gone_target.plot.partial"), b"01")
+            _write(_path("gone_target.plot.partial.checkpoint"), b"{}")
+
+            # copy finished but does not match the source
+            _write(_path("corrupt_source.plot"), b"0123")
+            _write(_path("corrupt_target.plot"), b"0000")
+
+            # source changed since the copy started
+            _write(_path("changed_source.plot"), b"0123")
+            _write(_path("changed_target.plot.partial"), b"01")
+
+            crashed_ledger = CopyLedger(state_filepath=state_filepath)
+            for name in ("interrupted", "unremoved", "broken", "gone", "corrupt", "changed"):
+                source_filepath = _path(f"{name}_source.plot")
+                crashed_ledger.start_copy(
+                    source_filepath,
+                    _path(f"{name}_target.plot"),
+                    os.stat(source_filepath) if os.path.exists(source_filepath) else None,
+                )
+            # a finished copy is not touched
+            crashed_ledger.start_copy(_path("done_source.plot"), _path("done_target.plot"))
+            _write(_path("done_target.plot"), b"0123")
+            crashed_ledger.finish_copy(_path("done_target.plot"), success=True)
+
+            _write(_path("changed_source.plot"), b"012345")
+
+            ledger = CopyLedger(state_filepath=state_filepath)
+            ledger.recover()
+
+            self.assertSetEqual(
+                set(os.listdir(tmp_dir)),
+                {
+                    "state.json",
+                    "interrupted_source.plot",
+                    "interrupted_target.plot.partial",
+                    "unremoved_target.plot",
+                    "broken_source.plot",
+                    "broken_target.plot.suspect",
+                    "corrupt_source.plot",
+                    "corrupt_target.plot.suspect",
+                    "changed_source.plot",
+                    "done_target.plot",
+                },
+            )
+
+            # the journal is compacted
+            with open(state_filepath, "r", encoding="utf8") as fp:
+                self.assertEqual(fp.read(), "")
+
+    def test_recover_keeps_mismatching_copy(self):
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            source = os.path.join(tmp_dir, "source.plot")
+            target = os.path.join(tmp_dir, "target.plot")
+            _write(source, b"0123")
+            _write(target, b"0000")
+
+            crashed_ledger = CopyLedger(state_filepath=os.path.join(tmp_dir, "state.json"))
+            crashed_ledger.start_copy(source, target, os.stat(source))
+
+            ledger = CopyLedger(state_filepath=os.path.join(tmp_dir, "state.json"))
+            ledger.recover()
+
+            # neither file is deleted, the copy is only renamed
+            self.assertFalse(os.path.exists(target))
+            with open(source, "rb") as fp:
+                self.assertEqual(fp.read(), b"0123")
+            with open(target + SUSPECT_SUFFIX, "rb") as fp:
+                self.assertEqual(fp.read(), b"0000")
+
+    def test_partial_files_of_own_copies_are_not_probed(self):
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            target = os.path.join(tmp_dir, "own.plot")
+            _touch(target + ".partial")
+
+            ledger = CopyLedger()
+            ledger.start_copy("source/own.plot", target)
+
+            with patch("chia_tea.copy.Disk.is_accessible") as is_accessible_mock:
+                result = ledger.get_files_being_copied({tmp_dir})
+            is_accessible_mock.assert_not_called()
+            self.assertSetEqual(result[tmp_dir].files_in_progress, {target + ".partial"})
+
+            ledger.finish_copy(target, success=True)
+            self.assertSetEqual(result[tmp_dir].files_in_progress, set())
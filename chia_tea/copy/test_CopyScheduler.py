@@ -0,0 +1,498 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import ANY, MagicMock, patch
+
+from .CopyScheduler import CopyScheduler
+from .ThroughputTracker import ThroughputTracker
+
+
+class TestCopyScheduler(unittest.TestCase):
+    def setUp(self) -> None:
+        # pylint: disable=consider-using-with
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        for folder in ("folder_a", "folder_b", "folder_c"):
+            os.makedirs(self._folder(folder))
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def _folder(self, name: str) -> str:
+        return os.path.join(self.tmp_dir.name, name)
+
+    def _source_file(self, name: str, size: int = 10) -> str:
+        filepath = os.path.join(self.tmp_dir.name, name)
+        with open(filepath, "wb") as fp:
+            fp.write(b"0" * size)
+        return filepath
+
+    @patch("chia_tea.copy.CopyScheduler.get_disks_with_space")
+    def test_find_target_dir_respects_per_target_limit(self, find_disk_mock: MagicMock):
+
+        scheduler = CopyScheduler(
+            target_folders={self._folder("folder_a"), self._folder("folder_b")},
+            max_parallel_copies=4,
+            max_parallel_copies_per_target=1,
+        )
+        scheduler.copies_in_progress["running_file"] = self._folder("folder_a")
+        find_disk_mock.side_effect = lambda _, counts, *__: {folder: 1.0 for folder in counts}
+
+        result = scheduler.find_target_dir("some_file")
+
+        self.assertEqual(result, self._folder("folder_b"))
+        find_disk_mock.assert_called_once_with(
+            "some_file", {self._folder("folder_b"): 0}, scheduler.disk_space_model, ANY
+        )
+        scheduler.shutdown()
+
+    @patch("chia_tea.copy.CopyScheduler.get_disks_with_space")
+    def test_find_target_dir_falls_back_to_busier_targets(self, find_disk_mock: MagicMock):
+
+        scheduler = CopyScheduler(
+            target_folders={self._folder("folder_a"), self._folder("folder_b")},
+            max_parallel_copies=4,
+            max_parallel_copies_per_target=2,
+        )
+        scheduler.copies_in_progress["running_file"] = self._folder("folder_a")
+
+        # the least used disk is full
+        find_disk_mock.side_effect = (
+            lambda _, counts, *__: {self._folder("folder_a"): 1.0}
+            if self._folder("folder_a") in counts
+            else {}
+        )
+
+        result = scheduler.find_target_dir("some_file")
+
+        self.assertEqual(result, self._folder("folder_a"))
+        find_disk_mock.assert_called_once_with(
+            "some_file",
+            {self._folder("folder_a"): 0, self._folder("folder_b"): 0},
+            scheduler.disk_space_model,
+            ANY,
+        )
+        scheduler.shutdown()
+
+    @patch("chia_tea.copy.CopyScheduler.get_disks_with_space")
+    def test_find_target_dir_all_slots_taken(self, find_disk_mock: MagicMock):
+
+        scheduler = CopyScheduler(
+            target_folders={self._folder("folder_a")},
+            max_parallel_copies=4,
+            max_parallel_copies_per_target=1,
+        )
+        scheduler.copies_in_progress["running_file"] = self._folder("folder_a")
+
+        result = scheduler.find_target_dir("some_file")
+
+        self.assertIsNone(result)
+        find_disk_mock.assert_not_called()
+        scheduler.shutdown()
+
+    @patch("chia_tea.copy.CopyScheduler.get_disks_with_space")
+    def test_find_target_dir_skips_demoted_targets(self, find_disk_mock: MagicMock):
+
+        tracker = MagicMock(spec=ThroughputTracker)
+        tracker.get_demoted_targets.return_value = {self._folder("folder_a")}
+        scheduler = CopyScheduler(
+            target_folders={self._folder("folder_a"), self._folder("folder_b")},
+            max_parallel_copies=4,
+            throughput_tracker=tracker,
+        )
+        find_disk_mock.side_effect = lambda _, counts, *__: {folder: 1.0 for folder in counts}
+
+        result = scheduler.find_target_dir("some_file")
+
+        self.assertEqual(result, self._folder("folder_b"))
+        find_disk_mock.assert_called_once_with(
+            "some_file", {self._folder("folder_b"): 0}, scheduler.disk_space_model, ANY
+        )
+        scheduler.shutdown()
+
+    def test_stalled_copies_free_their_slot(self):
+
+        tracker = MagicMock(spec=ThroughputTracker)
+        tracker.get_stalled_copies.return_value = set()
+        scheduler = CopyScheduler(
+            target_folders={self._folder("folder_a")},
+            max_parallel_copies=1,
+            throughput_tracker=tracker,
+        )
+        scheduler.copies_in_progress["running_file"] = self._folder("folder_a")
+        self.assertFalse(scheduler.has_free_slot())
+
+        tracker.get_stalled_copies.return_value = {"running_file"}
+        self.assertTrue(scheduler.has_free_slot())
+
+        # but never more threads than twice the copy limit are used
+        scheduler.copies_in_progress["other_file"] = self._folder("folder_a")
+        tracker.get_stalled_copies.return_value = {"running_file", "other_file"}
+        self.assertFalse(scheduler.has_free_slot())
+        scheduler.shutdown()
+
+    @patch("chia_tea.copy.CopyScheduler.get_disks_with_space")
+    def test_find_target_dir_resumes_interrupted_copy(self, find_disk_mock: MagicMock):
+
+        # an interrupted copy of the file lies in folder_b
+        partial_filepath = os.path.join(self._folder("folder_b"), "some_file.plot.partial")
+        with open(partial_filepath, "w", encoding="utf8"):
+            pass
+        find_disk_mock.side_effect = lambda _, counts, *__: {folder: 1.0 for folder in counts}
+
+        scheduler = CopyScheduler(
+            target_folders={self._folder("folder_a"), self._folder("folder_b")},
+            max_parallel_copies=4,
+            max_parallel_copies_per_target=1,
+        )
+
+        result = scheduler.find_target_dir("source/some_file.plot")
+
+        self.assertEqual(result, self._folder("folder_b"))
+        find_disk_mock.assert_called_once_with(
+            "source/some_file.plot", {self._folder("folder_b"): 0}, scheduler.disk_space_model, ANY
+        )
+        scheduler.shutdown()
+
+    def _abandoned_partial_file(self, folder: str, filename: str, source_filepath: str) -> str:
+        partial_filepath = os.path.join(self._folder(folder), filename + ".partial")
+        with open(partial_filepath + ".checkpoint", "w", encoding="utf8") as fp:
+            json.dump({"source": source_filepath, "size": 10, "mtime_ns": 0, "committed": 0}, fp)
+        with open(partial_filepath, "wb"):
+            pass
+        # the copy failed an hour ago
+        for filepath in (partial_filepath, partial_filepath + ".checkpoint"):
+            os.utime(filepath, (0, time.time() - 3600))
+        return partial_filepath
+
+    @patch("chia_tea.copy.CopyScheduler.move_file")
+    @patch("chia_tea.copy.CopyScheduler.get_disks_with_space")
+    def test_abandoned_partial_file_does_not_block_target(
+        self, find_disk_mock: MagicMock, move_file_mock: MagicMock
+    ):
+
+        # the source of a failed copy went to another target afterwards
+        partial_filepath = self._abandoned_partial_file(
+            "folder_a", "old.plot", os.path.join(self.tmp_dir.name, "old.plot")
+        )
+        find_disk_mock.side_effect = lambda _, counts, *__: {folder: 1.0 for folder in counts}
+
+        scheduler = CopyScheduler(
+            target_folders={self._folder("folder_a")}, max_parallel_copies_per_target=1
+        )
+
+        self.assertDictEqual(scheduler.get_target_copy_counts(), {self._folder("folder_a"): 0})
+        self.assertFalse(os.path.exists(partial_filepath))
+        self.assertFalse(os.path.exists(partial_filepath + ".checkpoint"))
+        self.assertTrue(scheduler.submit(self._source_file("new.plot")))
+        scheduler.shutdown()
+
+    @patch("chia_tea.copy.CopyScheduler.get_disks_with_space")
+    def test_abandoned_partial_file_is_resumed(self, find_disk_mock: MagicMock):
+
+        source_filepath = self._source_file("some_file.plot")
+        partial_filepath = self._abandoned_partial_file(
+            "folder_b", "some_file.plot", source_filepath
+        )
+        find_disk_mock.side_effect = lambda _, counts, *__: {folder: 1.0 for folder in counts}
+
+        scheduler = CopyScheduler(
+            target_folders={self._folder("folder_a"), self._folder("folder_b")},
+            max_parallel_copies_per_target=1,
+        )
+
+        # kept since its source still exists, but not counted as running copy
+        self.assertEqual(scheduler.find_target_dir(source_filepath), self._folder("folder_b"))
+        self.assertTrue(os.path.exists(partial_filepath))
+        self.assertDictEqual(
+            scheduler.get_target_copy_counts(),
+            {self._folder("folder_a"): 0, self._folder("folder_b"): 0},
+        )
+        scheduler.shutdown()
+
+    @patch("chia_tea.copy.Disk.is_accessible")
+    def test_target_copy_counts_contain_copies_of_other_processes(
+        self, is_accessible_mock: MagicMock
+    ):
+
+        # a copy of another process is running into folder_b
+        foreign_copy = os.path.join(self._folder("folder_b"), "foreign.plot")
+        with open(foreign_copy, "w", encoding="utf8"):
+            pass
+        is_accessible_mock.side_effect = lambda filepath: filepath != foreign_copy
+
+        scheduler = CopyScheduler(
+            target_folders={self._folder("folder_a"), self._folder("folder_b"), "not_existing"},
+        )
+        scheduler.copies_in_progress["running_file"] = self._folder("folder_a")
+
+        result = scheduler.get_target_copy_counts()
+
+        self.assertDictEqual(result, {self._folder("folder_a"): 1, self._folder("folder_b"): 1})
+        scheduler.shutdown()
+
+    @patch("chia_tea.copy.CopyScheduler.move_file")
+    @patch("chia_tea.copy.CopyScheduler.get_disks_with_space")
+    def test_copies_run_in_parallel(self, find_disk_mock: MagicMock, move_file_mock: MagicMock):
+
+        n_copies = 3
+        barrier = threading.Barrier(n_copies, timeout=5)
+        release = threading.Event()
+
+        def _move_file(*_):
+            # fails with BrokenBarrierError if copies don't run in parallel
+            barrier.wait()
+            release.wait(timeout=5)
+
+        move_file_mock.side_effect = _move_file
+        find_disk_mock.side_effect = lambda _, counts, *__: {folder: 1.0 for folder in counts}
+
+        scheduler = CopyScheduler(
+            target_folders={
+                self._folder("folder_a"),
+                self._folder("folder_b"),
+                self._folder("folder_c"),
+            },
+            max_parallel_copies=n_copies,
+            max_parallel_copies_per_target=1,
+        )
+
+        source_filepaths = {self._source_file(f"file_{i_file}") for i_file in range(n_copies)}
+        for source_filepath in source_filepaths:
+            self.assertTrue(scheduler.submit(source_filepath))
+
+        # all slots are taken now and space is reserved
+        self.assertFalse(scheduler.has_free_slot())
+        self.assertFalse(scheduler.submit(self._source_file("another_file")))
+        self.assertListEqual(
+            [
+                reservation.n_bytes
+                for reservation in scheduler.disk_space_model.reservations.values()
+            ],
+            [10] * n_copies,
+        )
+        self.assertSetEqual(
+            set(scheduler.copies_in_progress.values()),
+            {self._folder("folder_a"), self._folder("folder_b"), self._folder("folder_c")},
+        )
+
+        release.set()
+        finished = set()
+        while len(finished) < n_copies:
+            finished |= scheduler.wait_for_free_slot(timeout=5)
+
+        self.assertSetEqual(finished, source_filepaths)
+        self.assertEqual(scheduler.n_copies_in_progress, 0)
+        self.assertDictEqual(scheduler.disk_space_model.reservations, {})
+        self.assertTrue(scheduler.has_free_slot())
+        scheduler.shutdown()
+
+    @patch("chia_tea.copy.CopyScheduler.move_file")
+    @patch("chia_tea.copy.CopyScheduler.get_disks_with_space")
+    def test_failing_copy_frees_slot(self, find_disk_mock: MagicMock, move_file_mock: MagicMock):
+
+        move_file_mock.side_effect = OSError()
+        find_disk_mock.return_value = {self._folder("folder_a"): 1.0}
+
+        scheduler = CopyScheduler(target_folders={self._folder("folder_a")})
+        source_filepath = self._source_file("some_file")
+
+        self.assertTrue(scheduler.submit(source_filepath))
+        finished = scheduler.wait_for_free_slot(timeout=5)
+
+        self.assertSetEqual(finished, {source_filepath})
+        self.assertTrue(scheduler.has_free_slot())
+        self.assertDictEqual(scheduler.disk_space_model.reservations, {})
+        scheduler.shutdown()
+
+    @patch("chia_tea.copy.CopyScheduler.move_file")
+    @patch("chia_tea.copy.CopyScheduler.get_disks_with_space")
+    def test_vanished_source_is_not_submitted(
+        self, find_disk_mock: MagicMock, move_file_mock: MagicMock
+    ):
+
+        find_disk_mock.return_value = {self._folder("folder_a"): 1.0}
+
+        scheduler = CopyScheduler(target_folders={self._folder("folder_a")})
+        source_filepath = os.path.join(self.tmp_dir.name, "moved_away")
+
+        self.assertFalse(scheduler.submit(source_filepath))
+        self.assertEqual(scheduler.n_copies_in_progress, 0)
+        self.assertDictEqual(scheduler.disk_space_model.reservations, {})
+        move_file_mock.assert_not_called()
+        scheduler.shutdown()
+
+    @patch("chia_tea.copy.copy_engines.verify_full")
+    @patch("chia_tea.copy.CopyScheduler.get_disks_with_space")
+    def test_long_verification_is_no_stall(
+        self, find_disk_mock: MagicMock, verify_full_mock: MagicMock
+    ):
+
+        is_verifying = threading.Event()
+        verification_may_finish = threading.Event()
+
+        def _verify_full(*_):
+            is_verifying.set()
+            return verification_may_finish.wait(5)
+
+        verify_full_mock.side_effect = _verify_full
+        find_disk_mock.return_value = {self._folder("folder_a"): 1.0}
+
+        tracker = ThroughputTracker(stall_timeout_seconds=0.05)
+        scheduler = CopyScheduler(
+            target_folders={self._folder("folder_a")},
+            throughput_tracker=tracker,
+            verify_mode="full",
+        )
+        source_filepath = self._source_file("some_file", size=1000)
+        self.assertTrue(scheduler.submit(source_filepath))
+
+        # the target does not grow while the copy is verified
+        self.assertTrue(is_verifying.wait(5))
+        scheduler.collect_finished_copies()
+        time.sleep(0.2)
+        self.assertSetEqual(scheduler.collect_finished_copies(), set())
+
+        self.assertSetEqual(tracker.get_stalled_copies(), set())
+        self.assertSetEqual(tracker.get_demoted_targets(), set())
+        self.assertFalse(scheduler.has_free_slot())
+
+        verification_may_finish.set()
+        self.assertSetEqual(scheduler.wait_for_free_slot(timeout=5), {source_filepath})
+        self.assertFalse(os.path.exists(source_filepath))
+        scheduler.shutdown()
+
+    @patch("chia_tea.copy.CopyScheduler.move_file")
+    @patch("chia_tea.copy.CopyScheduler.get_disks_with_space")
+    def test_get_copy_jobs(self, find_disk_mock: MagicMock, move_file_mock: MagicMock):
+
+        copy_may_finish = threading.Event()
+        move_file_mock.side_effect = lambda *_: copy_may_finish.wait(5)
+        find_disk_mock.return_value = {self._folder("folder_a"): 1.0}
+
+        scheduler = CopyScheduler(target_folders={self._folder("folder_a")})
+        source_filepath = self._source_file("some_file", size=100)
+        self.assertTrue(scheduler.submit(source_filepath))
+
+        copy_jobs = scheduler.get_copy_jobs()
+
+        self.assertEqual(len(copy_jobs), 1)
+        self.assertEqual(copy_jobs[0].source_filepath, source_filepath)
+        self.assertEqual(
+            copy_jobs[0].target_filepath, os.path.join(self._folder("folder_a"), "some_file")
+        )
+        self.assertEqual(copy_jobs[0].n_bytes_total, 100)
+        self.assertAlmostEqual(copy_jobs[0].start_time, time.time(), delta=5)
+
+        copy_may_finish.set()
+        scheduler.wait_for_free_slot(timeout=5)
+        self.assertListEqual(scheduler.get_copy_jobs(), [])
+        scheduler.shutdown()
+
+    @patch("chia_tea.copy.CopyScheduler.move_file")
+    @patch("chia_tea.copy.CopyScheduler.get_disks_with_space")
+    def test_shutdown_stops_running_copies(
+        self, find_disk_mock: MagicMock, move_file_mock: MagicMock
+    ):
+
+        is_copying = threading.Event()
+
+        def _move_file(*args):
+            is_copying.set()
+            stop_event = args[-1]
+            if not stop_event.wait(5):
+                return True
+            raise InterruptedError()
+
+        move_file_mock.side_effect = _move_file
+        find_disk_mock.return_value = {self._folder("folder_a"): 1.0}
+
+        scheduler = CopyScheduler(target_folders={self._folder("folder_a")})
+        source_filepath = self._source_file("some_file")
+        self.assertTrue(scheduler.submit(source_filepath))
+        self.assertTrue(is_copying.wait(5))
+
+        # the copy does not run to its end
+        start = time.monotonic()
+        scheduler.shutdown(wait_for_copies=False)
+        self.assertSetEqual(scheduler.wait_for_free_slot(timeout=4), {source_filepath})
+        self.assertLess(time.monotonic() - start, 4)
+        self.assertTrue(os.path.exists(source_filepath))
+
+    def test_wake_up_interrupts_waiting(self):
+
+        scheduler = CopyScheduler(target_folders={self._folder("folder_a")})
+
+        threading.Timer(0.1, scheduler.wake_up).start()
+        start = time.monotonic()
+        finished = scheduler.wait_for_free_slot(timeout=10)
+
+        self.assertLess(time.monotonic() - start, 5)
+        self.assertSetEqual(finished, set())
+        scheduler.shutdown()
+
+    @patch("chia_tea.copy.CopyScheduler.get_disks_with_space")
+    def test_find_target_dir_skips_paused_targets(self, find_disk_mock: MagicMock):
+
+        scheduler = CopyScheduler(
+            target_folders={self._folder("folder_a"), self._folder("folder_b")},
+            max_parallel_copies=4,
+        )
+        find_disk_mock.side_effect = lambda _, counts, *__: {folder: 1.0 for folder in counts}
+
+        scheduler.pause_target(self._folder("folder_a"))
+        self.assertEqual(scheduler.find_target_dir("some_file"), self._folder("folder_b"))
+
+        find_disk_mock.reset_mock()
+        scheduler.resume_target(self._folder("folder_a"))
+        scheduler.find_target_dir("some_file")
+        find_disk_mock.assert_called_once_with(
+            "some_file",
+            {self._folder("folder_a"): 0, self._folder("folder_b"): 0},
+            scheduler.disk_space_model,
+            ANY,
+        )
+
+        with self.assertRaises(ValueError):
+            scheduler.pause_target(self._folder("unknown"))
+        scheduler.shutdown()
+
+    @patch("chia_tea.copy.CopyScheduler.move_file")
+    @patch("chia_tea.copy.CopyScheduler.get_disks_with_space")
+    def test_set_concurrency_keeps_running_copies(
+        self, find_disk_mock: MagicMock, move_file_mock: MagicMock
+    ):
+
+        release = threading.Event()
+        move_file_mock.side_effect = lambda *_: release.wait(5)
+        find_disk_mock.side_effect = lambda _, counts, *__: {folder: 1.0 for folder in counts}
+
+        scheduler = CopyScheduler(
+            target_folders={self._folder("folder_a"), self._folder("folder_b")},
+            max_parallel_copies=1,
+        )
+        first_file = self._source_file("first_file")
+        self.assertTrue(scheduler.submit(first_file))
+        self.assertFalse(scheduler.has_free_slot())
+
+        # more copies than threads of the initial pool
+        scheduler.set_concurrency(max_parallel_copies=3, max_parallel_copies_per_target=2)
+        source_filepaths = {self._source_file(f"file_{i_file}") for i_file in range(2)}
+        for source_filepath in source_filepaths:
+            self.assertTrue(scheduler.submit(source_filepath))
+        self.assertEqual(scheduler.n_copies_in_progress, 3)
+
+        # lowering the limits does not stop running copies
+        scheduler.set_concurrency(max_parallel_copies=1)
+        self.assertFalse(scheduler.has_free_slot())
+
+        release.set()
+        finished = set()
+        while len(finished) < 3:
+            finished |= scheduler.wait_for_free_slot(timeout=5)
+
+        self.assertSetEqual(finished, source_filepaths | {first_file})
+        self.assertTrue(scheduler.has_free_slot())
+        scheduler.shutdown()
@@ -1,9 +1,10 @@
 import ntpath
+import os
+import tempfile
 import unittest
 from unittest.mock import call, patch, MagicMock, Mock
 
 from .Disk import (
-    DiskCopyInfo,
     collect_files_from_folders,
     copy_file,
     filter_least_used_disks,
@@ -12,6 +13,7 @@ from .Disk import (
     is_accessible,
     move_file,
 )
+from .FilesystemSnapshot import FilesystemSnapshot
 
 
 # we need to mock the join function with our own implementation
@@ -20,6 +22,11 @@ def _path_join(*args):
     return "/".join(args)
 
 
+def _touch(filepath: str):
+    with open(filepath, "w", encoding="utf8"):
+        pass
+
+
 class TestDisk(unittest.TestCase):
     def test_filter_least_used_disks_works(self):
         result = filter_least_used_disks(
@@ -32,47 +39,32 @@ class TestDisk(unittest.TestCase):
         )
         self.assertSetEqual(result, {"a", "d"})
 
-    @patch("chia_tea.copy.Disk.os.path")
-    @patch("chia_tea.copy.Disk.glob")
-    def test_collect_files_from_folders(self, glob_mock, path_mock):
-        files_in_folders = {
-            "folder_a": [
-                "folder_a/file_a",
-                "folder_a/file_b",
-                "folder_a/subfolder",
-            ],
-        }
-
-        not_existing_folders = {"not_existing_folder"}
-        files_and_not_folders = {"some_file"}
-        some_symlink = {"some_symlink"}
-        all_directory_items = (
-            *files_in_folders.keys(),
-            *not_existing_folders,
-            *files_and_not_folders,
-            *some_symlink,
-        )
-
-        expected_filepaths = {
-            "folder_a/file_a",
-            "folder_a/file_b",
-        }
-
-        glob_mock.glob = lambda _: files_in_folders["folder_a"]
-        path_mock.exists = lambda path: path != "not_existing_folder"
-        path_mock.isfile = lambda path: path in {
-            "folder_a/file_a",
-            "folder_a/file_b",
-            "some_file",
-        }
-        path_mock.isdir = lambda path: path in {"folder_a", "folder_a/subfolder"}
-        path_mock.join = _path_join
+    def test_collect_files_from_folders(self):
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            folder_a = os.path.join(tmp_dir, "folder_a")
+            os.makedirs(os.path.join(folder_a, "subfolder"))
+            for name in ("file_a", "file_b", ".hidden_file"):
+                _touch(os.path.join(folder_a, name))
+            some_file = os.path.join(tmp_dir, "some_file")
+            _touch(some_file)
+            some_symlink = os.path.join(tmp_dir, "some_symlink")
+            os.symlink(os.path.join(tmp_dir, "nowhere"), some_symlink)
+
+            filepath_set = collect_files_from_folders(
+                folder_set={
+                    folder_a,
+                    os.path.join(tmp_dir, "not_existing_folder"),
+                    some_file,
+                    some_symlink,
+                },
+                pattern="*",
+            )
 
-        filepath_set = collect_files_from_folders(
-            folder_set=all_directory_items,
-            pattern="*",
-        )
-        self.assertSetEqual(filepath_set, expected_filepaths)
+            self.assertSetEqual(
+                filepath_set,
+                {os.path.join(folder_a, "file_a"), os.path.join(folder_a, "file_b")},
+            )
 
     @patch("chia_tea.copy.Disk.open")
     def test_is_accessible(self, open_mock: MagicMock):
@@ -112,13 +104,13 @@ class TestDisk(unittest.TestCase):
         self.assertFalse(result)
         open_mock.assert_called_with(filepath, "r+", encoding="utf8")
 
-    @patch("chia_tea.copy.Disk.psutil")
-    @patch("chia_tea.copy.Disk.os.path")
+    @patch("chia_tea.copy.FilesystemSnapshot.psutil")
+    @patch.object(FilesystemSnapshot, "stat")
     @patch("chia_tea.copy.Disk.os")
     def test_find_disk_with_space(
         self,
         os_mock: MagicMock,
-        path_mock: MagicMock,
+        stat_mock: MagicMock,
         psutil_mock: MagicMock,
     ):
         file_to_copy = "path/to/file"
@@ -127,8 +119,7 @@ class TestDisk(unittest.TestCase):
             "folder_b": 2,
         }
 
-        os_mock.stat.return_value = Mock(st_size=1.08e11)
-        path_mock.exists.return_value = True
+        stat_mock.return_value = Mock(st_size=1.08e11)
         psutil_mock.disk_usage.return_value = Mock(free=3 * 1.08e11)
 
         result = find_disk_with_space(
@@ -137,11 +128,7 @@ class TestDisk(unittest.TestCase):
         )
         self.assertEqual(result, "folder_a")
         os_mock.makedirs.assert_not_called()
-        os_mock.stat.assert_called_with(file_to_copy)
-        path_mock.exists.assert_has_calls(
-            [call(folder) for folder in target_dirs_process_count],
-            any_order=True,
-        )
+        stat_mock.assert_called_with(file_to_copy)
         psutil_mock.disk_usage.assert_has_calls(
             [call(folder) for folder in target_dirs_process_count],
             any_order=True,
@@ -155,24 +142,58 @@ class TestDisk(unittest.TestCase):
             OSError(),
         ):
             os_mock.reset_mock()
-            path_mock.reset_mock()
             psutil_mock.reset_mock()
 
-            os_mock.stat.return_value = Mock(st_size=1.08e11)
-            os_mock.path.exists.side_effect = err
+            psutil_mock.disk_usage.side_effect = err
 
             result = find_disk_with_space(
                 filepath_file=file_to_copy,
                 target_dirs_process_count=target_dirs_process_count,
             )
             self.assertIsNone(result)
-            os_mock.stat.assert_called_with(file_to_copy)
-            path_mock.exists.assert_has_calls(
+            psutil_mock.disk_usage.assert_has_calls(
                 [call(folder) for folder in target_dirs_process_count],
                 any_order=True,
             )
+            # missing folders are created
+            if isinstance(err, FileNotFoundError):
+                os_mock.makedirs.assert_has_calls(
+                    [call(folder, exist_ok=True) for folder in target_dirs_process_count],
+                    any_order=True,
+                )
+            else:
+                os_mock.makedirs.assert_not_called()
+
+    @patch("chia_tea.copy.FilesystemSnapshot.psutil")
+    @patch.object(FilesystemSnapshot, "stat")
+    @patch("chia_tea.copy.Disk.os")
+    def test_find_disk_with_space_with_disk_space_model(
+        self,
+        os_mock: MagicMock,
+        stat_mock: MagicMock,
+        psutil_mock: MagicMock,
+    ):
+        file_to_copy = "path/to/file"
+        free_space = {
+            "folder_a": 3 * 1.5e11,
+            "folder_b": 3 * 1.5e11,
+        }
+        disk_space_model = Mock()
+        disk_space_model.get_free_space.side_effect = free_space.get
+        stat_mock.return_value = Mock(st_size=1.5e11)
+
+        # other copies are assumed to be as large as the file
+        result = find_disk_with_space(
+            filepath_file=file_to_copy,
+            target_dirs_process_count={"folder_a": 2, "folder_b": 1},
+            disk_space_model=disk_space_model,
+        )
+
+        self.assertEqual(result, "folder_b")
+        psutil_mock.disk_usage.assert_not_called()
+        os_mock.makedirs.assert_not_called()
 
-    @patch("chia_tea.copy.Disk.shutil.copyfile")
+    @patch("chia_tea.copy.Disk.copy_file_content")
     @patch("chia_tea.copy.Disk.is_accessible")
     def test_copy_file(self, is_accessible_mock, copyfile_mock):
 
@@ -181,10 +202,19 @@ class TestDisk(unittest.TestCase):
 
         # success case
         is_accessible_mock.return_value = True
+        copyfile_mock.return_value = "sendfile"
         success = copy_file(source_file, target_file)
-        self.assertTrue(success)
+        self.assertEqual(success, "sendfile")
         is_accessible_mock.assert_called_once_with(source_file)
-        copyfile_mock.assert_called_once_with(source_file, target_file)
+        copyfile_mock.assert_called_once_with(
+            source_file,
+            target_file,
+            bandwidth_limiter=None,
+            verify_mode="none",
+            direct_io=False,
+            on_phase=None,
+            stop_event=None,
+        )
 
         is_accessible_mock.reset_mock()
         copyfile_mock.reset_mock()
@@ -236,12 +266,20 @@ class TestDisk(unittest.TestCase):
 
         path_mock.join = _path_join
         path_mock.isdir.return_value = True
-        copy_file_mock.return_value = True
+        copy_file_mock.return_value = "sendfile"
 
         move_file(source_file, target_folder)
 
         path_mock.isdir.assert_called_once_with(target_folder)
-        copy_file_mock.assert_called_once_with(source_file, target_path)
+        copy_file_mock.assert_called_once_with(
+            source_file,
+            target_path,
+            bandwidth_limiter=None,
+            verify_mode="none",
+            direct_io=False,
+            on_phase=None,
+            stop_event=None,
+        )
         os_mock.unlink.assert_called_once_with(source_file)
 
     @patch("chia_tea.copy.Disk.os.path")
@@ -258,12 +296,20 @@ class TestDisk(unittest.TestCase):
 
         path_mock.join = _path_join
         path_mock.isdir.return_value = True
-        copy_file_mock.return_value = False
+        copy_file_mock.return_value = ""
 
         move_file(source_file, target_folder)
 
         path_mock.isdir.assert_called_once_with(target_folder)
-        copy_file_mock.assert_called_once_with(source_file, target_path)
+        copy_file_mock.assert_called_once_with(
+            source_file,
+            target_path,
+            bandwidth_limiter=None,
+            verify_mode="none",
+            direct_io=False,
+            on_phase=None,
+            stop_event=None,
+        )
         os_mock.unlink.assert_not_called()
 
     @patch("chia_tea.copy.Disk.os.path")
@@ -280,197 +326,126 @@ class TestDisk(unittest.TestCase):
 
         path_mock.join = _path_join
         path_mock.isdir.return_value = True
-        copy_file_mock.return_value = True
+        copy_file_mock.return_value = "sendfile"
         os_mock.unlink.side_effect = FileNotFoundError()
 
         move_file(source_file, target_folder)
 
         path_mock.isdir.assert_called_once_with(target_folder)
-        copy_file_mock.assert_called_once_with(source_file, target_path)
+        copy_file_mock.assert_called_once_with(
+            source_file,
+            target_path,
+            bandwidth_limiter=None,
+            verify_mode="none",
+            direct_io=False,
+            on_phase=None,
+            stop_event=None,
+        )
         os_mock.unlink.assert_called_once_with(source_file)
 
     @patch("chia_tea.copy.Disk.is_accessible")
-    @patch("chia_tea.copy.Disk.os.path")
-    @patch("chia_tea.copy.Disk.os")
-    def test_get_files_being_copied_with_no_prev_checked_files(
-        self, os_mock, path_mock, is_accessible_mock
-    ):
+    def test_get_files_being_copied_with_no_prev_checked_files(self, is_accessible_mock):
 
-        target_dirs = {
-            "folder_a",
-        }
-        expected_result = {
-            "folder_a": DiskCopyInfo(
-                files_in_progress=set(),
-                files_not_being_copied={
-                    "folder_a/file_copied",
-                },
-            ),
-        }
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            folder_a = os.path.join(tmp_dir, "folder_a")
+            os.makedirs(folder_a)
+            file_copied = os.path.join(folder_a, "file_copied")
+            _touch(file_copied)
+            is_accessible_mock.return_value = True
 
-        # mock stuff
-        os_mock.listdir.return_value = ["file_copied"]
-        path_mock.join = _path_join
-        path_mock.exists.return_value = True
-        path_mock.isdir.return_value = True
-        path_mock.isfile.return_value = True
-        is_accessible_mock.return_value = True
+            result = get_files_being_copied(directories={folder_a})
 
-        # do the thing
-        result = get_files_being_copied(directories=target_dirs)
+            self.assertSetEqual(result[folder_a].files_in_progress, set())
+            self.assertSetEqual(result[folder_a].files_not_being_copied, {file_copied})
+            is_accessible_mock.assert_called_once_with(file_copied)
 
-        # checks
-        for folder, info in result.items():
-            self.assertSetEqual(
-                info.files_in_progress,
-                expected_result[folder].files_in_progress,
-            )
-            self.assertSetEqual(
-                info.files_not_being_copied,
-                expected_result[folder].files_not_being_copied,
-            )
+    @patch("chia_tea.copy.Disk.is_accessible")
+    def test_get_files_being_copied_with_copies_in_progress(self, is_accessible_mock):
 
-        is_accessible_mock.assert_has_calls(
-            [
-                *(
-                    call(path)
-                    for info in expected_result.values()
-                    for path in info.files_not_being_copied
-                ),
-                *(
-                    call(path)
-                    for info in expected_result.values()
-                    for path in info.files_in_progress
-                ),
-            ],
-            any_order=True,
-        )
-        os_mock.listdir.assert_has_calls(
-            [call(dirname) for dirname in target_dirs],
-            any_order=True,
-        )
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            target_dirs = {os.path.join(tmp_dir, "folder_a"), os.path.join(tmp_dir, "folder_b")}
+            for folder in target_dirs:
+                os.makedirs(folder)
+                _touch(os.path.join(folder, "file_in_progress"))
+            is_accessible_mock.return_value = False
+
+            result = get_files_being_copied(directories=target_dirs)
+
+            for folder in target_dirs:
+                self.assertSetEqual(
+                    result[folder].files_in_progress,
+                    {os.path.join(folder, "file_in_progress")},
+                )
+                self.assertSetEqual(result[folder].files_not_being_copied, set())
+            self.assertEqual(is_accessible_mock.call_count, 2)
 
     @patch("chia_tea.copy.Disk.is_accessible")
-    @patch("chia_tea.copy.Disk.os.path")
-    @patch("chia_tea.copy.Disk.os")
-    def test_get_files_being_copied_with_copies_in_progress(
-        self, os_mock, path_mock, is_accessible_mock
-    ):
+    def test_get_files_being_copied_not_being_given_dirs(self, is_accessible_mock):
 
-        target_dirs = {
-            "folder_a",
-            "folder_b",
-        }
-        expected_result = {
-            "folder_a": DiskCopyInfo(
-                files_in_progress={
-                    "folder_a/file_in_progress",
-                },
-                files_not_being_copied=set(),
-            ),
-            "folder_b": DiskCopyInfo(
-                files_in_progress={
-                    "folder_b/file_in_progress",
-                },
-                files_not_being_copied=set(),
-            ),
-        }
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            some_file = os.path.join(tmp_dir, "some_file")
+            _touch(some_file)
 
-        # mock stuff
-        os_mock.listdir.return_value = ["file_in_progress"]
-        path_mock.join = _path_join
-        path_mock.exists.return_value = True
-        path_mock.isdir.return_value = True
-        path_mock.isfile.return_value = True
-        is_accessible_mock.return_value = False
+            result = get_files_being_copied(directories={some_file})
 
-        # do the thing
-        result = get_files_being_copied(directories=target_dirs)
+            self.assertDictEqual(result, {})
+            is_accessible_mock.assert_not_called()
+
+    @patch("chia_tea.copy.Disk.is_accessible")
+    def test_get_files_being_copied_being_given_nonexisting_folders(self, is_accessible_mock):
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            result = get_files_being_copied(directories={os.path.join(tmp_dir, "does_not_exist")})
+
+            self.assertDictEqual(result, {})
+            is_accessible_mock.assert_not_called()
+
+    @patch("chia_tea.copy.Disk.is_accessible")
+    def test_get_files_being_copied_with_partial_files(self, is_accessible_mock):
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            _touch(os.path.join(tmp_dir, "file.plot.partial"))
+            _touch(os.path.join(tmp_dir, "file.plot.partial.checkpoint"))
+            is_accessible_mock.return_value = True
+
+            result = get_files_being_copied(directories={tmp_dir})
 
-        # checks
-        for folder, info in result.items():
-            self.assertSetEqual(
-                info.files_in_progress,
-                expected_result[folder].files_in_progress,
-            )
             self.assertSetEqual(
-                info.files_not_being_copied,
-                expected_result[folder].files_not_being_copied,
+                result[tmp_dir].files_in_progress, {os.path.join(tmp_dir, "file.plot.partial")}
             )
-        is_accessible_mock.assert_has_calls(
-            [
-                *(
-                    call(path)
-                    for info in expected_result.values()
-                    for path in info.files_not_being_copied
-                ),
-                *(
-                    call(path)
-                    for info in expected_result.values()
-                    for path in info.files_in_progress
-                ),
-            ],
-            any_order=True,
-        )
-        os_mock.listdir.assert_has_calls(
-            [call(dirname) for dirname in target_dirs],
-            any_order=True,
-        )
+            self.assertSetEqual(result[tmp_dir].files_not_being_copied, set())
+            is_accessible_mock.assert_not_called()
 
     @patch("chia_tea.copy.Disk.is_accessible")
-    @patch("chia_tea.copy.Disk.os.path")
-    @patch("chia_tea.copy.Disk.os")
-    def test_get_files_being_copied_not_being_given_dirs(
-        self, os_mock, path_mock, is_accessible_mock
-    ):
+    def test_get_files_being_copied_with_abandoned_partial_files(self, is_accessible_mock):
 
-        target_dirs = {
-            "some_file",
-        }
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            partial_filepath = os.path.join(tmp_dir, "file.plot.partial")
+            _touch(partial_filepath)
+            # not written for an hour e.g. since the copy failed
+            os.utime(partial_filepath, (0, os.path.getmtime(partial_filepath) - 3600))
 
-        # mock stuff
-        os_mock.listdir.return_value = []
-        path_mock.join = _path_join
-        path_mock.exists.return_value = True
-        path_mock.isdir.return_value = False
-        path_mock.isfile.return_value = True
-        is_accessible_mock.return_value = True
+            result = get_files_being_copied(directories={tmp_dir})
 
-        # do the thing
-        result = get_files_being_copied(directories=target_dirs)
+            self.assertSetEqual(result[tmp_dir].files_in_progress, set())
+            self.assertSetEqual(result[tmp_dir].interrupted_copies, {partial_filepath})
+            is_accessible_mock.assert_not_called()
 
-        # checks
-        self.assertDictEqual(result, {})
-        path_mock.exists.assert_called_once_with(next(iter(target_dirs)))
-        path_mock.isdir.assert_called_once_with(next(iter(target_dirs)))
-        os_mock.listdir.assert_not_called()
-        is_accessible_mock.assert_not_called()
+            # unless this process is still copying it
+            result = get_files_being_copied(directories={tmp_dir}, known_copies={partial_filepath})
+            self.assertSetEqual(result[tmp_dir].files_in_progress, {partial_filepath})
 
     @patch("chia_tea.copy.Disk.is_accessible")
-    @patch("chia_tea.copy.Disk.os.path")
-    @patch("chia_tea.copy.Disk.os")
-    def test_get_files_being_copied_being_given_nonexisting_folders(
-        self, os_mock, path_mock, is_accessible_mock
-    ):
-
-        target_dirs = {
-            "does_not_exist",
-        }
+    def test_get_files_being_copied_shares_snapshot(self, is_accessible_mock):
 
-        # mock stuff
-        os_mock.listdir.return_value = []
-        path_mock.join = _path_join
-        path_mock.exists.return_value = False
-        path_mock.isdir.return_value = True
-        path_mock.isfile.return_value = True
-        is_accessible_mock.return_value = True
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            _touch(os.path.join(tmp_dir, "file.plot"))
+            is_accessible_mock.return_value = True
+            snapshot = FilesystemSnapshot()
 
-        # do the thing
-        result = get_files_being_copied(directories=target_dirs)
+            with patch("chia_tea.copy.FilesystemSnapshot.os.scandir", wraps=os.scandir) as scandir:
+                get_files_being_copied(directories={tmp_dir}, snapshot=snapshot)
+                collect_files_from_folders({tmp_dir}, "*.plot", snapshot=snapshot)
 
-        # checks
-        self.assertDictEqual(result, {})
-        path_mock.exists.assert_called_once_with(next(iter(target_dirs)))
-        path_mock.isdir.assert_not_called()
-        os_mock.listdir.assert_not_called()
-        is_accessible_mock.assert_not_called()
+            # the folder is listed only once
+            scandir.assert_called_once()
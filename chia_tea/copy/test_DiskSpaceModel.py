@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, Mock, patch
+
+from .DiskSpaceModel import DiskSpaceModel
+
+
+class TestDiskSpaceModel(unittest.TestCase):
+    def setUp(self) -> None:
+        # pylint: disable=consider-using-with
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.folder = self.tmp_dir.name
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    @patch("chia_tea.copy.DiskSpaceModel.time")
+    @patch("chia_tea.copy.DiskSpaceModel.psutil")
+    def test_free_space_is_cached(self, psutil_mock: MagicMock, time_mock: MagicMock):
+
+        psutil_mock.disk_usage.return_value = Mock(free=1000)
+        time_mock.monotonic.return_value = 0
+
+        model = DiskSpaceModel(ttl_seconds=10)
+
+        self.assertEqual(model.get_free_space(self.folder), 1000)
+        self.assertEqual(model.get_free_space(self.folder), 1000)
+        psutil_mock.disk_usage.assert_called_once_with(self.folder)
+
+        # checked again after the ttl
+        psutil_mock.disk_usage.return_value = Mock(free=500)
+        time_mock.monotonic.return_value = 11
+        self.assertEqual(model.get_free_space(self.folder), 500)
+        self.assertEqual(psutil_mock.disk_usage.call_count, 2)
+
+    @patch("chia_tea.copy.DiskSpaceModel.psutil")
+    def test_reservations_are_subtracted(self, psutil_mock: MagicMock):
+
+        psutil_mock.disk_usage.return_value = Mock(free=1000)
+        target_filepath = os.path.join(self.folder, "file.plot")
+
+        model = DiskSpaceModel(ttl_seconds=0)
+        model.get_free_space(self.folder)
+        model.reserve(target_filepath, 300)
+        model.reserve(os.path.join(self.folder, "other.plot"), 100)
+
+        self.assertEqual(model.get_free_space(self.folder), 600)
+
+        # bytes on disk are contained in the free space already
+        with open(target_filepath + ".partial", "wb") as fp:
+            fp.write(b"0" * 200)
+        psutil_mock.disk_usage.return_value = Mock(free=800)
+        self.assertEqual(model.get_free_space(self.folder), 600)
+
+        model.release(target_filepath)
+        model.release("unknown.plot")
+        self.assertEqual(model.get_free_space(self.folder), 700)
+        self.assertListEqual(list(model.reservations), [os.path.join(self.folder, "other.plot")])
+
+    @patch("chia_tea.copy.DiskSpaceModel.psutil")
+    def test_release_checks_disk_again(self, psutil_mock: MagicMock):
+
+        psutil_mock.disk_usage.return_value = Mock(free=1000)
+        target_filepath = os.path.join(self.folder, "file.plot")
+
+        model = DiskSpaceModel(ttl_seconds=3600)
+        model.get_free_space(self.folder)
+        model.reserve(target_filepath, 300)
+        self.assertEqual(model.get_free_space(self.folder), 700)
+
+        # the copy finished and wrote its bytes
+        psutil_mock.disk_usage.return_value = Mock(free=700)
+        model.release(target_filepath)
+
+        self.assertEqual(model.get_free_space(self.folder), 700)
+        self.assertEqual(psutil_mock.disk_usage.call_count, 2)
+
+    def test_missing_folder_is_created(self):
+
+        folder = os.path.join(self.folder, "new")
+
+        model = DiskSpaceModel()
+
+        self.assertGreater(model.get_free_space(folder), 0)
+        self.assertTrue(os.path.isdir(folder))
@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from .FilesystemSnapshot import FilesystemSnapshot
+
+
+def _touch(filepath: str):
+    with open(filepath, "w", encoding="utf8"):
+        pass
+
+
+class TestFilesystemSnapshot(unittest.TestCase):
+    def test_folders_are_listed_once(self):
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            _touch(os.path.join(tmp_dir, "a.plot"))
+            _touch(os.path.join(tmp_dir, ".hidden.plot"))
+            os.makedirs(os.path.join(tmp_dir, "folder.plot"))
+            snapshot = FilesystemSnapshot()
+
+            with patch("chia_tea.copy.FilesystemSnapshot.os.scandir", wraps=os.scandir) as scandir:
+                self.assertListEqual(
+                    snapshot.get_files(tmp_dir, "*.plot"), [os.path.join(tmp_dir, "a.plot")]
+                )
+                self.assertSetEqual(
+                    set(snapshot.get_files(tmp_dir)),
+                    {os.path.join(tmp_dir, "a.plot"), os.path.join(tmp_dir, ".hidden.plot")},
+                )
+
+            scandir.assert_called_once_with(tmp_dir)
+
+    def test_listed_paths_are_not_stat_again(self):
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filepath = os.path.join(tmp_dir, "a.plot")
+            _touch(filepath)
+            snapshot = FilesystemSnapshot()
+            snapshot.list_folder(tmp_dir)
+
+            with patch("chia_tea.copy.FilesystemSnapshot.os.stat") as stat_mock:
+                self.assertTrue(snapshot.is_file(filepath))
+                self.assertFalse(snapshot.is_dir(filepath))
+                self.assertEqual(snapshot.stat(filepath).st_size, 0)
+                # missing from the listing means it does not exist
+                self.assertFalse(snapshot.exists(os.path.join(tmp_dir, "missing.plot")))
+
+            stat_mock.assert_not_called()
+
+    def test_errors_are_cached(self):
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            missing_folder = os.path.join(tmp_dir, "missing")
+            some_file = os.path.join(tmp_dir, "some_file")
+            _touch(some_file)
+            snapshot = FilesystemSnapshot()
+
+            with patch("chia_tea.copy.FilesystemSnapshot.os.scandir", wraps=os.scandir) as scandir:
+                for _ in range(2):
+                    with self.assertRaises(FileNotFoundError):
+                        snapshot.list_folder(missing_folder)
+                    with self.assertRaises(NotADirectoryError):
+                        snapshot.list_folder(some_file)
+                    self.assertListEqual(snapshot.get_files(missing_folder), [])
+
+            self.assertEqual(scandir.call_count, 2)
+
+    def test_snapshot_is_not_updated(self):
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            snapshot = FilesystemSnapshot()
+            self.assertListEqual(snapshot.get_files(tmp_dir), [])
+
+            _touch(os.path.join(tmp_dir, "new.plot"))
+
+            self.assertListEqual(snapshot.get_files(tmp_dir), [])
+            self.assertEqual(len(FilesystemSnapshot().get_files(tmp_dir)), 1)
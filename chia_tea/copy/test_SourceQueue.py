@@ -0,0 +1,89 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, Mock, patch
+
+from .SourceQueue import SourceQueue
+
+
+class TestSourceQueue(unittest.TestCase):
+    def setUp(self) -> None:
+        # pylint: disable=consider-using-with
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def _create_file(self, folder: str, name: str, mtime: float, size: int = 10) -> str:
+        folder = os.path.join(self.tmp_dir.name, folder)
+        os.makedirs(folder, exist_ok=True)
+        filepath = os.path.join(folder, name)
+        with open(filepath, "wb") as fp:
+            fp.write(b"0" * size)
+        os.utime(filepath, (mtime, mtime))
+        return filepath
+
+    @patch("chia_tea.copy.SourceQueue.psutil")
+    def test_oldest_file_first(self, psutil_mock: MagicMock):
+
+        psutil_mock.disk_usage.return_value = Mock(free=1000)
+        new_file = self._create_file("plots", "new.plot", mtime=200)
+        old_file = self._create_file("plots", "old.plot", mtime=100)
+
+        queue = SourceQueue()
+        queue.update({new_file, old_file})
+
+        self.assertListEqual(queue.get_ordered_files(), [old_file, new_file])
+        self.assertEqual(queue.get_next(copying={old_file}), new_file)
+
+        queue.update(set())
+        self.assertIsNone(queue.get_next())
+        self.assertEqual(len(queue), 0)
+
+    @patch("chia_tea.copy.SourceQueue.os.stat")
+    @patch("chia_tea.copy.SourceQueue.psutil")
+    def test_fullest_disk_first(self, psutil_mock: MagicMock, stat_mock: MagicMock):
+
+        stat_mock.side_effect = lambda filepath: Mock(
+            st_dev=1 if filepath.startswith("/full") else 2,
+            st_size=100,
+            st_mtime=100 if filepath.startswith("/full") else 0,
+        )
+        psutil_mock.disk_usage.side_effect = lambda folder: Mock(
+            free=50 if folder.startswith("/full") else 120
+        )
+
+        queue = SourceQueue()
+        queue.update({"/full/a.plot", "/full/b.plot", "/empty/c.plot"})
+
+        self.assertIn(queue.get_next(), {"/full/a.plot", "/full/b.plot"})
+        # the running copy frees space on the full disk soon
+        self.assertEqual(queue.get_next(copying={"/full/a.plot"}), "/empty/c.plot")
+        # free space is only checked once per disk
+        self.assertEqual(psutil_mock.disk_usage.call_count, 2)
+
+    @patch("chia_tea.copy.SourceQueue.psutil")
+    def test_source_priorities(self, psutil_mock: MagicMock):
+
+        psutil_mock.disk_usage.return_value = Mock(free=1000)
+        normal_file = self._create_file("plots", "a.plot", mtime=100)
+        important_file = self._create_file("important", "b.plot", mtime=200)
+
+        queue = SourceQueue(source_priorities={os.path.join(self.tmp_dir.name, "important", ""): 1})
+        queue.update({normal_file, important_file})
+
+        self.assertListEqual(queue.get_ordered_files(), [important_file, normal_file])
+
+    @patch("chia_tea.copy.SourceQueue.psutil")
+    def test_update_only_inspects_new_files(self, psutil_mock: MagicMock):
+
+        psutil_mock.disk_usage.return_value = Mock(free=1000)
+        filepath = self._create_file("plots", "a.plot", mtime=100)
+
+        queue = SourceQueue()
+        queue.update({filepath, "/does/not/exist.plot"})
+        self.assertListEqual(queue.get_ordered_files(), [filepath])
+
+        with patch("chia_tea.copy.SourceQueue.os.stat") as stat_mock:
+            queue.update({filepath})
+            stat_mock.assert_not_called()
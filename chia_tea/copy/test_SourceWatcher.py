@@ -0,0 +1,89 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from ..general.inotify import is_inotify_available
+from .SourceWatcher import SourceWatcher
+
+
+def _touch(filepath: str):
+    with open(filepath, "w", encoding="utf8"):
+        pass
+
+
+def _wait_until(condition, timeout: float = 5) -> bool:
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestSourceWatcher(unittest.TestCase):
+    def setUp(self) -> None:
+        # pylint: disable=consider-using-with
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.folder = os.path.join(self.tmp_dir.name, "plots")
+        os.makedirs(self.folder)
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    @unittest.skipUnless(is_inotify_available(), "requires inotify")
+    def test_new_files_are_reported(self):
+
+        existing_plot = os.path.join(self.folder, "existing.plot")
+        new_plot = os.path.join(self.folder, "new.plot")
+        _touch(existing_plot)
+
+        new_files_event = threading.Event()
+        watcher = SourceWatcher(
+            {self.folder, "not_existing"}, "*.plot", on_new_files=new_files_event.set
+        )
+        watcher.start()
+        try:
+            self.assertTrue(watcher.is_event_driven)
+            self.assertSetEqual(watcher.get_files(), {existing_plot})
+
+            # plots are written to a temporary file and renamed
+            _touch(new_plot + ".tmp")
+            self.assertFalse(new_files_event.wait(0.2))
+            os.rename(new_plot + ".tmp", new_plot)
+
+            self.assertTrue(new_files_event.wait(5))
+            self.assertSetEqual(watcher.get_files(), {existing_plot, new_plot})
+
+            # removed files are forgotten
+            os.unlink(existing_plot)
+            self.assertTrue(_wait_until(lambda: watcher.get_files() == {new_plot}))
+
+            # as well as all files of a removed folder
+            shutil.rmtree(self.folder)
+            self.assertTrue(_wait_until(lambda: watcher.get_files() == set()))
+        finally:
+            watcher.stop()
+
+    @patch("chia_tea.copy.SourceWatcher.collect_files_from_folders")
+    @patch("chia_tea.copy.SourceWatcher.is_inotify_available")
+    def test_falls_back_to_scanning(
+        self, is_inotify_available_mock: MagicMock, collect_files_mock: MagicMock
+    ):
+
+        is_inotify_available_mock.return_value = False
+        collect_files_mock.return_value = {"some.plot"}
+
+        watcher = SourceWatcher({self.folder}, "*.plot")
+        watcher.start()
+
+        self.assertFalse(watcher.is_event_driven)
+        self.assertSetEqual(watcher.get_files(), {"some.plot"})
+        self.assertSetEqual(watcher.get_files(), {"some.plot"})
+        self.assertEqual(collect_files_mock.call_count, 2)
+        collect_files_mock.assert_called_with({self.folder}, "*.plot")
+
+        watcher.stop()
@@ -0,0 +1,129 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from .copy_engines import PHASE_COPYING, PHASE_VERIFYING
+from .ThroughputTracker import ThroughputStats, ThroughputTracker
+
+
+class TestThroughputStats(unittest.TestCase):
+    def test_update_weights_by_duration(self):
+
+        stats = ThroughputStats()
+        stats.update(100, duration_seconds=10, half_life_seconds=60)
+        self.assertEqual(stats.bytes_per_sec, 100)
+
+        # a measurement over one half life moves halfway
+        stats.update(0, duration_seconds=60, half_life_seconds=60)
+        self.assertAlmostEqual(stats.bytes_per_sec, 50)
+        self.assertEqual(stats.measured_seconds, 70)
+
+
+@patch("chia_tea.copy.ThroughputTracker.time")
+class TestThroughputTracker(unittest.TestCase):
+    def _create_tracker(self) -> ThroughputTracker:
+        return ThroughputTracker(
+            half_life_seconds=60,
+            stall_timeout_seconds=100,
+            slow_throughput_ratio=0.5,
+            max_consecutive_failures=2,
+            demotion_seconds=1000,
+        )
+
+    def test_throughput_per_target_and_source(self, time_mock: MagicMock):
+
+        time_mock.monotonic.return_value = 0
+        tracker = self._create_tracker()
+        tracker.start_copy("/a/file1", "/a", source_device=1)
+        tracker.start_copy("/a/file2", "/a", source_device=2, n_bytes_copied=500)
+        tracker.start_copy("/b/file3", "/b", source_device=2)
+        tracker.update_progress({})
+
+        time_mock.monotonic.return_value = 10
+        tracker.update_progress({"/a/file1": 1000, "/a/file2": 1500, "/b/file3": 500})
+
+        self.assertEqual(tracker.target_throughputs, {"/a": 200, "/b": 50})
+        self.assertEqual(tracker.source_throughputs, {1: 100, 2: 150})
+        self.assertEqual(len(tracker.get_stats_lines()), 4)
+        self.assertEqual(tracker.get_copy_progress()["/a/file2"], (1500, 100))
+
+    def test_stalled_copy_demotes_target(self, time_mock: MagicMock):
+
+        time_mock.monotonic.return_value = 0
+        tracker = self._create_tracker()
+        tracker.start_copy("/a/file1", "/a", source_device=1)
+        tracker.start_copy("/b/file2", "/b", source_device=1)
+
+        time_mock.monotonic.return_value = 150
+        tracker.update_progress({"/a/file1": 0, "/b/file2": 1000})
+
+        self.assertIn("/a/file1", tracker.get_stalled_copies())
+        self.assertEqual(tracker.get_demoted_targets(), {"/a"})
+
+        # the demotion ends after some time if the copy continues
+        time_mock.monotonic.return_value = 1200
+        tracker.update_progress({"/a/file1": 1000, "/b/file2": 2000})
+        self.assertEqual(tracker.get_stalled_copies(), set())
+        self.assertEqual(tracker.get_demoted_targets(), set())
+
+    def test_verifying_copy_is_not_stalled(self, time_mock: MagicMock):
+
+        time_mock.monotonic.return_value = 0
+        tracker = self._create_tracker()
+        tracker.start_copy("/a/file1", "/a", source_device=1)
+        tracker.start_copy("/b/file2", "/b", source_device=1)
+        tracker.update_progress({})
+
+        time_mock.monotonic.return_value = 50
+        tracker.update_progress({"/a/file1": 1000, "/b/file2": 1000})
+        tracker.set_copy_phase("/a/file1", PHASE_VERIFYING)
+
+        # verifying takes longer than the stall timeout without writing
+        time_mock.monotonic.return_value = 500
+        tracker.update_progress({"/a/file1": 1000, "/b/file2": 10000})
+        self.assertEqual(tracker.get_stalled_copies(), set())
+        self.assertEqual(tracker.get_demoted_targets(), set())
+        self.assertEqual(tracker.target_throughputs["/a"], 20)
+
+        # the time spent verifying is not held against the copy
+        time_mock.monotonic.return_value = 550
+        tracker.set_copy_phase("/a/file1", PHASE_COPYING)
+        time_mock.monotonic.return_value = 600
+        self.assertEqual(tracker.get_stalled_copies(), set())
+        time_mock.monotonic.return_value = 700
+        self.assertIn("/a/file1", tracker.get_stalled_copies())
+
+    def test_failures_demote_target(self, time_mock: MagicMock):
+
+        time_mock.monotonic.return_value = 0
+        tracker = self._create_tracker()
+
+        for i_copy in range(2):
+            tracker.start_copy(f"/a/file{i_copy}", "/a", source_device=1)
+            tracker.finish_copy(f"/a/file{i_copy}", success=False)
+        self.assertEqual(tracker.get_demoted_targets(), {"/a"})
+
+        # a success resets the failures
+        tracker = self._create_tracker()
+        for i_copy, success in enumerate((False, True, False)):
+            tracker.start_copy(f"/a/file{i_copy}", "/a", source_device=1)
+            tracker.finish_copy(f"/a/file{i_copy}", success=success)
+        self.assertEqual(tracker.get_demoted_targets(), set())
+
+    def test_slow_target_is_demoted(self, time_mock: MagicMock):
+
+        time_mock.monotonic.return_value = 0
+        tracker = self._create_tracker()
+        for folder in ("/a", "/b", "/c"):
+            tracker.start_copy(f"{folder}/file", folder, source_device=1)
+        tracker.update_progress({})
+
+        # too short to be compared
+        time_mock.monotonic.return_value = 60
+        tracker.update_progress({"/a/file": 6000, "/b/file": 6000, "/c/file": 600})
+        self.assertEqual(tracker.get_demoted_targets(), set())
+
+        time_mock.monotonic.return_value = 180
+        tracker.update_progress({"/a/file": 18000, "/b/file": 18000, "/c/file": 1800})
+        self.assertEqual(tracker.get_demoted_targets(), {"/c"})
+        # the slow target is measured anew after the demotion
+        self.assertNotIn("/c", tracker.target_throughputs)
@@ -0,0 +1,87 @@
+import asyncio
+import os
+import stat
+import tempfile
+import unittest
+
+from ..utils.testing import async_test
+from .control import send_control_command, start_control_server
+
+
+class TestControl(unittest.TestCase):
+    def setUp(self) -> None:
+        # pylint: disable=consider-using-with
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.socket_filepath = os.path.join(self.tmp_dir.name, "control.sock")
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    @async_test
+    async def test_commands_are_answered(self):
+        async def _handler(command, args):
+            if command == "fail":
+                raise ValueError("failed on purpose")
+            return {"command": command, "args": args}
+
+        server = await start_control_server(_handler, self.socket_filepath)
+        loop = asyncio.get_event_loop()
+        try:
+            result = await loop.run_in_executor(
+                None,
+                lambda: send_control_command(self.socket_filepath, "pause_target", target_dir="a"),
+            )
+            self.assertDictEqual(result, {"command": "pause_target", "args": {"target_dir": "a"}})
+
+            with self.assertRaisesRegex(RuntimeError, "failed on purpose"):
+                await loop.run_in_executor(None, send_control_command, self.socket_filepath, "fail")
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    @async_test
+    async def test_socket_is_private(self):
+        async def _handler(command, args):
+            return None
+
+        server = await start_control_server(_handler, self.socket_filepath)
+        try:
+            mode = os.stat(self.socket_filepath).st_mode
+            self.assertTrue(stat.S_ISSOCK(mode))
+            self.assertEqual(stat.S_IMODE(mode), 0o600)
+            # only the socket is left in the folder
+            self.assertListEqual(os.listdir(self.tmp_dir.name), ["control.sock"])
+
+            # a running copy process keeps its socket
+            with self.assertRaises(OSError):
+                await start_control_server(_handler, self.socket_filepath)
+        finally:
+            server.close()
+            await server.wait_closed()
+
+        # the socket of a stopped copy process is replaced
+        server = await start_control_server(_handler, self.socket_filepath)
+        server.close()
+        await server.wait_closed()
+
+    @async_test
+    async def test_invalid_requests_are_rejected(self):
+        async def _handler(command, args):
+            return None
+
+        server = await start_control_server(_handler, self.socket_filepath)
+        try:
+            reader, writer = await asyncio.open_unix_connection(self.socket_filepath)
+            writer.write(b"not json\n")
+            self.assertEqual(
+                await reader.readline(), b'{"ok": false, "error": "Invalid request"}\n'
+            )
+            writer.close()
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    def test_no_copy_process_running(self):
+
+        with self.assertRaises(ConnectionError):
+            send_control_command(self.socket_filepath, "list_jobs")
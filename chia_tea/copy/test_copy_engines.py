@@ -0,0 +1,345 @@
+import errno
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from . import copy_engines
+from .copy_engines import (
+    COPY_ENGINES,
+    BufferedEngine,
+    DirectIOEngine,
+    copy_file_content,
+    get_checkpoint_filepath,
+    get_copy_engines,
+    get_partial_filepath,
+    read_checkpoint,
+)
+from .throttling import BandwidthLimiter
+
+
+def _write_random_file(filepath: str, size: int) -> bytes:
+    data = os.urandom(size)
+    with open(filepath, "wb") as fp:
+        fp.write(data)
+    return data
+
+
+def _read_file(filepath: str) -> bytes:
+    with open(filepath, "rb") as fp:
+        return fp.read()
+
+
+class TestCopyEngines(unittest.TestCase):
+    def test_every_available_engine_copies_correctly(self):
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            source_path = os.path.join(tmp_dir, "source")
+            target_path = os.path.join(tmp_dir, "target")
+            data = _write_random_file(source_path, 3 * 1024 + 17)
+
+            for engine in COPY_ENGINES:
+                if not engine.is_available():
+                    continue
+
+                with self.subTest(engine=engine.name):
+                    with open(source_path, "rb", buffering=0) as source, open(
+                        target_path, "wb", buffering=0
+                    ) as target:
+                        # copy in two uneven chunks to check offsets
+                        offset = 0
+                        for count in (1000, len(data)):
+                            n_bytes = engine.copy_chunk(source, target, offset, count)
+                            offset += n_bytes
+
+                    self.assertEqual(offset, len(data))
+                    self.assertEqual(_read_file(target_path), data)
+
+    def test_buffered_engine_with_small_buffer(self):
+
+        engine = BufferedEngine(buffer_size=100)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            source_path = os.path.join(tmp_dir, "source")
+            target_path = os.path.join(tmp_dir, "target")
+            data = _write_random_file(source_path, 1234)
+
+            with open(source_path, "rb", buffering=0) as source, open(
+                target_path, "wb", buffering=0
+            ) as target:
+                n_bytes = engine.copy_chunk(source, target, 0, 5000)
+
+            self.assertEqual(n_bytes, len(data))
+            self.assertEqual(_read_file(target_path), data)
+
+    def test_direct_io_engine_copies_unaligned_chunks(self):
+
+        engine = DirectIOEngine(buffer_size=8192)
+        if not engine.is_available():
+            self.skipTest("O_DIRECT is not available")
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            source_path = os.path.join(tmp_dir, "source")
+            target_path = os.path.join(tmp_dir, "target")
+            data = _write_random_file(source_path, 3 * 8192 + 17)
+
+            with open(source_path, "rb", buffering=0) as source, open(
+                target_path, "wb", buffering=0
+            ) as target:
+                offset = 0
+                try:
+                    while offset < len(data):
+                        # an unaligned first chunk as left by another engine
+                        count = 1000 if offset == 0 else len(data)
+                        offset += engine.copy_chunk(source, target, offset, count)
+                except OSError as err:
+                    if err.errno != errno.EINVAL:
+                        raise
+                    self.skipTest("O_DIRECT is not supported by the filesystem")
+
+            self.assertEqual(offset, len(data))
+            self.assertEqual(_read_file(target_path), data)
+
+    def test_copy_file_content_with_direct_io(self):
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            source_path = os.path.join(tmp_dir, "source")
+            target_path = os.path.join(tmp_dir, "target")
+            data = _write_random_file(source_path, 3 * 4096 + 5)
+
+            engine_name = copy_file_content(source_path, target_path, direct_io=True)
+
+            self.assertIn(engine_name, {"direct"} | {engine.name for engine in COPY_ENGINES})
+            self.assertEqual(_read_file(target_path), data)
+
+    def test_copy_file_content_drops_page_cache_without_direct_io(self):
+        class _UnsupportedEngine(DirectIOEngine):
+            name = "unsupported_direct"
+
+            def copy_chunk(self, source, target, offset, count):
+                raise OSError(errno.EINVAL, "Invalid argument")
+
+        with tempfile.TemporaryDirectory() as tmp_dir, patch.object(
+            copy_engines, "DIRECT_IO_ENGINE", _UnsupportedEngine()
+        ), patch.object(copy_engines, "_drop_cached_range") as drop_mock:
+            source_path = os.path.join(tmp_dir, "source")
+            target_path = os.path.join(tmp_dir, "target")
+            data = _write_random_file(source_path, 10000)
+
+            engine_name = copy_file_content(source_path, target_path, direct_io=True)
+
+            self.assertIn(engine_name, {engine.name for engine in COPY_ENGINES})
+            self.assertEqual(_read_file(target_path), data)
+            # the source and the target chunk are dropped
+            self.assertEqual(drop_mock.call_count, 2)
+
+    def test_copy_file_content(self):
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            source_path = os.path.join(tmp_dir, "source")
+            target_path = os.path.join(tmp_dir, "target")
+            data = _write_random_file(source_path, 10000)
+
+            with patch.object(copy_engines, "CHUNK_SIZE", 4096):
+                engine_name = copy_file_content(source_path, target_path)
+
+            self.assertIn(engine_name, {engine.name for engine in COPY_ENGINES})
+            self.assertEqual(_read_file(target_path), data)
+
+    def test_copy_file_content_falls_back_on_unsupported_engine(self):
+        class _UnsupportedEngine(BufferedEngine):
+            name = "unsupported"
+
+            def copy_chunk(self, source, target, offset, count):
+                raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+        engines = (_UnsupportedEngine(), BufferedEngine())
+
+        with tempfile.TemporaryDirectory() as tmp_dir, patch.object(
+            copy_engines, "COPY_ENGINES", engines
+        ):
+            source_path = os.path.join(tmp_dir, "source")
+            target_path = os.path.join(tmp_dir, "target")
+            data = _write_random_file(source_path, 10000)
+
+            engine_name = copy_file_content(source_path, target_path)
+
+            self.assertEqual(engine_name, "buffered")
+            self.assertEqual(_read_file(target_path), data)
+
+            # the failed engine is not tried again for these devices
+            device = os.stat(tmp_dir).st_dev
+            self.assertListEqual(
+                [engine.name for engine in get_copy_engines(device, device)],
+                ["buffered"],
+            )
+
+    def test_copy_file_content_raises_other_errors(self):
+        class _BrokenEngine(BufferedEngine):
+            name = "broken"
+
+            def copy_chunk(self, source, target, offset, count):
+                raise OSError(errno.EIO, "Input/output error")
+
+        with tempfile.TemporaryDirectory() as tmp_dir, patch.object(
+            copy_engines, "COPY_ENGINES", (_BrokenEngine(), BufferedEngine())
+        ):
+            source_path = os.path.join(tmp_dir, "source")
+            target_path = os.path.join(tmp_dir, "target")
+            _write_random_file(source_path, 100)
+
+            with self.assertRaises(OSError):
+                copy_file_content(source_path, target_path)
+
+    def _interrupt_copy(self, source_path: str, target_path: str, fail_at: int):
+        """Runs a copy which crashes after some bytes were written"""
+
+        class _CrashingEngine(BufferedEngine):
+            name = "crashing"
+
+            def copy_chunk(self, source, target, offset, count):
+                if offset >= fail_at:
+                    raise OSError(errno.EIO, "Input/output error")
+                return super().copy_chunk(source, target, offset, count)
+
+        with self.assertRaises(OSError):
+            copy_file_content(source_path, target_path, engines=[_CrashingEngine()])
+
+    def test_copy_file_content_resumes_interrupted_copy(self):
+
+        with tempfile.TemporaryDirectory() as tmp_dir, patch.object(
+            copy_engines, "CHUNK_SIZE", 1000
+        ), patch.object(copy_engines, "CHECKPOINT_INTERVAL", 2000), patch.object(
+            copy_engines, "VERIFY_SIZE", 100
+        ):
+            source_path = os.path.join(tmp_dir, "source")
+            target_path = os.path.join(tmp_dir, "target")
+            data = _write_random_file(source_path, 10000)
+
+            self._interrupt_copy(source_path, target_path, fail_at=5000)
+
+            self.assertFalse(os.path.exists(target_path))
+            self.assertTrue(os.path.exists(get_partial_filepath(target_path)))
+            checkpoint = read_checkpoint(target_path)
+            self.assertIsNotNone(checkpoint)
+            self.assertEqual(checkpoint["committed"], 4000)
+
+            # only the missing part is copied
+            engine = BufferedEngine()
+            with patch.object(engine, "copy_chunk", wraps=engine.copy_chunk) as copy_chunk_mock:
+                copy_file_content(source_path, target_path, engines=[engine])
+            self.assertEqual(copy_chunk_mock.call_args_list[0].args[2], 4000)
+
+            self.assertEqual(_read_file(target_path), data)
+            self.assertFalse(os.path.exists(get_partial_filepath(target_path)))
+            self.assertFalse(os.path.exists(get_checkpoint_filepath(target_path)))
+
+    def test_copy_file_content_stops_mid_file(self):
+
+        stop_event = threading.Event()
+
+        class _StoppingEngine(BufferedEngine):
+            name = "stopping"
+
+            def copy_chunk(self, source, target, offset, count):
+                # e.g. ctrl-c while the copy is running
+                if offset >= 3000:
+                    stop_event.set()
+                return super().copy_chunk(source, target, offset, count)
+
+        with tempfile.TemporaryDirectory() as tmp_dir, patch.object(
+            copy_engines, "CHUNK_SIZE", 1000
+        ), patch.object(copy_engines, "VERIFY_SIZE", 100):
+            source_path = os.path.join(tmp_dir, "source")
+            target_path = os.path.join(tmp_dir, "target")
+            data = _write_random_file(source_path, 10000)
+
+            with self.assertRaises(InterruptedError):
+                copy_file_content(
+                    source_path, target_path, engines=[_StoppingEngine()], stop_event=stop_event
+                )
+
+            # the copy stops after the current chunk and is checkpointed there
+            self.assertFalse(os.path.exists(target_path))
+            self.assertEqual(read_checkpoint(target_path)["committed"], 4000)
+
+            engine = BufferedEngine()
+            with patch.object(engine, "copy_chunk", wraps=engine.copy_chunk) as copy_chunk_mock:
+                copy_file_content(source_path, target_path, engines=[engine])
+            self.assertEqual(copy_chunk_mock.call_args_list[0].args[2], 4000)
+            self.assertEqual(_read_file(target_path), data)
+
+    def test_copy_file_content_restarts_if_source_changed(self):
+
+        with tempfile.TemporaryDirectory() as tmp_dir, patch.object(
+            copy_engines, "CHUNK_SIZE", 1000
+        ), patch.object(copy_engines, "CHECKPOINT_INTERVAL", 2000):
+            source_path = os.path.join(tmp_dir, "source")
+            target_path = os.path.join(tmp_dir, "target")
+            _write_random_file(source_path, 10000)
+
+            self._interrupt_copy(source_path, target_path, fail_at=5000)
+
+            # a different file with the same name appears
+            data = _write_random_file(source_path, 8000)
+
+            engine = BufferedEngine()
+            with patch.object(engine, "copy_chunk", wraps=engine.copy_chunk) as copy_chunk_mock:
+                copy_file_content(source_path, target_path, engines=[engine])
+            self.assertEqual(copy_chunk_mock.call_args_list[0].args[2], 0)
+
+            self.assertEqual(_read_file(target_path), data)
+
+    def test_copy_file_content_is_throttled(self):
+
+        limiter = BandwidthLimiter(max_target_bytes_per_sec=10**12)
+
+        with tempfile.TemporaryDirectory() as tmp_dir, patch.object(
+            copy_engines, "THROTTLED_CHUNK_SIZE", 4000
+        ), patch.object(limiter, "throttle") as throttle_mock:
+            source_path = os.path.join(tmp_dir, "source")
+            target_path = os.path.join(tmp_dir, "target")
+            data = _write_random_file(source_path, 10000)
+
+            copy_file_content(source_path, target_path, bandwidth_limiter=limiter)
+
+            self.assertEqual(_read_file(target_path), data)
+            self.assertListEqual(
+                [call_args.args[2] for call_args in throttle_mock.call_args_list],
+                [4000, 4000, 2000],
+            )
+
+    def test_copy_file_content_verifies_full_copy_after_resume(self):
+
+        with tempfile.TemporaryDirectory() as tmp_dir, patch.object(
+            copy_engines, "CHUNK_SIZE", 1000
+        ), patch.object(copy_engines, "CHECKPOINT_INTERVAL", 2000):
+            source_path = os.path.join(tmp_dir, "source")
+            target_path = os.path.join(tmp_dir, "target")
+            data = _write_random_file(source_path, 10000)
+
+            self._interrupt_copy(source_path, target_path, fail_at=5000)
+            engine_name = copy_file_content(source_path, target_path, verify_mode="full")
+
+            self.assertEqual(engine_name, "hashing")
+            self.assertEqual(_read_file(target_path), data)
+
+    def test_copy_file_content_removes_corrupted_copy(self):
+        def _corrupt(fp):
+            os.pwrite(fp.fileno(), b"corrupt", 5000)
+
+        for verify_mode in ("full", "sampled"):
+            with self.subTest(verify_mode=verify_mode), tempfile.TemporaryDirectory() as tmp_dir:
+                source_path = os.path.join(tmp_dir, "source")
+                target_path = os.path.join(tmp_dir, "target")
+                _write_random_file(source_path, 10000)
+
+                # the data on disk changes after it was written
+                with patch("chia_tea.copy.verification.drop_page_cache", side_effect=_corrupt):
+                    with self.assertRaises(OSError):
+                        copy_file_content(source_path, target_path, verify_mode=verify_mode)
+
+                self.assertFalse(os.path.exists(target_path))
+                self.assertFalse(os.path.exists(get_partial_filepath(target_path)))
+                self.assertFalse(os.path.exists(get_checkpoint_filepath(target_path)))
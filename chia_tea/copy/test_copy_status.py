@@ -0,0 +1,57 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from .copy_status import CopyJobStatus, read_copy_status, write_copy_status
+
+
+class TestCopyStatus(unittest.TestCase):
+    def setUp(self) -> None:
+        # pylint: disable=consider-using-with
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.status_filepath = os.path.join(self.tmp_dir.name, "copy", "status.json")
+        self.copy_job = CopyJobStatus(
+            source_filepath="/source/plot.plot",
+            target_filepath="/target/plot.plot",
+            start_time=1000.0,
+            n_bytes_copied=300,
+            n_bytes_total=1000,
+            bytes_per_sec=100.0,
+        )
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_eta_seconds(self):
+
+        self.assertEqual(self.copy_job.eta_seconds, 7)
+        self.copy_job.bytes_per_sec = 0
+        self.assertEqual(self.copy_job.eta_seconds, -1)
+
+    def test_write_and_read(self):
+
+        write_copy_status(self.status_filepath, [self.copy_job])
+
+        self.assertListEqual(read_copy_status(self.status_filepath), [self.copy_job])
+        self.assertFalse(os.path.exists(self.status_filepath + ".tmp"))
+
+    @patch("chia_tea.copy.copy_status.time")
+    def test_stale_status_is_ignored(self, time_mock: MagicMock):
+
+        time_mock.time.return_value = 0
+        write_copy_status(self.status_filepath, [self.copy_job])
+
+        time_mock.time.return_value = 1000
+        self.assertListEqual(read_copy_status(self.status_filepath), [])
+
+    def test_missing_or_broken_status_is_ignored(self):
+
+        self.assertListEqual(read_copy_status(self.status_filepath), [])
+
+        os.makedirs(os.path.dirname(self.status_filepath))
+        for content in ("{", json.dumps({"copy_jobs": []}), json.dumps([1, 2])):
+            with open(self.status_filepath, "w", encoding="utf8") as fp:
+                fp.write(content)
+            self.assertListEqual(read_copy_status(self.status_filepath), [])
@@ -0,0 +1,224 @@
+import random
+import unittest
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+from .placement_policies import (
+    PLACEMENT_POLICIES,
+    AbstractPlacementPolicy,
+    FillFirstPolicy,
+    LeastUsedPolicy,
+    PlacementCandidate,
+    RoundRobinPolicy,
+    SmrSequentialPolicy,
+    ThroughputWeightedPolicy,
+    create_placement_policy,
+    get_placement_policy_names,
+    register_placement_policy,
+)
+
+# size of a k32 plot in the simulation
+PLOT_SIZE = 108_000_000_000
+
+
+@dataclass
+class SimulatedDisk:
+    """A target disk of the simulated fleet"""
+
+    capacity: float
+    bytes_per_sec: float
+    n_bytes: float = 0
+    # start and end times of the copies running into the disk
+    copies: List[Tuple[float, float]] = field(default_factory=list)
+    max_parallel_copies_seen: int = 0
+
+    @property
+    def free_space(self) -> float:
+        return self.capacity - self.n_bytes
+
+
+def _simulate_fleet(
+    policy: AbstractPlacementPolicy,
+    disks: Dict[str, SimulatedDisk],
+    n_plots: int,
+    plot_interval_seconds: float,
+    max_parallel_copies_per_target: int = 2,
+) -> Dict[str, SimulatedDisk]:
+    """Places plots arriving regularly onto the simulated disks
+
+    Parallel copies into a disk share its bandwidth. Plots which
+    cannot be placed when they arrive wait for the next copy to end.
+    """
+    now = 0.0
+    waiting_plots = 0
+
+    for i_plot in range(n_plots):
+        now = max(now, i_plot * plot_interval_seconds)
+        waiting_plots += 1
+
+        while waiting_plots:
+            for folder, disk in disks.items():
+                for start, end in disk.copies:
+                    if end <= now:
+                        policy.on_copy_finished(folder, PLOT_SIZE, end - start)
+                disk.copies = [(start, end) for start, end in disk.copies if end > now]
+
+            candidates = [
+                PlacementCandidate(
+                    folder=folder,
+                    n_copies=len(disk.copies),
+                    free_space=disk.free_space - PLOT_SIZE,
+                )
+                for folder, disk in sorted(disks.items())
+                if len(disk.copies) < max_parallel_copies_per_target
+                and disk.free_space >= PLOT_SIZE
+            ]
+            target_dir = policy.choose_target_dir("plot", candidates) if candidates else None
+
+            if target_dir is None:
+                # wait for the next copy to finish
+                copy_ends = [end for disk in disks.values() for _, end in disk.copies]
+                if not copy_ends:
+                    return disks
+                now = min(copy_ends)
+                continue
+
+            disk = disks[target_dir]
+            disk.n_bytes += PLOT_SIZE
+            # parallel copies share the bandwidth of the disk
+            n_copies = len(disk.copies) + 1
+            disk.copies.append((now, now + PLOT_SIZE * n_copies / disk.bytes_per_sec))
+            disk.max_parallel_copies_seen = max(disk.max_parallel_copies_seen, n_copies)
+            waiting_plots -= 1
+
+    return disks
+
+
+def _create_fleet() -> Dict[str, SimulatedDisk]:
+    return {
+        "/disk_a": SimulatedDisk(capacity=10 * PLOT_SIZE, bytes_per_sec=200e6),
+        "/disk_b": SimulatedDisk(capacity=10 * PLOT_SIZE, bytes_per_sec=200e6),
+        "/disk_c": SimulatedDisk(capacity=10 * PLOT_SIZE, bytes_per_sec=50e6),
+        "/disk_d": SimulatedDisk(capacity=10 * PLOT_SIZE, bytes_per_sec=50e6),
+    }
+
+
+class TestPlacementPolicies(unittest.TestCase):
+    def setUp(self):
+        random.seed(0)
+        self.candidates = [
+            PlacementCandidate(folder="/disk_b", n_copies=1, free_space=5 * PLOT_SIZE),
+            PlacementCandidate(folder="/disk_a", n_copies=0, free_space=9 * PLOT_SIZE),
+            PlacementCandidate(folder="/disk_c", n_copies=0, free_space=2 * PLOT_SIZE),
+        ]
+
+    def test_least_used(self):
+
+        policy = LeastUsedPolicy()
+        for _ in range(10):
+            self.assertIn(policy.choose_target_dir("plot", self.candidates), {"/disk_a", "/disk_c"})
+
+    def test_fill_first(self):
+
+        policy = FillFirstPolicy()
+        self.assertEqual(policy.choose_target_dir("plot", self.candidates), "/disk_c")
+
+    def test_round_robin(self):
+
+        policy = RoundRobinPolicy()
+        chosen = [policy.choose_target_dir("plot", self.candidates) for _ in range(4)]
+        self.assertEqual(chosen, ["/disk_a", "/disk_b", "/disk_c", "/disk_a"])
+
+        # continues after the last folder even if it is not a candidate
+        policy.last_target_dir = "/disk_b"
+        self.assertEqual(policy.choose_target_dir("plot", self.candidates[1:]), "/disk_c")
+
+    def test_throughput_weighted(self):
+
+        policy = ThroughputWeightedPolicy()
+        policy.on_copy_finished("/disk_a", PLOT_SIZE, 100)
+        policy.on_copy_finished("/disk_b", PLOT_SIZE, 10_000)
+        policy.on_copy_finished("/disk_b", PLOT_SIZE, 0)
+        self.assertAlmostEqual(policy.throughputs["/disk_b"], PLOT_SIZE / 10_000)
+
+        candidates = self.candidates[:2]
+        chosen = [policy.choose_target_dir("plot", candidates) for _ in range(100)]
+        self.assertGreater(chosen.count("/disk_a"), 90)
+
+        # unknown folders are tried out
+        policy.throughputs["/disk_a"] = PLOT_SIZE / 10_000
+        chosen = [policy.choose_target_dir("plot", self.candidates) for _ in range(100)]
+        self.assertGreater(chosen.count("/disk_c"), 30)
+
+    def test_smr_sequential(self):
+
+        policy = SmrSequentialPolicy()
+        self.assertEqual(policy.choose_target_dir("plot", self.candidates), "/disk_a")
+        self.assertIsNone(policy.choose_target_dir("plot", self.candidates[:1]))
+
+    def test_create_placement_policy(self):
+
+        self.assertIsInstance(create_placement_policy(""), LeastUsedPolicy)
+        for name in get_placement_policy_names():
+            self.assertEqual(create_placement_policy(name).name, name)
+
+        with self.assertRaises(ValueError):
+            create_placement_policy("not_a_policy")
+
+    def test_register_placement_policy(self):
+        class AlwaysFirstPolicy(AbstractPlacementPolicy):
+            name = "always_first"
+
+            def choose_target_dir(self, source_filepath, candidates):
+                return candidates[0].folder
+
+        register_placement_policy(AlwaysFirstPolicy)
+        self.addCleanup(PLACEMENT_POLICIES.pop, AlwaysFirstPolicy.name)
+
+        self.assertIn("always_first", get_placement_policy_names())
+        policy = create_placement_policy("always_first")
+        self.assertEqual(policy.choose_target_dir("plot", self.candidates), "/disk_b")
+
+
+class TestSimulatedDiskFleet(unittest.TestCase):
+    """Replays plot arrivals onto a fleet of fast and slow disks"""
+
+    def setUp(self):
+        random.seed(0)
+
+    def _run(self, name: str, n_plots: int = 16, interval: float = 300) -> Dict[str, SimulatedDisk]:
+        return _simulate_fleet(create_placement_policy(name), _create_fleet(), n_plots, interval)
+
+    def test_all_plots_are_placed_without_overfilling(self):
+
+        for name in get_placement_policy_names():
+            with self.subTest(policy=name):
+                disks = self._run(name)
+                self.assertEqual(sum(disk.n_bytes for disk in disks.values()), 16 * PLOT_SIZE)
+                for disk in disks.values():
+                    self.assertLessEqual(disk.n_bytes, disk.capacity)
+
+    def test_fill_first_touches_fewest_disks(self):
+
+        disks = self._run("fill_first", interval=3000)
+        used_disks = [folder for folder, disk in disks.items() if disk.n_bytes]
+        self.assertEqual(len(used_disks), 2)
+
+    def test_round_robin_spreads_evenly(self):
+
+        disks = self._run("round_robin", interval=3000)
+        for disk in disks.values():
+            self.assertEqual(disk.n_bytes, 4 * PLOT_SIZE)
+
+    def test_throughput_favours_fast_disks(self):
+
+        disks = self._run("throughput", n_plots=30)
+        fast_bytes = disks["/disk_a"].n_bytes + disks["/disk_b"].n_bytes
+        slow_bytes = disks["/disk_c"].n_bytes + disks["/disk_d"].n_bytes
+        self.assertGreater(fast_bytes, slow_bytes)
+
+    def test_smr_sequential_never_writes_in_parallel(self):
+
+        disks = self._run("smr_sequential", interval=60)
+        for disk in disks.values():
+            self.assertLessEqual(disk.max_parallel_copies_seen, 1)
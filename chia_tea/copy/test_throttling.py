@@ -0,0 +1,120 @@
+import unittest
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+from ..models.ChiaWatchdog import ChiaWatchdog
+from ..models.MadMaxPlotInProgress import MadMaxPlotInProgress
+from .throttling import BandwidthLimiter, TokenBucket, is_plotter_busy
+
+
+def _create_plot(state: str) -> MadMaxPlotInProgress:
+    return MadMaxPlotInProgress(
+        process_id=0,
+        public_key="",
+        pool_public_key="",
+        farmer_public_key="",
+        start_time=datetime.now(),
+        progress=0,
+        plot_type=32,
+        state=state,
+    )
+
+
+class TestTokenBucket(unittest.TestCase):
+    @patch("chia_tea.copy.throttling.time")
+    def test_reserve_waits_for_refill(self, time_mock: MagicMock):
+
+        time_mock.monotonic.return_value = 0
+        bucket = TokenBucket(rate=100)
+
+        # the burst is available right away
+        self.assertEqual(bucket.reserve(100), 0)
+        # later consumers queue up behind earlier ones
+        self.assertAlmostEqual(bucket.reserve(50), 0.5)
+        self.assertAlmostEqual(bucket.reserve(50), 1.0)
+
+        # bucket refilled after waiting
+        time_mock.monotonic.return_value = 3
+        self.assertEqual(bucket.reserve(100), 0)
+
+    @patch("chia_tea.copy.throttling.time")
+    def test_unlimited_bucket_never_waits(self, time_mock: MagicMock):
+
+        time_mock.monotonic.return_value = 0
+        bucket = TokenBucket(rate=0)
+
+        self.assertEqual(bucket.reserve(10**12), 0)
+        self.assertEqual(bucket.consume(10**12), 0)
+        time_mock.sleep.assert_not_called()
+
+    @patch("chia_tea.copy.throttling.time")
+    def test_set_rate(self, time_mock: MagicMock):
+
+        time_mock.monotonic.return_value = 0
+        bucket = TokenBucket(rate=100)
+        bucket.reserve(100)
+
+        bucket.set_rate(10)
+        self.assertEqual(bucket.rate, 10)
+        self.assertAlmostEqual(bucket.reserve(10), 1.0)
+
+        bucket.set_rate(0)
+        self.assertEqual(bucket.reserve(10**12), 0)
+
+
+class TestBandwidthLimiter(unittest.TestCase):
+    @patch("chia_tea.copy.throttling.time")
+    def test_throttle_waits_for_slower_device(self, time_mock: MagicMock):
+
+        time_mock.monotonic.return_value = 0
+        limiter = BandwidthLimiter(max_source_bytes_per_sec=100, max_target_bytes_per_sec=50)
+
+        self.assertEqual(limiter.throttle(source_device=1, target_device=2, n_bytes=50), 0)
+        wait_seconds = limiter.throttle(source_device=1, target_device=2, n_bytes=50)
+
+        self.assertAlmostEqual(wait_seconds, 1.0)
+        time_mock.sleep.assert_called_once_with(wait_seconds)
+
+        # other devices have their own buckets
+        time_mock.sleep.reset_mock()
+        self.assertEqual(limiter.throttle(source_device=3, target_device=4, n_bytes=50), 0)
+        time_mock.sleep.assert_not_called()
+
+    @patch("chia_tea.copy.throttling.time")
+    def test_busy_plotter_switches_source_limit(self, time_mock: MagicMock):
+
+        time_mock.monotonic.return_value = 0
+        limiter = BandwidthLimiter(
+            max_source_bytes_per_sec=100,
+            max_source_bytes_per_sec_while_plotting=10,
+        )
+        self.assertEqual(limiter.get_source_rate(), 100)
+        limiter.throttle(source_device=1, target_device=2, n_bytes=100)
+
+        limiter.set_plotter_busy(True)
+        self.assertTrue(limiter.plotter_busy)
+        self.assertEqual(limiter.get_source_rate(), 10)
+        self.assertAlmostEqual(limiter.throttle(source_device=1, target_device=2, n_bytes=10), 1.0)
+
+        limiter.set_plotter_busy(False)
+        self.assertEqual(limiter.get_source_rate(), 100)
+
+    def test_is_limiting(self):
+
+        self.assertFalse(BandwidthLimiter().is_limiting)
+        self.assertTrue(BandwidthLimiter(max_target_bytes_per_sec=1).is_limiting)
+        self.assertTrue(BandwidthLimiter(max_source_bytes_per_sec_while_plotting=1).is_limiting)
+
+
+class TestIsPlotterBusy(unittest.TestCase):
+    def test_is_plotter_busy(self):
+
+        chia_dog = ChiaWatchdog(logfile_filepath="", madmax_logfiles=[])
+        self.assertFalse(is_plotter_busy(chia_dog))
+
+        chia_dog.plots_in_progress = [_create_plot("Plotting Phase2")]
+        self.assertFalse(is_plotter_busy(chia_dog))
+
+        for state in ("Plotting Phase3", "Plotting Phase4"):
+            chia_dog.plots_in_progress = [_create_plot("Plotting Done"), _create_plot(state)]
+            self.assertTrue(is_plotter_busy(chia_dog))
@@ -0,0 +1,93 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from .verification import (
+    SAMPLE_SIZE,
+    create_hasher,
+    get_sample_offsets,
+    get_verify_mode,
+    hash_file_range,
+    verify_full,
+    verify_sampled,
+)
+
+
+class TestVerification(unittest.TestCase):
+    def setUp(self) -> None:
+        # pylint: disable=consider-using-with
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.data = os.urandom(3 * SAMPLE_SIZE + 10)
+        self.source_path = self._write_file("source", self.data)
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def _write_file(self, name: str, data: bytes) -> str:
+        filepath = os.path.join(self.tmp_dir.name, name)
+        with open(filepath, "wb") as fp:
+            fp.write(data)
+        return filepath
+
+    def test_get_verify_mode(self):
+
+        self.assertEqual(get_verify_mode(""), "none")
+        self.assertEqual(get_verify_mode("full"), "full")
+        with self.assertRaises(ValueError):
+            get_verify_mode("sometimes")
+
+    def test_get_sample_offsets(self):
+
+        self.assertListEqual(get_sample_offsets(10), [0])
+        offsets = get_sample_offsets(100 * SAMPLE_SIZE, n_samples=5)
+        self.assertListEqual(offsets, [i * 99 * SAMPLE_SIZE // 4 for i in range(5)])
+
+    def test_hash_file_range(self):
+
+        hasher = create_hasher()
+        with open(self.source_path, "rb", buffering=0) as fp, patch(
+            "chia_tea.copy.verification.HASH_READ_SIZE", 1000
+        ):
+            hash_file_range(fp, 0, 5000, hasher)
+            hash_file_range(fp, 5000, len(self.data), hasher)
+            with self.assertRaises(OSError):
+                hash_file_range(fp, 0, len(self.data) + 1, create_hasher())
+
+        expected = create_hasher()
+        expected.update(self.data)
+        self.assertEqual(hasher.digest(), expected.digest())
+
+    def test_verify_full(self):
+
+        source_hasher = create_hasher()
+        source_hasher.update(self.data)
+
+        corrupted = bytearray(self.data)
+        corrupted[-1] ^= 0xFF
+        for data, expected in (
+            (self.data, True),
+            (bytes(corrupted), False),
+            (self.data[:-1], False),
+        ):
+            target_path = self._write_file("target", data)
+            with open(target_path, "rb", buffering=0) as target:
+                self.assertEqual(
+                    verify_full(target, len(self.data), source_hasher.digest()), expected
+                )
+
+    def test_verify_sampled(self):
+
+        corrupted = bytearray(self.data)
+        # the first, last and some blocks in between are compared
+        corrupted[-1] ^= 0xFF
+        for data, expected in (
+            (self.data, True),
+            (bytes(corrupted), False),
+            (self.data[:-1], False),
+        ):
+            target_path = self._write_file("target", data)
+            with open(self.source_path, "rb", buffering=0) as source, open(
+                target_path, "rb", buffering=0
+            ) as target:
+                self.assertEqual(verify_sampled(source, target, len(self.data)), expected)
@@ -0,0 +1,322 @@
+import asyncio
+import threading
+import time
+from typing import Dict, List
+
+from ..general.LogWatcher import LogWatcher
+from ..models.ChiaWatchdog import ChiaWatchdog
+from ..utils.logger import get_logger
+from ..watchdog.checks.regular_checks import remove_plotting_plots_if_madmax_does_not_run
+from ..watchdog.collection.madmax_logfile.line_checks import run_line_checks_on_lines
+
+# plotting phases with heavy I/O on the plotting drives
+BUSY_PLOTTING_STATES = ("Plotting Phase3", "Plotting Phase4")
+# seconds between checks if the plotting processes are still alive
+PLOTTER_CHECK_INTERVAL = 5
+
+
+class TokenBucket:
+    """Thread-safe token bucket limiting a rate of bytes per second
+
+    Consumers reserve their bytes in the order they arrive and
+    wait until the bucket refilled. Thus parallel consumers
+    share the rate fairly.
+    """
+
+    def __init__(self, rate: float, burst: float = 0):
+        """Initialize a token bucket
+
+        Parameters
+        ----------
+        rate : float
+            bytes per second. The bucket does not limit if the
+            rate is zero or negative.
+        burst : float
+            bytes which may be consumed at once without waiting.
+            Defaults to one second worth of bytes.
+        """
+        self.__lock = threading.Lock()
+        self.__rate = max(0.0, rate)
+        self.__burst = burst
+        self.__tokens = self.burst
+        self.__last_refill = time.monotonic()
+
+    @property
+    def rate(self) -> float:
+        """Limit in bytes per second, zero if unlimited"""
+        return self.__rate
+
+    @property
+    def burst(self) -> float:
+        """Maximum bytes to consume without waiting"""
+        return self.__burst if self.__burst > 0 else self.__rate
+
+    def set_rate(self, rate: float):
+        """Changes the rate of the bucket
+
+        Parameters
+        ----------
+        rate : float
+            new rate in bytes per second, zero for unlimited
+        """
+        with self.__lock:
+            self.__refill()
+            was_unlimited = self.__rate <= 0
+            self.__rate = max(0.0, rate)
+            if was_unlimited:
+                self.__tokens = self.burst
+            self.__tokens = min(self.__tokens, self.burst)
+
+    def reserve(self, n_bytes: int) -> float:
+        """Takes bytes from the bucket without waiting
+
+        Parameters
+        ----------
+        n_bytes : int
+            number of bytes to take
+
+        Returns
+        -------
+        wait_seconds : float
+            time the caller has to wait until the bytes may be used
+        """
+        with self.__lock:
+            if self.__rate <= 0:
+                return 0.0
+
+            self.__refill()
+            self.__tokens -= n_bytes
+
+            if self.__tokens >= 0:
+                return 0.0
+            return -self.__tokens / self.__rate
+
+    def consume(self, n_bytes: int) -> float:
+        """Takes bytes from the bucket and waits until they may be used
+
+        Parameters
+        ----------
+        n_bytes : int
+            number of bytes to take
+
+        Returns
+        -------
+        wait_seconds : float
+            time waited
+        """
+        wait_seconds = self.reserve(n_bytes)
+        if wait_seconds > 0:
+            time.sleep(wait_seconds)
+        return wait_seconds
+
+    def __refill(self):
+        now = time.monotonic()
+        self.__tokens = min(self.burst, self.__tokens + (now - self.__last_refill) * self.__rate)
+        self.__last_refill = now
+
+
+class BandwidthLimiter:
+    """Limits copies per source and per target device
+
+    Every device gets its own token bucket which is shared by all
+    copies reading from or writing to it. While the plotter is busy
+    the source devices get a separate limit, so that copies don't
+    slow down plotting.
+    """
+
+    def __init__(
+        self,
+        max_source_bytes_per_sec: float = 0,
+        max_target_bytes_per_sec: float = 0,
+        max_source_bytes_per_sec_while_plotting: float = 0,
+    ):
+        """Initialize a bandwidth limiter
+
+        Parameters
+        ----------
+        max_source_bytes_per_sec : float
+            read limit per source device, zero for unlimited
+        max_target_bytes_per_sec : float
+            write limit per target device, zero for unlimited
+        max_source_bytes_per_sec_while_plotting : float
+            read limit per source device while the plotter is busy.
+            The normal source limit is used if zero.
+        """
+        self.max_source_bytes_per_sec = max(0.0, max_source_bytes_per_sec)
+        self.max_target_bytes_per_sec = max(0.0, max_target_bytes_per_sec)
+        self.max_source_bytes_per_sec_while_plotting = max(
+            0.0, max_source_bytes_per_sec_while_plotting
+        )
+
+        self.__lock = threading.Lock()
+        self.__plotter_busy = False
+        # device id -> bucket
+        self.__source_buckets: Dict[int, TokenBucket] = {}
+        self.__target_buckets: Dict[int, TokenBucket] = {}
+
+    @property
+    def is_limiting(self) -> bool:
+        """Whether any limit is configured"""
+        return bool(
+            self.max_source_bytes_per_sec
+            or self.max_target_bytes_per_sec
+            or self.max_source_bytes_per_sec_while_plotting
+        )
+
+    @property
+    def plotter_busy(self) -> bool:
+        """Whether the plotter is in an I/O heavy phase"""
+        return self.__plotter_busy
+
+    def get_source_rate(self) -> float:
+        """Get the current read limit per source device
+
+        Returns
+        -------
+        rate : float
+            bytes per second, zero if unlimited
+        """
+        if self.__plotter_busy and self.max_source_bytes_per_sec_while_plotting:
+            return self.max_source_bytes_per_sec_while_plotting
+        return self.max_source_bytes_per_sec
+
+    def set_plotter_busy(self, plotter_busy: bool):
+        """Switches the source limits depending on the plotter
+
+        Parameters
+        ----------
+        plotter_busy : bool
+            whether the plotter is in an I/O heavy phase
+        """
+        with self.__lock:
+            if plotter_busy == self.__plotter_busy:
+                return
+            self.__plotter_busy = plotter_busy
+
+            source_rate = self.get_source_rate()
+            for bucket in self.__source_buckets.values():
+                bucket.set_rate(source_rate)
+
+        get_logger(__file__).info(
+            "Plotter %s, source limit per device: %s",
+            "busy" if plotter_busy else "idle",
+            _format_rate(source_rate),
+        )
+
+    def throttle(self, source_device: int, target_device: int, n_bytes: int) -> float:
+        """Waits until bytes may be copied between two devices
+
+        Parameters
+        ----------
+        source_device : int
+            device id of the source file
+        target_device : int
+            device id of the target file
+        n_bytes : int
+            number of bytes to be copied
+
+        Returns
+        -------
+        wait_seconds : float
+            time waited
+        """
+        with self.__lock:
+            source_bucket = self.__source_buckets.get(source_device)
+            if source_bucket is None:
+                source_bucket = TokenBucket(self.get_source_rate())
+                self.__source_buckets[source_device] = source_bucket
+
+            target_bucket = self.__target_buckets.get(target_device)
+            if target_bucket is None:
+                target_bucket = TokenBucket(self.max_target_bytes_per_sec)
+                self.__target_buckets[target_device] = target_bucket
+
+        # both buckets refill while waiting thus waiting for the slower one is enough
+        wait_seconds = max(source_bucket.reserve(n_bytes), target_bucket.reserve(n_bytes))
+        if wait_seconds > 0:
+            time.sleep(wait_seconds)
+
+        return wait_seconds
+
+
+def _format_rate(rate: float) -> str:
+    return f"{rate / 1e6:.0f} MB/s" if rate > 0 else "unlimited"
+
+
+def is_plotter_busy(chia_dog: ChiaWatchdog) -> bool:
+    """Checks if a plot is in an I/O heavy plotting phase
+
+    Parameters
+    ----------
+    chia_dog : ChiaWatchdog
+        watchdog tracking the madmax plotter
+
+    Returns
+    -------
+    plotter_busy : bool
+        whether any plot of any plotter is in phase 3 or 4
+    """
+    return any(plot.state in BUSY_PLOTTING_STATES for plot in chia_dog.plots_in_progress)
+
+
+async def watch_madmax_plotter(madmax_logfiles: List[str], bandwidth_limiter: BandwidthLimiter):
+    """Updates the bandwidth limiter from the madmax logfiles forever
+
+    Parameters
+    ----------
+    madmax_logfiles : List[str]
+        paths to the logfiles of the madmax plotters
+    bandwidth_limiter : BandwidthLimiter
+        limiter to notify whether a plotter is busy
+    """
+    chia_dog = ChiaWatchdog(logfile_filepath="", madmax_logfiles=madmax_logfiles)
+
+    def _get_on_lines(madmax_logfile: str):
+        async def _on_lines(lines: List[str]):
+            await run_line_checks_on_lines(chia_dog, lines, madmax_logfile)
+            bandwidth_limiter.set_plotter_busy(is_plotter_busy(chia_dog))
+
+        return _on_lines
+
+    log_watcher = LogWatcher()
+    for madmax_logfile in madmax_logfiles:
+        log_watcher.add_logfile(madmax_logfile, on_lines=_get_on_lines(madmax_logfile))
+
+    async def _check_plotter_regularly():
+        while True:
+            # plots of killed plotters never finish
+            remove_plotting_plots_if_madmax_does_not_run(chia_dog)
+            bandwidth_limiter.set_plotter_busy(is_plotter_busy(chia_dog))
+            await asyncio.sleep(PLOTTER_CHECK_INTERVAL)
+
+    await asyncio.gather(
+        log_watcher.run(),
+        _check_plotter_regularly(),
+    )
+
+
+def start_watching_madmax_plotter(
+    madmax_logfiles: List[str], bandwidth_limiter: BandwidthLimiter
+) -> threading.Thread:
+    """Watches the madmax logfiles in a background thread
+
+    Parameters
+    ----------
+    madmax_logfiles : List[str]
+        paths to the logfiles of the madmax plotters
+    bandwidth_limiter : BandwidthLimiter
+        limiter to notify whether a plotter is busy
+
+    Returns
+    -------
+    thread : threading.Thread
+        daemon thread watching the logfiles
+    """
+    thread = threading.Thread(
+        target=asyncio.run,
+        args=(watch_madmax_plotter(madmax_logfiles, bandwidth_limiter),),
+        name="madmax-watcher",
+        daemon=True,
+    )
+    thread.start()
+    return thread
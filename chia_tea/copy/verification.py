@@ -0,0 +1,209 @@
+import errno
+import hashlib
+import os
+import threading
+from typing import Any, BinaryIO, List, Optional
+
+# copies are not verified
+VERIFY_NONE = "none"
+# blocks spread over the file are compared with the source
+VERIFY_SAMPLED = "sampled"
+# the file is hashed while copying and the target is read once
+VERIFY_FULL = "full"
+VERIFY_MODES = (VERIFY_NONE, VERIFY_SAMPLED, VERIFY_FULL)
+
+# bytes hashed at once when reading a file
+HASH_READ_SIZE = 8 * 1024 * 1024
+# number and size of the blocks compared in sampled mode
+N_SAMPLES = 64
+SAMPLE_SIZE = 1024 * 1024
+
+
+def get_verify_mode(name: str) -> str:
+    """Validates the name of a verification mode
+
+    Parameters
+    ----------
+    name : str
+        name of the mode. Copies are not verified if empty.
+
+    Returns
+    -------
+    verify_mode : str
+        one of VERIFY_MODES
+
+    Raises
+    ------
+    ValueError
+        If the mode does not exist.
+    """
+    verify_mode = name or VERIFY_NONE
+    if verify_mode not in VERIFY_MODES:
+        raise ValueError(
+            f"Unknown verification mode '{name}', choose one of: {', '.join(VERIFY_MODES)}"
+        )
+    return verify_mode
+
+
+def create_hasher() -> Any:
+    """Creates the hash used to verify copies
+
+    Returns
+    -------
+    hasher : Any
+        new hashlib object
+    """
+    # blake2b is much faster than sha256 without sha extensions
+    return hashlib.blake2b(digest_size=32)
+
+
+def drop_page_cache(fp: BinaryIO):
+    """Evicts a file from the page cache if the os supports it
+
+    Parameters
+    ----------
+    fp : BinaryIO
+        file whose cached pages are dropped
+
+    Notes
+    -----
+        Otherwise reading a file which was just written returns the
+        cached data instead of what actually is on the disk.
+    """
+    if hasattr(os, "posix_fadvise"):
+        # pylint: disable=no-member
+        os.posix_fadvise(fp.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+
+
+def hash_file_range(
+    fp: BinaryIO,
+    start: int,
+    end: int,
+    hasher: Any,
+    stop_event: Optional[threading.Event] = None,
+):
+    """Feeds a byte range of a file into a hash
+
+    Parameters
+    ----------
+    fp : BinaryIO
+        unbuffered file to read
+    start : int
+        offset to start reading at
+    end : int
+        offset to stop reading at
+    hasher : Any
+        hashlib object to update
+    stop_event : Optional[threading.Event]
+        hashing stops early once this is set
+
+    Raises
+    ------
+    OSError
+        If the file ends before the range.
+    InterruptedError
+        If the stop event was set.
+    """
+    buffer = memoryview(bytearray(min(HASH_READ_SIZE, max(0, end - start))))
+    fp.seek(start)
+
+    offset = start
+    while offset < end:
+        if stop_event is not None and stop_event.is_set():
+            raise InterruptedError(errno.EINTR, "Hashing was stopped", fp.name)
+        n_bytes = fp.readinto(buffer[: min(len(buffer), end - offset)])
+        if not n_bytes:
+            raise OSError(errno.EIO, f"File ended after {offset} of {end} bytes", fp.name)
+        hasher.update(buffer[:n_bytes])
+        offset += n_bytes
+
+
+def verify_full(
+    target: BinaryIO,
+    size: int,
+    source_digest: bytes,
+    stop_event: Optional[threading.Event] = None,
+) -> bool:
+    """Verifies a copied file against the hash of its source
+
+    Parameters
+    ----------
+    target : BinaryIO
+        unbuffered copied file, flushed to disk
+    size : int
+        size of the source file
+    source_digest : bytes
+        hash of the source file computed while copying
+    stop_event : Optional[threading.Event]
+        verification stops early once this is set
+
+    Returns
+    -------
+    is_valid : bool
+        whether the copy matches the source
+
+    Raises
+    ------
+    InterruptedError
+        If the stop event was set.
+    """
+    if os.fstat(target.fileno()).st_size != size:
+        return False
+
+    drop_page_cache(target)
+
+    hasher = create_hasher()
+    hash_file_range(target, 0, size, hasher, stop_event)
+    return hasher.digest() == source_digest
+
+
+def get_sample_offsets(size: int, n_samples: int = N_SAMPLES) -> List[int]:
+    """Get the offsets of the blocks compared in sampled mode
+
+    Parameters
+    ----------
+    size : int
+        size of the file
+    n_samples : int
+        number of blocks
+
+    Returns
+    -------
+    offsets : List[int]
+        start of every block, evenly spread including first and last
+    """
+    last_offset = max(0, size - SAMPLE_SIZE)
+    if n_samples < 2 or last_offset == 0:
+        return [0]
+    return sorted({last_offset * i_sample // (n_samples - 1) for i_sample in range(n_samples)})
+
+
+def verify_sampled(source: BinaryIO, target: BinaryIO, size: int) -> bool:
+    """Verifies a copied file by comparing blocks with the source
+
+    Parameters
+    ----------
+    source : BinaryIO
+        unbuffered source file
+    target : BinaryIO
+        unbuffered copied file, flushed to disk
+    size : int
+        size of the source file
+
+    Returns
+    -------
+    is_valid : bool
+        whether all sampled blocks match the source
+    """
+    if os.fstat(target.fileno()).st_size != size:
+        return False
+
+    drop_page_cache(target)
+
+    for offset in get_sample_offsets(size):
+        source.seek(offset)
+        target.seek(offset)
+        if source.read(SAMPLE_SIZE) != target.read(SAMPLE_SIZE):
+            return False
+
+    return True
@@ -0,0 +1,376 @@
+import asyncio
+import os
+import traceback
+from typing import Awaitable, BinaryIO, Callable, Coroutine, Dict, List, Optional, Set, Tuple
+
+from ..utils.logger import get_logger
+from .inotify import (
+    IN_CREATE,
+    IN_DELETE,
+    IN_IGNORED,
+    IN_MODIFY,
+    IN_MOVED_FROM,
+    IN_MOVED_TO,
+    IN_ONLYDIR,
+    IN_Q_OVERFLOW,
+    Inotify,
+    is_inotify_available,
+)
+from .logfile_reading import (
+    CHUNK_SIZE,
+    file_was_replaced_or_cleared,
+    read_current_content,
+    read_rotated_logfiles,
+    seek_to_position,
+    split_lines,
+)
+from .LogfilePosition import LogfilePosition
+
+# events of the files in a directory, new content or logfiles being rotated
+DIRECTORY_WATCH_MASK = IN_MODIFY | IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_ONLYDIR
+# with inotify all logfiles are checked in this interval in case events got lost
+INOTIFY_TIMEOUT_SECONDS = 30.0
+
+
+class _WatchedLogfile:
+    """A logfile registered at a `LogWatcher`"""
+
+    # pylint: disable=too-few-public-methods, too-many-instance-attributes
+
+    def __init__(
+        self,
+        filepath: str,
+        on_lines: Callable[[List[str]], Awaitable[None]],
+        on_ready: Optional[Callable[[], Coroutine]],
+        on_file_missing: Optional[Callable[[], Coroutine]],
+        position: LogfilePosition,
+        prefilter: Optional[Tuple[bytes, ...]],
+    ):
+        self.filepath = filepath
+        self.on_lines = on_lines
+        self.on_ready = on_ready
+        self.on_file_missing = on_file_missing
+        self.position = position
+        self.prefilter = prefilter
+
+        self.fp: Optional[BinaryIO] = None
+        # the rest of a line being written
+        self.remainder = b""
+        # whether the content present at the start was read
+        self.is_ready = False
+        self.is_missing = False
+
+    def close(self):
+        if self.fp is not None:
+            self.fp.close()
+            self.fp = None
+        self.remainder = b""
+
+
+class LogWatcher:
+    """Watches many logfiles from a single task
+
+    All logfiles share one inotify instance watching their
+    directories, thus logfiles in the same directory also share a
+    watch. An event wakes up the task, which only reads the logfiles
+    the event belongs to. Adding a logfile costs an open file and a
+    few entries in dicts, no task, timer or inotify instance. Without
+    inotify all logfiles are checked in a fixed interval.
+
+    Every logfile is read in binary chunks split into lines at once:
+    the lines rotated away since its position and the content present
+    at the start are read at once, rotated logfiles are detected by
+    their inode and read to their end before the new logfile.
+    `watch_logfile_lines_generator` wraps a watcher of a single
+    logfile.
+    """
+
+    def __init__(self, interval_seconds: float = 1, chunk_size: int = CHUNK_SIZE):
+        """Initialize a watcher without logfiles
+
+        Parameters
+        ----------
+        interval_seconds : float
+            interval to check the logfiles in if inotify is not
+            available. With inotify it is the interval to look for
+            logfiles whose directory does not exist yet.
+        chunk_size : int
+            bytes read at once from a logfile
+        """
+        self.interval_seconds = interval_seconds
+        self.chunk_size = chunk_size
+
+        self.__logfiles: List[_WatchedLogfile] = []
+        # directory -> filename -> logfiles
+        self.__logfiles_by_directory: Dict[str, Dict[str, List[_WatchedLogfile]]] = {}
+        # directory -> watch descriptor
+        self.__directory_watches: Dict[str, int] = {}
+        self.__unwatched_directories: Set[str] = set()
+        # logfiles to read next in the order of their events
+        self.__pending: Dict[_WatchedLogfile, None] = {}
+
+        self.__inotify: Optional[Inotify] = None
+        self.__loop: Optional[asyncio.AbstractEventLoop] = None
+        self.__changed: Optional[asyncio.Event] = None
+
+    @property
+    def is_event_driven(self) -> bool:
+        """Whether the logfiles are watched with inotify"""
+        return self.__inotify is not None
+
+    def add_logfile(
+        self,
+        filepath: str,
+        on_lines: Callable[[List[str]], Awaitable[None]],
+        on_ready: Optional[Callable[[], Coroutine]] = None,
+        on_file_missing: Optional[Callable[[], Coroutine]] = None,
+        position: Optional[LogfilePosition] = None,
+        prefilter: Optional[Tuple[bytes, ...]] = None,
+    ) -> LogfilePosition:
+        """Registers a logfile to watch
+
+        Parameters
+        ----------
+        filepath : str
+            path to the logfile
+        on_lines : Callable[[List[str]], Awaitable[None]]
+            function to be triggered with new lines of the logfile
+        on_ready : Optional[Callable[[], Coroutine]]
+            function to be called when the lines present at the
+            start were read, that is before the last of them are
+            handed to on_lines
+        on_file_missing : Optional[Callable[[], Coroutine]]
+            function to be called once if the logfile does not exist
+        position : Optional[LogfilePosition]
+            position to resume reading from
+        prefilter : Optional[Tuple[bytes, ...]]
+            if given only lines containing any of these are processed
+
+        Returns
+        -------
+        position : LogfilePosition
+            position which is kept up to date with the lines processed
+
+        Notes
+        -----
+            Logfiles may also be added while the watcher is running.
+        """
+        if filepath.startswith("~"):
+            filepath = os.path.expanduser(filepath)
+
+        logfile = _WatchedLogfile(
+            filepath=filepath,
+            on_lines=on_lines,
+            on_ready=on_ready,
+            on_file_missing=on_file_missing,
+            position=position if position is not None else LogfilePosition(),
+            prefilter=prefilter,
+        )
+        self.__logfiles.append(logfile)
+
+        directory = os.path.dirname(os.path.abspath(filepath))
+        filename = os.path.basename(filepath)
+        self.__logfiles_by_directory.setdefault(directory, {}).setdefault(filename, []).append(
+            logfile
+        )
+        self.__watch_directory(directory)
+
+        self.__pending[logfile] = None
+        if self.__changed is not None:
+            self.__changed.set()
+
+        return logfile.position
+
+    async def run(self):
+        """Watches the logfiles until cancelled"""
+        self.__start()
+        try:
+            while True:
+                pending = list(self.__pending)
+                self.__pending.clear()
+                for logfile in pending:
+                    await self.__update(logfile)
+
+                await self.__wait()
+        finally:
+            self.close()
+
+    def close(self):
+        """Stops watching and closes all logfiles"""
+        if self.__inotify is not None:
+            if self.__loop is not None and not self.__loop.is_closed():
+                self.__loop.remove_reader(self.__inotify.fileno())
+            self.__inotify.close()
+            self.__inotify = None
+        self.__directory_watches.clear()
+        self.__changed = None
+
+        for logfile in self.__logfiles:
+            logfile.close()
+
+    def __start(self):
+        """Starts watching the directories of the logfiles
+
+        Notes
+        -----
+            Falls back to checking the logfiles in an interval if
+            inotify is not available or fails e.g. due to reaching
+            its limits.
+        """
+        self.__changed = asyncio.Event()
+        if not is_inotify_available():
+            return
+
+        inotify: Optional[Inotify] = None
+        try:
+            inotify = Inotify()
+            loop = asyncio.get_event_loop()
+            loop.add_reader(inotify.fileno(), self.__on_events)
+        except (OSError, NotImplementedError) as err:
+            get_logger(__file__).debug("Cannot use inotify, polling logfiles instead: %s", err)
+            if inotify is not None:
+                inotify.close()
+            return
+
+        self.__inotify = inotify
+        self.__loop = loop
+        for directory in self.__logfiles_by_directory:
+            self.__watch_directory(directory)
+
+    def __watch_directory(self, directory: str):
+        """Watches a directory of logfiles if not done already"""
+        if self.__inotify is None or directory in self.__directory_watches:
+            return
+
+        try:
+            self.__directory_watches[directory] = self.__inotify.add_watch(
+                directory, DIRECTORY_WATCH_MASK
+            )
+            self.__unwatched_directories.discard(directory)
+        except OSError:
+            # e.g. the directory does not exist yet
+            self.__unwatched_directories.add(directory)
+
+    async def __wait(self):
+        """Waits until logfiles changed and marks them as pending"""
+        if self.__inotify is None or self.__changed is None:
+            await asyncio.sleep(self.interval_seconds)
+            self.__pending.update(dict.fromkeys(self.__logfiles))
+            return
+
+        timeout = self.interval_seconds if self.__unwatched_directories else INOTIFY_TIMEOUT_SECONDS
+        try:
+            await asyncio.wait_for(self.__changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            for directory in list(self.__unwatched_directories):
+                self.__watch_directory(directory)
+            self.__pending.update(dict.fromkeys(self.__logfiles))
+        self.__changed.clear()
+
+    def __on_events(self):
+        """Reads the pending events and marks the logfiles they belong to"""
+        if self.__inotify is None or self.__changed is None:
+            return
+
+        for event in self.__inotify.read_events(timeout=0):
+            if event.mask & IN_Q_OVERFLOW:
+                self.__pending.update(dict.fromkeys(self.__logfiles))
+                continue
+
+            logfiles_by_filename = self.__logfiles_by_directory.get(event.path, {})
+            if event.mask & IN_IGNORED:
+                # the directory is gone and watched again once it exists
+                self.__directory_watches.pop(event.path, None)
+                self.__unwatched_directories.add(event.path)
+                for logfiles in logfiles_by_filename.values():
+                    self.__pending.update(dict.fromkeys(logfiles))
+            else:
+                self.__pending.update(dict.fromkeys(logfiles_by_filename.get(event.name, ())))
+
+        if self.__pending:
+            self.__changed.set()
+
+    async def __update(self, logfile: _WatchedLogfile):
+        """Reads the new lines of a logfile and follows its rotation"""
+        try:
+            if logfile.fp is not None:
+                await self.__read_new_lines(logfile)
+                if not file_was_replaced_or_cleared(logfile.fp, logfile.filepath):
+                    return
+                await self.__read_rotated_rest(logfile)
+
+            await self.__open(logfile)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            tb = traceback.format_exc()
+            get_logger(__file__).error("Error while watching logfile:\n%s", tb)
+            # reopened at the position on the next check
+            logfile.close()
+
+    async def __open(self, logfile: _WatchedLogfile):
+        """Opens the logfile at the path and reads it"""
+        logger = get_logger(__file__)
+        try:
+            logfile.fp = open(logfile.filepath, "rb")  # pylint: disable=consider-using-with
+        except FileNotFoundError:
+            if not logfile.is_missing:
+                logfile.is_missing = True
+                logger.info("Logfile %s not found, waiting for one to appear.", logfile.filepath)
+                if logfile.on_file_missing is not None:
+                    await logfile.on_file_missing()
+            return
+
+        logger.debug("(Re)opening logfile: %s", logfile.filepath)
+        logfile.is_missing = False
+
+        if logfile.is_ready:
+            seek_to_position(logfile.fp, logfile.position)
+            await self.__read_new_lines(logfile)
+            return
+
+        # lines which went into rotated logfiles since the position
+        async for lines in read_rotated_logfiles(
+            logfile.filepath, logfile.position, self.chunk_size, logfile.prefilter
+        ):
+            await logfile.on_lines(lines)
+
+        # catch up with the current content at once
+        seek_to_position(logfile.fp, logfile.position)
+        async for lines in read_current_content(
+            logfile.fp, logfile.position, self.chunk_size, logfile.prefilter, logfile.on_ready
+        ):
+            await logfile.on_lines(lines)
+        logfile.is_ready = True
+
+    async def __read_new_lines(self, logfile: _WatchedLogfile):
+        """Hands the lines written since the last read to the logfile's callback"""
+        fp = logfile.fp
+        if fp is None:
+            return
+
+        chunk = fp.read(self.chunk_size)
+        while chunk:
+            lines, logfile.remainder = split_lines(logfile.remainder + chunk, logfile.prefilter)
+            offset = fp.tell() - len(logfile.remainder)
+            if lines:
+                await logfile.on_lines(lines)
+            logfile.position.offset = offset
+            chunk = fp.read(self.chunk_size)
+
+    async def __read_rotated_rest(self, logfile: _WatchedLogfile):
+        """Reads a rotated logfile to its end and closes it"""
+        fp = logfile.fp
+        if fp is None:
+            return
+
+        # lines written before the file was rotated
+        # and the rest of an unterminated last line
+        rest = logfile.remainder + fp.read()
+        if rest and not rest.endswith(b"\n"):
+            rest += b"\n"
+        lines, _ = split_lines(rest, logfile.prefilter)
+        if lines:
+            await logfile.on_lines(lines)
+        logfile.position.offset = fp.tell()
+        logfile.close()
@@ -0,0 +1,28 @@
+import os
+from dataclasses import dataclass
+
+
+@dataclass
+class LogfilePosition:
+    """Position in a logfile up to which lines were processed"""
+
+    # inode and device identifying the file, -1 if unknown
+    inode: int = -1
+    device: int = -1
+    # bytes of the file processed
+    offset: int = 0
+
+    def is_file(self, stat: os.stat_result) -> bool:
+        """Checks if the position belongs to a file
+
+        Parameters
+        ----------
+        stat : os.stat_result
+            stat of the file
+
+        Returns
+        -------
+        is_file : bool
+            whether inode and device of the file match
+        """
+        return (self.inode, self.device) == (stat.st_ino, stat.st_dev)
@@ -1,9 +1,10 @@
 import asyncio
-import os
-import traceback
-from typing import AsyncGenerator, Awaitable, Callable, Coroutine, Optional, TextIO, Union
+from typing import AsyncGenerator, Awaitable, Callable, Coroutine, List, Optional, Tuple, Union
 
 from ..utils.logger import get_logger
+from .logfile_reading import CHUNK_SIZE
+from .LogfilePosition import LogfilePosition
+from .LogWatcher import LogWatcher
 
 
 async def watch_lines_infinitely(
@@ -11,6 +12,9 @@ async def watch_lines_infinitely(
     on_file_missing: Optional[Coroutine] = None,
     on_ready: Optional[Coroutine] = None,
     on_line: Optional[Callable[[str], Awaitable[None]]] = None,
+    on_lines: Optional[Callable[[List[str]], Awaitable[None]]] = None,
+    position: Optional[LogfilePosition] = None,
+    prefilter: Optional[Tuple[bytes, ...]] = None,
 ):
     """Start watching the specified file
 
@@ -27,6 +31,14 @@ async def watch_lines_infinitely(
     on_line : Optional[Callable[[str], Awaitable[None]]]
         function to be triggered if a new line has
         been found in the file
+    on_lines : Optional[Callable[[List[str]], Awaitable[None]]]
+        function to be triggered with all lines read at once,
+        which is much faster when catching up with a large file
+    position : Optional[LogfilePosition]
+        position to resume reading from, which is kept up to
+        date with the lines processed
+    prefilter : Optional[Tuple[bytes, ...]]
+        if given only lines containing any of these are processed
     """
 
     if not filepath:
@@ -37,34 +49,35 @@ async def watch_lines_infinitely(
     logger = get_logger(__name__)
     logger.debug("Searching logfile: %s", filepath)
 
-    # try to watch file
-    file_missing_was_run = False
-    line_generator: Union[None, AsyncGenerator[str, None]] = None
-    while line_generator is None:
-        try:
-            line_generator = watch_logfile_generator(
-                filepath=filepath,
-                on_ready=on_ready,
-            )
-
-            logger.debug("Logfile '%s' found. Starting to watch it.", filepath)
-
-            # process lines
-            async for line in line_generator:
-                if on_line is not None:
-                    await on_line(line)
-
-        except FileNotFoundError:
-            # in case there is no log file (yet) simply
-            # wait gently for one to appear
-            logger.info("Logfile %s not found, waiting for one to appear.", filepath)
-            await asyncio.sleep(3)
-            if on_file_missing is not None and not file_missing_was_run:
-                await on_file_missing()
-                file_missing_was_run = True
-
-
-async def watch_logfile_generator(  # noqa: C901
+    async def _on_lines(lines: List[str]):
+        await _process_lines(lines, on_line, on_lines)
+
+    log_watcher = LogWatcher()
+    log_watcher.add_logfile(
+        filepath,
+        on_lines=_on_lines,
+        on_ready=on_ready,
+        on_file_missing=on_file_missing,
+        position=position,
+        prefilter=prefilter,
+    )
+    await log_watcher.run()
+
+
+async def _process_lines(
+    lines: List[str],
+    on_line: Optional[Callable[[str], Awaitable[None]]],
+    on_lines: Optional[Callable[[List[str]], Awaitable[None]]],
+):
+    """Hands new lines to the callbacks of `watch_lines_infinitely`"""
+    if on_lines is not None:
+        await on_lines(lines)
+    if on_line is not None:
+        for line in lines:
+            await on_line(line)
+
+
+async def watch_logfile_generator(
     filepath: str, on_ready: Optional[Coroutine] = None, interval_seconds: float = 1
 ) -> AsyncGenerator[str, None]:
     """Watch a logfile for changes
@@ -82,56 +95,120 @@ async def watch_logfile_generator(  # noqa: C901
     ------
     line : str
         a newly added line to the file
-    """
-
-    logger = get_logger(__name__)
-
-    if filepath.startswith("~"):
-        filepath = os.path.expanduser(filepath)
-
-    # loop for reopening the log file
-    # chia uses a rotating logging scheme
-    # moving the log file when it's full
-    # and making a new one in-place.
-    # To keep track we need to reopen the new file
-    while True:
-        try:
-            logger.debug("(Re)opening logfile: %s", filepath)
-            with open(filepath, "r", encoding="utf8") as fp:
-                while True:
-
-                    # yield as many lines as there are
-                    new_line = fp.readline()
-                    while new_line:
-
-                        # must be placed here so when we yielded
-                        # the last line we caught up
-                        if _end_of_file(fp):
-                            await on_ready()
-
-                        terminate = yield new_line
-                        if terminate:
-                            raise StopAsyncIteration()
-                        new_line = fp.readline()
-
-                    # sleep to give it a rest
-                    await asyncio.sleep(interval_seconds)
-
-                    # check if file was replaced, then rewind
-                    if _file_was_replaced_or_cleared(fp, filepath):
-                        break
-
-            if terminate:
-                break
 
-        except Exception:
-            tb = traceback.format_exc()
-            logger.error("Error while watching logfile:\n%s", tb)
+    Notes
+    -----
+        Wraps `watch_logfile_lines_generator` for consumers
+        processing one line at a time.
+    """
+    lines_generator = watch_logfile_lines_generator(filepath, on_ready, interval_seconds)
+    try:
+        async for lines in lines_generator:
+            for line in lines:
+                terminate = yield line
+                if terminate:
+                    return
+    finally:
+        await lines_generator.aclose()
+
+
+async def watch_logfile_lines_generator(
+    filepath: str,
+    on_ready: Optional[Coroutine] = None,
+    interval_seconds: float = 1,
+    chunk_size: int = CHUNK_SIZE,
+    position: Optional[LogfilePosition] = None,
+    prefilter: Optional[Tuple[bytes, ...]] = None,
+) -> AsyncGenerator[List[str], None]:
+    """Watch a logfile for changes and yield new lines in batches
 
+    Parameters
+    ----------
+    filepath : str
+        path to the logfile to watch
+    on_ready: Optional[Coroutine] = None,
+        function to be called once the initial lines were loaded,
+        that is before the batch reaching the end of the file
+        is yielded
+    interval_seconds : str
+        timing interval in which to check the file for new content
+        if the file cannot be watched with inotify
+    chunk_size : int
+        bytes read at once from the file
+    position : Optional[LogfilePosition]
+        position to resume from if it belongs to the logfile. It is
+        updated with the lines processed whenever the next batch
+        is requested.
+    prefilter : Optional[Tuple[bytes, ...]]
+        if given only lines containing any of these are decoded
+        and yielded
 
-def _end_of_file(fp: TextIO) -> bool:
-    return fp.tell() == os.stat(fp.fileno()).st_size
+    Yields
+    ------
+    lines : List[str]
+        newly added lines to the file including their line break
 
+    Raises
+    ------
+    FileNotFoundError
+        If the logfile does not exist.
+
+    Notes
+    -----
+        The file is read in binary chunks which are split into
+        lines at once, thus catching up with a large file does not
+        cost a read and a coroutine switch per line. A line is only
+        yielded once it is terminated by a line break, the rest of a
+        line being written is kept until the next read.
+
+        The logfile is read by a `LogWatcher` of its own, thus on
+        linux new lines are yielded right after they were written. A
+        rotated logfile is detected by its inode and read to its end
+        before the new logfile is opened.
+
+        If the logfile was rotated since the position, the rest of the
+        rotated logfile holding the position and any newer rotated
+        logfiles are read before the current logfile.
+
+        The content of the logfile at the start is read in large
+        chunks at once. With a prefilter the lines are filtered before
+        decoding them, which speeds up reading a large logfile if
+        only a few lines are of interest.
+    """
 
-def _file_was_replaced_or_cleared(fp: TextIO, filepath: str) -> bool:
-    return fp.tell() > os.stat(filepath).st_size
+    queue: "asyncio.Queue[Union[List[str], Exception]]" = asyncio.Queue()
+
+    async def _on_lines(lines: List[str]):
+        await queue.put(lines)
+        # the position moves once the consumer requests the next batch
+        await queue.join()
+
+    async def _on_file_missing():
+        await queue.put(FileNotFoundError(f"Logfile {filepath} not found"))
+
+    def _on_watcher_done(task: "asyncio.Future[None]"):
+        if not task.cancelled() and task.exception() is not None:
+            queue.put_nowait(task.exception())
+
+    log_watcher = LogWatcher(interval_seconds, chunk_size)
+    log_watcher.add_logfile(
+        filepath,
+        on_lines=_on_lines,
+        on_ready=on_ready,
+        on_file_missing=_on_file_missing,
+        position=position,
+        prefilter=prefilter,
+    )
+
+    task = asyncio.ensure_future(log_watcher.run())
+    task.add_done_callback(_on_watcher_done)
+    try:
+        while True:
+            lines = await queue.get()
+            if isinstance(lines, Exception):
+                raise lines
+            yield lines
+            queue.task_done()
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
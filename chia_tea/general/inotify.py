@@ -0,0 +1,210 @@
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+# event flags from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_UNMOUNT = 0x00002000
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+IN_CLOEXEC = 0o2000000
+IN_NONBLOCK = 0o4000
+
+# wd, mask, cookie, len
+_EVENT_HEADER = struct.Struct("iIII")
+# enough for many events with long names
+_READ_SIZE = 64 * 1024
+
+
+@dataclass
+class InotifyEvent:
+    """A filesystem event reported by inotify"""
+
+    watch_descriptor: int
+    mask: int
+    cookie: int
+    # directory of the watch the event belongs to
+    path: str
+    # name of the file within the watched directory, empty
+    # if the event concerns the watched path itself
+    name: str
+
+    @property
+    def filepath(self) -> str:
+        """Full path of the file the event is about"""
+        return os.path.join(self.path, self.name) if self.name else self.path
+
+
+def _load_libc() -> Optional[ctypes.CDLL]:
+    if not sys.platform.startswith("linux"):
+        return None
+
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    except OSError:
+        return None
+
+    if not all(
+        hasattr(libc, name) for name in ("inotify_init1", "inotify_add_watch", "inotify_rm_watch")
+    ):
+        return None
+
+    return libc
+
+
+_LIBC = _load_libc()
+
+
+def is_inotify_available() -> bool:
+    """Checks if inotify can be used on this system
+
+    Returns
+    -------
+    available : bool
+        whether the system is linux and libc provides inotify
+    """
+    return _LIBC is not None
+
+
+class Inotify:
+    """Minimal wrapper around the inotify API of linux
+
+    Raises
+    ------
+    OSError
+        If inotify is not available or cannot be initialized
+        e.g. due to reaching the limit of inotify instances.
+    """
+
+    def __init__(self):
+        if _LIBC is None:
+            raise OSError(errno.ENOSYS, "inotify is not available")
+
+        fd = _LIBC.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+
+        self.fd = fd
+        # watch descriptor -> watched path
+        self.watches: Dict[int, str] = {}
+
+    def fileno(self) -> int:
+        """File descriptor of the inotify instance"""
+        return self.fd
+
+    def add_watch(self, path: str, mask: int) -> int:
+        """Starts watching a path
+
+        Parameters
+        ----------
+        path : str
+            file or directory to watch
+        mask : int
+            events to watch for
+
+        Returns
+        -------
+        watch_descriptor : int
+            id of the watch
+
+        Raises
+        ------
+        OSError
+            If the path cannot be watched.
+        """
+        wd = _LIBC.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), path)
+
+        self.watches[wd] = path
+        return wd
+
+    def remove_watch(self, watch_descriptor: int):
+        """Stops watching a path
+
+        Parameters
+        ----------
+        watch_descriptor : int
+            id of the watch returned by `add_watch`
+        """
+        if self.watches.pop(watch_descriptor, None) is not None:
+            # fails if the kernel removed the watch already
+            _LIBC.inotify_rm_watch(self.fd, watch_descriptor)
+
+    def read_events(self, timeout: Optional[float] = None) -> List[InotifyEvent]:
+        """Waits for events
+
+        Parameters
+        ----------
+        timeout : Optional[float]
+            maximum time to wait in seconds. Waits forever if None.
+
+        Returns
+        -------
+        events : List[InotifyEvent]
+            events which occurred, empty if the timeout passed
+        """
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return []
+
+        try:
+            data = os.read(self.fd, _READ_SIZE)
+        except BlockingIOError:
+            return []
+
+        events = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))  # noqa: E203
+            offset += length
+
+            path = self.watches.get(wd, "")
+            if mask & IN_IGNORED:
+                # the kernel removed the watch e.g. since the path is gone
+                self.watches.pop(wd, None)
+
+            events.append(
+                InotifyEvent(
+                    watch_descriptor=wd,
+                    mask=mask,
+                    cookie=cookie,
+                    path=path,
+                    name=name,
+                )
+            )
+
+        return events
+
+    def close(self):
+        """Closes the inotify instance and all its watches"""
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+            self.watches.clear()
+
+    def __enter__(self) -> "Inotify":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,451 @@
+import mmap
+import os
+from typing import AsyncGenerator, BinaryIO, Coroutine, Iterator, List, Optional, Tuple
+
+from ..utils.logger import get_logger
+from .LogfilePosition import LogfilePosition
+
+# bytes read at once from a logfile
+CHUNK_SIZE = 1024 * 1024
+
+
+def split_lines(
+    data: bytes, prefilter: Optional[Tuple[bytes, ...]] = None
+) -> Tuple[List[str], bytes]:
+    """Splits data into complete lines and the rest of an unterminated line
+
+    Parameters
+    ----------
+    data : bytes
+        data read from the logfile
+    prefilter : Optional[Tuple[bytes, ...]]
+        if given only lines containing any of these are returned
+
+    Returns
+    -------
+    lines : List[str]
+        decoded lines including their line break
+    remainder : bytes
+        data after the last line break
+
+    Notes
+    -----
+        With a prefilter the lines are searched on the bytes level
+        and only the matching lines are decoded, which is much
+        faster if only a few lines are of interest.
+    """
+    i_end = data.rfind(b"\n") + 1
+    if i_end == 0:
+        return [], data
+
+    if prefilter is not None:
+        return _find_lines(data[:i_end], prefilter), data[i_end:]
+
+    # like text mode, any line ending is read as a line break
+    text = data[:i_end].decode("utf8", errors="replace")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    lines = [line + "\n" for line in text[:-1].split("\n")]
+
+    return lines, data[i_end:]
+
+
+def _find_lines(data: bytes, keywords: Tuple[bytes, ...]) -> List[str]:
+    """Finds the lines containing any keyword in data ending with a line break"""
+    line_bounds = set()
+    for keyword in keywords:
+        i_match = data.find(keyword)
+        while i_match >= 0:
+            i_start = data.rfind(b"\n", 0, i_match) + 1
+            i_end = data.find(b"\n", i_match) + 1
+            line_bounds.add((i_start, i_end))
+            i_match = data.find(keyword, i_end)
+
+    lines = []
+    for i_start, i_end in sorted(line_bounds):
+        line = data[i_start : i_end - 1]  # noqa: E203
+        # like `split_lines` without prefilter, a bare \r is a line break too
+        parts = line.split(b"\r") if b"\r" in line else (line,)
+        for part in parts:
+            if part and any(keyword in part for keyword in keywords):
+                lines.append(part.decode("utf8", errors="replace") + "\n")
+    return lines
+
+
+def iter_lines_mmap(
+    fileno: int,
+    offset: int,
+    size: int,
+    chunk_size: int = CHUNK_SIZE,
+    prefilter: Optional[Tuple[bytes, ...]] = None,
+) -> Iterator[Tuple[List[str], int]]:
+    """Reads the complete lines of a file by memory mapping it
+
+    Parameters
+    ----------
+    fileno : int
+        file descriptor of the file
+    offset : int
+        byte offset to start reading from
+    size : int
+        bytes of the file to read
+    chunk_size : int
+        bytes split into lines at once
+    prefilter : Optional[Tuple[bytes, ...]]
+        if given only lines containing any of these are yielded
+
+    Yields
+    ------
+    lines : List[str]
+        lines of the file including their line break, may be
+        empty if no line matched the prefilter
+    offset : int
+        byte offset after the lines
+
+    Notes
+    -----
+        The file is read without copying it through a read buffer.
+        Data after the last line break is not read. Accessing the
+        mapping of a file truncated meanwhile crashes the process
+        with SIGBUS, thus use `iter_lines_read` for a live logfile.
+    """
+    if offset >= size:
+        return
+
+    with mmap.mmap(fileno, size, access=mmap.ACCESS_READ) as data:
+        while offset < size:
+            # chunks end at a line break, unless a line is that long
+            i_end = data.rfind(b"\n", offset, min(size, offset + chunk_size)) + 1
+            if i_end == 0:
+                i_end = data.find(b"\n", offset + chunk_size, size) + 1
+            if i_end == 0:
+                return
+
+            lines, _ = split_lines(data[offset:i_end], prefilter)
+            offset = i_end
+            yield lines, offset
+
+
+def iter_lines_read(
+    fp: BinaryIO,
+    offset: int,
+    size: int,
+    chunk_size: int = CHUNK_SIZE,
+    prefilter: Optional[Tuple[bytes, ...]] = None,
+) -> Iterator[Tuple[List[str], int]]:
+    """Reads the complete lines of a file in plain chunks
+
+    Parameters
+    ----------
+    fp : BinaryIO
+        file opened in binary mode
+    offset : int
+        byte offset to start reading from
+    size : int
+        bytes of the file to read
+    chunk_size : int
+        bytes read at once
+    prefilter : Optional[Tuple[bytes, ...]]
+        if given only lines containing any of these are yielded
+
+    Yields
+    ------
+    lines : List[str]
+        lines of the file including their line break, may be
+        empty if no line matched the prefilter
+    offset : int
+        byte offset after the lines
+
+    Notes
+    -----
+        Unlike `iter_lines_mmap` this is safe for a file which is
+        still written, a file truncated meanwhile just ends early.
+        Data after the last line break is not read.
+    """
+    fp.seek(offset)
+    remainder = b""
+    i_read = offset
+    while i_read < size:
+        chunk = fp.read(min(chunk_size, size - i_read))
+        if not chunk:
+            return
+        i_read += len(chunk)
+
+        lines, remainder = split_lines(remainder + chunk, prefilter)
+        if len(remainder) < len(chunk):
+            yield lines, i_read - len(remainder)
+
+
+def get_rotated_logfiles(filepath: str) -> List[str]:
+    """Get the files a logfile was rotated into
+
+    Parameters
+    ----------
+    filepath : str
+        path to the logfile
+
+    Returns
+    -------
+    filepaths : List[str]
+        rotated logfiles such as 'debug.log.1', 'debug.log.2', ...
+        from the newest to the oldest
+
+    Notes
+    -----
+        Chia rotates its logfile by renaming 'debug.log' to
+        'debug.log.1' after shifting 'debug.log.1' to 'debug.log.2'
+        and so on.
+    """
+    folder = os.path.dirname(os.path.abspath(filepath))
+    prefix = os.path.basename(filepath) + "."
+
+    rotated_logfiles = []
+    try:
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                suffix = entry.name[len(prefix) :]  # noqa: E203
+                if entry.name.startswith(prefix) and suffix.isdigit() and entry.is_file():
+                    rotated_logfiles.append((int(suffix), entry.path))
+    except OSError:
+        return []
+
+    return [path for _, path in sorted(rotated_logfiles)]
+
+
+def find_unread_logfiles(filepath: str, position: LogfilePosition) -> Optional[List[str]]:
+    """Finds the rotated logfiles which were not read completely
+
+    Parameters
+    ----------
+    filepath : str
+        path to the logfile
+    position : LogfilePosition
+        position up to which the logfile was read
+
+    Returns
+    -------
+    filepaths : Optional[List[str]]
+        rotated logfiles to read from the oldest to the newest. The
+        first one is the file of the position, which is read from
+        its offset. Empty if the position belongs to the logfile
+        itself and None if no file of the position was found.
+    """
+    try:
+        stat = os.stat(filepath)
+        if position.is_file(stat):
+            return [] if position.offset <= stat.st_size else None
+    except OSError:
+        pass
+
+    rotated_logfiles = get_rotated_logfiles(filepath)
+    for i_file, rotated_filepath in enumerate(rotated_logfiles):
+        try:
+            stat = os.stat(rotated_filepath)
+        except OSError:
+            continue
+        if position.is_file(stat):
+            if position.offset > stat.st_size:
+                return None
+            # newer files have a lower number
+            return rotated_logfiles[i_file::-1]
+
+    return None
+
+
+def read_lines_from_offset(
+    filepath: str,
+    offset: int,
+    chunk_size: int = CHUNK_SIZE,
+    prefilter: Optional[Tuple[bytes, ...]] = None,
+) -> Iterator[Tuple[List[str], int]]:
+    """Reads the lines of a file which doesn't change anymore
+
+    Parameters
+    ----------
+    filepath : str
+        path to the file
+    offset : int
+        byte offset to start reading from
+    chunk_size : int
+        bytes split into lines at once
+    prefilter : Optional[Tuple[bytes, ...]]
+        if given only lines containing any of these are yielded
+
+    Yields
+    ------
+    lines : List[str]
+        lines of the file including their line break
+    offset : int
+        byte offset after the lines
+
+    Notes
+    -----
+        The file is memory mapped, thus it is read without copying it
+        through a read buffer. An unterminated last line is yielded
+        as a complete line since nothing is appended anymore.
+    """
+    with open(filepath, "rb") as fp:
+        size = os.fstat(fp.fileno()).st_size
+        for lines, offset in iter_lines_mmap(fp.fileno(), offset, size, chunk_size, prefilter):
+            yield lines, offset
+
+        if offset < size:
+            fp.seek(offset)
+            yield split_lines(fp.read() + b"\n", prefilter)[0], size
+
+
+async def read_current_content(
+    fp: BinaryIO,
+    position: LogfilePosition,
+    chunk_size: int,
+    prefilter: Optional[Tuple[bytes, ...]],
+    on_ready: Optional[Coroutine],
+) -> AsyncGenerator[List[str], None]:
+    """Reads the complete lines of the logfile from the position to its end
+
+    Parameters
+    ----------
+    fp : BinaryIO
+        opened logfile
+    position : LogfilePosition
+        position to read from, which is updated with the lines
+        processed whenever the next batch is requested
+    chunk_size : int
+        bytes read at once from the file
+    prefilter : Optional[Tuple[bytes, ...]]
+        if given only lines containing any of these are yielded
+    on_ready : Optional[Coroutine]
+        function to be called before the last lines are yielded
+
+    Yields
+    ------
+    lines : List[str]
+        lines of the logfile including their line break
+
+    Notes
+    -----
+        The file is read with plain reads instead of memory mapping
+        it since it may be truncated while the lines are processed.
+        It is positioned after the last complete line afterwards.
+    """
+    size = os.fstat(fp.fileno()).st_size
+    is_empty = True
+    batches = iter_lines_read(fp, position.offset, size, chunk_size, prefilter)
+
+    batch = next(batches, None)
+    while batch is not None:
+        next_batch = next(batches, None)
+        lines, offset = batch
+        is_empty = False
+        if next_batch is None and on_ready is not None:
+            await on_ready()
+        if lines:
+            yield lines
+        # the consumer is done with the lines
+        position.offset = offset
+        batch = next_batch
+
+    # files without any complete line are read completely too
+    if is_empty and on_ready is not None:
+        await on_ready()
+    fp.seek(position.offset)
+
+
+async def read_rotated_logfiles(
+    filepath: str,
+    position: LogfilePosition,
+    chunk_size: int,
+    prefilter: Optional[Tuple[bytes, ...]],
+) -> AsyncGenerator[List[str], None]:
+    """Reads the lines rotated away since the position was saved
+
+    Parameters
+    ----------
+    filepath : str
+        path to the current logfile
+    position : LogfilePosition
+        position saved before, which is moved through the rotated
+        logfiles with the lines processed
+    chunk_size : int
+        bytes read at once from the files
+    prefilter : Optional[Tuple[bytes, ...]]
+        if given only lines containing any of these are yielded
+
+    Yields
+    ------
+    lines : List[str]
+        lines of the rotated logfiles from oldest to newest
+    """
+    if position.inode < 0:
+        return
+
+    logger = get_logger(__file__)
+    unread_logfiles = find_unread_logfiles(filepath, position)
+    if unread_logfiles is None:
+        logger.warning("Logfile of the last position not found, reading '%s' fully", filepath)
+        return
+
+    for i_file, unread_filepath in enumerate(unread_logfiles):
+        logger.debug("Reading rotated logfile: %s", unread_filepath)
+        try:
+            stat = os.stat(unread_filepath)
+            position.inode = stat.st_ino
+            position.device = stat.st_dev
+            position.offset = position.offset if i_file == 0 else 0
+            for lines, offset in read_lines_from_offset(
+                unread_filepath, position.offset, chunk_size, prefilter
+            ):
+                if lines:
+                    yield lines
+                # the consumer is done with the lines
+                position.offset = offset
+        except OSError as err:
+            logger.warning("Cannot read rotated logfile '%s': %s", unread_filepath, err)
+
+
+def seek_to_position(fp: BinaryIO, position: LogfilePosition):
+    """Continues at the position if it belongs to the file, else starts over
+
+    Parameters
+    ----------
+    fp : BinaryIO
+        opened logfile
+    position : LogfilePosition
+        position to continue at, which is reset to the start of
+        the file if it belongs to another file
+    """
+    stat = os.fstat(fp.fileno())
+    if position.is_file(stat) and position.offset <= stat.st_size:
+        fp.seek(position.offset)
+    else:
+        position.inode = stat.st_ino
+        position.device = stat.st_dev
+        position.offset = 0
+
+
+def file_was_replaced_or_cleared(fp: BinaryIO, filepath: str) -> bool:
+    """Checks if the logfile was rotated or truncated
+
+    Parameters
+    ----------
+    fp : BinaryIO
+        opened logfile
+    filepath : str
+        path of the logfile
+
+    Returns
+    -------
+    replaced_or_cleared : bool
+        whether another file is at the path or the file is shorter
+        than what was read. A missing file does not count as
+        replaced until a new one is created.
+    """
+    try:
+        stat = os.stat(filepath)
+    except FileNotFoundError:
+        # the rotated logfile is not replaced yet
+        return False
+
+    fstat = os.fstat(fp.fileno())
+    is_replaced = (stat.st_ino, stat.st_dev) != (fstat.st_ino, fstat.st_dev)
+    return is_replaced or fp.tell() > stat.st_size
@@ -0,0 +1,182 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from typing import Dict, List
+from unittest.mock import patch
+
+from ..utils.testing import async_test
+from .inotify import is_inotify_available
+from . import LogWatcher as log_watcher_module
+from .LogWatcher import LogWatcher
+
+
+class TestLogWatcher(unittest.TestCase):
+    def setUp(self) -> None:
+        # pylint: disable=consider-using-with
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.lines: Dict[str, List[str]] = {}
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def _write(self, filename: str, content: str, mode: str = "a") -> str:
+        filepath = os.path.join(self.tmp_dir.name, filename)
+        with open(filepath, mode, encoding="utf8") as fp:
+            fp.write(content)
+        return filepath
+
+    def _add_logfile(self, watcher: LogWatcher, filepath: str, **kwargs):
+        self.lines[filepath] = []
+
+        async def _on_lines(lines: List[str]):
+            self.lines[filepath].extend(lines)
+
+        return watcher.add_logfile(filepath, on_lines=_on_lines, **kwargs)
+
+    async def _wait_for_lines(self, filepath: str, expected_lines: List[str]):
+        for _ in range(500):
+            if len(self.lines[filepath]) >= len(expected_lines):
+                break
+            await asyncio.sleep(0.01)
+        self.assertListEqual(self.lines[filepath], expected_lines)
+
+    @async_test
+    async def test_watches_many_logfiles(self):
+
+        filepaths = [self._write(f"madmax_{i_file}.log", f"{i_file}\n") for i_file in range(3)]
+        n_ready = 0
+
+        async def _on_ready():
+            nonlocal n_ready
+            n_ready += 1
+
+        watcher = LogWatcher(interval_seconds=0.01)
+        for filepath in filepaths:
+            self._add_logfile(watcher, filepath, on_ready=_on_ready)
+
+        task = asyncio.create_task(watcher.run())
+        try:
+            for i_file, filepath in enumerate(filepaths):
+                await self._wait_for_lines(filepath, [f"{i_file}\n"])
+            self.assertEqual(n_ready, 3)
+
+            self._write("madmax_1.log", "A\n")
+            await self._wait_for_lines(filepaths[1], ["1\n", "A\n"])
+            self.assertListEqual(self.lines[filepaths[0]], ["0\n"])
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    @unittest.skipUnless(is_inotify_available(), "requires inotify")
+    @async_test
+    async def test_logfiles_share_a_directory_watch(self):
+
+        filepaths = [self._write(f"madmax_{i_file}.log", "") for i_file in range(3)]
+
+        # events wake up the watcher, not the interval
+        watcher = LogWatcher(interval_seconds=100)
+        for filepath in filepaths:
+            self._add_logfile(watcher, filepath)
+
+        task = asyncio.create_task(watcher.run())
+        try:
+            await asyncio.sleep(0.1)
+            self.assertTrue(watcher.is_event_driven)
+
+            self._write("madmax_2.log", "A\n")
+            await self._wait_for_lines(filepaths[2], ["A\n"])
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    @async_test
+    async def test_follows_rotation_and_missing_logfiles(self):
+
+        filepath = self._write("debug.log", "A\n")
+        missing_filepath = os.path.join(self.tmp_dir.name, "missing", "madmax.log")
+        n_missing = 0
+
+        async def _on_file_missing():
+            nonlocal n_missing
+            n_missing += 1
+
+        watcher = LogWatcher(interval_seconds=0.01)
+        position = self._add_logfile(watcher, filepath)
+        self._add_logfile(watcher, missing_filepath, on_file_missing=_on_file_missing)
+
+        task = asyncio.create_task(watcher.run())
+        try:
+            await self._wait_for_lines(filepath, ["A\n"])
+
+            # the rest of the rotated logfile is read before the new one
+            self._write("debug.log.new", "C\n")
+            self._write("debug.log", "B")
+            os.rename(filepath, filepath + ".1")
+            os.replace(filepath + ".new", filepath)
+            await self._wait_for_lines(filepath, ["A\n", "B\n", "C\n"])
+            self.assertTrue(position.is_file(os.stat(filepath)))
+            self.assertEqual(position.offset, 2)
+
+            # logfiles are found once their directory exists
+            os.makedirs(os.path.dirname(missing_filepath))
+            self._write(os.path.join("missing", "madmax.log"), "D\n")
+            await self._wait_for_lines(missing_filepath, ["D\n"])
+            self.assertEqual(n_missing, 1)
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    @async_test
+    async def test_rotated_logfile_ending_with_line_break(self):
+
+        filepath = self._write("debug.log", "A\n")
+        file_was_replaced_or_cleared = log_watcher_module.file_was_replaced_or_cleared
+        is_rotated = False
+
+        def _file_was_replaced_or_cleared(fp, path) -> bool:
+            nonlocal is_rotated
+            is_replaced = file_was_replaced_or_cleared(fp, path)
+            if is_replaced and not is_rotated:
+                # written right before the logfile was rotated
+                self._write("debug.log.1", "B\n")
+                is_rotated = True
+            return is_replaced
+
+        watcher = LogWatcher(interval_seconds=0.01)
+        self._add_logfile(watcher, filepath)
+
+        with patch.object(
+            log_watcher_module, "file_was_replaced_or_cleared", _file_was_replaced_or_cleared
+        ):
+            task = asyncio.create_task(watcher.run())
+            try:
+                await self._wait_for_lines(filepath, ["A\n"])
+
+                self._write("debug.log.new", "C\n")
+                os.rename(filepath, filepath + ".1")
+                os.replace(filepath + ".new", filepath)
+                await self._wait_for_lines(filepath, ["A\n", "B\n", "C\n"])
+            finally:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+
+    @patch("chia_tea.general.LogWatcher.is_inotify_available", return_value=False)
+    @async_test
+    async def test_polling_fallback(self, _):
+
+        filepath = self._write("debug.log", "A\n")
+
+        watcher = LogWatcher(interval_seconds=0.01)
+        self._add_logfile(watcher, filepath)
+
+        task = asyncio.create_task(watcher.run())
+        try:
+            await self._wait_for_lines(filepath, ["A\n"])
+            self.assertFalse(watcher.is_event_driven)
+
+            self._write("debug.log", "B\n")
+            await self._wait_for_lines(filepath, ["A\n", "B\n"])
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
@@ -1,9 +1,16 @@
+import asyncio
 import os
 import tempfile
 import unittest
 
 from ..utils.testing import async_test
-from .file_watching import watch_logfile_generator
+from .inotify import is_inotify_available
+from .file_watching import (
+    watch_lines_infinitely,
+    watch_logfile_generator,
+    watch_logfile_lines_generator,
+)
+from .LogfilePosition import LogfilePosition
 
 
 class TestChiaWatchdog(unittest.TestCase):
@@ -69,3 +76,184 @@ class TestChiaWatchdog(unittest.TestCase):
             line = await line_generator.asend(None)
             line = line.replace("\n", "")
             self.assertEqual(line, lines[-1])
+
+    @async_test
+    async def test_watch_logfile_lines_generator_reads_in_batches(self):
+
+        some_list = []
+
+        async def set_ready():
+            some_list.append("something")
+
+        with tempfile.TemporaryDirectory() as dir_path:
+            filepath = os.path.join(dir_path, "test.log")
+            with open(filepath, "wb") as fp:
+                fp.write("A\nB\r\nC \u00e4\nunterminated".encode("utf8"))
+
+            lines_generator = watch_logfile_lines_generator(
+                filepath, on_ready=set_ready, interval_seconds=0.01, chunk_size=4
+            )
+
+            lines = []
+            while len(lines) < 3:
+                lines.extend(await lines_generator.asend(None))
+            self.assertListEqual(lines, ["A\n", "B\n", "C \u00e4\n"])
+
+            # the unterminated line is completed
+            with open(filepath, "ab") as fp:
+                fp.write(b" line\nD\n")
+            lines = []
+            while len(lines) < 2:
+                lines.extend(await lines_generator.asend(None))
+            self.assertListEqual(lines, ["unterminated line\n", "D\n"])
+            self.assertEqual(len(some_list), 1)
+
+            await lines_generator.aclose()
+
+    @async_test
+    async def test_watch_logfile_lines_generator_empty_file_is_ready(self):
+
+        some_list = []
+
+        async def set_ready():
+            some_list.append("something")
+
+        with tempfile.TemporaryDirectory() as dir_path:
+            filepath = os.path.join(dir_path, "test.log")
+            with open(filepath, "w", encoding="utf-8"):
+                pass
+
+            lines_generator = watch_logfile_lines_generator(
+                filepath, on_ready=set_ready, interval_seconds=0.01
+            )
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(lines_generator.asend(None), 0.1)
+            self.assertEqual(len(some_list), 1)
+
+    @async_test
+    async def test_watch_lines_infinitely_with_lines_and_line(self):
+
+        batches = []
+        single_lines = []
+
+        async def on_lines(lines):
+            batches.append(lines)
+
+        async def on_line(line):
+            single_lines.append(line)
+
+        with tempfile.TemporaryDirectory() as dir_path:
+            filepath = os.path.join(dir_path, "test.log")
+            with open(filepath, "w", encoding="utf-8") as fp:
+                fp.write("A\nB\n")
+
+            task = asyncio.ensure_future(
+                watch_lines_infinitely(filepath, on_line=on_line, on_lines=on_lines)
+            )
+            await asyncio.sleep(0.1)
+            task.cancel()
+
+            self.assertListEqual(batches, [["A\n", "B\n"]])
+            self.assertListEqual(single_lines, ["A\n", "B\n"])
+
+    @unittest.skipUnless(is_inotify_available(), "requires inotify")
+    @async_test
+    async def test_watch_logfile_lines_generator_is_woken_up_by_inotify(self):
+
+        with tempfile.TemporaryDirectory() as dir_path:
+            filepath = os.path.join(dir_path, "test.log")
+            with open(filepath, "w", encoding="utf-8") as fp:
+                fp.write("A\n")
+
+            # polling would not see any new line within the test
+            lines_generator = watch_logfile_lines_generator(filepath, interval_seconds=100)
+            self.assertListEqual(await lines_generator.asend(None), ["A\n"])
+
+            with open(filepath, "a", encoding="utf-8") as fp:
+                fp.write("B\n")
+            lines = await asyncio.wait_for(lines_generator.asend(None), 5)
+            self.assertListEqual(lines, ["B\n"])
+
+            # rotation with a line written just before it
+            with open(filepath, "a", encoding="utf-8") as fp:
+                fp.write("C\n")
+            os.rename(filepath, filepath + ".1")
+            with open(filepath, "w", encoding="utf-8") as fp:
+                fp.write("D\n")
+
+            lines = []
+            while len(lines) < 2:
+                lines.extend(await asyncio.wait_for(lines_generator.asend(None), 5))
+            self.assertListEqual(lines, ["C\n", "D\n"])
+
+            await lines_generator.aclose()
+
+    @async_test
+    async def test_watch_logfile_lines_generator_resumes_at_position(self):
+
+        with tempfile.TemporaryDirectory() as dir_path:
+            filepath = os.path.join(dir_path, "test.log")
+            with open(filepath, "w", encoding="utf-8") as fp:
+                fp.write("A\nB\n")
+
+            stat = os.stat(filepath)
+            position = LogfilePosition(inode=stat.st_ino, device=stat.st_dev, offset=2)
+            lines_generator = watch_logfile_lines_generator(
+                filepath, interval_seconds=0.01, position=position
+            )
+            self.assertListEqual(await lines_generator.asend(None), ["B\n"])
+            # the position moves once the lines were processed
+            self.assertEqual(position.offset, 2)
+
+            with open(filepath, "a", encoding="utf-8") as fp:
+                fp.write("C\n")
+            self.assertListEqual(await lines_generator.asend(None), ["C\n"])
+            self.assertEqual(position.offset, 4)
+            await lines_generator.aclose()
+
+            # a position of another file is not used
+            position = LogfilePosition(inode=stat.st_ino + 1, device=stat.st_dev, offset=2)
+            lines_generator = watch_logfile_lines_generator(
+                filepath, interval_seconds=0.01, position=position
+            )
+            self.assertListEqual(await lines_generator.asend(None), ["A\n", "B\n", "C\n"])
+            self.assertEqual(position.inode, stat.st_ino)
+            await lines_generator.aclose()
+
+    @async_test
+    async def test_watch_logfile_lines_generator_reads_rotated_logfiles(self):
+
+        with tempfile.TemporaryDirectory() as dir_path:
+            filepath = os.path.join(dir_path, "debug.log")
+            for suffix, content in ((".2", "A\nB\n"), (".1", "C\n"), ("", "D\n")):
+                with open(filepath + suffix, "w", encoding="utf-8") as fp:
+                    fp.write(content)
+
+            # A was processed before the logfile was rotated twice
+            stat = os.stat(filepath + ".2")
+            position = LogfilePosition(inode=stat.st_ino, device=stat.st_dev, offset=2)
+            lines_generator = watch_logfile_lines_generator(
+                filepath, interval_seconds=0.01, position=position
+            )
+
+            lines = []
+            while len(lines) < 3:
+                lines.extend(await lines_generator.asend(None))
+            self.assertListEqual(lines, ["B\n", "C\n", "D\n"])
+
+            with open(filepath, "a", encoding="utf-8") as fp:
+                fp.write("E\n")
+            self.assertListEqual(await lines_generator.asend(None), ["E\n"])
+            self.assertEqual(position.offset, 2)
+            self.assertTrue(position.is_file(os.stat(filepath)))
+            await lines_generator.aclose()
+
+    @async_test
+    async def test_watch_logfile_lines_generator_missing_file(self):
+
+        with tempfile.TemporaryDirectory() as dir_path:
+            filepath = os.path.join(dir_path, "test.log")
+
+            lines_generator = watch_logfile_lines_generator(filepath, interval_seconds=0.01)
+            with self.assertRaises(FileNotFoundError):
+                await asyncio.wait_for(lines_generator.asend(None), 5)
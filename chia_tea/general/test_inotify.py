@@ -0,0 +1,56 @@
+import os
+import tempfile
+import unittest
+
+from .inotify import (
+    IN_CLOSE_WRITE,
+    IN_DELETE,
+    IN_IGNORED,
+    IN_MOVED_TO,
+    Inotify,
+    is_inotify_available,
+)
+
+
+@unittest.skipUnless(is_inotify_available(), "requires inotify")
+class TestInotify(unittest.TestCase):
+    def test_events_are_read(self):
+
+        with tempfile.TemporaryDirectory() as tmp_dir, Inotify() as inotify:
+            wd = inotify.add_watch(tmp_dir, IN_CLOSE_WRITE | IN_MOVED_TO | IN_DELETE)
+
+            filepath = os.path.join(tmp_dir, "file")
+            with open(filepath + ".tmp", "w", encoding="utf8") as fp:
+                fp.write("content")
+            os.rename(filepath + ".tmp", filepath)
+            os.unlink(filepath)
+
+            events = inotify.read_events(timeout=5)
+
+            self.assertListEqual(
+                [(event.watch_descriptor, event.mask, event.filepath) for event in events],
+                [
+                    (wd, IN_CLOSE_WRITE, filepath + ".tmp"),
+                    (wd, IN_MOVED_TO, filepath),
+                    (wd, IN_DELETE, filepath),
+                ],
+            )
+            self.assertListEqual(inotify.read_events(timeout=0), [])
+
+    def test_removed_watch(self):
+
+        with tempfile.TemporaryDirectory() as tmp_dir, Inotify() as inotify:
+            wd = inotify.add_watch(tmp_dir, IN_CLOSE_WRITE)
+            self.assertDictEqual(inotify.watches, {wd: tmp_dir})
+
+            inotify.remove_watch(wd)
+            self.assertDictEqual(inotify.watches, {})
+
+            events = inotify.read_events(timeout=5)
+            self.assertEqual(len(events), 1)
+            self.assertTrue(events[0].mask & IN_IGNORED)
+
+    def test_add_watch_to_missing_path_fails(self):
+
+        with Inotify() as inotify, self.assertRaises(FileNotFoundError):
+            inotify.add_watch("/does/not/exist", IN_CLOSE_WRITE)
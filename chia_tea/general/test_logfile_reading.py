@@ -0,0 +1,116 @@
+import os
+import tempfile
+import unittest
+
+from .logfile_reading import (
+    find_unread_logfiles,
+    get_rotated_logfiles,
+    iter_lines_read,
+    read_lines_from_offset,
+    split_lines,
+)
+from .LogfilePosition import LogfilePosition
+
+
+class TestLogfileReading(unittest.TestCase):
+    def setUp(self) -> None:
+        # pylint: disable=consider-using-with
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.filepath = os.path.join(self.tmp_dir.name, "debug.log")
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def _write(self, filepath: str, content: str):
+        with open(filepath, "w", encoding="utf8") as fp:
+            fp.write(content)
+
+    def _get_position(self, filepath: str, offset: int) -> LogfilePosition:
+        stat = os.stat(filepath)
+        return LogfilePosition(inode=stat.st_ino, device=stat.st_dev, offset=offset)
+
+    def test_split_lines(self):
+
+        self.assertTupleEqual(split_lines(b"A\nB\r\nC"), (["A\n", "B\n"], b"C"))
+        self.assertTupleEqual(split_lines(b"C"), ([], b"C"))
+        self.assertTupleEqual(split_lines(b"\xff\n"), (["�\n"], b""))
+
+    def test_split_lines_with_prefilter(self):
+
+        data = b"a farmer\nb harvester\r\nc farmer harvester\nfarmer d"
+        self.assertTupleEqual(
+            split_lines(data, prefilter=(b"harvester", b"c farmer")),
+            (["b harvester\n", "c farmer harvester\n"], b"farmer d"),
+        )
+        self.assertTupleEqual(split_lines(data, prefilter=()), ([], b"farmer d"))
+
+    def test_split_lines_with_carriage_returns(self):
+
+        # e.g. progress output of the madmax plotter
+        data = b"[P1] Table 1\r[P1] Table 2\rdone\n[P2] Table 7\r\n\r\n"
+        keywords = (b"[P1]", b"[P2]")
+
+        lines, _ = split_lines(data)
+        self.assertListEqual(
+            lines, ["[P1] Table 1\n", "[P1] Table 2\n", "done\n", "[P2] Table 7\n", "\n"]
+        )
+        # the prefilter only drops lines, it splits them the same way
+        self.assertListEqual(
+            split_lines(data, prefilter=keywords)[0],
+            [line for line in lines if "[P1]" in line or "[P2]" in line],
+        )
+
+    def test_get_rotated_logfiles(self):
+
+        for suffix in ("", ".1", ".2", ".10", ".tmp", ".1.gz"):
+            self._write(self.filepath + suffix, "")
+
+        self.assertListEqual(
+            get_rotated_logfiles(self.filepath),
+            [self.filepath + ".1", self.filepath + ".2", self.filepath + ".10"],
+        )
+
+    def test_find_unread_logfiles(self):
+
+        self._write(self.filepath + ".2", "A\nB\n")
+        self._write(self.filepath + ".1", "C\n")
+        self._write(self.filepath, "D\n")
+
+        position = self._get_position(self.filepath + ".2", 2)
+        self.assertListEqual(
+            find_unread_logfiles(self.filepath, position),
+            [self.filepath + ".2", self.filepath + ".1"],
+        )
+
+        position = self._get_position(self.filepath, 2)
+        self.assertListEqual(find_unread_logfiles(self.filepath, position), [])
+
+        # offsets beyond the end belong to another file
+        position = self._get_position(self.filepath + ".1", 100)
+        self.assertIsNone(find_unread_logfiles(self.filepath, position))
+        self.assertIsNone(find_unread_logfiles(self.filepath, LogfilePosition()))
+
+    def test_read_lines_from_offset(self):
+
+        self._write(self.filepath, "A\nBB\nunterminated")
+
+        results = list(read_lines_from_offset(self.filepath, 2, chunk_size=2))
+        self.assertListEqual(results, [(["BB\n"], 5), (["unterminated\n"], 17)])
+
+        self.assertListEqual(list(read_lines_from_offset(self.filepath, 17)), [])
+
+        self._write(self.filepath, "")
+        self.assertListEqual(list(read_lines_from_offset(self.filepath, 0)), [])
+
+    def test_iter_lines_read(self):
+
+        self._write(self.filepath, "A\nBBBB\nC\nunterminated")
+
+        with open(self.filepath, "rb") as fp:
+            # long lines span several chunks
+            results = list(iter_lines_read(fp, 2, 19, chunk_size=2))
+            self.assertListEqual(results, [(["BBBB\n"], 7), (["C\n"], 9)])
+
+            # a logfile truncated meanwhile just ends early
+            os.truncate(self.filepath, 4)
+            self.assertListEqual(list(iter_lines_read(fp, 0, 19, chunk_size=2)), [(["A\n"], 2)])
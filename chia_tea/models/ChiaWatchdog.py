@@ -1,6 +1,6 @@
 import copy
 import asyncio
-from typing import Dict, List
+from typing import Dict, List, Set
 
 from .FarmerAPI import FarmerAPI
 from .HarvesterAPI import HarvesterAPI
@@ -16,7 +16,6 @@ class ChiaWatchdog:
     # pylint: disable=too-many-instance-attributes
 
     __logfile_chia_ready: bool = False
-    __logfile_madmax_ready: bool = False
 
     # members related to logfile checking
     harvester_infos: Dict[str, FarmerHarvesterLogfile]
@@ -31,18 +30,19 @@ class ChiaWatchdog:
     harvester_service: HarvesterAPI
     full_node_service: FullNodeAPI
 
-    def __init__(self, logfile_filepath: str, madmax_logfile: str):
+    def __init__(self, logfile_filepath: str, madmax_logfiles: List[str]):
         """initialize a chia watchdog
 
         Parameters
         ----------
         logfile_filepath : str
             path to the logfile to watch
-        madmax_logfile : str
-            path to the madmax logfile to watch
+        madmax_logfiles : List[str]
+            paths to the logfiles of the madmax plotters to watch
         """
         self.logfile_filepath = logfile_filepath
-        self.madmax_logfile = madmax_logfile
+        self.madmax_logfiles = madmax_logfiles
+        self.__ready_madmax_logfiles: Set[str] = set()
         self.harvester_infos = {}
         self.farmer_service = FarmerAPI()
         self.wallet_service = WalletAPI()
@@ -55,7 +55,7 @@ class ChiaWatchdog:
         """Wait for the readiness of the watchdog"""
         while not (
             self.__logfile_chia_ready
-            and self.__logfile_madmax_ready
+            and self.__ready_madmax_logfiles.issuperset(self.madmax_logfiles)
             and self.harvester_service.is_ready
             and self.farmer_service.is_ready
             and self.wallet_service.is_ready
@@ -67,9 +67,15 @@ class ChiaWatchdog:
         """When the chia logfile scanner has done its init, this gets called"""
         self.__logfile_chia_ready = True
 
-    def set_madmax_logfile_is_ready(self):
-        """When the madmax logfile scanner has done its init, this gets called"""
-        self.__logfile_madmax_ready = True
+    def set_madmax_logfile_is_ready(self, madmax_logfile: str):
+        """When the scanner of a madmax logfile has done its init, this gets called
+
+        Parameters
+        ----------
+        madmax_logfile : str
+            path to the madmax logfile
+        """
+        self.__ready_madmax_logfiles.add(madmax_logfile)
 
     def get_or_create_harvester_info(
         self,
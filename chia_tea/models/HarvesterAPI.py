@@ -1,6 +1,8 @@
 from dataclasses import dataclass, field
 from typing import Iterable, List
 
+from .PlotInventory import PlotInventory
+
 
 @dataclass
 class HarvesterAPI:
@@ -14,18 +16,7 @@ class HarvesterAPI:
     is_ready: bool = False
 
     is_running: bool = False
-    plots: List[dict] = field(default_factory=list)
-    # Plot layout:
-    # {
-    #     'file_size': 108878195752,
-    #     'filename': 'path/to/blabla.plot',
-    #     'plot-seed': '0x00000000...',
-    #     'plot_public_key': '0x00000000....',
-    #     'pool_contract_puzzle_hash': None,
-    #     'pool_public_key': '0x00000000....',
-    #     'size': 32,
-    #     'time_modified': 1621370658.446281
-    # }
+    plot_inventory: PlotInventory = field(default_factory=PlotInventory)
     failed_to_open_filenames: List[str] = field(default_factory=list)
     not_found_filenames: List[str] = field(default_factory=list)
     plot_directories: Iterable[str] = tuple()
@@ -65,3 +65,5 @@ class MadMaxPlotInProgress:
     progress: float
     plot_type: int
     state: str
+    # madmax logfile the plot is tracked in
+    logfile: str = ""
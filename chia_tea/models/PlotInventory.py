@@ -0,0 +1,289 @@
+import os
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..protobuf.generated.chia_pb2 import HarvesterPlot
+
+# the harvester loads new plots with a delay thus changed directories
+# are refreshed until they did not change for this long
+SETTLE_SECONDS = 180
+# all plots are refreshed once in a while to catch anything missed
+FULL_REFRESH_SECONDS = 1800
+# plots failing to open don't change their directory, thus the failed
+# and missing plots are requested in this interval in any case
+PROBLEM_REFRESH_SECONDS = 300
+
+# signature of a directory which cannot be reached
+MISSING_SIGNATURE = (-1, -1)
+
+
+@dataclass
+class _DirectoryState:
+    """Last seen state of a plot directory"""
+
+    # modification time in ns and size of the directory
+    signature: Tuple[int, int]
+    # monotonic time the signature changed the last time
+    changed_at: float
+
+
+class PlotInventory:
+    """Plots of the harvester indexed by their plot public key
+
+    The harvester only reports all plots at once. To not compare and
+    convert thousands of plots every few seconds, the directories of
+    the plots are stat'ed and only if one changed the plots are
+    updated. Only the entries of changed directories are compared
+    with the harvester's answer and only changed plots are converted
+    again. Every plot keeps its protobuf message, thus the messages
+    must not be modified.
+
+    A plot is keyed by its public key and belongs to the directory
+    of its file, which is also watched if it is a subdirectory of a
+    plot directory.
+
+    Plots which fail to open or went missing don't change their
+    directory, thus the plots are also requested in a slower
+    interval to report these.
+    """
+
+    def __init__(
+        self,
+        settle_seconds: float = SETTLE_SECONDS,
+        full_refresh_seconds: float = FULL_REFRESH_SECONDS,
+        problem_refresh_seconds: float = PROBLEM_REFRESH_SECONDS,
+    ):
+        """Initialize an empty plot inventory
+
+        Parameters
+        ----------
+        settle_seconds : float
+            time for which a changed directory is refreshed
+        full_refresh_seconds : float
+            time after which all plots are refreshed
+        problem_refresh_seconds : float
+            time after which the plots failing to open are
+            requested again
+        """
+        self.settle_seconds = settle_seconds
+        self.full_refresh_seconds = full_refresh_seconds
+        self.problem_refresh_seconds = problem_refresh_seconds
+
+        # plot public key -> plot
+        self.__plots: Dict[str, HarvesterPlot] = {}
+        # plot public key -> filename, file size and modification time
+        self.__versions: Dict[str, Tuple[str, int, float]] = {}
+        # directory -> number of plots in it
+        self.__plot_counts: Counter = Counter()
+        # directory -> last seen state
+        self.__directories: Dict[str, _DirectoryState] = {}
+        self.__last_full_refresh: Optional[float] = None
+        self.__last_problem_refresh: Optional[float] = None
+        self.__plot_list: Optional[List[HarvesterPlot]] = None
+
+    def __len__(self) -> int:
+        return len(self.__plots)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "PlotInventory":
+        # messages are never modified, thus sharing them is safe
+        # and avoids copying thousands of plots for every snapshot
+        inventory = PlotInventory(
+            self.settle_seconds, self.full_refresh_seconds, self.problem_refresh_seconds
+        )
+        inventory.__plots = dict(self.__plots)
+        inventory.__versions = dict(self.__versions)
+        inventory.__plot_counts = Counter(self.__plot_counts)
+        inventory.__directories = dict(self.__directories)
+        inventory.__last_full_refresh = self.__last_full_refresh
+        inventory.__last_problem_refresh = self.__last_problem_refresh
+        inventory.__plot_list = self.__plot_list
+        memo[id(self)] = inventory
+        return inventory
+
+    def get_plots(self) -> List[HarvesterPlot]:
+        """Get all plots of the inventory
+
+        Returns
+        -------
+        plots : List[HarvesterPlot]
+            plots of the harvester, the list is reused until
+            the inventory changes
+        """
+        if self.__plot_list is None:
+            self.__plot_list = list(self.__plots.values())
+        return self.__plot_list
+
+    def invalidate(self):
+        """Makes the next check request a full refresh, e.g. after a restart"""
+        self.__last_full_refresh = None
+        self.__last_problem_refresh = None
+
+    def is_problem_refresh_due(self) -> bool:
+        """Checks if the plots failing to open need to be requested again
+
+        Returns
+        -------
+        is_due : bool
+            whether the failed and missing plots were not requested
+            for a while
+        """
+        return (
+            self.__last_problem_refresh is None
+            or time.monotonic() - self.__last_problem_refresh > self.problem_refresh_seconds
+        )
+
+    def set_problems_refreshed(self):
+        """Remembers that the failed and missing plots were just requested"""
+        self.__last_problem_refresh = time.monotonic()
+
+    def get_directories_to_refresh(self, plot_directories: Iterable[str]) -> Optional[Set[str]]:
+        """Checks which directories changed and need a refresh
+
+        Parameters
+        ----------
+        plot_directories : Iterable[str]
+            plot directories of the harvester
+
+        Returns
+        -------
+        directories : Optional[Set[str]]
+            directories whose plots need to be refreshed, None if
+            all plots need a refresh and empty if nothing changed
+
+        Notes
+        -----
+            Directories with plots and the plot directories are
+            stat'ed once every call. A directory stays in the result
+            until it did not change for a while, since the harvester
+            loads new plots with a delay. Directories which are no
+            plot directory anymore are returned once so that their
+            plots are removed.
+        """
+        now = time.monotonic()
+        watched_directories = {os.path.normpath(directory) for directory in plot_directories}
+        watched_directories |= set(self.__plot_counts)
+
+        to_refresh = set()
+        for directory in set(self.__directories) - watched_directories:
+            del self.__directories[directory]
+            to_refresh.add(directory)
+
+        for directory in watched_directories:
+            signature = _get_signature(directory)
+            state = self.__directories.get(directory)
+            if state is None or state.signature != signature:
+                state = _DirectoryState(signature=signature, changed_at=now)
+                self.__directories[directory] = state
+            if now - state.changed_at <= self.settle_seconds:
+                to_refresh.add(directory)
+
+        if (
+            self.__last_full_refresh is None
+            or now - self.__last_full_refresh > self.full_refresh_seconds
+        ):
+            return None
+        return to_refresh
+
+    def update(self, plots: List[Dict[str, Any]], directories: Optional[Set[str]] = None):
+        """Updates the inventory from the plots reported by the harvester
+
+        Parameters
+        ----------
+        plots : List[Dict[str, Any]]
+            all plots as returned by the harvester's 'get_plots'
+        directories : Optional[Set[str]]
+            directories whose plots are updated as returned by
+            `get_directories_to_refresh`. All plots are updated
+            if not specified.
+
+        Notes
+        -----
+            Plots in directories not seen before are always added.
+            Plots are removed only from the updated directories.
+
+            Plot layout:
+            {
+                'file_size': 108878195752,
+                'filename': 'path/to/blabla.plot',
+                'plot-seed': '0x00000000...',
+                'plot_public_key': '0x00000000....',
+                'pool_contract_puzzle_hash': None,
+                'pool_public_key': '0x00000000....',
+                'size': 32,
+                'time_modified': 1621370658.446281
+            }
+        """
+        reported_keys = set()
+        for plot in plots:
+            directory = _get_directory(plot["filename"])
+            if (
+                directories is not None
+                and directory in self.__directories
+                and directory not in directories
+            ):
+                continue
+
+            key = plot["plot_public_key"]
+            reported_keys.add(key)
+            version = (plot["filename"], plot["file_size"], plot["time_modified"])
+            if self.__versions.get(key) != version:
+                self.__remove(key)
+                self.__plots[key] = _to_harvester_plot(plot)
+                self.__versions[key] = version
+                self.__plot_counts[directory] += 1
+                self.__plot_list = None
+
+        removed_keys = [
+            key
+            for key, (filename, _, _) in self.__versions.items()
+            if key not in reported_keys
+            and (directories is None or _get_directory(filename) in directories)
+        ]
+        for key in removed_keys:
+            self.__remove(key)
+
+        if directories is None:
+            self.__last_full_refresh = time.monotonic()
+
+    def __remove(self, key: str):
+        """Removes a plot if it is in the inventory"""
+        version = self.__versions.pop(key, None)
+        if version is None:
+            return
+
+        del self.__plots[key]
+        directory = _get_directory(version[0])
+        self.__plot_counts[directory] -= 1
+        if self.__plot_counts[directory] <= 0:
+            del self.__plot_counts[directory]
+        self.__plot_list = None
+
+
+def _get_directory(filename: str) -> str:
+    """Get the normalized directory of a plot file"""
+    return os.path.dirname(os.path.normpath(filename))
+
+
+def _get_signature(directory: str) -> Tuple[int, int]:
+    """Get the modification time and size of a directory"""
+    try:
+        stat = os.stat(directory)
+    except OSError:
+        return MISSING_SIGNATURE
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _to_harvester_plot(plot: Dict[str, Any]) -> HarvesterPlot:
+    """Converts a plot reported by the harvester to protobuf"""
+    return HarvesterPlot(
+        id=plot["plot_public_key"],
+        plot_seed=plot["plot-seed"],
+        filename=plot["filename"],
+        filesize=plot["file_size"],
+        pool_contract_puzzle_hash=plot["pool_contract_puzzle_hash"],
+        pool_public_key=plot["pool_public_key"],
+        size=plot["size"],
+        time_modified=plot["time_modified"],
+    )
@@ -8,7 +8,7 @@ from .ChiaWatchdog import ChiaWatchdog
 class TestChiaWatchdog(unittest.TestCase):
     @async_test
     async def test_readiness(self):
-        dog = ChiaWatchdog("", "")
+        dog = ChiaWatchdog("", ["madmax_1.log", "madmax_2.log"])
 
         async def assert_not_ready():
             with self.assertRaises(asyncio.TimeoutError):
@@ -16,7 +16,9 @@ class TestChiaWatchdog(unittest.TestCase):
 
         dog.set_chia_logfile_is_ready()
         await assert_not_ready()
-        dog.set_madmax_logfile_is_ready()
+        dog.set_madmax_logfile_is_ready("madmax_1.log")
+        await assert_not_ready()
+        dog.set_madmax_logfile_is_ready("madmax_2.log")
         await assert_not_ready()
         dog.farmer_service.is_ready = True
         await assert_not_ready()
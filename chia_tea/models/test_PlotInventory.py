@@ -0,0 +1,159 @@
+import copy
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from .PlotInventory import PlotInventory
+
+
+def _get_plot(directory: str, key: str, time_modified: float = 1.0) -> dict:
+    return {
+        "file_size": 100,
+        "filename": os.path.join(directory, f"plot-{key}.plot"),
+        "plot-seed": "0x00",
+        "plot_public_key": key,
+        "pool_contract_puzzle_hash": None,
+        "pool_public_key": "0x01",
+        "size": 32,
+        "time_modified": time_modified,
+    }
+
+
+class TestPlotInventory(unittest.TestCase):
+    def setUp(self) -> None:
+        # pylint: disable=consider-using-with
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.dir_a = os.path.join(self.tmp_dir.name, "a")
+        self.dir_b = os.path.join(self.tmp_dir.name, "b")
+        os.makedirs(self.dir_a)
+        os.makedirs(self.dir_b)
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def _touch(self, directory: str, filename: str):
+        with open(os.path.join(directory, filename), "w", encoding="utf8"):
+            pass
+
+    def test_unchanged_directories_need_no_refresh(self):
+
+        inventory = PlotInventory(settle_seconds=0)
+        plot_directories = [self.dir_a, self.dir_b]
+
+        self.assertIsNone(inventory.get_directories_to_refresh(plot_directories))
+        inventory.update([_get_plot(self.dir_a, "1"), _get_plot(self.dir_b, "2")])
+
+        self.assertSetEqual(inventory.get_directories_to_refresh(plot_directories), set())
+        self.assertSetEqual({plot.id for plot in inventory.get_plots()}, {"1", "2"})
+
+    def test_changed_directories_are_refreshed_until_settled(self):
+
+        inventory = PlotInventory(settle_seconds=100, full_refresh_seconds=1e10)
+        plot_directories = [self.dir_a, self.dir_b]
+        inventory.get_directories_to_refresh(plot_directories)
+        inventory.update([])
+
+        with patch("chia_tea.models.PlotInventory.time.monotonic", return_value=1e9):
+            self.assertSetEqual(inventory.get_directories_to_refresh(plot_directories), set())
+
+            self._touch(self.dir_a, "new.plot")
+            self.assertSetEqual(
+                inventory.get_directories_to_refresh(plot_directories), {self.dir_a}
+            )
+
+        with patch("chia_tea.models.PlotInventory.time.monotonic", return_value=1e9 + 50):
+            self.assertSetEqual(
+                inventory.get_directories_to_refresh(plot_directories), {self.dir_a}
+            )
+
+        with patch("chia_tea.models.PlotInventory.time.monotonic", return_value=1e9 + 200):
+            self.assertSetEqual(inventory.get_directories_to_refresh(plot_directories), set())
+
+    def test_full_refresh_after_a_while(self):
+
+        inventory = PlotInventory(settle_seconds=0, full_refresh_seconds=100)
+        inventory.get_directories_to_refresh([self.dir_a])
+        inventory.update([])
+
+        with patch("chia_tea.models.PlotInventory.time.monotonic", return_value=1e9):
+            self.assertIsNone(inventory.get_directories_to_refresh([self.dir_a]))
+
+        inventory.invalidate()
+        self.assertIsNone(inventory.get_directories_to_refresh([self.dir_a]))
+
+    def test_only_changed_directories_are_updated(self):
+
+        inventory = PlotInventory(settle_seconds=0)
+        plot_a = _get_plot(self.dir_a, "1")
+        plot_b = _get_plot(self.dir_b, "2")
+        inventory.get_directories_to_refresh([self.dir_a, self.dir_b])
+        inventory.update([plot_a, plot_b])
+        message_a = inventory.get_plots()[0]
+
+        # plot 2 is gone, but its directory is not refreshed
+        inventory.update([plot_a], {self.dir_a})
+        self.assertEqual(len(inventory), 2)
+
+        inventory.update([plot_a], {self.dir_a, self.dir_b})
+        self.assertListEqual(inventory.get_plots(), [message_a])
+        # unchanged plots keep their message
+        self.assertIs(inventory.get_plots()[0], message_a)
+
+        inventory.update([_get_plot(self.dir_a, "1", time_modified=2.0)], {self.dir_a})
+        self.assertEqual(inventory.get_plots()[0].time_modified, 2.0)
+
+    def test_plots_in_new_directories_are_added(self):
+
+        inventory = PlotInventory(settle_seconds=0)
+        inventory.get_directories_to_refresh([self.dir_a])
+        inventory.update([])
+
+        subdir = os.path.join(self.dir_a, "subdir")
+        inventory.update([_get_plot(subdir, "1")], {self.dir_a})
+
+        self.assertEqual(len(inventory), 1)
+        # the subdirectory is watched from now on
+        inventory.get_directories_to_refresh([self.dir_a])
+        os.makedirs(subdir)
+        self.assertSetEqual(
+            inventory.get_directories_to_refresh([self.dir_a]), {self.dir_a, subdir}
+        )
+
+    def test_removed_plot_directories_are_refreshed_once(self):
+
+        inventory = PlotInventory(settle_seconds=0)
+        inventory.get_directories_to_refresh([self.dir_a, self.dir_b])
+        inventory.update([])
+
+        self.assertSetEqual(inventory.get_directories_to_refresh([self.dir_a]), {self.dir_b})
+        self.assertSetEqual(inventory.get_directories_to_refresh([self.dir_a]), set())
+
+    def test_deepcopy_shares_messages(self):
+
+        inventory = PlotInventory()
+        inventory.update([_get_plot(self.dir_a, "1")])
+
+        inventory_copy = copy.deepcopy(inventory)
+        inventory.update([])
+
+        self.assertEqual(len(inventory), 0)
+        self.assertEqual(len(inventory_copy), 1)
+        self.assertEqual(inventory_copy.get_plots()[0].id, "1")
+
+    def test_problems_are_refreshed_in_an_interval(self):
+
+        inventory = PlotInventory(problem_refresh_seconds=100)
+        self.assertTrue(inventory.is_problem_refresh_due())
+
+        with patch("chia_tea.models.PlotInventory.time.monotonic", return_value=1000):
+            inventory.set_problems_refreshed()
+        with patch("chia_tea.models.PlotInventory.time.monotonic", return_value=1050):
+            self.assertFalse(inventory.is_problem_refresh_due())
+        with patch("chia_tea.models.PlotInventory.time.monotonic", return_value=1101):
+            self.assertTrue(inventory.is_problem_refresh_due())
+
+            # e.g. the harvester restarted
+            inventory.set_problems_refreshed()
+            inventory.invalidate()
+            self.assertTrue(inventory.is_problem_refresh_due())
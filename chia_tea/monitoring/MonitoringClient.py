@@ -94,6 +94,7 @@ class MonitoringClient:
     credentials_cert: str
     machine_id: str
     machine_name: str
+    copy_status_filepath: str
 
     # throttling
     collection_frequencies: Dict[str, float]
@@ -109,6 +110,7 @@ class MonitoringClient:
         config=MonitoringConfig.ClientConfig,
         credentials_cert: str = "",
         machine_name: str = "",
+        copy_status_filepath: str = "",
     ):
         self.config = config
         self.credentials_cert = credentials_cert
@@ -117,6 +119,7 @@ class MonitoringClient:
         self.collection_frequencies = get_collection_frequencies(config)
         self.last_time_sent = {}
         self.machine_name = machine_name
+        self.copy_status_filepath = copy_status_filepath
 
     def is_event_allowed_to_be_sent(self, pb_msg: UpdateEvent) -> bool:
         """Checks if a an update event is allowed to be sent
@@ -222,6 +225,7 @@ class MonitoringClient:
                 # we make a copy here, otherwise the object might get
                 # mutated during data collection (takes a few ms).
                 self.chia_dog.snapshot(),
+                self.copy_status_filepath,
             )
 
             event_list = [
@@ -178,22 +178,7 @@ async def collect_harvester_plots(chia_dog: ChiaWatchdog) -> List[HarvesterPlot]
         list of plots on the harvester
     """
 
-    plots: List[HarvesterPlot] = []
-    for plot_response in chia_dog.harvester_service.plots:
-        plots.append(
-            HarvesterPlot(
-                id=plot_response["plot_public_key"],
-                plot_seed=plot_response["plot-seed"],
-                filename=plot_response["filename"],
-                filesize=plot_response["file_size"],
-                pool_contract_puzzle_hash=plot_response["pool_contract_puzzle_hash"],
-                pool_public_key=plot_response["pool_public_key"],
-                size=plot_response["size"],
-                time_modified=plot_response["time_modified"],
-            )
-        )
-
-    return plots
+    return list(chia_dog.harvester_service.plot_inventory.get_plots())
 
 
 @log_runtime_async(__file__)
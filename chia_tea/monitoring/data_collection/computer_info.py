@@ -14,11 +14,14 @@ from .chia import (
     collect_process_info,
     collect_wallet_info,
 )
+from .copying import collect_copy_jobs
 from .hardware import collect_cpu_info, collect_disk_info, collect_ram_info
 
 
 @log_runtime_async(__file__)
-async def collect_computer_info(machine_id: str, chia_dog: ChiaWatchdog) -> ComputerInfo:
+async def collect_computer_info(
+    machine_id: str, chia_dog: ChiaWatchdog, copy_status_filepath: str = ""
+) -> ComputerInfo:
     """Collects all the info about the machine
 
     Parameters
@@ -27,6 +30,8 @@ async def collect_computer_info(machine_id: str, chia_dog: ChiaWatchdog) -> Comp
         id of the machine
     chia_dog : ChiaWatchdog
         chia watchdog to take data from
+    copy_status_filepath : str
+        status file of the copy tool to take running copies from
 
     Returns
     -------
@@ -46,6 +51,7 @@ async def collect_computer_info(machine_id: str, chia_dog: ChiaWatchdog) -> Comp
         connected_harvesters,
         plots_in_progress,
         full_node_info,
+        copy_jobs,
     ) = await asyncio.gather(
         collect_cpu_info(),
         collect_disk_info(),
@@ -58,6 +64,7 @@ async def collect_computer_info(machine_id: str, chia_dog: ChiaWatchdog) -> Comp
         collect_connected_harvesters_to_farmer(chia_dog),
         collect_plots_in_progress(chia_dog),
         collect_full_node_info(chia_dog),
+        collect_copy_jobs(copy_status_filepath),
     )
 
     computer_info = ComputerInfo(
@@ -74,6 +81,7 @@ async def collect_computer_info(machine_id: str, chia_dog: ChiaWatchdog) -> Comp
         processes=chia_processes,
         plotting_plots=plots_in_progress,
         full_node=full_node_info,
+        copy_jobs=copy_jobs,
     )
 
     return computer_info
@@ -0,0 +1,37 @@
+import os
+from typing import List
+
+from ...copy.copy_status import read_copy_status
+from ...protobuf.generated.chia_pb2 import CopyJob
+from ...utils.logger import log_runtime_async
+
+
+@log_runtime_async(__file__)
+async def collect_copy_jobs(status_filepath: str) -> List[CopyJob]:
+    """Converts the copies published by the copy tool to protobuf
+
+    Parameters
+    ----------
+    status_filepath : str
+        status file of the copy tool. Nothing is collected if empty.
+
+    Returns
+    -------
+    copy_jobs : List[CopyJob]
+        running copies converted to protobuf
+    """
+    if not status_filepath:
+        return []
+
+    return [
+        CopyJob(
+            id=copy_job.target_filepath,
+            source_filepath=copy_job.source_filepath,
+            start_time=copy_job.start_time,
+            n_bytes_copied=copy_job.n_bytes_copied,
+            n_bytes_total=copy_job.n_bytes_total,
+            bytes_per_sec=copy_job.bytes_per_sec,
+            eta_seconds=copy_job.eta_seconds,
+        )
+        for copy_job in read_copy_status(os.path.expanduser(status_filepath))
+    ]
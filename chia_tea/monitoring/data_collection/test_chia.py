@@ -50,7 +50,7 @@ class TestChiaDataCollection(unittest.TestCase):
             n_responses=0,
         )
 
-        dog = ChiaWatchdog("", "")
+        dog = ChiaWatchdog("", [])
         dog.farmer_service.connections = [harvster_api]
         dog.harvester_infos = {node_id_str: harvester_logfile}
 
@@ -0,0 +1,51 @@
+import os
+import tempfile
+import unittest
+
+from ...copy.copy_status import CopyJobStatus, write_copy_status
+from ...protobuf.generated.chia_pb2 import CopyJob
+from ...utils.testing import async_test
+from .copying import collect_copy_jobs
+
+
+class TestCopyJobCollection(unittest.TestCase):
+    @async_test
+    async def test_copy_jobs_are_collected_from_status_file(self):
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            status_filepath = os.path.join(tmp_dir, "status.json")
+            write_copy_status(
+                status_filepath,
+                [
+                    CopyJobStatus(
+                        source_filepath="/source/plot.plot",
+                        target_filepath="/target/plot.plot",
+                        start_time=1000.0,
+                        n_bytes_copied=300,
+                        n_bytes_total=1000,
+                        bytes_per_sec=100.0,
+                    )
+                ],
+            )
+
+            copy_jobs = await collect_copy_jobs(status_filepath)
+
+        self.assertListEqual(
+            copy_jobs,
+            [
+                CopyJob(
+                    id="/target/plot.plot",
+                    source_filepath="/source/plot.plot",
+                    start_time=1000.0,
+                    n_bytes_copied=300,
+                    n_bytes_total=1000,
+                    bytes_per_sec=100.0,
+                    eta_seconds=7.0,
+                )
+            ],
+        )
+
+    @async_test
+    async def test_nothing_is_collected_without_status_file(self):
+
+        self.assertListEqual(await collect_copy_jobs(""), [])
@@ -19,7 +19,7 @@ def run_monitoring_client(config: ChiaTeaConfig) -> None:
     # create the watchdog
     watchdog = ChiaWatchdog(
         config.chia.logfile_filepath,
-        config.chia.madmax_logfile,
+        [filepath for filepath in config.chia.madmax_logfiles if filepath],
     )
 
     # we disable auth during testing
@@ -33,10 +33,11 @@ def run_monitoring_client(config: ChiaTeaConfig) -> None:
         config=config.monitoring.client,
         credentials_cert=cert,
         machine_name=config.machine.name,
+        copy_status_filepath=config.copy.status_filepath,
     )
 
     # setup event loops
     loop = asyncio.get_event_loop()
-    loop.create_task(run_watchdog(watchdog))
+    loop.create_task(run_watchdog(watchdog, config.chia.checkpoint_filepath))
     loop.create_task(client.start_sending_updates())
     loop.run_forever()
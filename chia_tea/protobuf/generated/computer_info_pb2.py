@@ -22,7 +22,7 @@ DESCRIPTOR = _descriptor.FileDescriptor(
   syntax='proto3',
   serialized_options=None,
   create_key=_descriptor._internal_create_key,
-  serialized_pb=b'\n/chia_tea/protobuf/generated/computer_info.proto\x12-chia_tea.protobuf.generated.computer_info_pb2\x1a*chia_tea/protobuf/generated/hardware.proto\x1a&chia_tea/protobuf/generated/chia.proto\"\xa9\x06\n\x0c\x43omputerInfo\x12\x11\n\ttimestamp\x18\x01 \x01(\x01\x12\x12\n\nmachine_id\x18\x02 \x01(\x03\x12:\n\x03\x63pu\x18\x03 \x01(\x0b\x32-.chia_tea.protobuf.generated.hardware_pb2.Cpu\x12:\n\x03ram\x18\x04 \x01(\x0b\x32-.chia_tea.protobuf.generated.hardware_pb2.Ram\x12=\n\x05\x64isks\x18\x05 \x03(\x0b\x32..chia_tea.protobuf.generated.hardware_pb2.Disk\x12L\n\x0eplotting_plots\x18\x06 \x03(\x0b\x32\x34.chia_tea.protobuf.generated.chia_pb2.PlotInProgress\x12<\n\x06\x66\x61rmer\x18\x07 \x01(\x0b\x32,.chia_tea.protobuf.generated.chia_pb2.Farmer\x12Z\n\x11\x66\x61rmer_harvesters\x18\x08 \x03(\x0b\x32?.chia_tea.protobuf.generated.chia_pb2.HarvesterViewedFromFarmer\x12\x42\n\tharvester\x18\t \x01(\x0b\x32/.chia_tea.protobuf.generated.chia_pb2.Harvester\x12L\n\x0fharvester_plots\x18\n \x03(\x0b\x32\x33.chia_tea.protobuf.generated.chia_pb2.HarvesterPlot\x12<\n\x06wallet\x18\x0b \x01(\x0b\x32,.chia_tea.protobuf.generated.chia_pb2.Wallet\x12\x41\n\tfull_node\x18\r \x01(\x0b\x32..chia_tea.protobuf.generated.chia_pb2.FullNode\x12@\n\tprocesses\x18\x0c \x03(\x0b\x32-.chia_tea.protobuf.generated.chia_pb2.Process\"\xed\x06\n\x0bUpdateEvent\x12L\n\nevent_type\x18\x03 \x01(\x0e\x32\x38.chia_tea.protobuf.generated.computer_info_pb2.EventType\x12<\n\x03\x63pu\x18\x04 \x01(\x0b\x32-.chia_tea.protobuf.generated.hardware_pb2.CpuH\x00\x12<\n\x03ram\x18\x05 \x01(\x0b\x32-.chia_tea.protobuf.generated.hardware_pb2.RamH\x00\x12>\n\x04\x64isk\x18\x06 \x01(\x0b\x32..chia_tea.protobuf.generated.hardware_pb2.DiskH\x00\x12>\n\x06\x66\x61rmer\x18\x07 \x01(\x0b\x32,.chia_tea.protobuf.generated.chia_pb2.FarmerH\x00\x12[\n\x10\x66\x61rmer_harvester\x18\x08 \x01(\x0b\x32?.chia_tea.protobuf.generated.chia_pb2.HarvesterViewedFromFarmerH\x00\x12M\n\x0eharvester_plot\x18\r \x01(\x0b\x32\x33.chia_tea.protobuf.generated.chia_pb2.HarvesterPlotH\x00\x12\x44\n\tharvester\x18\t \x01(\x0b\x32/.chia_tea.protobuf.generated.chia_pb2.HarvesterH\x00\x12>\n\x06wallet\x18\n \x01(\x0b\x32,.chia_tea.protobuf.generated.chia_pb2.WalletH\x00\x12@\n\x07process\x18\x0b \x01(\x0b\x32-.chia_tea.protobuf.generated.chia_pb2.ProcessH\x00\x12M\n\rplotting_plot\x18\x0c \x01(\x0b\x32\x34.chia_tea.protobuf.generated.chia_pb2.PlotInProgressH\x00\x12\x43\n\tfull_node\x18\x0e \x01(\x0b\x32..chia_tea.protobuf.generated.chia_pb2.FullNodeH\x00\x42\x0c\n\nevent_data*6\n\tEventType\x12\x08\n\x04NONE\x10\x00\x12\x07\n\x03\x41\x44\x44\x10\x01\x12\n\n\x06UPDATE\x10\x02\x12\n\n\x06\x44\x45LETE\x10\x03\x62\x06proto3'
+  serialized_pb=b'\n/chia_tea/protobuf/generated/computer_info.proto\x12-chia_tea.protobuf.generated.computer_info_pb2\x1a*chia_tea/protobuf/generated/hardware.proto\x1a&chia_tea/protobuf/generated/chia.proto\"\xeb\x06\n\x0c\x43omputerInfo\x12\x11\n\ttimestamp\x18\x01 \x01(\x01\x12\x12\n\nmachine_id\x18\x02 \x01(\x03\x12:\n\x03\x63pu\x18\x03 \x01(\x0b\x32-.chia_tea.protobuf.generated.hardware_pb2.Cpu\x12:\n\x03ram\x18\x04 \x01(\x0b\x32-.chia_tea.protobuf.generated.hardware_pb2.Ram\x12=\n\x05\x64isks\x18\x05 \x03(\x0b\x32..chia_tea.protobuf.generated.hardware_pb2.Disk\x12L\n\x0eplotting_plots\x18\x06 \x03(\x0b\x32\x34.chia_tea.protobuf.generated.chia_pb2.PlotInProgress\x12<\n\x06\x66\x61rmer\x18\x07 \x01(\x0b\x32,.chia_tea.protobuf.generated.chia_pb2.Farmer\x12Z\n\x11\x66\x61rmer_harvesters\x18\x08 \x03(\x0b\x32?.chia_tea.protobuf.generated.chia_pb2.HarvesterViewedFromFarmer\x12\x42\n\tharvester\x18\t \x01(\x0b\x32/.chia_tea.protobuf.generated.chia_pb2.Harvester\x12L\n\x0fharvester_plots\x18\n \x03(\x0b\x32\x33.chia_tea.protobuf.generated.chia_pb2.HarvesterPlot\x12<\n\x06wallet\x18\x0b \x01(\x0b\x32,.chia_tea.protobuf.generated.chia_pb2.Wallet\x12\x41\n\tfull_node\x18\r \x01(\x0b\x32..chia_tea.protobuf.generated.chia_pb2.FullNode\x12@\n\tprocesses\x18\x0c \x03(\x0b\x32-.chia_tea.protobuf.generated.chia_pb2.Process\x12@\n\tcopy_jobs\x18\x0e \x03(\x0b\x32-.chia_tea.protobuf.generated.chia_pb2.CopyJob\"\xb0\x07\n\x0bUpdateEvent\x12L\n\nevent_type\x18\x03 \x01(\x0e\x32\x38.chia_tea.protobuf.generated.computer_info_pb2.EventType\x12<\n\x03\x63pu\x18\x04 \x01(\x0b\x32-.chia_tea.protobuf.generated.hardware_pb2.CpuH\x00\x12<\n\x03ram\x18\x05 \x01(\x0b\x32-.chia_tea.protobuf.generated.hardware_pb2.RamH\x00\x12>\n\x04\x64isk\x18\x06 \x01(\x0b\x32..chia_tea.protobuf.generated.hardware_pb2.DiskH\x00\x12>\n\x06\x66\x61rmer\x18\x07 \x01(\x0b\x32,.chia_tea.protobuf.generated.chia_pb2.FarmerH\x00\x12[\n\x10\x66\x61rmer_harvester\x18\x08 \x01(\x0b\x32?.chia_tea.protobuf.generated.chia_pb2.HarvesterViewedFromFarmerH\x00\x12M\n\x0eharvester_plot\x18\r \x01(\x0b\x32\x33.chia_tea.protobuf.generated.chia_pb2.HarvesterPlotH\x00\x12\x44\n\tharvester\x18\t \x01(\x0b\x32/.chia_tea.protobuf.generated.chia_pb2.HarvesterH\x00\x12>\n\x06wallet\x18\n \x01(\x0b\x32,.chia_tea.protobuf.generated.chia_pb2.WalletH\x00\x12@\n\x07process\x18\x0b \x01(\x0b\x32-.chia_tea.protobuf.generated.chia_pb2.ProcessH\x00\x12M\n\rplotting_plot\x18\x0c \x01(\x0b\x32\x34.chia_tea.protobuf.generated.chia_pb2.PlotInProgressH\x00\x12\x43\n\tfull_node\x18\x0e \x01(\x0b\x32..chia_tea.protobuf.generated.chia_pb2.FullNodeH\x00\x12\x41\n\x08\x63opy_job\x18\x0f \x01(\x0b\x32-.chia_tea.protobuf.generated.chia_pb2.CopyJobH\x00\x42\x0c\n\nevent_data*6\n\tEventType\x12\x08\n\x04NONE\x10\x00\x12\x07\n\x03\x41\x44\x44\x10\x01\x12\n\n\x06UPDATE\x10\x02\x12\n\n\x06\x44\x45LETE\x10\x03\x62\x06proto3'
   ,
   dependencies=[chia__tea_dot_protobuf_dot_generated_dot_hardware__pb2.DESCRIPTOR,chia__tea_dot_protobuf_dot_generated_dot_chia__pb2.DESCRIPTOR,])
 
@@ -56,8 +56,8 @@ _EVENTTYPE = _descriptor.EnumDescriptor(
   ],
   containing_type=None,
   serialized_options=None,
-  serialized_start=1874,
-  serialized_end=1928,
+  serialized_start=2007,
+  serialized_end=2061,
 )
 _sym_db.RegisterEnumDescriptor(_EVENTTYPE)
 
@@ -168,6 +168,13 @@ _COMPUTERINFO = _descriptor.Descriptor(
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='copy_jobs', full_name='chia_tea.protobuf.generated.computer_info_pb2.ComputerInfo.copy_jobs', index=13,
+      number=14, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
@@ -181,7 +188,7 @@ _COMPUTERINFO = _descriptor.Descriptor(
   oneofs=[
   ],
   serialized_start=183,
-  serialized_end=992,
+  serialized_end=1058,
 )
 
 
@@ -277,6 +284,13 @@ _UPDATEEVENT = _descriptor.Descriptor(
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='copy_job', full_name='chia_tea.protobuf.generated.computer_info_pb2.UpdateEvent.copy_job', index=12,
+      number=15, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
@@ -294,8 +308,8 @@ _UPDATEEVENT = _descriptor.Descriptor(
       create_key=_descriptor._internal_create_key,
     fields=[]),
   ],
-  serialized_start=995,
-  serialized_end=1872,
+  serialized_start=1061,
+  serialized_end=2005,
 )
 
 _COMPUTERINFO.fields_by_name['cpu'].message_type = chia__tea_dot_protobuf_dot_generated_dot_hardware__pb2._CPU
@@ -309,6 +323,7 @@ _COMPUTERINFO.fields_by_name['harvester_plots'].message_type = chia__tea_dot_pro
 _COMPUTERINFO.fields_by_name['wallet'].message_type = chia__tea_dot_protobuf_dot_generated_dot_chia__pb2._WALLET
 _COMPUTERINFO.fields_by_name['full_node'].message_type = chia__tea_dot_protobuf_dot_generated_dot_chia__pb2._FULLNODE
 _COMPUTERINFO.fields_by_name['processes'].message_type = chia__tea_dot_protobuf_dot_generated_dot_chia__pb2._PROCESS
+_COMPUTERINFO.fields_by_name['copy_jobs'].message_type = chia__tea_dot_protobuf_dot_generated_dot_chia__pb2._COPYJOB
 _UPDATEEVENT.fields_by_name['event_type'].enum_type = _EVENTTYPE
 _UPDATEEVENT.fields_by_name['cpu'].message_type = chia__tea_dot_protobuf_dot_generated_dot_hardware__pb2._CPU
 _UPDATEEVENT.fields_by_name['ram'].message_type = chia__tea_dot_protobuf_dot_generated_dot_hardware__pb2._RAM
@@ -321,6 +336,7 @@ _UPDATEEVENT.fields_by_name['wallet'].message_type = chia__tea_dot_protobuf_dot_
 _UPDATEEVENT.fields_by_name['process'].message_type = chia__tea_dot_protobuf_dot_generated_dot_chia__pb2._PROCESS
 _UPDATEEVENT.fields_by_name['plotting_plot'].message_type = chia__tea_dot_protobuf_dot_generated_dot_chia__pb2._PLOTINPROGRESS
 _UPDATEEVENT.fields_by_name['full_node'].message_type = chia__tea_dot_protobuf_dot_generated_dot_chia__pb2._FULLNODE
+_UPDATEEVENT.fields_by_name['copy_job'].message_type = chia__tea_dot_protobuf_dot_generated_dot_chia__pb2._COPYJOB
 _UPDATEEVENT.oneofs_by_name['event_data'].fields.append(
   _UPDATEEVENT.fields_by_name['cpu'])
 _UPDATEEVENT.fields_by_name['cpu'].containing_oneof = _UPDATEEVENT.oneofs_by_name['event_data']
@@ -354,6 +370,9 @@ _UPDATEEVENT.fields_by_name['plotting_plot'].containing_oneof = _UPDATEEVENT.one
 _UPDATEEVENT.oneofs_by_name['event_data'].fields.append(
   _UPDATEEVENT.fields_by_name['full_node'])
 _UPDATEEVENT.fields_by_name['full_node'].containing_oneof = _UPDATEEVENT.oneofs_by_name['event_data']
+_UPDATEEVENT.oneofs_by_name['event_data'].fields.append(
+  _UPDATEEVENT.fields_by_name['copy_job'])
+_UPDATEEVENT.fields_by_name['copy_job'].containing_oneof = _UPDATEEVENT.oneofs_by_name['event_data']
 DESCRIPTOR.message_types_by_name['ComputerInfo'] = _COMPUTERINFO
 DESCRIPTOR.message_types_by_name['UpdateEvent'] = _UPDATEEVENT
 DESCRIPTOR.enum_types_by_name['EventType'] = _EVENTTYPE
@@ -20,7 +20,7 @@ DESCRIPTOR = _descriptor.FileDescriptor(
   syntax='proto3',
   serialized_options=None,
   create_key=_descriptor._internal_create_key,
-  serialized_pb=b'\n(chia_tea/protobuf/generated/config.proto\x12&chia_tea.protobuf.generated.config_pb2\"\x1d\n\rMachineConfig\x12\x0c\n\x04name\x18\x01 \x01(\t\"\xb3\x01\n\rLoggingConfig\x12\x42\n\x08loglevel\x18\x01 \x01(\x0e\x32\x30.chia_tea.protobuf.generated.config_pb2.LogLevel\x12\x16\n\x0elog_to_console\x18\x02 \x01(\x08\x12\x13\n\x0blog_to_file\x18\x03 \x01(\x08\x12\x14\n\x0cmax_logfiles\x18\x04 \x01(\x05\x12\x1b\n\x13max_logfile_size_mb\x18\x05 \x01(\x05\"<\n\nCopyConfig\x12\x16\n\x0esource_folders\x18\x01 \x03(\t\x12\x16\n\x0etarget_folders\x18\x02 \x03(\t\">\n\nChiaConfig\x12\x18\n\x10logfile_filepath\x18\x01 \x01(\t\x12\x16\n\x0emadmax_logfile\x18\x02 \x01(\t\"2\n\rDiscordConfig\x12\r\n\x05token\x18\x01 \x01(\t\x12\x12\n\nchannel_id\x18\x02 \x01(\x03\"\x9b\x06\n\x10MonitoringConfig\x12Q\n\x04\x61uth\x18\x01 \x01(\x0b\x32\x43.chia_tea.protobuf.generated.config_pb2.MonitoringConfig.AuthConfig\x12U\n\x06server\x18\x02 \x01(\x0b\x32\x45.chia_tea.protobuf.generated.config_pb2.MonitoringConfig.ServerConfig\x12U\n\x06\x63lient\x18\x03 \x01(\x0b\x32\x45.chia_tea.protobuf.generated.config_pb2.MonitoringConfig.ClientConfig\x1a\x39\n\nAuthConfig\x12\x15\n\rcert_filepath\x18\x01 \x01(\t\x12\x14\n\x0ckey_filepath\x18\x02 \x01(\t\x1a\x31\n\x0cServerConfig\x12\x0c\n\x04port\x18\x01 \x01(\x05\x12\x13\n\x0b\x64\x62_filepath\x18\x02 \x01(\t\x1a\x97\x03\n\x0c\x43lientConfig\x12\x0f\n\x07\x61\x64\x64ress\x18\x01 \x01(\t\x12\x0c\n\x04port\x18\x02 \x01(\x05\x12\x1a\n\x12\x63ollect_data_every\x18\x03 \x01(\x01\x12p\n\x11send_update_every\x18\x04 \x01(\x0b\x32U.chia_tea.protobuf.generated.config_pb2.MonitoringConfig.ClientConfig.SendUpdateEvery\x1a\xd9\x01\n\x0fSendUpdateEvery\x12\x0b\n\x03\x63pu\x18\x01 \x01(\x01\x12\x0b\n\x03ram\x18\x02 \x01(\x01\x12\x0c\n\x04\x64isk\x18\x03 \x01(\x01\x12\x0f\n\x07process\x18\x04 \x01(\x01\x12\x0e\n\x06\x66\x61rmer\x18\x05 \x01(\x01\x12\x18\n\x10\x66\x61rmer_harvester\x18\x06 \x01(\x01\x12\x11\n\tharvester\x18\x07 \x01(\x01\x12\x0e\n\x06wallet\x18\x08 \x01(\x01\x12\x15\n\rplotting_plot\x18\t \x01(\x01\x12\x16\n\x0eharvester_plot\x18\n \x01(\x01\x12\x11\n\tfull_node\x18\x0b \x01(\x01\"J\n\x11\x44\x65velopmentConfig\x12\x0f\n\x07testing\x18\x01 \x01(\x08\x12$\n\x1cmonitoring_client_state_file\x18\x02 \x01(\t\"\x9a\x04\n\rChiaTeaConfig\x12\x0f\n\x07version\x18\x01 \x01(\x05\x12\x46\n\x07machine\x18\x08 \x01(\x0b\x32\x35.chia_tea.protobuf.generated.config_pb2.MachineConfig\x12\x46\n\x07logging\x18\x02 \x01(\x0b\x32\x35.chia_tea.protobuf.generated.config_pb2.LoggingConfig\x12@\n\x04\x63opy\x18\x03 \x01(\x0b\x32\x32.chia_tea.protobuf.generated.config_pb2.CopyConfig\x12@\n\x04\x63hia\x18\x04 \x01(\x0b\x32\x32.chia_tea.protobuf.generated.config_pb2.ChiaConfig\x12\x46\n\x07\x64iscord\x18\x05 \x01(\x0b\x32\x35.chia_tea.protobuf.generated.config_pb2.DiscordConfig\x12L\n\nmonitoring\x18\x06 \x01(\x0b\x32\x38.chia_tea.protobuf.generated.config_pb2.MonitoringConfig\x12N\n\x0b\x64\x65velopment\x18\x07 \x01(\x0b\x32\x39.chia_tea.protobuf.generated.config_pb2.DevelopmentConfig*B\n\x08LogLevel\x12\t\n\x05TRACE\x10\x00\x12\t\n\x05\x44\x45\x42UG\x10\x01\x12\x08\n\x04INFO\x10\x02\x12\x0b\n\x07WARNING\x10\x03\x12\t\n\x05\x45RROR\x10\x04\x62\x06proto3'
+  serialized_pb=b'\n(chia_tea/protobuf/generated/config.proto\x12&chia_tea.protobuf.generated.config_pb2\"\x1d\n\rMachineConfig\x12\x0c\n\x04name\x18\x01 \x01(\t\"\xb3\x01\n\rLoggingConfig\x12\x42\n\x08loglevel\x18\x01 \x01(\x0e\x32\x30.chia_tea.protobuf.generated.config_pb2.LogLevel\x12\x16\n\x0elog_to_console\x18\x02 \x01(\x08\x12\x13\n\x0blog_to_file\x18\x03 \x01(\x08\x12\x14\n\x0cmax_logfiles\x18\x04 \x01(\x05\x12\x1b\n\x13max_logfile_size_mb\x18\x05 \x01(\x05\"\xb3\x04\n\nCopyConfig\x12\x16\n\x0esource_folders\x18\x01 \x03(\t\x12\x16\n\x0etarget_folders\x18\x02 \x03(\t\x12\x1b\n\x13max_parallel_copies\x18\x03 \x01(\x05\x12&\n\x1emax_parallel_copies_per_target\x18\x04 \x01(\x05\x12\x16\n\x0estate_filepath\x18\x05 \x01(\t\x12\x1d\n\x15max_source_mb_per_sec\x18\x06 \x01(\x05\x12\x1d\n\x15max_target_mb_per_sec\x18\x07 \x01(\x05\x12,\n$max_source_mb_per_sec_while_plotting\x18\x08 \x01(\x05\x12\x18\n\x10placement_policy\x18\t \x01(\t\x12\x13\n\x0bverify_mode\x18\n \x01(\t\x12\x17\n\x0fstatus_filepath\x18\x0b \x01(\t\x12\x63\n\x11source_priorities\x18\x0c \x03(\x0b\x32H.chia_tea.protobuf.generated.config_pb2.CopyConfig.SourcePrioritiesEntry\x12\x11\n\tdirect_io\x18\r \x01(\x08\x12\x1f\n\x17\x63ontrol_socket_filepath\x18\x0f \x01(\t\x1a\x37\n\x15SourcePrioritiesEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x05:\x02\x38\x01J\x04\x08\x0e\x10\x0fR\x0c\x63ontrol_port\"r\n\nChiaConfig\x12\x18\n\x10logfile_filepath\x18\x01 \x01(\t\x12\x1b\n\x13\x63heckpoint_filepath\x18\x03 \x01(\t\x12\x17\n\x0fmadmax_logfiles\x18\x04 \x03(\tJ\x04\x08\x02\x10\x03R\x0emadmax_logfile\"2\n\rDiscordConfig\x12\r\n\x05token\x18\x01 \x01(\t\x12\x12\n\nchannel_id\x18\x02 \x01(\x03\"\xad\x06\n\x10MonitoringConfig\x12Q\n\x04\x61uth\x18\x01 \x01(\x0b\x32\x43.chia_tea.protobuf.generated.config_pb2.MonitoringConfig.AuthConfig\x12U\n\x06server\x18\x02 \x01(\x0b\x32\x45.chia_tea.protobuf.generated.config_pb2.MonitoringConfig.ServerConfig\x12U\n\x06\x63lient\x18\x03 \x01(\x0b\x32\x45.chia_tea.protobuf.generated.config_pb2.MonitoringConfig.ClientConfig\x1a\x39\n\nAuthConfig\x12\x15\n\rcert_filepath\x18\x01 \x01(\t\x12\x14\n\x0ckey_filepath\x18\x02 \x01(\t\x1a\x31\n\x0cServerConfig\x12\x0c\n\x04port\x18\x01 \x01(\x05\x12\x13\n\x0b\x64\x62_filepath\x18\x02 \x01(\t\x1a\xa9\x03\n\x0c\x43lientConfig\x12\x0f\n\x07\x61\x64\x64ress\x18\x01 \x01(\t\x12\x0c\n\x04port\x18\x02 \x01(\x05\x12\x1a\n\x12\x63ollect_data_every\x18\x03 \x01(\x01\x12p\n\x11send_update_every\x18\x04 \x01(\x0b\x32U.chia_tea.protobuf.generated.config_pb2.MonitoringConfig.ClientConfig.SendUpdateEvery\x1a\xeb\x01\n\x0fSendUpdateEvery\x12\x0b\n\x03\x63pu\x18\x01 \x01(\x01\x12\x0b\n\x03ram\x18\x02 \x01(\x01\x12\x0c\n\x04\x64isk\x18\x03 \x01(\x01\x12\x0f\n\x07process\x18\x04 \x01(\x01\x12\x0e\n\x06\x66\x61rmer\x18\x05 \x01(\x01\x12\x18\n\x10\x66\x61rmer_harvester\x18\x06 \x01(\x01\x12\x11\n\tharvester\x18\x07 \x01(\x01\x12\x0e\n\x06wallet\x18\x08 \x01(\x01\x12\x15\n\rplotting_plot\x18\t \x01(\x01\x12\x16\n\x0eharvester_plot\x18\n \x01(\x01\x12\x11\n\tfull_node\x18\x0b \x01(\x01\x12\x10\n\x08\x63opy_job\x18\x0c \x01(\x01\"J\n\x11\x44\x65velopmentConfig\x12\x0f\n\x07testing\x18\x01 \x01(\x08\x12$\n\x1cmonitoring_client_state_file\x18\x02 \x01(\t\"\x9a\x04\n\rChiaTeaConfig\x12\x0f\n\x07version\x18\x01 \x01(\x05\x12\x46\n\x07machine\x18\x08 \x01(\x0b\x32\x35.chia_tea.protobuf.generated.config_pb2.MachineConfig\x12\x46\n\x07logging\x18\x02 \x01(\x0b\x32\x35.chia_tea.protobuf.generated.config_pb2.LoggingConfig\x12@\n\x04\x63opy\x18\x03 \x01(\x0b\x32\x32.chia_tea.protobuf.generated.config_pb2.CopyConfig\x12@\n\x04\x63hia\x18\x04 \x01(\x0b\x32\x32.chia_tea.protobuf.generated.config_pb2.ChiaConfig\x12\x46\n\x07\x64iscord\x18\x05 \x01(\x0b\x32\x35.chia_tea.protobuf.generated.config_pb2.DiscordConfig\x12L\n\nmonitoring\x18\x06 \x01(\x0b\x32\x38.chia_tea.protobuf.generated.config_pb2.MonitoringConfig\x12N\n\x0b\x64\x65velopment\x18\x07 \x01(\x0b\x32\x39.chia_tea.protobuf.generated.config_pb2.DevelopmentConfig*B\n\x08LogLevel\x12\t\n\x05TRACE\x10\x00\x12\t\n\x05\x44\x45\x42UG\x10\x01\x12\x08\n\x04INFO\x10\x02\x12\x0b\n\x07WARNING\x10\x03\x12\t\n\x05\x45RROR\x10\x04\x62\x06proto3'
 )
 
 _LOGLEVEL = _descriptor.EnumDescriptor(
@@ -58,8 +58,8 @@ _LOGLEVEL = _descriptor.EnumDescriptor(
   ],
   containing_type=None,
   serialized_options=None,
-  serialized_start=1890,
-  serialized_end=1956,
+  serialized_start=2464,
+  serialized_end=2530,
 )
 _sym_db.RegisterEnumDescriptor(_LOGLEVEL)
 
@@ -164,6 +164,44 @@ _LOGGINGCONFIG = _descriptor.Descriptor(
 )
 
 
+_COPYCONFIG_SOURCEPRIORITIESENTRY = _descriptor.Descriptor(
+  name='SourcePrioritiesEntry',
+  full_name='chia_tea.protobuf.generated.config_pb2.CopyConfig.SourcePrioritiesEntry',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='key', full_name='chia_tea.protobuf.generated.config_pb2.CopyConfig.SourcePrioritiesEntry.key', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='value', full_name='chia_tea.protobuf.generated.config_pb2.CopyConfig.SourcePrioritiesEntry.value', index=1,
+      number=2, type=5, cpp_type=1, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=b'8\001',
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=786,
+  serialized_end=841,
+)
+
 _COPYCONFIG = _descriptor.Descriptor(
   name='CopyConfig',
   full_name='chia_tea.protobuf.generated.config_pb2.CopyConfig',
@@ -186,10 +224,94 @@ _COPYCONFIG = _descriptor.Descriptor(
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='max_parallel_copies', full_name='chia_tea.protobuf.generated.config_pb2.CopyConfig.max_parallel_copies', index=2,
+      number=3, type=5, cpp_type=1, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='max_parallel_copies_per_target', full_name='chia_tea.protobuf.generated.config_pb2.CopyConfig.max_parallel_copies_per_target', index=3,
+      number=4, type=5, cpp_type=1, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='state_filepath', full_name='chia_tea.protobuf.generated.config_pb2.CopyConfig.state_filepath', index=4,
+      number=5, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='max_source_mb_per_sec', full_name='chia_tea.protobuf.generated.config_pb2.CopyConfig.max_source_mb_per_sec', index=5,
+      number=6, type=5, cpp_type=1, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='max_target_mb_per_sec', full_name='chia_tea.protobuf.generated.config_pb2.CopyConfig.max_target_mb_per_sec', index=6,
+      number=7, type=5, cpp_type=1, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='max_source_mb_per_sec_while_plotting', full_name='chia_tea.protobuf.generated.config_pb2.CopyConfig.max_source_mb_per_sec_while_plotting', index=7,
+      number=8, type=5, cpp_type=1, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='placement_policy', full_name='chia_tea.protobuf.generated.config_pb2.CopyConfig.placement_policy', index=8,
+      number=9, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='verify_mode', full_name='chia_tea.protobuf.generated.config_pb2.CopyConfig.verify_mode', index=9,
+      number=10, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='status_filepath', full_name='chia_tea.protobuf.generated.config_pb2.CopyConfig.status_filepath', index=10,
+      number=11, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='source_priorities', full_name='chia_tea.protobuf.generated.config_pb2.CopyConfig.source_priorities', index=11,
+      number=12, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='direct_io', full_name='chia_tea.protobuf.generated.config_pb2.CopyConfig.direct_io', index=12,
+      number=13, type=8, cpp_type=7, label=1,
+      has_default_value=False, default_value=False,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='control_socket_filepath', full_name='chia_tea.protobuf.generated.config_pb2.CopyConfig.control_socket_filepath', index=13,
+      number=15, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
-  nested_types=[],
+  nested_types=[_COPYCONFIG_SOURCEPRIORITIESENTRY, ],
   enum_types=[
   ],
   serialized_options=None,
@@ -198,8 +320,8 @@ _COPYCONFIG = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=297,
-  serialized_end=357,
+  serialized_start=298,
+  serialized_end=861,
 )
 
 
@@ -219,12 +341,19 @@ _CHIACONFIG = _descriptor.Descriptor(
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
     _descriptor.FieldDescriptor(
-      name='madmax_logfile', full_name='chia_tea.protobuf.generated.config_pb2.ChiaConfig.madmax_logfile', index=1,
-      number=2, type=9, cpp_type=9, label=1,
+      name='checkpoint_filepath', full_name='chia_tea.protobuf.generated.config_pb2.ChiaConfig.checkpoint_filepath', index=1,
+      number=3, type=9, cpp_type=9, label=1,
       has_default_value=False, default_value=b"".decode('utf-8'),
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='madmax_logfiles', full_name='chia_tea.protobuf.generated.config_pb2.ChiaConfig.madmax_logfiles', index=2,
+      number=4, type=9, cpp_type=9, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
@@ -237,8 +366,8 @@ _CHIACONFIG = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=359,
-  serialized_end=421,
+  serialized_start=863,
+  serialized_end=977,
 )
 
 
@@ -276,8 +405,8 @@ _DISCORDCONFIG = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=423,
-  serialized_end=473,
+  serialized_start=979,
+  serialized_end=1029,
 )
 
 
@@ -315,8 +444,8 @@ _MONITORINGCONFIG_AUTHCONFIG = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=753,
-  serialized_end=810,
+  serialized_start=1309,
+  serialized_end=1366,
 )
 
 _MONITORINGCONFIG_SERVERCONFIG = _descriptor.Descriptor(
@@ -353,8 +482,8 @@ _MONITORINGCONFIG_SERVERCONFIG = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=812,
-  serialized_end=861,
+  serialized_start=1368,
+  serialized_end=1417,
 )
 
 _MONITORINGCONFIG_CLIENTCONFIG_SENDUPDATEEVERY = _descriptor.Descriptor(
@@ -442,6 +571,13 @@ _MONITORINGCONFIG_CLIENTCONFIG_SENDUPDATEEVERY = _descriptor.Descriptor(
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='copy_job', full_name='chia_tea.protobuf.generated.config_pb2.MonitoringConfig.ClientConfig.SendUpdateEvery.copy_job', index=11,
+      number=12, type=1, cpp_type=5, label=1,
+      has_default_value=False, default_value=float(0),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
@@ -454,8 +590,8 @@ _MONITORINGCONFIG_CLIENTCONFIG_SENDUPDATEEVERY = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1054,
-  serialized_end=1271,
+  serialized_start=1610,
+  serialized_end=1845,
 )
 
 _MONITORINGCONFIG_CLIENTCONFIG = _descriptor.Descriptor(
@@ -506,8 +642,8 @@ _MONITORINGCONFIG_CLIENTCONFIG = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=864,
-  serialized_end=1271,
+  serialized_start=1420,
+  serialized_end=1845,
 )
 
 _MONITORINGCONFIG = _descriptor.Descriptor(
@@ -551,8 +687,8 @@ _MONITORINGCONFIG = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=476,
-  serialized_end=1271,
+  serialized_start=1032,
+  serialized_end=1845,
 )
 
 
@@ -590,8 +726,8 @@ _DEVELOPMENTCONFIG = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1273,
-  serialized_end=1347,
+  serialized_start=1847,
+  serialized_end=1921,
 )
 
 
@@ -671,11 +807,13 @@ _CHIATEACONFIG = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1350,
-  serialized_end=1888,
+  serialized_start=1924,
+  serialized_end=2462,
 )
 
 _LOGGINGCONFIG.fields_by_name['loglevel'].enum_type = _LOGLEVEL
+_COPYCONFIG_SOURCEPRIORITIESENTRY.containing_type = _COPYCONFIG
+_COPYCONFIG.fields_by_name['source_priorities'].message_type = _COPYCONFIG_SOURCEPRIORITIESENTRY
 _MONITORINGCONFIG_AUTHCONFIG.containing_type = _MONITORINGCONFIG
 _MONITORINGCONFIG_SERVERCONFIG.containing_type = _MONITORINGCONFIG
 _MONITORINGCONFIG_CLIENTCONFIG_SENDUPDATEEVERY.containing_type = _MONITORINGCONFIG_CLIENTCONFIG
@@ -717,11 +855,19 @@ LoggingConfig = _reflection.GeneratedProtocolMessageType('LoggingConfig', (_mess
 _sym_db.RegisterMessage(LoggingConfig)
 
 CopyConfig = _reflection.GeneratedProtocolMessageType('CopyConfig', (_message.Message,), {
+
+  'SourcePrioritiesEntry' : _reflection.GeneratedProtocolMessageType('SourcePrioritiesEntry', (_message.Message,), {
+    'DESCRIPTOR' : _COPYCONFIG_SOURCEPRIORITIESENTRY,
+    '__module__' : 'chia_tea.protobuf.generated.config_pb2'
+    # @@protoc_insertion_point(class_scope:chia_tea.protobuf.generated.config_pb2.CopyConfig.SourcePrioritiesEntry)
+    })
+  ,
   'DESCRIPTOR' : _COPYCONFIG,
   '__module__' : 'chia_tea.protobuf.generated.config_pb2'
   # @@protoc_insertion_point(class_scope:chia_tea.protobuf.generated.config_pb2.CopyConfig)
   })
 _sym_db.RegisterMessage(CopyConfig)
+_sym_db.RegisterMessage(CopyConfig.SourcePrioritiesEntry)
 
 ChiaConfig = _reflection.GeneratedProtocolMessageType('ChiaConfig', (_message.Message,), {
   'DESCRIPTOR' : _CHIACONFIG,
@@ -791,4 +937,5 @@ ChiaTeaConfig = _reflection.GeneratedProtocolMessageType('ChiaTeaConfig', (_mess
 _sym_db.RegisterMessage(ChiaTeaConfig)
 
 
+_COPYCONFIG_SOURCEPRIORITIESENTRY._options = None
 # @@protoc_insertion_point(module_scope)
@@ -36,18 +36,83 @@ copy:
   source_folders:
     - "/some/plotting/folder"
     - "/another/plotting/folder"
+  # Plots of the fullest source disk are copied first
+  # so that no plotter runs out of space. Folders with
+  # a higher priority are copied before all others.
+  # source_priorities:
+  #   "/some/plotting/folder": 1
   target_folders:
     - "/some/harvester/folder"
     - "/another/harvester/folder"
+  # How many copies may run at the same time in
+  # total. A new copy is started as soon as one
+  # of these slots frees up.
+  max_parallel_copies: 4
+  # How many copies may write into the same target
+  # folder at once. Disks don't like parallel writes
+  # thus 1 is a good choice.
+  max_parallel_copies_per_target: 1
+  # Journal of the started and finished copies.
+  # If the copy process crashes, interrupted copies
+  # are resumed, verified or cleaned up on the next
+  # start. Leave empty to not keep a journal.
+  state_filepath: ~/.chia_tea/copy/journal.jsonl
+  # The running copies are written to this file so
+  # that the monitoring client can report them.
+  # Leave empty to not write it.
+  status_filepath: ~/.chia_tea/copy/status.json
+  # Bandwidth limits in MB/s shared by all copies
+  # reading from the same source disk or writing
+  # to the same target disk. Use 0 for no limit.
+  max_source_mb_per_sec: 0
+  max_target_mb_per_sec: 0
+  # Read limit per source disk while a madmax
+  # plotter (see chia.madmax_logfiles) is in phase
+  # 3 or 4. Plotting then writes a lot to disk and
+  # slow copies let the plotter run at full speed.
+  # Use 0 to keep the limit from above.
+  max_source_mb_per_sec_while_plotting: 0
+  # How to choose the target folder of a plot:
+  # - least_used: folder with the fewest copies
+  # - fill_first: fill up one disk after another
+  #   so that the other disks can spin down
+  # - round_robin: one folder after another
+  # - throughput: prefer the fastest folders
+  # - smr_sequential: one copy per disk at a time
+  #   filling disks in order, good for SMR disks
+  placement_policy: least_used
+  # How to check copies before the plot is removed
+  # from the source folder:
+  # - none: no check
+  # - sampled: compare 64 blocks spread over the plot
+  # - full: hash while copying and read the copy once
+  verify_mode: none
+  # Copy with O_DIRECT so that plots don't evict
+  # other data from the page cache, e.g. of the
+  # harvester. If a filesystem does not support it,
+  # the copied data is dropped from the cache.
+  direct_io: false
+  # Unix socket of the control API of a running copy
+  # process. Use 'chia-tea copy' to list jobs, pause
+  # targets or change the limits without a restart.
+  # Only your user can connect to it. Leave empty to
+  # disable it.
+  control_socket_filepath: ~/.chia_tea/config/copy_control.sock
 
 # General chia-related settings
 chia:
   # Filepath at which the chia logfile resides.
   logfile_filepath: ~/.chia/mainnet/log/debug.log
-  # Filepath to the logfile of the madmax plotter.
-  # This tracks the plotting progress. Leave empty
-  # if not used.
-  madmax_logfile: ""
+  # Filepaths to the logfiles of the madmax plotters,
+  # one per plotter. This tracks the plotting progress.
+  # Leave empty if not used.
+  madmax_logfiles: []
+  # The state gathered from the logfiles is saved
+  # here regularly. On a restart the logfiles are
+  # read from where the state was saved instead of
+  # from their beginning. Leave empty to always
+  # read the logfiles completely.
+  checkpoint_filepath: ~/.chia_tea/watchdog/checkpoint.json
 
 discord:
   token: YOUR_DISCORD_TOKEN
@@ -109,6 +174,7 @@ monitoring:
       # plotting_plot: 2
       # harvester_plot: 2
       # full_node: 2
+      # copy_job: 2
 
 # Enables development mode. This currently disables
 # encryption and also the discord bot does not send
@@ -224,6 +290,7 @@ def read_config(filepath: str) -> ChiaTeaConfig:
     """
     with open(filepath, "r", encoding="utf8") as stream:
         config_dict = yaml.safe_load(stream)
+    _migrate_config_dict(config_dict)
 
     config = ParseDict(
         js_dict=config_dict,
@@ -239,6 +306,33 @@ def read_config(filepath: str) -> ChiaTeaConfig:
     return config
 
 
+def _migrate_config_dict(config_dict: dict):
+    """Updates settings of older configs in place
+
+    Parameters
+    ----------
+    config_dict : dict
+        config as read from the yaml file
+
+    Notes
+    -----
+        The single 'chia.madmax_logfile' became the list
+        'chia.madmax_logfiles'. The 'copy.control_port' was
+        replaced by the unix socket 'copy.control_socket_filepath'
+        and is dropped, so the control API is off until
+        configured again.
+    """
+    copy_dict = config_dict.get("copy") if isinstance(config_dict, dict) else None
+    if isinstance(copy_dict, dict):
+        copy_dict.pop("control_port", None)
+
+    chia_dict = config_dict.get("chia") if isinstance(config_dict, dict) else None
+    if isinstance(chia_dict, dict) and "madmax_logfile" in chia_dict:
+        madmax_logfile = chia_dict.pop("madmax_logfile")
+        if madmax_logfile and "madmax_logfiles" not in chia_dict:
+            chia_dict["madmax_logfiles"] = [madmax_logfile]
+
+
 def config_is_loaded() -> bool:
     """Checks whether a config was loaded
 
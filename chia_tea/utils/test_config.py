@@ -2,7 +2,7 @@ import os
 import unittest
 
 import tempfile
-from .config import create_default_config, get_default_config
+from .config import _migrate_config_dict, create_default_config, get_default_config
 from .testing import set_directory
 
 
@@ -27,3 +27,19 @@ class TestConfig(unittest.TestCase):
                     filepath=os.path.join("config.yaml"),
                     overwrite=False,
                 )
+
+    def test_single_madmax_logfile_is_migrated(self):
+
+        config_dict = {"chia": {"madmax_logfile": "/var/log/madmax.log"}}
+        _migrate_config_dict(config_dict)
+        self.assertDictEqual(config_dict, {"chia": {"madmax_logfiles": ["/var/log/madmax.log"]}})
+
+        config_dict = {"chia": {"madmax_logfile": ""}}
+        _migrate_config_dict(config_dict)
+        self.assertDictEqual(config_dict, {"chia": {}})
+
+    def test_control_port_is_dropped(self):
+
+        config_dict = {"copy": {"control_port": 43210}}
+        _migrate_config_dict(config_dict)
+        self.assertDictEqual(config_dict, {"copy": {}})
@@ -0,0 +1,215 @@
+import dataclasses
+import json
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple, Type, TypeVar, get_type_hints
+
+from ..general.logfile_reading import find_unread_logfiles
+from ..general.LogfilePosition import LogfilePosition
+from ..models.ChiaWatchdog import ChiaWatchdog
+from ..models.FarmerHarvesterLogfile import FarmerHarvesterLogfile
+from ..models.MadMaxPlotInProgress import MadMaxPlotInProgress
+from ..utils.logger import get_logger
+
+# checkpoints of other versions are ignored
+CHECKPOINT_VERSION = 2
+# seconds between checkpoints
+CHECKPOINT_INTERVAL_SECONDS = 60
+
+T = TypeVar("T")
+
+
+def write_checkpoint(
+    checkpoint_filepath: str,
+    chia_dog: ChiaWatchdog,
+    chia_position: LogfilePosition,
+    madmax_positions: Dict[str, LogfilePosition],
+):
+    """Saves the state gathered from the logfiles
+
+    Parameters
+    ----------
+    checkpoint_filepath : str
+        path of the checkpoint file
+    chia_dog : ChiaWatchdog
+        watchdog whose logfile state is saved
+    chia_position : LogfilePosition
+        position up to which the chia logfile was processed
+    madmax_positions : Dict[str, LogfilePosition]
+        positions up to which the madmax logfiles were processed
+
+    Notes
+    -----
+        The file is replaced atomically so that a crash never
+        leaves a partial checkpoint. Errors are only logged since
+        the checkpoint must never interrupt the watchdog.
+    """
+    checkpoint = {
+        "version": CHECKPOINT_VERSION,
+        "timestamp": time.time(),
+        "chia": {
+            "filepath": chia_dog.logfile_filepath,
+            "position": dataclasses.asdict(chia_position),
+            "harvester_infos": [
+                _to_dict(harvester_info) for harvester_info in chia_dog.harvester_infos.values()
+            ],
+            "farmed_blocks": list(chia_dog.farmed_blocks),
+            "n_proofs": chia_dog.harvester_service.n_proofs,
+        },
+        "madmax": [
+            {
+                "filepath": madmax_logfile,
+                "position": dataclasses.asdict(madmax_position),
+                "plots_in_progress": [
+                    _to_dict(plot)
+                    for plot in chia_dog.plots_in_progress
+                    if plot.logfile == madmax_logfile
+                ],
+            }
+            for madmax_logfile, madmax_position in madmax_positions.items()
+        ],
+    }
+
+    checkpoint_filepath = os.path.expanduser(checkpoint_filepath)
+    try:
+        folder = os.path.dirname(checkpoint_filepath)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+        tmp_filepath = checkpoint_filepath + ".tmp"
+        with open(tmp_filepath, "w", encoding="utf8") as fp:
+            json.dump(checkpoint, fp)
+        os.replace(tmp_filepath, checkpoint_filepath)
+    except OSError as err:
+        get_logger(__file__).error(
+            "Cannot write watchdog checkpoint '%s': %s", checkpoint_filepath, err
+        )
+
+
+def read_checkpoint(
+    checkpoint_filepath: str,
+    chia_dog: ChiaWatchdog,
+) -> Tuple[LogfilePosition, Dict[str, LogfilePosition]]:
+    """Restores the state gathered from the logfiles
+
+    Parameters
+    ----------
+    checkpoint_filepath : str
+        path of the checkpoint file
+    chia_dog : ChiaWatchdog
+        watchdog whose logfile state is restored
+
+    Returns
+    -------
+    chia_position : LogfilePosition
+        position to continue reading the chia logfile from
+    madmax_positions : Dict[str, LogfilePosition]
+        positions to continue reading the madmax logfiles from
+
+    Notes
+    -----
+        The state of a logfile is only restored if the file of the
+        checkpoint, identified by its inode, is still the logfile
+        or one of its rotated logfiles. Otherwise the logfile is
+        read from its beginning as if there was no checkpoint.
+    """
+    checkpoint = _load(os.path.expanduser(checkpoint_filepath))
+    if checkpoint is None:
+        return LogfilePosition(), _get_initial_positions(chia_dog)
+
+    try:
+        chia_position = _get_position(checkpoint["chia"], chia_dog.logfile_filepath)
+        if chia_position is not None:
+            chia_dog.harvester_infos = {
+                harvester_info.harvester_id: harvester_info
+                for harvester_info in (
+                    _from_dict(FarmerHarvesterLogfile, data)
+                    for data in checkpoint["chia"]["harvester_infos"]
+                )
+            }
+            chia_dog.farmed_blocks = list(checkpoint["chia"]["farmed_blocks"])
+            chia_dog.harvester_service.n_proofs = checkpoint["chia"]["n_proofs"]
+
+        madmax_positions = _get_initial_positions(chia_dog)
+        plots_in_progress = []
+        for madmax_checkpoint in checkpoint["madmax"]:
+            madmax_logfile = madmax_checkpoint["filepath"]
+            if madmax_logfile not in madmax_positions:
+                continue
+            madmax_position = _get_position(madmax_checkpoint, madmax_logfile)
+            if madmax_position is not None:
+                madmax_positions[madmax_logfile] = madmax_position
+                plots_in_progress.extend(
+                    _from_dict(MadMaxPlotInProgress, data)
+                    for data in madmax_checkpoint["plots_in_progress"]
+                )
+        chia_dog.plots_in_progress = plots_in_progress
+    except (ValueError, KeyError, TypeError) as err:
+        get_logger(__file__).warning(
+            "Ignoring broken watchdog checkpoint '%s': %s", checkpoint_filepath, err
+        )
+        return LogfilePosition(), _get_initial_positions(chia_dog)
+
+    return chia_position or LogfilePosition(), madmax_positions
+
+
+def _get_initial_positions(chia_dog: ChiaWatchdog) -> Dict[str, LogfilePosition]:
+    """Positions to read the madmax logfiles from their beginning"""
+    return {madmax_logfile: LogfilePosition() for madmax_logfile in chia_dog.madmax_logfiles}
+
+
+def _load(checkpoint_filepath: str) -> Optional[Dict[str, Any]]:
+    """Loads a checkpoint of the current version"""
+    try:
+        with open(checkpoint_filepath, "r", encoding="utf8") as fp:
+            checkpoint = json.load(fp)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as err:
+        get_logger(__file__).warning(
+            "Cannot read watchdog checkpoint '%s': %s", checkpoint_filepath, err
+        )
+        return None
+
+    if not isinstance(checkpoint, dict) or checkpoint.get("version") != CHECKPOINT_VERSION:
+        return None
+
+    return checkpoint
+
+
+def _get_position(log_checkpoint: Dict[str, Any], filepath: str) -> Optional[LogfilePosition]:
+    """Get the position of a logfile if the checkpoint is still valid for it"""
+    if not filepath or log_checkpoint["filepath"] != filepath:
+        return None
+
+    position = LogfilePosition(**log_checkpoint["position"])
+    if find_unread_logfiles(os.path.expanduser(filepath), position) is None:
+        return None
+
+    return position
+
+
+def _to_dict(obj: Any) -> Dict[str, Any]:
+    """Converts a dataclass to json with datetimes in iso format"""
+    return {field.name: _encode(getattr(obj, field.name)) for field in dataclasses.fields(obj)}
+
+
+def _encode(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _from_dict(cls: Type[T], data: Dict[str, Any]) -> T:
+    """Creates a dataclass from json written by `_to_dict`"""
+    type_hints = get_type_hints(cls)
+    kwargs = {}
+    for field in dataclasses.fields(cls):
+        if field.name not in data:
+            continue
+        value = data[field.name]
+        type_hint = type_hints[field.name]
+        is_datetime = type_hint is datetime or datetime in getattr(type_hint, "__args__", ())
+        kwargs[field.name] = (
+            datetime.fromisoformat(value) if is_datetime and value is not None else value
+        )
+    return cls(**kwargs)
@@ -12,7 +12,7 @@ from .regular_checks import remove_plotting_plots_if_madmax_does_not_run
 class TestRegularChecks(unittest.TestCase):
     def test_plotting_plot_is_not_removed_if_plotting_job_is_running(self):
 
-        watchdog = ChiaWatchdog("", "")
+        watchdog = ChiaWatchdog("", [])
         watchdog.plots_in_progress = [
             MadMaxPlotInProgress(
                 process_id=1,
@@ -34,7 +34,7 @@ class TestRegularChecks(unittest.TestCase):
 
     def test_plotting_plot_is_removed_if_plotting_job_is_gone(self):
 
-        watchdog = ChiaWatchdog("", "")
+        watchdog = ChiaWatchdog("", [])
         plot = MadMaxPlotInProgress(
             process_id=1,
             farmer_public_key="",
@@ -28,7 +28,7 @@ if sys.version_info >= (3, 8):  # noqa: C901
             "chia_tea.watchdog.collection.api.update_from_farmer.load_config", autospec=True
         )
         async def test_new_harvester_connected(self, load_config_mock, MockRpcClient):
-            dog = ChiaWatchdog("", "")
+            dog = ChiaWatchdog("", [])
 
             node_id = b"1n\x0f\xc4J\xb5q8\xc4\x98\x0b\xe7\\\xac\xd1\x82"
             plots = ["only", "length", "is", "used"]
@@ -88,7 +88,7 @@ if sys.version_info >= (3, 8):  # noqa: C901
             "chia_tea.watchdog.collection.api.update_from_farmer.load_config", autospec=True
         )
         async def test_harvester_disconnected(self, load_config_mock, MockRpcClient):
-            dog = ChiaWatchdog("", "")
+            dog = ChiaWatchdog("", [])
 
             node_id = b"1n\x0f\xc4J\xb5q8\xc4\x98\x0b\xe7\\\xac\xd1\x82"
             dog.farmer_service.connections = [
@@ -137,7 +137,7 @@ if sys.version_info >= (3, 8):  # noqa: C901
             "chia_tea.watchdog.collection.api.update_from_farmer.load_config", autospec=True
         )
         async def test_existing_harvester_is_updated(self, load_config_mock, MockRpcClient):
-            dog = ChiaWatchdog("", "")
+            dog = ChiaWatchdog("", [])
 
             node_id = b"1n\x0f\xc4J\xb5q8\xc4\x98\x0b\xe7\\\xac\xd1\x82"
             plots = ["only", "length", "is", "used"]
@@ -216,7 +216,7 @@ if sys.version_info >= (3, 8):  # noqa: C901
         ):
             # pylint: disable=too-many-locals
 
-            dog = ChiaWatchdog("", "")
+            dog = ChiaWatchdog("", [])
 
             node_id1 = b"1n\x0f\xc4J\xb5q8\xc4\x98\x0b\xe7\\\xac\xd1\x82"
             plots1 = ["only", "length", "is", "used"]
@@ -321,7 +321,7 @@ if sys.version_info >= (3, 8):  # noqa: C901
         async def test_harvester_connects_between_two_api_calls(
             self, load_config_mock, MockRpcClient
         ):
-            dog = ChiaWatchdog("", "")
+            dog = ChiaWatchdog("", [])
 
             node_id1 = b"1n\x0f\xc4J\xb5q8\xc4\x98\x0b\xe7\\\xac\xd1\x82"
             plots1 = ["only", "length", "is", "used"]
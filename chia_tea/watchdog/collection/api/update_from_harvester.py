@@ -27,20 +27,31 @@ async def update_from_harvester(chia_dog: ChiaWatchdog):
             self_hostname, uint16(harvester_rpc_port), DEFAULT_ROOT_PATH, config
         )
 
-        plots_response = await harvester_client.get_plots()
-        chia_dog.harvester_service.is_running = True
-        if plots_response["success"]:
-            chia_dog.harvester_service.plots = plots_response["plots"]
-            chia_dog.harvester_service.failed_to_open_filenames = plots_response[
-                "failed_to_open_filenames"
-            ]
-            chia_dog.harvester_service.not_found_filenames = plots_response["not_found_filenames"]
-
-        chia_dog.harvester_service.plot_directories = await harvester_client.get_plot_directories()
+        harvester_service = chia_dog.harvester_service
+        harvester_service.plot_directories = await harvester_client.get_plot_directories()
+        harvester_service.is_running = True
+
+        # plots are only requested if their directories changed or
+        # the plots failing to open were not checked for a while
+        plot_inventory = harvester_service.plot_inventory
+        directories = plot_inventory.get_directories_to_refresh(harvester_service.plot_directories)
+        plots_changed = directories is None or bool(directories)
+        if plots_changed or plot_inventory.is_problem_refresh_due():
+            plots_response = await harvester_client.get_plots()
+            if plots_response["success"]:
+                harvester_service.failed_to_open_filenames = plots_response[
+                    "failed_to_open_filenames"
+                ]
+                harvester_service.not_found_filenames = plots_response["not_found_filenames"]
+                plot_inventory.set_problems_refreshed()
+                if plots_changed:
+                    plot_inventory.update(plots_response["plots"], directories)
 
     # pylint: disable=catching-non-exception
     except API_EXCEPTIONS:
         chia_dog.harvester_service.is_running = False
+        # a restarted harvester may have loaded different plots
+        chia_dog.harvester_service.plot_inventory.invalidate()
     finally:
         if "harvester_client" in locals():
             harvester_client.close()
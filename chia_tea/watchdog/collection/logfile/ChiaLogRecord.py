@@ -0,0 +1,98 @@
+from datetime import datetime
+from typing import List, Optional
+
+
+class ChiaLogRecord:
+    """A line of the chia logfile split into its parts
+
+    Chia formats its log lines as
+
+        2021-05-26T09:37:13.872 farmer farmer_server   : DEBUG    <message>
+
+    thus timestamp, service, logger name, level and message are
+    separated once per line. The timestamp is only converted and the
+    message only split into fragments when an action asks for it.
+    """
+
+    __slots__ = (
+        "line",
+        "timestamp_str",
+        "service",
+        "logger",
+        "level",
+        "message",
+        "__timestamp",
+        "__fragments",
+    )
+
+    def __init__(
+        self,
+        line: str,
+        timestamp_str: str,
+        service: str,
+        logger: str,
+        level: str,
+        message: str,
+    ):
+        self.line = line
+        self.timestamp_str = timestamp_str
+        self.service = service
+        self.logger = logger
+        self.level = level
+        self.message = message
+        self.__timestamp: Optional[datetime] = None
+        self.__fragments: Optional[List[str]] = None
+
+    @classmethod
+    def from_line(cls, line: str) -> Optional["ChiaLogRecord"]:
+        """Splits a chia log line into its parts
+
+        Parameters
+        ----------
+        line : str
+            line of the chia logfile
+
+        Returns
+        -------
+        record : Optional[ChiaLogRecord]
+            parts of the line or None if the line is not formatted like
+            a chia log line, e.g. continued lines of a traceback
+        """
+        parts = line.split(" ", 2)
+        if len(parts) != 3:
+            return None
+        timestamp_str, service, rest = parts
+
+        # logger names are padded with spaces before the colon
+        i_colon = rest.find(":")
+        if i_colon <= 0:
+            return None
+        logger = rest[:i_colon].rstrip()
+
+        level_and_message = rest[i_colon + 1 :].split(None, 1)  # noqa: E203
+        if not level_and_message:
+            return None
+        level = level_and_message[0]
+        message = level_and_message[1].rstrip("\n") if len(level_and_message) == 2 else ""
+
+        return cls(line, timestamp_str, service, logger, level, message)
+
+    @property
+    def timestamp(self) -> datetime:
+        """Time of the line
+
+        Raises
+        ------
+        ValueError
+            If the timestamp is not in iso format.
+        """
+        if self.__timestamp is None:
+            self.__timestamp = datetime.fromisoformat(self.timestamp_str)
+        return self.__timestamp
+
+    @property
+    def fragments(self) -> List[str]:
+        """Words of the message separated by whitespace"""
+        if self.__fragments is None:
+            self.__fragments = self.message.split()
+        return self.__fragments
@@ -1,29 +1,89 @@
 import traceback
-from datetime import datetime
+from abc import abstractmethod
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from ....general.AbstractLineAction import AbstractLineAction
 from ....models.ChiaWatchdog import ChiaWatchdog
 from ....utils.logger import get_logger
+from .ChiaLogRecord import ChiaLogRecord
 
 
-class ActionMessageFromHarvester(AbstractLineAction):
-    """This action is triggered if a farmer sends a msg to a harvester"""
+class AbstractChiaLineAction(AbstractLineAction):
+    """Action on lines of the chia logfile
+
+    Actions declare the service logging the lines they care about,
+    optionally the logger, and words which the message must contain.
+    This allows to route a parsed line only to the few actions of its
+    service instead of checking every action on every line.
+    """
+
+    # service writing the line such as 'farmer' or 'full_node'
+    SERVICE: str = ""
+    # name of the logger or None for any logger of the service
+    LOGGER: Optional[str] = None
+    # words which all must be in the message
+    KEYWORDS: Tuple[str, ...] = ()
 
     def is_match(self, line: str) -> bool:
-        codewords = ("farmer", "farming_info from peer")
-        return all(word in line for word in codewords)
+        record = ChiaLogRecord.from_line(line)
+        return record is not None and self.is_record_match(record)
+
+    def is_record_match(self, record: ChiaLogRecord) -> bool:
+        """Checks if a parsed line is matching the action
+
+        Parameters
+        ----------
+        record : ChiaLogRecord
+            parsed line to be checked for a match
+
+        Returns
+        -------
+        is_match : bool
+            if the line is a match
+        """
+        return (
+            record.service == self.SERVICE
+            and (self.LOGGER is None or record.logger == self.LOGGER)
+            and all(word in record.message for word in self.KEYWORDS)
+        )
 
     def apply(
         self,
         line: str,
         chia_dog: ChiaWatchdog,
     ):
+        record = ChiaLogRecord.from_line(line)
+        if record is None:
+            raise ValueError(f"Not a chia log line: {line}")
+        self.apply_record(record, chia_dog)
+
+    @abstractmethod
+    def apply_record(self, record: ChiaLogRecord, chia_dog: ChiaWatchdog):
+        """Apply the action on a parsed line
+
+        Parameter
+        ---------
+        record : ChiaLogRecord
+            parsed line from which information will be extracted
+        chia_dog : ChiaWatchdog
+            chia watchdog to be modified
+        """
+        raise NotImplementedError()
+
+
+class ActionMessageFromHarvester(AbstractChiaLineAction):
+    """This action is triggered if a farmer sends a msg to a harvester"""
+
+    SERVICE = "farmer"
+    KEYWORDS = ("farming_info from peer",)
+
+    def apply_record(self, record: ChiaLogRecord, chia_dog: ChiaWatchdog):
 
-        fragments = line.split()
+        fragments = record.fragments
 
         # extract data from line
-        timestamp = fragments[0]
-        timestamp_dt = datetime.fromisoformat(timestamp)
+        timestamp_dt = record.timestamp
         harvester_id = fragments[-2]
         ip_address = fragments[-1]
 
@@ -38,23 +98,17 @@ class ActionMessageFromHarvester(AbstractLineAction):
         chia_dog.harvester_infos[harvester_id] = harvester_info
 
 
-class ActionMessageToHarvester(AbstractLineAction):
+class ActionMessageToHarvester(AbstractChiaLineAction):
     """This action is triggered if a farmer sends a msg to a harvester"""
 
-    def is_match(self, line: str) -> bool:
-        codewords = ("farmer", "new_signage_point_harvester")
-        return all(word in line for word in codewords)
+    SERVICE = "farmer"
+    KEYWORDS = ("new_signage_point_harvester",)
 
-    def apply(
-        self,
-        line: str,
-        chia_dog: ChiaWatchdog,
-    ):
-        fragments = line.split()
+    def apply_record(self, record: ChiaLogRecord, chia_dog: ChiaWatchdog):
+        fragments = record.fragments
 
         # extract data from line
-        timestamp = fragments[0]
-        timestamp_dt = datetime.fromisoformat(timestamp)
+        timestamp_dt = record.timestamp
         harvester_id = fragments[-1]
         ip_address = fragments[-2]
 
@@ -66,26 +120,18 @@ class ActionMessageToHarvester(AbstractLineAction):
         chia_dog.harvester_infos[harvester_id] = harvester_info
 
 
-class ActionFinishedSignagePoint(AbstractLineAction):
+class ActionFinishedSignagePoint(AbstractChiaLineAction):
     """
     Action is currently used as check if a Harvester is timed out.
     Might be used for SignPoint Metrics at a later stage
     """
 
-    def is_match(self, line: str) -> bool:
-        codewords = ("full_node", "Finished signage point")
-        return all(word in line for word in codewords)
-
-    def apply(
-        self,
-        line: str,
-        chia_dog: ChiaWatchdog,
-    ):
-        fragments = line.split()
+    SERVICE = "full_node"
+    KEYWORDS = ("Finished signage point",)
 
+    def apply_record(self, record: ChiaLogRecord, chia_dog: ChiaWatchdog):
         # extract data from line
-        timestamp = fragments[0]
-        timestamp_dt = datetime.fromisoformat(timestamp)
+        timestamp_dt = record.timestamp
 
         # Harvester Time out Check
         for farmer_harvester_logfile in chia_dog.harvester_infos.values():
@@ -93,22 +139,17 @@ class ActionFinishedSignagePoint(AbstractLineAction):
                 farmer_harvester_logfile.check_for_timeout(timestamp_dt)
 
 
-class ActionHarvesterConnected(AbstractLineAction):
+class ActionHarvesterConnected(AbstractChiaLineAction):
     """This action is triggered if a farmer connects to a harvester"""
 
-    def is_match(self, line: str) -> bool:
-        codewords = ("farmer", "harvester_handshake to peer")
-        return all(word in line for word in codewords)
+    SERVICE = "farmer"
+    KEYWORDS = ("harvester_handshake to peer",)
 
-    def apply(
-        self,
-        line: str,
-        chia_dog: ChiaWatchdog,
-    ):
-        fragments = line.split()
+    def apply_record(self, record: ChiaLogRecord, chia_dog: ChiaWatchdog):
+        fragments = record.fragments
 
         # extract data from line
-        timestamp_dt = datetime.fromisoformat(fragments[0])
+        timestamp_dt = record.timestamp
         harvester_id = fragments[-1]
         ip_address = fragments[-2]
 
@@ -120,22 +161,17 @@ class ActionHarvesterConnected(AbstractLineAction):
         chia_dog.harvester_infos[harvester_id] = harvester_info
 
 
-class ActionHarvesterDisconnected(AbstractLineAction):
+class ActionHarvesterDisconnected(AbstractChiaLineAction):
     """This action is triggered if a farmer disconnects to a harvester"""
 
-    def is_match(self, line: str) -> bool:
-        codewords = ("farmer", "peer disconnected")
-        return all(word in line for word in codewords)
+    SERVICE = "farmer"
+    KEYWORDS = ("peer disconnected",)
 
-    def apply(
-        self,
-        line: str,
-        chia_dog: ChiaWatchdog,
-    ):
-        fragments = line.split()
+    def apply_record(self, record: ChiaLogRecord, chia_dog: ChiaWatchdog):
+        fragments = record.fragments
 
         # extract data from line
-        timestamp_dt = datetime.fromisoformat(fragments[0])
+        timestamp_dt = record.timestamp
         # harvester_id = fragments[-1]
         ip_address = fragments[-3].replace("'", "").replace(",", "")
 
@@ -156,7 +192,7 @@ class ActionHarvesterDisconnected(AbstractLineAction):
             )
 
 
-class ActionHarvesterFoundProof(AbstractLineAction):
+class ActionHarvesterFoundProof(AbstractChiaLineAction):
     """This action is triggered if a harvester found a proof"""
 
     # Chia Version: 1.2.0
@@ -166,23 +202,12 @@ class ActionHarvesterFoundProof(AbstractLineAction):
     # 0 plots were eligible for farming 142fd5714f...
     # Found 0 proofs. Time: 0.00017 s. Total 0 plots
 
-    def is_match(self, line: str) -> bool:
-        codewords = (
-            "harvester chia.harvester.harvester",
-            "eligible",
-            "Found",
-            "proofs",
-        )
-        if all(word in line for word in codewords):
-            return True
-        return False
+    SERVICE = "harvester"
+    LOGGER = "chia.harvester.harvester"
+    KEYWORDS = ("eligible", "Found", "proofs")
 
-    def apply(
-        self,
-        line: str,
-        chia_dog: ChiaWatchdog,
-    ):
-        fragments = line.split()
+    def apply_record(self, record: ChiaLogRecord, chia_dog: ChiaWatchdog):
+        fragments = record.fragments
 
         # extract data from line
         proofs = int(fragments[-8])  # interger number
@@ -192,21 +217,15 @@ class ActionHarvesterFoundProof(AbstractLineAction):
             harvester_service.n_proofs += proofs
 
 
-class ActionFarmedUnfinishedBlock(AbstractLineAction):
+class ActionFarmedUnfinishedBlock(AbstractChiaLineAction):
     """This action is triggered if a harvester found a block"""
 
-    def is_match(self, line: str) -> bool:
-        codewords = ("full_node chia.full_node.full_node", "Farmed unfinished_block")
-        if all(word in line for word in codewords):
-            return True
-        return False
+    SERVICE = "full_node"
+    LOGGER = "chia.full_node.full_node"
+    KEYWORDS = ("Farmed unfinished_block",)
 
-    def apply(
-        self,
-        line: str,
-        chia_dog: ChiaWatchdog,
-    ):
-        fragments = line.split()
+    def apply_record(self, record: ChiaLogRecord, chia_dog: ChiaWatchdog):
+        fragments = record.fragments
 
         # extract block id from fragements
         block_id = fragments[-1]
@@ -214,19 +233,93 @@ class ActionFarmedUnfinishedBlock(AbstractLineAction):
             chia_dog.farmed_blocks.append(block_id)
 
 
-async def run_line_checks(chia_dog: ChiaWatchdog, line: str):
-    """Processes a line from the logfile
+def index_actions_by_service(
+    actions: Iterable[AbstractChiaLineAction],
+) -> Dict[str, List[AbstractChiaLineAction]]:
+    """Groups line actions by the service whose lines they check
+
+    Parameters
+    ----------
+    actions : Iterable[AbstractChiaLineAction]
+        actions to group
+
+    Returns
+    -------
+    actions_by_service : Dict[str, List[AbstractChiaLineAction]]
+        actions with the service as key
+    """
+    actions_by_service: Dict[str, List[AbstractChiaLineAction]] = defaultdict(list)
+    for action in actions:
+        actions_by_service[action.SERVICE].append(action)
+    return dict(actions_by_service)
+
+
+def get_line_prefilter(
+    actions: Iterable[AbstractChiaLineAction],
+) -> Optional[Tuple[bytes, ...]]:
+    """Get words of which one is in every line matching any action
+
+    Parameters
+    ----------
+    actions : Iterable[AbstractChiaLineAction]
+        actions to match lines for
+
+    Returns
+    -------
+    prefilter : Optional[Tuple[bytes, ...]]
+        the longest keyword of every action, None if an action
+        has no keywords and thus any line might match
+
+    Notes
+    -----
+        Lines are searched for these on the bytes level to decode
+        and parse only the lines which might be of interest.
+    """
+    prefilter = set()
+    for action in actions:
+        if not action.KEYWORDS:
+            return None
+        prefilter.add(max(action.KEYWORDS, key=len).encode("utf8"))
+    return tuple(sorted(prefilter))
+
+
+def process_line(chia_dog: ChiaWatchdog, line: str):
+    """Applies the matching actions on a line from the logfile
 
     Parameters
     ----------
+    chia_dog : ChiaWatchdog
+        chia watchdog to be modified
     line : str
         logfile line
+
+    Notes
+    -----
+        The line is parsed at most once and only checked against
+        the actions of the service which logged it.
     """
     try:
-        if line:
-            for action in ALL_LINE_ACTIONS:
-                if action.is_match(line):
-                    action.apply(line, chia_dog)
+        if not line:
+            return
+
+        # most lines are of no interest, thus only the service is
+        # looked at before the whole line is parsed
+        parts = line.split(" ", 2)
+        if len(parts) != 3:
+            return
+        actions = ACTIONS_BY_SERVICE.get(parts[1])
+        if actions is None or not any(
+            all(word in parts[2] for word in action.KEYWORDS) for action in actions
+        ):
+            return
+
+        record = ChiaLogRecord.from_line(line)
+        if record is None:
+            return
+
+        for action in actions:
+            if action.is_record_match(record):
+                action.apply_record(record, chia_dog)
 
     except Exception:
         trace = traceback.format_exc()
@@ -234,6 +327,33 @@ async def run_line_checks(chia_dog: ChiaWatchdog, line: str):
         get_logger(__name__).error(err_msg, line, trace)
 
 
+async def run_line_checks(chia_dog: ChiaWatchdog, line: str):
+    """Processes a line from the logfile
+
+    Parameters
+    ----------
+    chia_dog : ChiaWatchdog
+        chia watchdog to be modified
+    line : str
+        logfile line
+    """
+    process_line(chia_dog, line)
+
+
+async def run_line_checks_on_lines(chia_dog: ChiaWatchdog, lines: List[str]):
+    """Processes a batch of lines from the logfile
+
+    Parameters
+    ----------
+    chia_dog : ChiaWatchdog
+        chia watchdog to be modified
+    lines : List[str]
+        logfile lines in the order of the file
+    """
+    for line in lines:
+        process_line(chia_dog, line)
+
+
 ALL_LINE_ACTIONS = (
     ActionMessageFromHarvester(),
     ActionMessageToHarvester(),
@@ -242,3 +362,7 @@ ALL_LINE_ACTIONS = (
     ActionHarvesterDisconnected(),
     ActionHarvesterFoundProof(),
 )
+
+ACTIONS_BY_SERVICE = index_actions_by_service(ALL_LINE_ACTIONS)
+
+LINE_PREFILTER = get_line_prefilter(ALL_LINE_ACTIONS)
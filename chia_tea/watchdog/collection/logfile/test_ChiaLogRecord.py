@@ -0,0 +1,43 @@
+import unittest
+from datetime import datetime
+
+from .ChiaLogRecord import ChiaLogRecord
+
+
+class TestChiaLogRecord(unittest.TestCase):
+    def test_line_is_split_into_its_parts(self):
+
+        line = (
+            "2021-05-26T09:37:13.872 farmer farmer_server              : DEBUG"
+            + "    -> new_signage_point_harvester to peer 57.22.39.97 d46fb9aa\n"
+        )
+        record = ChiaLogRecord.from_line(line)
+
+        self.assertIsNotNone(record)
+        self.assertEqual(record.service, "farmer")
+        self.assertEqual(record.logger, "farmer_server")
+        self.assertEqual(record.level, "DEBUG")
+        self.assertEqual(
+            record.message, "-> new_signage_point_harvester to peer 57.22.39.97 d46fb9aa"
+        )
+        self.assertEqual(record.timestamp, datetime(2021, 5, 26, 9, 37, 13, 872000))
+        self.assertEqual(record.fragments[-2:], ["57.22.39.97", "d46fb9aa"])
+
+    def test_logger_without_padding(self):
+
+        line = "2021-05-26T09:37:13.872 full_node chia.full_node.full_node: INFO"
+        record = ChiaLogRecord.from_line(line)
+
+        self.assertEqual(record.logger, "chia.full_node.full_node")
+        self.assertEqual(record.level, "INFO")
+        self.assertEqual(record.message, "")
+
+    def test_malformed_lines(self):
+
+        self.assertIsNone(ChiaLogRecord.from_line(""))
+        self.assertIsNone(ChiaLogRecord.from_line("Traceback (most recent call last):"))
+        self.assertIsNone(ChiaLogRecord.from_line("    raise ValueError()\n"))
+
+        record = ChiaLogRecord.from_line("not a timestamp: INFO message")
+        with self.assertRaises(ValueError):
+            record.timestamp  # pylint: disable=pointless-statement
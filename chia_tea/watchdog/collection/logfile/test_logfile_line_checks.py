@@ -11,6 +11,8 @@ from .line_checks import (
     ActionMessageFromHarvester,
     ActionFinishedSignagePoint,
     ActionMessageToHarvester,
+    get_line_prefilter,
+    process_line,
 )
 
 # pylint: skip-file
@@ -31,7 +33,7 @@ class TestLineAction(unittest.TestCase):
             + f"peer disconnected {{'host': '{ip_address}', 'port': 8448}}"
         )
 
-        chia_dog = ChiaWatchdog("", "")
+        chia_dog = ChiaWatchdog("", [])
         chia_dog.harvester_infos = {
             node_id: FarmerHarvesterLogfile(
                 node_id,
@@ -66,7 +68,7 @@ class TestLineAction(unittest.TestCase):
         self.assertTrue(action.is_match(line))
 
         # check case that harvester does not exist yet
-        chia_dog = ChiaWatchdog("", "")
+        chia_dog = ChiaWatchdog("", [])
 
         action.apply(line, chia_dog)
         self.assertTrue(len(chia_dog.harvester_infos) == 1)
@@ -106,7 +108,7 @@ class TestLineAction(unittest.TestCase):
         self.assertTrue(action.is_match(line))
 
         # check correct modification
-        chia_dog = ChiaWatchdog("", "")
+        chia_dog = ChiaWatchdog("", [])
         action.apply(line, chia_dog)
 
         self.assertEqual(len(chia_dog.harvester_infos), 1)
@@ -129,7 +131,7 @@ class TestLineAction(unittest.TestCase):
         self.assertTrue(action.is_match(line))
 
         # check correct modification
-        chia_dog = ChiaWatchdog("", "")
+        chia_dog = ChiaWatchdog("", [])
         action.apply(line, chia_dog)
 
         self.assertEqual(len(chia_dog.harvester_infos), 1)
@@ -159,7 +161,7 @@ class TestLineAction(unittest.TestCase):
         self.assertTrue(action1.is_match(lineFirstRewardFound))
         self.assertTrue(action1.is_match(lineSecondRewardFound))
 
-        chia_dog = ChiaWatchdog("", "")
+        chia_dog = ChiaWatchdog("", [])
         chia_dog.harvester_infos = {
             node_id: FarmerHarvesterLogfile(
                 node_id,
@@ -203,7 +205,7 @@ class TestLineAction(unittest.TestCase):
         self.assertTrue(action1.is_match(line1Found))
         self.assertTrue(action1.is_match(line10Found))
 
-        chia_dog = ChiaWatchdog("", "")
+        chia_dog = ChiaWatchdog("", [])
 
         action1.apply(line, chia_dog)
         harvester_service = chia_dog.harvester_service
@@ -219,7 +221,7 @@ class TestLineAction(unittest.TestCase):
         """
         # pylint: disable=too-many-locals
 
-        chia_dog = ChiaWatchdog("", "")
+        chia_dog = ChiaWatchdog("", [])
 
         node_id = "d46fb9aaaa01f3aa3fc04f3e43231d35c3a1ddd4"
         ip_address = "57.22.39.97"
@@ -295,7 +297,7 @@ class TestLineAction(unittest.TestCase):
         timestamp = datetime.fromisoformat(timestamp1_str)
 
         # pylint: disable=duplicate-code
-        chia_dog = ChiaWatchdog("", "")
+        chia_dog = ChiaWatchdog("", [])
         chia_dog.harvester_infos = {
             node_id: FarmerHarvesterLogfile(
                 node_id,
@@ -342,6 +344,47 @@ class TestLineAction(unittest.TestCase):
         actionOut.apply(lineOut, chia_dog)
         actionIn.apply(lineIn, chia_dog)
 
+    def test_line_prefilter(self):
+
+        self.assertTupleEqual(
+            get_line_prefilter([ActionHarvesterFoundProof(), ActionMessageToHarvester()]),
+            (b"eligible", b"new_signage_point_harvester"),
+        )
+
+        class _ActionWithoutKeywords(ActionMessageToHarvester):
+            KEYWORDS = ()
+
+        self.assertIsNone(get_line_prefilter([_ActionWithoutKeywords()]))
+
+    def test_process_line_dispatches_by_service(self):
+
+        node_id = "d46fb9aaaa01f3aa3fc04f3e43231d35c3a1ddd4"
+        ip_address = "57.22.39.97"
+
+        chia_dog = ChiaWatchdog("", [])
+        process_line(chia_dog, msg_signage_point("2021-05-26T09:30:00.872"))
+        process_line(chia_dog, msg_to_harvester("2021-05-26T09:30:01.872", ip_address, node_id))
+        process_line(chia_dog, msg_from_harvester("2021-05-26T09:30:02.872", ip_address, node_id))
+
+        harvester_info = chia_dog.harvester_infos[node_id]
+        self.assertTrue(harvester_info.is_connected)
+        self.assertEqual(
+            harvester_info.last_update, datetime.fromisoformat("2021-05-26T09:30:02.872")
+        )
+
+        # lines of other services and malformed lines are ignored
+        process_line(
+            chia_dog,
+            "2021-05-26T09:30:03.872 wallet wallet_server : DEBUG peer disconnected "
+            + f"{{'host': '{ip_address}', 'port': 8448}}",
+        )
+        process_line(chia_dog, "Traceback (most recent call last):")
+        process_line(chia_dog, "")
+        self.assertTrue(harvester_info.is_connected)
+
+        process_line(chia_dog, msg_disconnect("2021-05-26T09:30:04.872", ip_address, node_id))
+        self.assertFalse(harvester_info.is_connected)
+
 
 def msg_to_harvester(timestamp_str: str, ip_address: str, node_id: str) -> str:
     """Get a fake log msg indicating a send msg to harvester"""
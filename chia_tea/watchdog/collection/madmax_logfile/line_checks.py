@@ -1,7 +1,7 @@
 import os
 import traceback
 from datetime import datetime
-from typing import Tuple
+from typing import List, Tuple
 
 from ....general.AbstractLineAction import AbstractLineAction
 from ....models.ChiaWatchdog import ChiaWatchdog
@@ -334,11 +334,13 @@ class StartCopyOfPlot(AbstractLineAction):
 #                 break
 
 
-async def run_line_checks(chia_dog: ChiaWatchdog, line: str):
-    """Processes a line from the logfile
+def process_line(chia_dog: ChiaWatchdog, line: str):
+    """Applies the matching actions on a line from the logfile
 
     Parameters
     ----------
+    chia_dog : ChiaWatchdog
+        chia watchdog to be modified
     line : str
         logfile line
     """
@@ -354,6 +356,50 @@ async def run_line_checks(chia_dog: ChiaWatchdog, line: str):
         get_logger(__name__).error(err_msg, line, trace)
 
 
+async def run_line_checks(chia_dog: ChiaWatchdog, line: str):
+    """Processes a line from the logfile
+
+    Parameters
+    ----------
+    line : str
+        logfile line
+    """
+    process_line(chia_dog, line)
+
+
+async def run_line_checks_on_lines(
+    chia_dog: ChiaWatchdog, lines: List[str], madmax_logfile: str = ""
+):
+    """Processes a batch of lines from the logfile
+
+    Parameters
+    ----------
+    chia_dog : ChiaWatchdog
+        chia watchdog to be modified
+    lines : List[str]
+        logfile lines in the order of the file
+    madmax_logfile : str
+        logfile the lines are from
+
+    Notes
+    -----
+        The lines of a logfile refer to the latest plot of the same
+        logfile, thus the plots of other logfiles are set aside while
+        the lines are processed. New plots are tracked in the logfile.
+    """
+    other_plots = [plot for plot in chia_dog.plots_in_progress if plot.logfile != madmax_logfile]
+    chia_dog.plots_in_progress = [
+        plot for plot in chia_dog.plots_in_progress if plot.logfile == madmax_logfile
+    ]
+    try:
+        for line in lines:
+            process_line(chia_dog, line)
+    finally:
+        for plot in chia_dog.plots_in_progress:
+            plot.logfile = madmax_logfile
+        chia_dog.plots_in_progress = other_plots + chia_dog.plots_in_progress
+
+
 ALL_LINE_ACTIONS: Tuple[AbstractLineAction, ...] = (
     AddNewPlotInProgress(),
     SetPoolPublicKeyForLatestPlot(),
@@ -3,6 +3,7 @@ import unittest
 
 from ....models.ChiaWatchdog import ChiaWatchdog
 from ....models.MadMaxPlotInProgress import MadMaxPercentages, MadMaxPlotInProgress
+from ....utils.testing import async_test
 from .line_checks import (
     AddNewPlotInProgress,
     LatestPlotEnteringPhase2,
@@ -15,6 +16,7 @@ from .line_checks import (
     SetPlotDataForLatestPlot,
     SetPoolPublicKeyForLatestPlot,
     StartCopyOfPlot,
+    run_line_checks_on_lines,
 )
 
 
@@ -26,7 +28,7 @@ class TestLineAction(unittest.TestCase):
 
         logfile_line = "Process ID: 1374"
 
-        dog = ChiaWatchdog("", "")
+        dog = ChiaWatchdog("", [])
 
         action = AddNewPlotInProgress()
         self.assertTrue(action.is_match(logfile_line))
@@ -44,7 +46,7 @@ class TestLineAction(unittest.TestCase):
             f"Started copy to /some/drive/plot-k32-2021-10-06-00-53-{self.public_key}.plot"
         )
 
-        dog = ChiaWatchdog("", "")
+        dog = ChiaWatchdog("", [])
         dog.plots_in_progress.append(
             MadMaxPlotInProgress(
                 process_id=1,
@@ -67,7 +69,7 @@ class TestLineAction(unittest.TestCase):
 
         logfile_line = f"Pool Public Key:   {self.public_key}"
 
-        dog = ChiaWatchdog("", "")
+        dog = ChiaWatchdog("", [])
         plot = MadMaxPlotInProgress(
             process_id=1,
             public_key=self.public_key,
@@ -90,7 +92,7 @@ class TestLineAction(unittest.TestCase):
 
         logfile_line = f"Farmer Public Key: {self.public_key}"
 
-        dog = ChiaWatchdog("", "")
+        dog = ChiaWatchdog("", [])
         plot = MadMaxPlotInProgress(
             process_id=1,
             public_key=self.public_key,
@@ -113,7 +115,7 @@ class TestLineAction(unittest.TestCase):
 
         logfile_line = f"Plot Name: plot-k32-2021-10-05-20-38-{self.public_key}"
 
-        dog = ChiaWatchdog("", "")
+        dog = ChiaWatchdog("", [])
         plot = MadMaxPlotInProgress(
             process_id=1,
             public_key=self.public_key,
@@ -151,7 +153,7 @@ class TestLineAction(unittest.TestCase):
             "[P1] Table 7 took 248.694 sec, found 4294916656 matches"
         ]
 
-        dog = ChiaWatchdog("", "")
+        dog = ChiaWatchdog("", [])
         plot = MadMaxPlotInProgress(
             process_id=1,
             public_key=self.public_key,
@@ -175,7 +177,7 @@ class TestLineAction(unittest.TestCase):
 
         logfile_line = "[P2] max_table_size = 4295062806"
 
-        dog = ChiaWatchdog("", "")
+        dog = ChiaWatchdog("", [])
         plot = MadMaxPlotInProgress(
             process_id=1,
             public_key=self.public_key,
@@ -211,7 +213,7 @@ class TestLineAction(unittest.TestCase):
             "[P2] Table 2 rewrite took 106.716 sec, dropped 865599957 entries (20.1538 %)",
         ]
 
-        dog = ChiaWatchdog("", "")
+        dog = ChiaWatchdog("", [])
         plot = MadMaxPlotInProgress(
             process_id=1,
             public_key=self.public_key,
@@ -235,7 +237,7 @@ class TestLineAction(unittest.TestCase):
 
         logfile_line = "Wrote plot header with 268 bytes"
 
-        dog = ChiaWatchdog("", "")
+        dog = ChiaWatchdog("", [])
         plot = MadMaxPlotInProgress(
             process_id=1,
             public_key=self.public_key,
@@ -271,7 +273,7 @@ class TestLineAction(unittest.TestCase):
             "[P3-2] Table 7 took 162.498 sec, wrote 4294916656 left entries, 4294916656 final",
         ]
 
-        dog = ChiaWatchdog("", "")
+        dog = ChiaWatchdog("", [])
         plot = MadMaxPlotInProgress(
             process_id=1,
             public_key=self.public_key,
@@ -295,7 +297,7 @@ class TestLineAction(unittest.TestCase):
 
         logfile_line = "[P4] Starting to write C1 and C3 tables"
 
-        dog = ChiaWatchdog("", "")
+        dog = ChiaWatchdog("", [])
         plot = MadMaxPlotInProgress(
             process_id=1,
             public_key=self.public_key,
@@ -313,3 +315,22 @@ class TestLineAction(unittest.TestCase):
         action.apply(line=logfile_line, chia_dog=dog)
         self.assertEqual(dog.plots_in_progress, [plot])
         self.assertEqual(plot.state, "Plotting Phase4")
+
+    @async_test
+    async def test_plots_of_several_logfiles(self):
+
+        dog = ChiaWatchdog("", ["madmax_1.log", "madmax_2.log"])
+
+        await run_line_checks_on_lines(dog, ["Process ID: 1\n"], "madmax_1.log")
+        await run_line_checks_on_lines(dog, ["Process ID: 2\n"], "madmax_2.log")
+        # lines refer to the latest plot of their logfile
+        await run_line_checks_on_lines(
+            dog, ["[P4] Starting to write C1 and C3 tables\n"], "madmax_1.log"
+        )
+
+        plots = {plot.process_id: plot for plot in dog.plots_in_progress}
+        self.assertEqual(len(plots), 2)
+        self.assertEqual(plots[1].state, "Plotting Phase4")
+        self.assertEqual(plots[1].logfile, "madmax_1.log")
+        self.assertEqual(plots[2].state, "Init")
+        self.assertEqual(plots[2].logfile, "madmax_2.log")
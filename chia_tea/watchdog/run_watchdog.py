@@ -1,14 +1,19 @@
 import asyncio
+import functools
 import traceback
-from typing import Callable
+from typing import Callable, Dict, List
 
-from ..general.file_watching import watch_lines_infinitely
+from ..general.LogfilePosition import LogfilePosition
+from ..general.LogWatcher import LogWatcher
 from ..models.ChiaWatchdog import ChiaWatchdog
 from ..utils.logger import get_logger
+from .checkpoint import CHECKPOINT_INTERVAL_SECONDS, read_checkpoint, write_checkpoint
 from .checks.regular_checks import run_watchdog_checks
 from .collection.api.update_all import update_directly_from_chia
-from .collection.logfile.line_checks import run_line_checks
-from .collection.madmax_logfile.line_checks import run_line_checks as run_line_checks_madmax
+from .collection.logfile.line_checks import LINE_PREFILTER, run_line_checks_on_lines
+from .collection.madmax_logfile.line_checks import (
+    run_line_checks_on_lines as run_line_checks_on_lines_madmax,
+)
 
 
 async def __start_watchdog_self_checks(chia_dog: ChiaWatchdog):
@@ -39,30 +44,91 @@ async def __start_updating_watchdog_service_infos(chia_dog: ChiaWatchdog):
         await asyncio.sleep(7)
 
 
-def __get_function_to_update_chia_dog_on_line(chia_dog: ChiaWatchdog):
+async def __start_checkpointing(
+    chia_dog: ChiaWatchdog,
+    checkpoint_filepath: str,
+    chia_position: LogfilePosition,
+    madmax_positions: Dict[str, LogfilePosition],
+):
+    """Infinite loop to save the state gathered from the logfiles regularly"""
+    if not checkpoint_filepath:
+        return
+
+    try:
+        while True:
+            await asyncio.sleep(CHECKPOINT_INTERVAL_SECONDS)
+            write_checkpoint(checkpoint_filepath, chia_dog, chia_position, madmax_positions)
+    finally:
+        # also save the latest state when shutting down
+        write_checkpoint(checkpoint_filepath, chia_dog, chia_position, madmax_positions)
+
+
+def __get_function_to_update_chia_dog_on_lines(chia_dog: ChiaWatchdog):
     """Wrapper function to bring chia_dog into the context of
-    the line updating function
+    the lines updating function
     """
 
-    async def _on_line_function(line: str):
-        await run_line_checks(chia_dog, line)
+    async def _on_lines_function(lines: List[str]):
+        await run_line_checks_on_lines(chia_dog, lines)
 
-    return _on_line_function
+    return _on_lines_function
 
 
-def __get_function_to_update_chia_dog_on_madmax_line(chia_dog: ChiaWatchdog):
-    """Wrapper function to bring chia_dog into the context of
-    the line updating function
+def __get_function_to_update_chia_dog_on_madmax_lines(chia_dog: ChiaWatchdog, madmax_logfile: str):
+    """Wrapper function to bring chia_dog and the logfile into the
+    context of the lines updating function
     """
 
-    async def _on_line_function(line: str):
-        await run_line_checks_madmax(chia_dog, line)
+    async def _on_lines_function(lines: List[str]):
+        await run_line_checks_on_lines_madmax(chia_dog, lines, madmax_logfile)
 
-    return _on_line_function
+    return _on_lines_function
+
+
+def __create_log_watcher(
+    chia_dog: ChiaWatchdog,
+    chia_position: LogfilePosition,
+    madmax_positions: Dict[str, LogfilePosition],
+) -> LogWatcher:
+    """Creates a watcher for the chia logfile and all madmax logfiles"""
+    log_watcher = LogWatcher()
+
+    if chia_dog.logfile_filepath:
+        log_watcher.add_logfile(
+            chia_dog.logfile_filepath,
+            on_lines=__get_function_to_update_chia_dog_on_lines(chia_dog),
+            on_ready=__get_on_ready_function(chia_dog.set_chia_logfile_is_ready),
+            # the watchdog is set ready if the logfile is missing
+            # this might just mean that the machine doesn't run
+            # chia.
+            on_file_missing=__get_on_ready_function(chia_dog.set_chia_logfile_is_ready),
+            position=chia_position,
+            # only lines the line checks might match are read
+            prefilter=LINE_PREFILTER,
+        )
+    else:
+        chia_dog.set_chia_logfile_is_ready()
+
+    for madmax_logfile in chia_dog.madmax_logfiles:
+        set_ready = __get_on_ready_function(
+            functools.partial(chia_dog.set_madmax_logfile_is_ready, madmax_logfile)
+        )
+        log_watcher.add_logfile(
+            madmax_logfile,
+            on_lines=__get_function_to_update_chia_dog_on_madmax_lines(chia_dog, madmax_logfile),
+            on_ready=set_ready,
+            # a missing logfile might just mean that the plotter
+            # did not run yet
+            on_file_missing=set_ready,
+            position=madmax_positions[madmax_logfile],
+        )
+
+    return log_watcher
 
 
 async def run_watchdog(
     chia_dog: ChiaWatchdog,
+    checkpoint_filepath: str = "",
 ):
     """Start observing chia
 
@@ -70,44 +136,53 @@ async def run_watchdog(
     ----------
     chia_dog : ChiaWatchdog
         the data of this watchdog will be updated regularly
+    checkpoint_filepath : str
+        file to save the state gathered from the logfiles in.
+        The logfiles are read from where the state was saved
+        instead of from their beginning if the file exists.
 
     Notes
     -----
         Runs the following checks:
-        - watches the logfile indefinitely
+        - watches the chia and madmax logfiles indefinitely
         - runs regular self checks
         - connects to chia services to retrieve information
+        - saves the state gathered from the logfiles regularly
     """
+    chia_position = LogfilePosition()
+    madmax_positions = {
+        madmax_logfile: LogfilePosition() for madmax_logfile in chia_dog.madmax_logfiles
+    }
+    if checkpoint_filepath:
+        chia_position, madmax_positions = read_checkpoint(checkpoint_filepath, chia_dog)
+
     while True:
-        try:
-            await asyncio.gather(
-                # infinite watching of the chia logfile
-                watch_lines_infinitely(
-                    chia_dog.logfile_filepath,
-                    # the watchdog is set ready if the logfile is missing
-                    # this might just mean that the machine doesn't run
-                    # chia.
-                    on_file_missing=__get_on_ready_function(chia_dog.set_chia_logfile_is_ready),
-                    on_ready=__get_on_ready_function(chia_dog.set_chia_logfile_is_ready),
-                    on_line=__get_function_to_update_chia_dog_on_line(chia_dog),
-                ),
-                # infinite watchig of the madmax logfile
-                watch_lines_infinitely(
-                    chia_dog.madmax_logfile,
-                    # the watchdog is set ready if the logfile is missing
-                    # this might just mean that the machine doesn't run
-                    # madmax.
-                    on_file_missing=__get_on_ready_function(chia_dog.set_madmax_logfile_is_ready),
-                    on_ready=__get_on_ready_function(chia_dog.set_madmax_logfile_is_ready),
-                    on_line=__get_function_to_update_chia_dog_on_madmax_line(chia_dog),
-                ),
+        tasks = [
+            asyncio.ensure_future(coroutine)
+            for coroutine in (
+                # infinite watching of all logfiles in a single task
+                __create_log_watcher(chia_dog, chia_position, madmax_positions).run(),
                 # regular checks such as time out
                 __start_watchdog_self_checks(chia_dog),
                 # regular status update from chia services
                 __start_updating_watchdog_service_infos(chia_dog),
+                # regular checkpoints of the logfile state
+                __start_checkpointing(
+                    chia_dog, checkpoint_filepath, chia_position, madmax_positions
+                ),
             )
+        ]
+        try:
+            await asyncio.gather(*tasks)
 
         except Exception:
             err_msg = traceback.format_exc()
             get_logger(__file__).error(err_msg)
-            await asyncio.sleep(5)
+        finally:
+            # gather leaves the other tasks running if one fails, these
+            # would process the logfiles twice after the restart
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        await asyncio.sleep(5)
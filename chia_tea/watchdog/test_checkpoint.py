@@ -0,0 +1,162 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from typing import Dict
+
+from ..general.LogfilePosition import LogfilePosition
+from ..models.ChiaWatchdog import ChiaWatchdog
+from ..models.FarmerHarvesterLogfile import FarmerHarvesterLogfile
+from ..models.MadMaxPlotInProgress import MadMaxPlotInProgress
+from .checkpoint import read_checkpoint, write_checkpoint
+
+
+class TestCheckpoint(unittest.TestCase):
+    def setUp(self) -> None:
+        # pylint: disable=consider-using-with
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.checkpoint_filepath = os.path.join(self.tmp_dir.name, "checkpoint.json")
+        self.logfile = os.path.join(self.tmp_dir.name, "debug.log")
+        self.madmax_logfiles = [
+            os.path.join(self.tmp_dir.name, "madmax_1.log"),
+            os.path.join(self.tmp_dir.name, "madmax_2.log"),
+        ]
+        for filepath in [self.logfile, *self.madmax_logfiles]:
+            with open(filepath, "w", encoding="utf8") as fp:
+                fp.write("line\n")
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def _get_position(self, filepath: str) -> LogfilePosition:
+        stat = os.stat(filepath)
+        return LogfilePosition(inode=stat.st_ino, device=stat.st_dev, offset=stat.st_size)
+
+    def _get_madmax_positions(self) -> Dict[str, LogfilePosition]:
+        return {filepath: self._get_position(filepath) for filepath in self.madmax_logfiles}
+
+    def _get_chia_dog(self) -> ChiaWatchdog:
+        chia_dog = ChiaWatchdog(self.logfile, self.madmax_logfiles)
+        chia_dog.harvester_infos = {
+            "harvester": FarmerHarvesterLogfile(
+                harvester_id="harvester",
+                ip_address="57.22.39.97",
+                is_connected=True,
+                time_last_incoming_msg=datetime(2021, 5, 26, 9, 37, 13),
+                n_responses=3,
+                last_update=datetime(2021, 5, 26, 9, 37, 14),
+            )
+        }
+        chia_dog.farmed_blocks = ["block"]
+        chia_dog.harvester_service.n_proofs = 2
+        chia_dog.plots_in_progress = [
+            MadMaxPlotInProgress(
+                process_id=1374 + i_file,
+                public_key="key",
+                pool_public_key="pool",
+                farmer_public_key="farmer",
+                start_time=datetime(2021, 5, 26, 9, 0, 0),
+                progress=0.5,
+                plot_type=1,
+                state="Plotting Phase2",
+                logfile=madmax_logfile,
+            )
+            for i_file, madmax_logfile in enumerate(self.madmax_logfiles)
+        ]
+        return chia_dog
+
+    def test_state_is_restored(self):
+
+        chia_dog = self._get_chia_dog()
+        chia_position = self._get_position(self.logfile)
+        madmax_positions = self._get_madmax_positions()
+        write_checkpoint(self.checkpoint_filepath, chia_dog, chia_position, madmax_positions)
+
+        restored_dog = ChiaWatchdog(self.logfile, self.madmax_logfiles)
+        positions = read_checkpoint(self.checkpoint_filepath, restored_dog)
+
+        self.assertTupleEqual(positions, (chia_position, madmax_positions))
+        self.assertDictEqual(restored_dog.harvester_infos, chia_dog.harvester_infos)
+        self.assertListEqual(restored_dog.farmed_blocks, ["block"])
+        self.assertEqual(restored_dog.harvester_service.n_proofs, 2)
+        self.assertListEqual(restored_dog.plots_in_progress, chia_dog.plots_in_progress)
+
+    def test_state_of_replaced_logfile_is_discarded(self):
+
+        chia_dog = self._get_chia_dog()
+        write_checkpoint(
+            self.checkpoint_filepath,
+            chia_dog,
+            self._get_position(self.logfile),
+            self._get_madmax_positions(),
+        )
+
+        # the chia logfile was replaced and not rotated
+        with open(self.logfile + ".new", "w", encoding="utf8") as fp:
+            fp.write("new line\n")
+        os.replace(self.logfile + ".new", self.logfile)
+
+        restored_dog = ChiaWatchdog(self.logfile, self.madmax_logfiles)
+        chia_position, madmax_positions = read_checkpoint(self.checkpoint_filepath, restored_dog)
+
+        self.assertEqual(chia_position, LogfilePosition())
+        self.assertDictEqual(restored_dog.harvester_infos, {})
+        self.assertListEqual(restored_dog.farmed_blocks, [])
+        self.assertDictEqual(madmax_positions, self._get_madmax_positions())
+        self.assertEqual(len(restored_dog.plots_in_progress), 2)
+
+    def test_state_of_rotated_logfile_is_restored(self):
+
+        chia_dog = self._get_chia_dog()
+        chia_position = self._get_position(self.logfile)
+        write_checkpoint(
+            self.checkpoint_filepath,
+            chia_dog,
+            chia_position,
+            self._get_madmax_positions(),
+        )
+
+        os.rename(self.logfile, self.logfile + ".1")
+        with open(self.logfile, "w", encoding="utf8") as fp:
+            fp.write("new line\n")
+
+        restored_dog = ChiaWatchdog(self.logfile, self.madmax_logfiles)
+        restored_position, _ = read_checkpoint(self.checkpoint_filepath, restored_dog)
+
+        self.assertEqual(restored_position, chia_position)
+        self.assertEqual(len(restored_dog.harvester_infos), 1)
+
+    def test_missing_or_broken_checkpoint(self):
+
+        chia_dog = ChiaWatchdog(self.logfile, self.madmax_logfiles)
+        initial_madmax_positions = {
+            filepath: LogfilePosition() for filepath in self.madmax_logfiles
+        }
+        self.assertTupleEqual(
+            read_checkpoint(self.checkpoint_filepath, chia_dog),
+            (LogfilePosition(), initial_madmax_positions),
+        )
+
+        with open(self.checkpoint_filepath, "w", encoding="utf8") as fp:
+            fp.write('{"version": 2, "chia": {}}')
+        self.assertTupleEqual(
+            read_checkpoint(self.checkpoint_filepath, chia_dog),
+            (LogfilePosition(), initial_madmax_positions),
+        )
+
+    def test_state_of_removed_madmax_logfile_is_discarded(self):
+
+        chia_dog = self._get_chia_dog()
+        write_checkpoint(
+            self.checkpoint_filepath,
+            chia_dog,
+            self._get_position(self.logfile),
+            self._get_madmax_positions(),
+        )
+
+        # the second plotter is not watched anymore
+        restored_dog = ChiaWatchdog(self.logfile, self.madmax_logfiles[:1])
+        _, madmax_positions = read_checkpoint(self.checkpoint_filepath, restored_dog)
+
+        self.assertListEqual(list(madmax_positions), self.madmax_logfiles[:1])
+        self.assertListEqual(restored_dog.plots_in_progress, chia_dog.plots_in_progress[:1])